@@ -0,0 +1,123 @@
+"""
+Benchmark the single-pass boundary matcher against the old per-line loop.
+
+The legacy side splits the manuscript into lines and tries the scene break
+pattern and up to five chapter patterns on every line; the new side runs one
+MULTILINE alternation over the whole text with ``finditer``.
+
+Usage:
+    python benchmarks/bench_chapters.py [--lines 200000]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.core.chapter import iter_boundaries, SCENE_BREAK  # noqa: E402
+
+# The previous per-line patterns, tried in order on every line
+CHAPTER_PATTERNS = [
+    re.compile(r'^#\s+(.+)$'),  # Markdown H1
+    re.compile(r'^##\s+(.+)$'),  # Markdown H2
+    re.compile(r'^Chapter\s+\d+[:\s]+(.+)'),  # "Chapter 1: Title"
+    re.compile(r'^CHAPTER\s+\d+[:\s]+(.+)'),  # "CHAPTER 1: Title"
+    re.compile(r'^Ch\.\s*\d+[:\s]+(.+)'),  # "Ch. 1: Title"
+]
+SCENE_BREAK_PATTERN = re.compile(r'^\s*(?:\*\*\*|---)\s*$')
+
+
+def match_chapter_heading(line: str) -> Optional[str]:
+    """Stripped chapter title if a line is a chapter heading, else None."""
+    for pattern in CHAPTER_PATTERNS:
+        match = pattern.match(line)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def is_scene_break(line: str) -> bool:
+    """Check whether a line is a scene break (*** or ---)."""
+    return SCENE_BREAK_PATTERN.match(line) is not None
+
+
+def legacy_boundaries(text: str):
+    """The previous detection: split into lines, match each line separately."""
+    headings = []
+    scene_breaks = 0
+    line_start = 0
+    for line in text.split('\n'):
+        if is_scene_break(line):
+            scene_breaks += 1
+        title = match_chapter_heading(line)
+        if title is not None:
+            headings.append((line_start, title))
+        line_start += len(line) + 1
+    return headings, scene_breaks
+
+
+def combined_boundaries(text: str):
+    """Detection through iter_boundaries, collected the same way."""
+    headings = []
+    scene_breaks = 0
+    for boundary in iter_boundaries(text):
+        if boundary.kind == SCENE_BREAK:
+            scene_breaks += 1
+        else:
+            headings.append((boundary.start, boundary.title))
+    return headings, scene_breaks
+
+
+def build_manuscript(line_count: int, seed: int = 11) -> str:
+    """Generate a manuscript with the requested number of lines."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    headings = ["# Chapter {n}", "## Interlude {n}", "Chapter {n}: The Bridge", "CHAPTER {n} THE RIVER", "Ch. {n}: Night"]
+    lines = []
+    chapter = 0
+    while len(lines) < line_count:
+        if len(lines) >= chapter * 400:
+            chapter += 1
+            lines.append(rng.choice(headings).format(n=chapter))
+            lines.append("")
+        elif rng.random() < 0.01:
+            lines.append(rng.choice(["***", "---", "  ***  "]))
+        else:
+            sentence = " ".join(rng.choice(words) for _ in range(rng.randint(5, 25)))
+            lines.append(sentence.capitalize() + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _time(func, text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200_000, help="Generated manuscript size in lines")
+    args = parser.parse_args()
+
+    text = build_manuscript(args.lines)
+    assert legacy_boundaries(text) == combined_boundaries(text)
+    headings, scene_breaks = combined_boundaries(text)
+    print(f"Manuscript: {text.count(chr(10)) + 1} lines, {len(headings)} headings, {scene_breaks} scene breaks")
+    legacy = _time(legacy_boundaries, text)
+    combined = _time(combined_boundaries, text)
+    print(f"  legacy (per line):   {legacy * 1000:8.1f} ms")
+    print(f"  combined (finditer): {combined * 1000:8.1f} ms   ({legacy / combined:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
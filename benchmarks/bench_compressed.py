@@ -0,0 +1,103 @@
+"""
+Benchmark streaming analysis of compressed manuscripts.
+
+The legacy side decompresses the manuscript to a temporary file and then
+analyzes that file with ``--stream``; the new side analyzes the compressed
+file directly, decompressing on a background thread while the analysis
+runs (``iter_compressed_text``; the background thread is only used when
+a second CPU is available). Both produce the same statistics; wall time
+and the bytes written to disk are reported for each format.
+
+Usage:
+    python benchmarks/bench_compressed.py [--megabytes 50]
+"""
+
+import argparse
+import bz2
+import gzip
+import lzma
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.core.streaming import analyze_manuscript_stream  # noqa: E402
+from musestat.io.compressed import open_compressed  # noqa: E402
+
+COMPRESSORS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+
+def build_text(path: Path, megabytes: int, seed: int = 11):
+    """Write a Markdown manuscript of roughly the given size."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    with open(path, 'w', encoding='utf-8') as f:
+        written = 0
+        chapter = 0
+        while written < megabytes * 1_000_000:
+            chapter += 1
+            paragraphs = [f"# Chapter {chapter}"]
+            for _ in range(200):
+                sentence = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120))).capitalize()
+                paragraphs.append(f'{sentence}. "Yes," she said.')
+            written += f.write("\n\n".join(paragraphs) + "\n\n")
+
+
+def legacy_analyze(path: Path) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        inflated = Path(directory) / path.stem
+        with open_compressed(str(path)) as source, open(inflated, 'wb') as target:
+            shutil.copyfileobj(source, target, 1 << 20)
+        return analyze_manuscript_stream(str(inflated))
+
+
+def streaming_analyze(path: Path) -> dict:
+    return analyze_manuscript_stream(str(path))
+
+
+def _time(func, path: Path, repeat: int = 2):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=int, default=50, help="Generated manuscript size in MB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        plain = Path(directory) / "bench.md"
+        build_text(plain, args.megabytes)
+        size = plain.stat().st_size
+        print(f"Manuscript: {size / 1e6:.0f} MB")
+
+        for extension, compressor in COMPRESSORS.items():
+            path = plain.with_name(plain.name + extension)
+            with open(plain, 'rb') as source, compressor(path, 'wb') as target:
+                shutil.copyfileobj(source, target, 1 << 20)
+
+            legacy, legacy_time = _time(legacy_analyze, path)
+            streamed, stream_time = _time(streaming_analyze, path)
+            assert legacy['total_words'] == streamed['total_words']
+            assert legacy['common_words'] == streamed['common_words']
+            print(f"  {extension:4} decompress to disk: {legacy_time * 1000:8.1f} ms ({size / 1e6:.0f} MB written)   "
+                  f"streamed: {stream_time * 1000:8.1f} ms (0 MB written)   "
+                  f"{legacy_time / stream_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark the streaming .docx reader against python-docx.
+
+The legacy side loads the whole document model with python-docx and joins
+its paragraphs; the new side streams ``word/document.xml`` with
+``iterparse`` (``iter_docx_paragraphs``). Both see the same paragraphs; time
+and peak traced memory are reported for each.
+
+Usage:
+    python benchmarks/bench_docx.py [--paragraphs 20000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.io.documents import iter_docx_paragraphs  # noqa: E402
+
+try:
+    from docx import Document
+except ImportError:
+    Document = None
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="word/document.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+W = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def build_docx(path: Path, paragraph_count: int, seed: int = 5):
+    """Write a minimal .docx with Heading 2 chapters and body paragraphs."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    body = []
+    for i in range(paragraph_count):
+        if i % 200 == 0:
+            body.append(
+                f'<w:p><w:pPr><w:pStyle w:val="Heading2"/></w:pPr>'
+                f'<w:r><w:t>Chapter {i // 200 + 1}</w:t></w:r></w:p>'
+            )
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120))).capitalize() + "."
+        half = len(sentence) // 2
+        body.append(
+            f'<w:p><w:r><w:rPr><w:i/></w:rPr><w:t xml:space="preserve">{escape(sentence[:half])}</w:t></w:r>'
+            f'<w:r><w:t>{escape(sentence[half:])}</w:t></w:r></w:p>'
+        )
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W}"><w:body>{"".join(body)}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', CONTENT_TYPES)
+        archive.writestr('_rels/.rels', PACKAGE_RELS)
+        archive.writestr('word/document.xml', document)
+
+
+def legacy_paragraphs(path: Path):
+    return [paragraph.text for paragraph in Document(str(path)).paragraphs]
+
+
+def streaming_paragraphs(path: Path):
+    return [paragraph.text for paragraph in iter_docx_paragraphs(str(path))]
+
+
+def _measure(func, path: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=20_000, help="Generated document size in paragraphs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.docx"
+        build_docx(path, args.paragraphs)
+        print(f"Document: {path.stat().st_size / 1024:.0f} KB zipped")
+
+        streamed, stream_time, stream_peak = _measure(streaming_paragraphs, path)
+        print(f"  streaming (iterparse): {stream_time * 1000:8.1f} ms   peak {stream_peak / 1e6:7.1f} MB")
+        if Document is None:
+            print("  python-docx not installed; skipping the comparison")
+            return
+
+        legacy, legacy_time, legacy_peak = _measure(legacy_paragraphs, path)
+        assert legacy == streamed
+        print(f"  python-docx:           {legacy_time * 1000:8.1f} ms   peak {legacy_peak / 1e6:7.1f} MB")
+        print(f"  speedup {legacy_time / stream_time:.1f}x, {legacy_peak / stream_peak:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark analyzing an EPUB against the same book as Markdown.
+
+A book is generated twice: as Markdown (``# Chapter N`` headings and
+paragraphs) and as an EPUB 3 with one XHTML file per chapter (the longer
+chapters split across two files, as converters do), a navigation
+document and inline markup. Both are analyzed with ``analyze_manuscript``
+and must give the same word and chapter counts; the EPUB's XHTML items
+are parsed in a process pool when more than one CPU is available.
+
+Usage:
+    python benchmarks/bench_epub.py [--chapters 60] [--paragraphs 150]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.core.analyzer import analyze_manuscript  # noqa: E402
+
+CONTAINER = (
+    '<?xml version="1.0"?><container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+    '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>'
+    '</rootfiles></container>'
+)
+XHTML = (
+    '<?xml version="1.0" encoding="utf-8"?><html xmlns="http://www.w3.org/1999/xhtml" '
+    'xmlns:epub="http://www.idpf.org/2007/ops"><head><title>{title}</title>'
+    '<link rel="stylesheet" href="style.css"/></head><body>{body}</body></html>'
+)
+
+
+def build_book(markdown_path: Path, epub_path: Path, chapter_count: int, paragraph_count: int, seed: int = 17):
+    """Write the same generated book as Markdown and as an EPUB 3."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    markdown = []
+    manifest = []
+    spine = []
+    nav = []
+    files = {}
+    for number in range(1, chapter_count + 1):
+        title = f"Chapter {number}"
+        paragraphs = [" ".join(rng.choice(words) for _ in range(rng.randint(20, 120))).capitalize() + "."
+                      for _ in range(paragraph_count)]
+        markdown.append(f"# {title}\n\n" + "\n\n".join(paragraphs))
+        halves = [paragraphs] if number % 3 else [paragraphs[:paragraph_count // 2], paragraphs[paragraph_count // 2:]]
+        for part, chunk in enumerate(halves):
+            name = f"chapter{number:03}_{part}.xhtml"
+            body = ''.join(
+                f'<p class="body"><span class="dropcap">{escape(text[0])}</span>{escape(text[1:-1])}<em>.</em></p>'
+                for text in chunk
+            )
+            if part == 0:
+                body = f'<section epub:type="chapter"><h1 class="title">{title}</h1>{body}</section>'
+                nav.append(f'<li><a href="{name}">{title}</a></li>')
+            files[f"OEBPS/{name}"] = XHTML.format(title=title, body=body)
+            manifest.append(f'<item id="c{number}_{part}" href="{name}" media-type="application/xhtml+xml"/>')
+            spine.append(f'<itemref idref="c{number}_{part}"/>')
+
+    markdown_path.write_text("\n\n".join(markdown) + "\n", encoding='utf-8')
+    files["OEBPS/nav.xhtml"] = XHTML.format(
+        title="Contents", body=f'<nav epub:type="toc"><ol>{"".join(nav)}</ol></nav>')
+    opf = (
+        '<?xml version="1.0" encoding="utf-8"?><package xmlns="http://www.idpf.org/2007/opf" version="3.0">'
+        '<metadata/><manifest>'
+        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>'
+        f'{"".join(manifest)}</manifest><spine>{"".join(spine)}</spine></package>'
+    )
+    with zipfile.ZipFile(epub_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(zipfile.ZipInfo('mimetype'), 'application/epub+zip')
+        archive.writestr('META-INF/container.xml', CONTAINER)
+        archive.writestr('OEBPS/content.opf', opf)
+        for name, content in files.items():
+            archive.writestr(name, content)
+
+
+def _time(path: Path, repeat: int = 2):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = analyze_manuscript(str(path))
+        result['chapters']
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=60, help="Chapters in the generated book")
+    parser.add_argument("--paragraphs", type=int, default=150, help="Paragraphs per chapter")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        markdown_path = Path(directory) / "book.md"
+        epub_path = Path(directory) / "book.epub"
+        build_book(markdown_path, epub_path, args.chapters, args.paragraphs)
+
+        markdown, markdown_time = _time(markdown_path)
+        print(f"Book: {markdown['total_words']:,} words, {args.chapters} chapters")
+        print(f"  Markdown: {markdown_time * 1000:8.1f} ms")
+        book, epub_time = _time(epub_path)
+        assert book['total_words'] == markdown['total_words']
+        assert [c['title'] for c in book['chapters']] == [c['title'] for c in markdown['chapters']]
+        print(f"  EPUB:     {epub_time * 1000:8.1f} ms   ({epub_time / markdown_time:.2f}x the Markdown time)")
+
+
+if __name__ == "__main__":
+    main()
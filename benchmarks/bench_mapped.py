@@ -0,0 +1,102 @@
+"""
+Benchmark the memory-mapped text reader against text-mode file reads.
+
+Two comparisons on a generated UTF-8 manuscript (Windows line endings,
+accented and non-Latin text):
+
+* whole-file reads: ``f.read()`` on a text-mode file (the old
+  ``read_text``) against ``read_text``, which joins blocks decoded from a
+  mapping, reporting time and peak traced memory;
+* streaming: chunked text-mode reads with ``tell()`` checkpoints (the old
+  ``TextFileSource``) against ``TextFileSource.iter_chunks``, which
+  decodes the mapping with an incremental decoder.
+
+Usage:
+    python benchmarks/bench_mapped.py [--megabytes 200]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.io.readers import TextFileSource, read_text, DEFAULT_STREAM_CHUNK_SIZE  # noqa: E402
+
+
+def build_text(path: Path, megabytes: int, seed: int = 3):
+    """Write a manuscript of roughly the given size with CRLF line endings."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old café bridge — Привет").split()
+    paragraphs = []
+    for i in range(2000):
+        if i % 200 == 0:
+            paragraphs.append(f"# Chapter {i // 200 + 1}")
+        paragraphs.append(" ".join(rng.choice(words) for _ in range(rng.randint(20, 120))).capitalize() + ".")
+    block = ("\r\n\r\n".join(paragraphs) + "\r\n\r\n").encode('utf-8')
+    with open(path, 'wb') as f:
+        for _ in range(max(megabytes * 1_000_000 // len(block), 1)):
+            f.write(block)
+
+
+def legacy_read(path: Path) -> int:
+    with open(path, 'r', encoding='utf-8') as f:
+        return len(f.read())
+
+
+def mapped_read(path: Path) -> int:
+    return len(read_text(str(path)))
+
+
+def legacy_stream(path: Path) -> int:
+    offset = 0
+    with open(path, 'r', encoding='utf-8') as f:
+        while True:
+            f.tell()
+            chunk = f.read(DEFAULT_STREAM_CHUNK_SIZE)
+            if not chunk:
+                return offset
+            offset += len(chunk)
+
+
+def mapped_stream(path: Path) -> int:
+    return sum(len(chunk) for chunk in TextFileSource(str(path)).iter_chunks())
+
+
+def _measure(func, path: Path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=int, default=200, help="Generated manuscript size in MB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.md"
+        build_text(path, args.megabytes)
+        size = path.stat().st_size / 1e6
+        print(f"Manuscript: {size:.0f} MB")
+
+        for label, legacy, mapped in (("whole file", legacy_read, mapped_read),
+                                      ("streaming ", legacy_stream, mapped_stream)):
+            old, old_time, old_peak = _measure(legacy, path)
+            new, new_time, new_peak = _measure(mapped, path)
+            assert old == new
+            print(f"  {label}  text mode: {old_time * 1000:8.1f} ms  peak {old_peak / 1e6:7.1f} MB   "
+                  f"mmap: {new_time * 1000:8.1f} ms  peak {new_peak / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
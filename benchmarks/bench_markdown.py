@@ -0,0 +1,101 @@
+"""
+Benchmark the single-pass markdown scanner against the old seven-pass cleaner.
+
+Usage:
+    python benchmarks/bench_markdown.py [--size-mb 4]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.core.text_processing import clean_markdown  # noqa: E402
+
+
+def legacy_clean_markdown(text: str) -> str:
+    """The previous implementation: seven sequential re.sub passes."""
+    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
+    text = re.sub(r'`[^`]+`', '', text)
+    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
+    text = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', '', text)
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[*_]{1,3}([^*_]+)[*_]{1,3}', r'\1', text)
+    return text
+
+
+def build_manuscript(size_mb: float) -> str:
+    """Generate a markdown manuscript of roughly the requested size."""
+    rng = random.Random(42)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    parts = []
+    size = 0
+    chapter = 0
+    target = int(size_mb * 1024 * 1024)
+    while size < target:
+        if size // 50_000 >= chapter:
+            chapter += 1
+            parts.append(f"# Chapter {chapter}\n\n")
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(5, 25)))
+        roll = rng.random()
+        if roll < 0.1:
+            sentence = f"*{sentence}*"
+        elif roll < 0.15:
+            sentence = f"**{sentence}** and [a link](https://example.com)"
+        elif roll < 0.17:
+            sentence = f"`{sentence}` <em>tagged</em>"
+        paragraph = sentence.capitalize() + ".\n\n"
+        parts.append(paragraph)
+        size += len(paragraph)
+    return "".join(parts)
+
+
+def adversarial_inputs(size_kb: int):
+    """Inputs dense with emphasis markers that stress the old emphasis regex."""
+    n = size_kb * 1024
+    return {
+        "asterisks only": "*" * n,
+        "underscores only": "_" * n,
+        "alternating *_": "*_" * (n // 2),
+        "open markers, no close": "*a " * (n // 3),
+        "unclosed brackets": "[a](" * (n // 4),
+    }
+
+
+def _time(func, text: str, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=float, default=4.0, help="Generated manuscript size in MB")
+    parser.add_argument("--adversarial-kb", type=int, default=64, help="Adversarial input size in KB")
+    args = parser.parse_args()
+
+    text = build_manuscript(args.size_mb)
+    print(f"Manuscript: {len(text) / 1024 / 1024:.1f} MB")
+    legacy = _time(legacy_clean_markdown, text)
+    scanner = _time(clean_markdown, text)
+    print(f"  legacy (7 passes):   {legacy * 1000:8.1f} ms")
+    print(f"  scanner (1 pass):    {scanner * 1000:8.1f} ms   ({legacy / scanner:.1f}x)")
+
+    print(f"\nAdversarial inputs ({args.adversarial_kb} KB):")
+    for name, sample in adversarial_inputs(args.adversarial_kb).items():
+        legacy = _time(legacy_clean_markdown, sample, repeat=1)
+        scanner = _time(clean_markdown, sample, repeat=1)
+        print(f"  {name:<24} legacy {legacy * 1000:9.1f} ms   scanner {scanner * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
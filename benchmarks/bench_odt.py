@@ -0,0 +1,117 @@
+"""
+Benchmark the streaming .odt reader against parsing the whole content.xml.
+
+The DOM side parses ``content.xml`` into one ElementTree and walks its
+body; the streaming side reads it with ``iterparse``
+(``iter_odt_paragraphs``), dropping each paragraph once yielded. Both see
+the same paragraphs; time and peak traced memory are reported for each,
+at two document sizes to show that the streaming reader's peak stays flat.
+
+Usage:
+    python benchmarks/bench_odt.py [--paragraphs 20000]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.io.documents import (  # noqa: E402
+    ODF_TEXT_NAMESPACE,
+    ODT_CONTENT_PART,
+    _odt_paragraph_text,
+    iter_odt_paragraphs,
+)
+
+NAMESPACES = (
+    'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+    f'xmlns:text="{ODF_TEXT_NAMESPACE}" '
+    'xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0"'
+)
+
+
+def build_odt(path: Path, paragraph_count: int, seed: int = 5):
+    """Write a minimal .odt with level-2 headings and body paragraphs."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    body = []
+    for i in range(paragraph_count):
+        if i % 200 == 0:
+            body.append(f'<text:h text:style-name="Heading_20_2" text:outline-level="2">'
+                        f'Chapter {i // 200 + 1}</text:h>')
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120))).capitalize() + "."
+        half = len(sentence) // 2
+        body.append(
+            f'<text:p text:style-name="Text_20_body"><text:span text:style-name="T1">{escape(sentence[:half])}'
+            f'</text:span>{escape(sentence[half:])}</text:p>'
+        )
+    content = (
+        f'<?xml version="1.0" encoding="UTF-8"?><office:document-content {NAMESPACES}>'
+        f'<office:body><office:text>{"".join(body)}</office:text></office:body></office:document-content>'
+    )
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(zipfile.ZipInfo('mimetype'), 'application/vnd.oasis.opendocument.text')
+        archive.writestr(ODT_CONTENT_PART, content)
+
+
+def dom_paragraphs(path: Path):
+    paragraph_tags = {f'{{{ODF_TEXT_NAMESPACE}}}p', f'{{{ODF_TEXT_NAMESPACE}}}h'}
+    with zipfile.ZipFile(path) as archive, archive.open(ODT_CONTENT_PART) as part:
+        root = ElementTree.parse(part).getroot()
+    for element in root.iter():
+        if element.tag in paragraph_tags:
+            yield _odt_paragraph_text(element)
+
+
+def streaming_paragraphs(path: Path):
+    for paragraph in iter_odt_paragraphs(str(path)):
+        yield paragraph.text
+
+
+def _time(func, path: Path):
+    start = time.perf_counter()
+    result = list(func(path))
+    return result, time.perf_counter() - start
+
+
+def _peak(func, path: Path) -> int:
+    """Peak traced memory while reading the paragraphs one by one without keeping them."""
+    tracemalloc.start()
+    for _ in func(path):
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=20_000, help="Generated document size in paragraphs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (args.paragraphs, args.paragraphs * 4):
+            path = Path(directory) / f"bench{count}.odt"
+            build_odt(path, count)
+            print(f"Document: {count:,} paragraphs, {path.stat().st_size / 1024:.0f} KB zipped")
+
+            streamed, stream_time = _time(streaming_paragraphs, path)
+            dom, dom_time = _time(dom_paragraphs, path)
+            assert dom == streamed
+            print(f"  streaming (iterparse): {stream_time * 1000:8.1f} ms   "
+                  f"peak {_peak(streaming_paragraphs, path) / 1e6:7.1f} MB")
+            print(f"  whole content.xml:     {dom_time * 1000:8.1f} ms   "
+                  f"peak {_peak(dom_paragraphs, path) / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
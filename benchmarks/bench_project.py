@@ -0,0 +1,102 @@
+"""
+Benchmark analyzing a multi-file project with and without its cache.
+
+A generated book is written as one file per chapter. It is analyzed cold
+(no cache), warm (every file unchanged), and after editing one chapter,
+where only that file is analyzed again before the per-file results are
+merged. Streaming the same chapters joined into one file is timed for
+reference, and the statistics are checked to match it.
+
+Usage:
+    python benchmarks/bench_project.py [--chapters 60] [--words 5000] [--advanced]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.core.project import analyze_project  # noqa: E402
+from musestat.core.streaming import analyze_manuscript_stream  # noqa: E402
+from musestat.io.project import PROJECT_SEPARATOR, project_cache_path  # noqa: E402
+
+COMPARED_KEYS = ('total_words', 'total_characters', 'total_sentences', 'total_paragraphs', 'common_words')
+
+
+def build_chapter(number: int, word_count: int, rng: random.Random) -> str:
+    """Generate one chapter of prose with dialogue and a heading."""
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+    paragraphs = [f"# Chapter {number}"]
+    written = 0
+    while written < word_count:
+        sentence = " ".join(rng.choice(words) for _ in range(rng.randint(6, 30))).capitalize() + "."
+        if rng.random() < 0.2:
+            sentence = f'"{sentence}" she said.'
+        paragraphs.append(sentence)
+        written += len(sentence.split())
+    return "\n\n".join(paragraphs) + "\n"
+
+
+def _chapters(stats):
+    return [(chapter.title, chapter.start, chapter.end, chapter.words, chapter.line) for chapter in stats['chapters']]
+
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chapters", type=int, default=60, help="Number of chapter files")
+    parser.add_argument("--words", type=int, default=5000, help="Words per chapter")
+    parser.add_argument("--advanced", action="store_true", help="Collect dialogue, pacing and readability counts")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as directory:
+        project = Path(directory) / "chapters"
+        project.mkdir()
+        texts = []
+        for number in range(1, args.chapters + 1):
+            text = build_chapter(number, args.words, rng)
+            (project / f"{number:02d}-chapter.md").write_text(text, encoding="utf-8")
+            texts.append(text)
+        joined = Path(directory) / "joined.md"
+        joined.write_text(PROJECT_SEPARATOR.join(texts), encoding="utf-8")
+        print(f"Project: {args.chapters} files, ~{args.chapters * args.words:,} words")
+
+        streamed, stream_time = _time(lambda: analyze_manuscript_stream(str(joined), enable_advanced=args.advanced))
+        cold, cold_time = _time(lambda: analyze_project(str(project), enable_advanced=args.advanced))
+        warm, warm_time = _time(lambda: analyze_project(str(project), enable_advanced=args.advanced))
+
+        edited = project / "01-chapter.md"
+        with open(edited, "a", encoding="utf-8") as f:
+            f.write("\nOne more line for the first chapter.\n")
+        stat = edited.stat()
+        os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        _, edit_time = _time(lambda: analyze_project(str(project), enable_advanced=args.advanced))
+
+        for key in COMPARED_KEYS:
+            assert cold[key] == streamed[key] == warm[key], key
+        assert _chapters(cold) == _chapters(streamed) == _chapters(warm)
+        assert all(f["cached"] for f in warm["files"])
+
+        print(f"  stream joined file:  {stream_time * 1000:8.1f} ms")
+        print(f"  project, cold:       {cold_time * 1000:8.1f} ms")
+        print(f"  project, warm:       {warm_time * 1000:8.1f} ms")
+        print(f"  project, 1 edited:   {edit_time * 1000:8.1f} ms")
+        cache = project_cache_path(str(project))
+        assert cache.parent == project.resolve()
+        print(f"  cache size:          {cache.stat().st_size / 1024:8.0f} KB ({cache.name} in the project folder)")
+
+
+if __name__ == "__main__":
+    main()
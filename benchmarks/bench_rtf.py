@@ -0,0 +1,107 @@
+"""
+Benchmark the streaming RTF tokenizer against striprtf.
+
+The legacy side reads the whole file into a string and runs striprtf's
+``rtf_to_text`` (one regex match per plain character, plus a character
+loop to drop binary pictures); the new side feeds the file's bytes to
+``RtfParser`` in blocks (``iter_rtf_text``), matching whole text runs at a
+time and skipping picture groups by scanning for braces. The generated
+document mimics a word processor's output: font, color and style tables,
+formatted paragraphs, escapes, and hex-encoded pictures.
+
+Usage:
+    python benchmarks/bench_rtf.py [--paragraphs 20000] [--pictures 40]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.io.rtf import iter_rtf_text  # noqa: E402
+
+try:
+    from striprtf.striprtf import rtf_to_text
+except ImportError:
+    rtf_to_text = None
+
+HEADER = (
+    r"{\rtf1\ansi\ansicpg1252\deff0\nouicompat\deflang1033"
+    r"{\fonttbl{\f0\fnil\fcharset0 Calibri;}{\f1\froman\fcharset0 Times New Roman;}}"
+    r"{\colortbl ;\red0\green0\blue255;}"
+    r"{\stylesheet{\s0 Normal;}{\s1 heading 1;}}"
+    r"{\*\generator Riched20 10.0.19041}\viewkind4\uc1" "\n"
+)
+
+
+def build_rtf(path: Path, paragraph_count: int, picture_count: int, seed: int = 9):
+    """Write a word-processor-like RTF document with embedded hex pictures."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old caf\\'e9 bridge").split()
+    picture_every = max(paragraph_count // max(picture_count, 1), 1)
+    with open(path, 'w', encoding='ascii') as f:
+        f.write(HEADER)
+        for i in range(paragraph_count):
+            if i % 200 == 0:
+                f.write(f"\\pard\\s1\\sb240\\sa60\\b\\f1\\fs32 Chapter {i // 200 + 1}\\b0\\fs22\\par\n")
+            sentence = " ".join(rng.choice(words) for _ in range(rng.randint(20, 120))).capitalize()
+            f.write(f"\\pard\\sa200\\sl276\\slmult1\\f0\\fs22\\lang9 {sentence}, "
+                    f"\\i she said\\i0  \\ldblquote yes\\rdblquote .\\par\n")
+            if picture_count and i % picture_every == 0:
+                f.write("{\\pict{\\*\\picprop}\\wmetafile8\\picw2000\\pich2000 ")
+                for _ in range(1500):
+                    f.write("".join(rng.choice("0123456789abcdef") for _ in range(128)) + "\n")
+                f.write("}\n")
+        f.write("}\n")
+
+
+def legacy_text(path: Path) -> str:
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return rtf_to_text(f.read())
+
+
+def streaming_text(path: Path) -> str:
+    return ''.join(iter_rtf_text(str(path)))
+
+
+def _time(func, path: Path, repeat: int = 3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=20_000, help="Generated document size in paragraphs")
+    parser.add_argument("--pictures", type=int, default=40, help="Embedded hex pictures (~190 KB each)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bench.rtf"
+        build_rtf(path, args.paragraphs, args.pictures)
+        size = path.stat().st_size / 1e6
+        print(f"Document: {size:.1f} MB, {args.paragraphs} paragraphs, {args.pictures} pictures")
+
+        streamed, stream_time = _time(streaming_text, path)
+        print(f"  streaming tokenizer: {stream_time * 1000:8.1f} ms   ({size / stream_time:6.1f} MB/s)")
+        if rtf_to_text is None:
+            print("  striprtf not installed; skipping the comparison")
+            return
+
+        legacy, legacy_time = _time(legacy_text, path, repeat=1)
+        assert legacy == streamed
+        print(f"  striprtf:            {legacy_time * 1000:8.1f} ms   ({size / legacy_time:6.1f} MB/s)")
+        print(f"  speedup {legacy_time / stream_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark reading a Scrivener project.
+
+A project with a Draft of parts, chapter folders and scene documents is
+generated, then read three ways with ``iter_scrivener_text``: every RTF
+document parsed in-process, parsed in a process pool (one worker per
+available CPU), and re-read with the extraction cache warm. All three
+produce the same manuscript.
+
+Usage:
+    python benchmarks/bench_scrivener.py [--documents 600] [--words 1500]
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.io.scrivener import iter_scrivener_text, scrivener_cache_path  # noqa: E402
+from musestat.utils.concurrency import available_cpus  # noqa: E402
+
+SCENES_PER_CHAPTER = 4
+CHAPTERS_PER_PART = 10
+
+
+def build_project(project: Path, document_count: int, words_per_document: int, seed: int = 13):
+    """Write a Scrivener 3 style project with the given number of scene documents."""
+    rng = random.Random(seed)
+    words = ("the night was dark and the river ran cold beneath a silver moon "
+             "she said nothing while he waited by the old stone bridge").split()
+
+    def item(title, kind, paragraphs=None, children=()):
+        item_id = str(uuid.UUID(int=rng.getrandbits(128))).upper()
+        if paragraphs is not None:
+            folder = project / 'Files' / 'Data' / item_id
+            folder.mkdir(parents=True)
+            body = ''.join(f"\\pard\\sa200\\f0\\fs24 {text}\\par\n" for text in paragraphs)
+            (folder / 'content.rtf').write_text(
+                "{\\rtf1\\ansi\\ansicpg1252\\cocoartf2639{\\fonttbl\\f0\\froman\\fcharset0 Times-Roman;}"
+                "{\\colortbl;\\red255\\green255\\blue255;}\\pard\\tx720\\f0 " + body + "}",
+                encoding='ascii'
+            )
+        children_xml = f"<Children>{''.join(children)}</Children>" if children else ''
+        return (f'<BinderItem UUID="{item_id}" Type="{kind}"><Title>{escape(title)}</Title>'
+                f'<MetaData><IncludeInCompile>Yes</IncludeInCompile></MetaData>{children_xml}</BinderItem>')
+
+    def paragraphs():
+        remaining = words_per_document
+        while remaining > 0:
+            count = min(rng.randint(20, 120), remaining)
+            remaining -= count
+            yield " ".join(rng.choice(words) for _ in range(count)).capitalize() + "."
+
+    scenes = [item(f"Scene {i + 1}", 'Text', list(paragraphs())) for i in range(document_count)]
+    chapters = [
+        item(f"Chapter {i // SCENES_PER_CHAPTER + 1}", 'Folder', children=scenes[i:i + SCENES_PER_CHAPTER])
+        for i in range(0, len(scenes), SCENES_PER_CHAPTER)
+    ]
+    parts = [
+        item(f"Part {i // CHAPTERS_PER_PART + 1}", 'Folder', children=chapters[i:i + CHAPTERS_PER_PART])
+        for i in range(0, len(chapters), CHAPTERS_PER_PART)
+    ]
+    draft = item('Draft', 'DraftFolder', children=parts)
+    (project / f"{project.stem}.scrivx").write_text(
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<ScrivenerProject><Binder>{draft}</Binder></ScrivenerProject>',
+        encoding='utf-8'
+    )
+
+
+def _time(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=600, help="Scene documents in the project")
+    parser.add_argument("--words", type=int, default=1500, help="Words per scene document")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        project = Path(directory) / "Novel.scriv"
+        build_project(project, args.documents, args.words)
+        print(f"Project: {args.documents} documents, {args.documents * args.words:,} words")
+
+        sequential, sequential_time = _time(
+            lambda: ''.join(iter_scrivener_text(str(project), workers=1, use_cache=False)))
+        print(f"  in-process parsing:     {sequential_time * 1000:8.1f} ms")
+
+        cpus = available_cpus()
+        pooled, pooled_time = _time(
+            lambda: ''.join(iter_scrivener_text(str(project), workers=max(cpus, 2), use_cache=False)))
+        assert pooled == sequential
+        print(f"  {max(cpus, 2)} worker processes:     {pooled_time * 1000:8.1f} ms   "
+              f"({sequential_time / pooled_time:.1f}x, {cpus} CPU(s) available)")
+
+        ''.join(iter_scrivener_text(str(project)))
+        cached, cached_time = _time(lambda: ''.join(iter_scrivener_text(str(project))))
+        assert cached == sequential
+        print(f"  warm extraction cache:  {cached_time * 1000:8.1f} ms   ({sequential_time / cached_time:.1f}x)")
+        scrivener_cache_path(str(project)).unlink()
+
+
+if __name__ == "__main__":
+    main()
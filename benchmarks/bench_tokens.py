@@ -0,0 +1,110 @@
+"""
+Benchmark interned token arrays against list-of-words + Counter statistics.
+
+Both sides compute the total word count, the top-N words with stopword
+filtering, and the top-N words of every chapter on a generated corpus.
+
+Usage:
+    python benchmarks/bench_tokens.py [--words 1000000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from musestat.core.text_processing import WORD_PATTERN  # noqa: E402
+from musestat.core.tokens import TokenStore  # noqa: E402
+from musestat.features.language import get_language_stopwords  # noqa: E402
+
+
+def build_corpus(word_count: int, chapters: int, seed: int = 7):
+    """Generate cleaned text with a Zipf-like vocabulary and chapter spans."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(30000)]
+    vocabulary[:20] = ["the", "and", "of", "to", "a", "in", "was", "he", "she", "it",
+                       "that", "his", "her", "with", "as", "had", "for", "on", "at", "but"]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    words = rng.choices(vocabulary, weights=weights, k=word_count)
+    for i in range(0, word_count, 11):
+        words[i] = words[i].capitalize()
+
+    per_chapter = word_count // chapters
+    parts = []
+    spans = []
+    offset = 0
+    for c in range(chapters):
+        chunk = " ".join(words[c * per_chapter:(c + 1) * per_chapter]) + "\n\n"
+        spans.append((offset, offset + len(chunk)))
+        parts.append(chunk)
+        offset += len(chunk)
+    return "".join(parts), spans
+
+
+def legacy_statistics(text, spans, stop_words, n=20):
+    """Word list + Counter, re-tokenizing each chapter."""
+    total = len(WORD_PATTERN.findall(text))
+    words = WORD_PATTERN.findall(text.lower())
+    words = [w for w in words if w not in stop_words and len(w) >= 3]
+    top = Counter(words).most_common(n)
+    per_chapter = []
+    for start, end in spans:
+        chapter_words = [w for w in WORD_PATTERN.findall(text[start:end].lower())
+                         if w not in stop_words and len(w) >= 3]
+        per_chapter.append(Counter(chapter_words).most_common(n))
+    return total, top, per_chapter
+
+
+def interned_statistics(text, spans, stop_words, n=20):
+    """Token ids + offsets, chapters as token ranges."""
+    store = TokenStore(text)
+    total = len(store)
+    top = store.most_common(n, stop_words=stop_words, min_length=3)
+    per_chapter = []
+    for start, end in spans:
+        first, last = store.token_range(start, end)
+        per_chapter.append(store.most_common(n, stop_words=stop_words, min_length=3, start=first, end=last))
+    return total, top, per_chapter
+
+
+def measure(func, *args, repeat=5):
+    """Return (best wall time, peak traced memory) for func(*args)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=1_000_000, help="Corpus size in words")
+    parser.add_argument("--chapters", type=int, default=40, help="Number of chapters")
+    args = parser.parse_args()
+
+    text, spans = build_corpus(args.words, args.chapters)
+    stop_words = get_language_stopwords("en")
+    print(f"Corpus: {args.words:,} words, {len(text) / 1024 / 1024:.1f} MB, {args.chapters} chapters")
+
+    legacy_time, legacy_peak, legacy = measure(legacy_statistics, text, spans, stop_words)
+    interned_time, interned_peak, interned = measure(interned_statistics, text, spans, stop_words)
+    assert legacy == interned, "interned statistics differ from the Counter baseline"
+
+    print(f"  list + Counter:   {legacy_time * 1000:8.1f} ms   peak {legacy_peak / 1024 / 1024:7.1f} MB")
+    print(f"  interned arrays:  {interned_time * 1000:8.1f} ms   peak {interned_peak / 1024 / 1024:7.1f} MB")
+    print(f"  speedup {legacy_time / interned_time:.1f}x, peak memory {legacy_peak / interned_peak:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ Command-line interface for MuseStat.
 import sys
 import argparse
 import os
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from datetime import datetime
 from rich.console import Console
 from rich.panel import Panel
@@ -23,8 +23,16 @@ except ImportError:
     QUESTIONARY_AVAILABLE = False
 
 from ..config import __version__
-from ..core.analyzer import analyze_manuscript
-from ..io.readers import read_manuscript, get_supported_formats_info
+from ..core.analyzer import analyze_manuscript, ADVANCED_STATISTICS
+from ..core.result import AnalysisResult
+from ..core.streaming import analyze_manuscript_stream, STREAMABLE_EXTENSIONS, LARGE_TEXT_FILE_SIZE
+from ..core.project import analyze_project
+from ..core.frequency import DEFAULT_SKETCH_CAPACITY
+from ..core.chapter import get_boundary_matcher, load_boundary_patterns, PATTERNS_FILE
+from ..core.structure import LEVELS, CHAPTER, get_level_sections
+from ..io.readers import read_manuscript, get_supported_formats_info, DEFAULT_STREAM_CHUNK_SIZE
+from ..io.compressed import archive_path, is_compressed, split_member_path
+from ..io.project import is_project, project_root
 from ..io.exporters import export_to_json, export_to_csv, export_to_html
 from ..io.badges import generate_badges
 from ..utils.stats import save_stats_snapshot, load_comparison_stats
@@ -302,6 +310,7 @@ def main():
                "  %(prog)s -sc                             # Semi-compact view (RECOMMENDED)\n"
                "  %(prog)s --verify                        # Check for formatting issues\n"
                "  %(prog)s -f mybook.docx                  # Analyze specific file\n"
+               "  %(prog)s -f chapters/                    # Analyze a folder of chapter files as one book\n"
                "  %(prog)s --advanced                      # Enable all advanced features\n"
                "  %(prog)s --minimalist                    # Plain text output (editor integration)\n"
                "  %(prog)s --export html                   # Export to HTML report\n"
@@ -318,7 +327,7 @@ def main():
                "  %(prog)s --show-top-chapters 5           # Show 5 longest chapters\n"
                "\n"
                "Display Modes: full, -sc (semi-compact), -c (compact), -m (minimalist), -v (verify)\n"
-               "Supported formats: .md, .txt, .docx, .rtf\n"
+               "Supported formats: .md, .txt, .docx, .odt, .rtf, .epub, .scriv, projects (folder, SUMMARY.md, glob)\n"
                "Advanced features require: langdetect, textstat questionary\n"
                "Export formats: json, csv, html"
     )
@@ -326,7 +335,8 @@ def main():
     parser.add_argument(
         '--file', '-f',
         metavar='PATH',
-        help='Path to manuscript file (default: manuscript.md)'
+        help='Path to manuscript file, or a project: a folder of chapter files, an mdBook SUMMARY.md, '
+             'or a quoted glob such as "chapters/*.md" (default: manuscript.md)'
     )
     
     parser.add_argument(
@@ -371,6 +381,81 @@ def main():
         help='Enable advanced features (language detection, readability, dialogue, pacing)'
     )
     
+    parser.add_argument(
+        '--approx-frequency',
+        action='store_true',
+        help='Estimate word frequencies with a bounded-memory sketch (for very large corpora)'
+    )
+    
+    parser.add_argument(
+        '--approx-capacity',
+        type=int,
+        metavar='N',
+        default=DEFAULT_SKETCH_CAPACITY,
+        help=f'Number of counters used by --approx-frequency (default: {DEFAULT_SKETCH_CAPACITY})'
+    )
+    
+    parser.add_argument(
+        '--skip-stages',
+        metavar='STAGES',
+        help=f'Comma-separated advanced stages to skip ({", ".join(ADVANCED_STATISTICS)}; not used with --stream or projects)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Read the manuscript in chunks instead of loading it whole (bounded memory)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        metavar='CHARS',
+        default=DEFAULT_STREAM_CHUNK_SIZE,
+        help=f'Characters read at a time with --stream (default: {DEFAULT_STREAM_CHUNK_SIZE})'
+    )
+    
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Keep a sidecar index (FILE.musestat.idx) so unchanged files are not analyzed again (not used with --stream or projects)'
+    )
+    
+    parser.add_argument(
+        '--chapter-pattern',
+        action='append',
+        metavar='REGEX',
+        help='Additional chapter heading pattern, matched at the start of a line (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--scene-pattern',
+        action='append',
+        metavar='REGEX',
+        help='Additional scene break pattern, matched against a whole line (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--part-pattern',
+        action='append',
+        metavar='REGEX',
+        help='Additional part heading pattern, matched at the start of a line (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--level',
+        choices=LEVELS,
+        default=CHAPTER,
+        help='Structure level of the breakdown table and CSV export (default: chapter)'
+    )
+    
+    parser.add_argument(
+        '--patterns-file',
+        metavar='FILE',
+        default=PATTERNS_FILE,
+        help=f'File with "chapter:", "scene:" and "part:" REGEX lines (default: {PATTERNS_FILE})'
+    )
+    
     parser.add_argument(
         '--compare',
         metavar='STATS_FILE',
@@ -591,7 +676,8 @@ def main():
         # If still no file (shouldn't happen after interactive mode)
         file_path = "manuscript.md"
     
-    if not Path(file_path).exists():
+    project = is_project(file_path)
+    if not project and not Path(archive_path(file_path)).exists():
         console.print(f"[bold red]Error:[/bold red] File '{file_path}' not found!")
         console.print("\n[dim]Tip: Use --list to see available files or run without arguments for interactive mode[/dim]")
         return
@@ -601,28 +687,106 @@ def main():
     if args.compare:
         comparison_stats = load_comparison_stats(args.compare)
     
+    skip_stages = [s.strip() for s in (args.skip_stages or '').split(',') if s.strip()]
+    unknown_stages = [s for s in skip_stages if s not in ADVANCED_STATISTICS]
+    if unknown_stages:
+        console.print(f"[bold red]Error:[/bold red] Unknown stage(s): {', '.join(unknown_stages)}")
+        console.print(f"[dim]Stages that can be skipped: {', '.join(ADVANCED_STATISTICS)}[/dim]")
+        return
+    
+    # Custom chapter/scene patterns: the patterns file first, then the CLI
+    chapter_patterns, scene_patterns, part_patterns = load_boundary_patterns(args.patterns_file)
+    chapter_patterns += args.chapter_pattern or []
+    scene_patterns += args.scene_pattern or []
+    part_patterns += args.part_pattern or []
+    try:
+        get_boundary_matcher(tuple(chapter_patterns), tuple(scene_patterns), tuple(part_patterns))
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        return
+    
     # Analyze manuscript (with progress bar unless minimalist or output to file)
     show_progress = not (args.minimalist or args.output or args.no_animation)
-    stats = analyze_manuscript(
-        file_path, 
-        enable_advanced=args.advanced, 
-        show_progress=show_progress,
-        top_words_count=max(args.top_words, 1),  # Ensure at least 1
-        min_word_length=max(args.min_word_length, 1)  # Ensure at least 1
-    )
+    # A project is named after its folder (or summary) for exports and snapshots
+    path = project_root(file_path) if project else Path(file_path)
+    if (not project and not args.stream and not is_compressed(file_path) and path.suffix.lower() in STREAMABLE_EXTENSIONS
+            and path.stat().st_size >= LARGE_TEXT_FILE_SIZE):
+        # The whole text plus its cleaned copies would not fit comfortably in memory
+        console.print(f"[yellow]Note: {path.name} is larger than {LARGE_TEXT_FILE_SIZE >> 30} GB; analyzing it with --stream.[/yellow]")
+        args.stream = True
+    if args.stream or project:
+        # Streamed and project runs have no stage pipeline or sidecar index
+        ignored = [option for option, used in (('--skip-stages', skip_stages), ('--index', args.index)) if used]
+        if ignored:
+            mode = 'projects' if project else '--stream'
+            console.print(f"[yellow]Note: {' and '.join(ignored)} {'are' if len(ignored) > 1 else 'is'} "
+                          f"not used with {mode}; ignoring.[/yellow]")
+    if project:
+        # Each file is analyzed (or restored from the project cache) and the totals merged
+        stats = analyze_project(
+            file_path,
+            chunk_size=max(args.chunk_size, 1),
+            enable_advanced=args.advanced,
+            top_words_count=max(args.top_words, 1),
+            min_word_length=max(args.min_word_length, 1),
+            approx_frequency=args.approx_frequency,
+            sketch_capacity=max(args.approx_capacity, 1),
+            chapter_patterns=chapter_patterns,
+            scene_patterns=scene_patterns,
+            part_patterns=part_patterns
+        )
+        if stats and not (args.minimalist or args.output):
+            analyzed = sum(1 for f in stats['files'] if not f['cached'])
+            console.print(f"[dim]Project: {len(stats['files'])} files, {analyzed} analyzed, "
+                          f"{len(stats['files']) - analyzed} unchanged (cached)[/dim]")
+    elif args.stream:
+        stats = analyze_manuscript_stream(
+            file_path,
+            chunk_size=max(args.chunk_size, 1),
+            enable_advanced=args.advanced,
+            top_words_count=max(args.top_words, 1),
+            min_word_length=max(args.min_word_length, 1),
+            approx_frequency=args.approx_frequency,
+            sketch_capacity=max(args.approx_capacity, 1),
+            chapter_patterns=chapter_patterns,
+            scene_patterns=scene_patterns,
+            part_patterns=part_patterns
+        )
+    else:
+        stats = analyze_manuscript(
+            file_path, 
+            enable_advanced=args.advanced, 
+            show_progress=show_progress,
+            top_words_count=max(args.top_words, 1),  # Ensure at least 1
+            min_word_length=max(args.min_word_length, 1),  # Ensure at least 1
+            approx_frequency=args.approx_frequency,
+            sketch_capacity=max(args.approx_capacity, 1),
+            skip_stages=skip_stages,
+            chapter_patterns=chapter_patterns,
+            scene_patterns=scene_patterns,
+            part_patterns=part_patterns,
+            use_index=args.index
+        )
     
     if not stats:
         console.print("[bold red]Failed to analyze manuscript.[/bold red]")
         return
     
+    # Breakdown level: fall back to chapters when the manuscript has no such level
+    level = args.level
+    if level != CHAPTER and not get_level_sections(stats, level):
+        untracked = ' (not tracked with --stream or projects)' if args.stream or project else ''
+        console.print(f"[yellow]Note: No {level}s found{untracked}; showing chapters.[/yellow]")
+        level = CHAPTER
+    
     # Handle export first if requested
     if args.export:
-        export_file = args.output if args.output else f"{Path(file_path).stem}.{args.export}"
+        export_file = args.output if args.output else f"{path.stem}.{args.export}"
         
         if args.export == 'json':
             export_to_json(stats, export_file)
         elif args.export == 'csv':
-            export_to_csv(stats, export_file)
+            export_to_csv(stats, export_file, level=level)
         elif args.export == 'html':
             export_to_html(stats, export_file)
         
@@ -632,7 +796,10 @@ def main():
     
     # Save snapshot if requested
     if args.save_snapshot:
-        snapshot_file = save_stats_snapshot(stats, file_path)
+        # A zip member's snapshot is saved next to the archive
+        archive, member = split_member_path(file_path)
+        snapshot_path = str(Path(archive).parent / PurePosixPath(member).name) if member else str(path)
+        snapshot_file = save_stats_snapshot(stats, snapshot_path)
         if snapshot_file:
             console.print(f"[green]✓ Snapshot saved: {snapshot_file}[/green]\n")
 
@@ -680,9 +847,16 @@ def main():
             transient=True
         ) as progress:
             task = progress.add_task("[cyan]Running comprehensive verification...", total=100)
-            text = read_manuscript(file_path)
+            # Reuse the analysis's text and indexes (streamed and project runs keep none)
+            text = stats.shared('text') if isinstance(stats, AnalysisResult) else None
+            if text:
+                paragraphs = stats.shared('tokens').paragraphs
+                line_index = stats.shared('line_index')
+            else:
+                text = read_manuscript(file_path)
+                paragraphs = line_index = None
             progress.update(task, advance=30)
-            issues = verify_manuscript(text, ignore_patterns)
+            issues = verify_manuscript(text, ignore_patterns, paragraphs, line_index)
             progress.update(task, advance=70)
         
         # Display file info and ignore patterns status
@@ -744,11 +918,13 @@ def main():
     # Display results based on mode
     if args.chapters_only:
         console.clear()
-        if stats['chapters']:
+        sections = get_level_sections(stats, level)
+        if sections:
             console.print(create_chapters_table(
-                stats['chapters'], 
+                sections, 
                 max_chapters=args.max_chapters,
-                sparkline_width=args.sparkline_width
+                sparkline_width=args.sparkline_width,
+                level=level
             ))
         else:
             console.print("[yellow]No chapters found in manuscript.[/yellow]")
@@ -821,7 +997,7 @@ def main():
                             console.print()
                 
                 if stats['chapters']:
-                    console.print(create_chapters_table(stats['chapters']))
+                    console.print(create_chapters_table(get_level_sections(stats, level), level=level))
                     console.print()
                 console.print(create_word_frequency_table(stats['common_words']))
         else:
@@ -833,7 +1009,8 @@ def main():
                 'hide_word_frequency': args.hide_word_frequency,
                 'hide_heat_map': args.hide_heat_map,
                 'hide_chapter_details': args.hide_chapter_details,
-                'show_top_chapters': args.show_top_chapters
+                'show_top_chapters': args.show_top_chapters,
+                'level': level
             }
             
             display_statistics(
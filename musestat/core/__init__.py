@@ -1,25 +1,113 @@
 """Core manuscript analysis modules."""
 
 from .analyzer import analyze_manuscript
+from .streaming import analyze_manuscript_stream, iter_blocks, open_chunks, StreamAccumulator, accumulator_statistics
+from .project import analyze_project, analyze_file
+from .result import AnalysisResult
+from .pipeline import Pipeline, Stage, STAGES, stage
 from .text_processing import (
     clean_markdown,
     count_words,
     count_characters,
     count_sentences,
     count_paragraphs,
-    get_most_common_words
+    get_most_common_words,
+    build_word_sketch,
+    get_approximate_common_words
+)
+from .frequency import SpaceSaving, WordEstimate, merge_sketches
+from .tokens import TokenStore
+from .tokenizer import TokenizedText, tokenize
+from .sentences import Sentence, SentenceIndex, segment_sentences
+from .paragraphs import Paragraph, ParagraphIndex, index_paragraphs
+from .lines import Location, LineIndex, index_lines
+from .chapter import (
+    Chapter,
+    Boundary,
+    BoundaryMatcher,
+    iter_boundaries,
+    HeadingSpan,
+    iter_heading_spans,
+    get_boundary_matcher,
+    load_boundary_patterns,
+    extract_chapters,
+    calculate_chapter_statistics
+)
+from .sections import SectionStats, measure_sections, measure_chapters, merge_sections
+from .sidecar import Sidecar, sidecar_path, open_sidecar, write_sidecar
+from .structure import (
+    StructureNode,
+    Outline,
+    LEVELS,
+    build_outline,
+    measure_outline,
+    get_level_sections,
+    flag_scene_outliers,
+    calculate_scene_statistics
 )
-from .chapter import extract_chapters, calculate_chapter_statistics
 
 __all__ = [
     'analyze_manuscript',
+    'analyze_manuscript_stream',
+    'iter_blocks',
+    'open_chunks',
+    'StreamAccumulator',
+    'accumulator_statistics',
+    'analyze_project',
+    'analyze_file',
+    'AnalysisResult',
+    'Pipeline',
+    'Stage',
+    'STAGES',
+    'stage',
     'clean_markdown',
     'count_words',
     'count_characters',
     'count_sentences',
     'count_paragraphs',
     'get_most_common_words',
+    'build_word_sketch',
+    'get_approximate_common_words',
+    'SpaceSaving',
+    'WordEstimate',
+    'merge_sketches',
+    'TokenStore',
+    'TokenizedText',
+    'tokenize',
+    'Sentence',
+    'SentenceIndex',
+    'segment_sentences',
+    'Paragraph',
+    'ParagraphIndex',
+    'index_paragraphs',
+    'Location',
+    'LineIndex',
+    'index_lines',
+    'Sidecar',
+    'sidecar_path',
+    'open_sidecar',
+    'write_sidecar',
+    'Chapter',
+    'Boundary',
+    'BoundaryMatcher',
+    'iter_boundaries',
+    'HeadingSpan',
+    'iter_heading_spans',
+    'get_boundary_matcher',
+    'load_boundary_patterns',
     'extract_chapters',
     'calculate_chapter_statistics',
+    'SectionStats',
+    'measure_sections',
+    'measure_chapters',
+    'merge_sections',
+    'StructureNode',
+    'Outline',
+    'LEVELS',
+    'build_outline',
+    'measure_outline',
+    'get_level_sections',
+    'flag_scene_outliers',
+    'calculate_scene_statistics',
 ]
 
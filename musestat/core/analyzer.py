@@ -1,143 +1,339 @@
 """
 Main manuscript analysis orchestration.
+
+Every statistic is produced by a stage registered with ``@stage``, which
+declares the values it reads and the statistics it writes. A Pipeline runs
+just the stages a result needs, each after the stages it depends on.
 """
 
+from contextlib import nullcontext
+from functools import partial
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
 from ..io.readers import read_manuscript
-from .text_processing import (
-    count_words,
-    count_characters,
-    count_sentences,
-    count_paragraphs,
-    get_most_common_words
-)
-from .chapter import extract_chapters, calculate_chapter_statistics
+from ..io.compressed import archive_path
+from .text_processing import get_most_common_words, build_word_sketch
+from .frequency import DEFAULT_SKETCH_CAPACITY
+from .tokenizer import tokenize, TokenizedText
+from .sentences import SentenceIndex
+from .chapter import BoundaryMatcher, get_boundary_matcher, calculate_chapter_statistics
+from .sections import SectionStats
+from .lines import LineIndex, index_lines
+from .structure import Outline, StructureNode, SCENE, build_outline, measure_outline, calculate_scene_statistics
+from .pipeline import Pipeline, stage
+from .sidecar import open_sidecar, write_sidecar
+from .result import AnalysisResult
 from ..features.language import detect_language, get_language_stopwords
-from ..features.dialogue import count_dialogue
 from ..features.readability import calculate_readability, detect_pacing_issues
 from ..utils.achievements import get_achievement_badge, estimate_reading_time
 
 console = Console()
 
+# Statistics in the order they appear in the result
+STATISTICS = (
+    'language',
+    'total_words',
+    'total_characters',
+    'total_characters_no_spaces',
+    'total_sentences',
+    'total_paragraphs',
+    'chapters',
+    'structure',
+    'common_words',
+    'avg_words_per_sentence',
+    'reading_time',
+    'chapter_stats',
+    'scene_stats',
+    'badge',
+)
+
+# Statistics only included with enable_advanced
+ADVANCED_STATISTICS = ('dialogue', 'pacing', 'readability')
+
+
+@stage('read', inputs=('file_path',), outputs=('text',), description='Reading file')
+def _read(file_path: str) -> Dict[str, Any]:
+    return {'text': read_manuscript(file_path)}
+
+
+@stage('tokenize', inputs=('text',), outputs=('tokens',), description='Cleaning text')
+def _tokenize(text: str) -> Dict[str, Any]:
+    return {'tokens': tokenize(text)}
+
+
+@stage('lines', inputs=('text',), outputs=('line_index',), description='Indexing lines')
+def _lines(text: str) -> Dict[str, Any]:
+    return {'line_index': index_lines(text)}
+
+
+@stage(
+    'chapters',
+    inputs=('text', 'boundary_matcher', 'line_index'),
+    outputs=('outline',),
+    description='Finding chapters'
+)
+def _chapters(text: str, boundary_matcher: BoundaryMatcher, line_index: LineIndex) -> Dict[str, Any]:
+    return {'outline': build_outline(text, boundary_matcher, line_index)}
+
+
+@stage('sentences', inputs=('tokens', 'language'), outputs=('sentence_index',), description='Splitting sentences')
+def _sentences(tokens: TokenizedText, language: str) -> Dict[str, Any]:
+    return {'sentence_index': tokens.segment(language)}
+
+
+@stage(
+    'sections',
+    inputs=('tokens', 'outline', 'sentence_index', 'measure_dialogue'),
+    outputs=('chapters', 'structure', 'totals', 'preamble'),
+    description='Analyzing structure'
+)
+def _sections(
+    tokens: TokenizedText,
+    outline: Outline,
+    sentence_index: SentenceIndex,
+    measure_dialogue: bool
+) -> Dict[str, Any]:
+    # Scenes, chapters, parts and the book are measured in one pass and
+    # merged bottom-up; the whole-book totals are the root's metrics
+    totals, preamble = measure_outline(
+        tokens, outline, include_dialogue=measure_dialogue, sentences=sentence_index
+    )
+    return {'chapters': outline.chapters, 'structure': outline.root, 'totals': totals, 'preamble': preamble}
+
+
+@stage(
+    'counts',
+    inputs=('totals',),
+    outputs=('total_words', 'total_characters', 'total_characters_no_spaces', 'total_sentences', 'total_paragraphs'),
+    description='Counting words'
+)
+def _counts(totals: SectionStats) -> Dict[str, Any]:
+    return {
+        'total_words': totals.words,
+        'total_characters': totals.characters,
+        'total_characters_no_spaces': totals.characters_no_spaces,
+        'total_sentences': totals.sentences,
+        'total_paragraphs': totals.paragraphs,
+    }
+
+
+@stage('language', inputs=('tokens', 'enable_advanced'), outputs=('language',), description='Detecting language')
+def _language(tokens: TokenizedText, enable_advanced: bool) -> Dict[str, Any]:
+    return {'language': detect_language(tokens) if enable_advanced else 'en'}
+
+
+@stage('stopwords', inputs=('language',), outputs=('stop_words',), description='Loading stopwords')
+def _stopwords(language: str) -> Dict[str, Any]:
+    return {'stop_words': get_language_stopwords(language)}
+
+
+@stage(
+    'frequency',
+    inputs=('tokens', 'stop_words', 'top_words_count', 'min_word_length', 'approx_frequency', 'sketch_capacity'),
+    outputs=('common_words', 'word_sketch'),
+    description='Extracting keywords'
+)
+def _frequency(
+    tokens: TokenizedText,
+    stop_words: set,
+    top_words_count: int,
+    min_word_length: int,
+    approx_frequency: bool,
+    sketch_capacity: int
+) -> Dict[str, Any]:
+    """Exact word frequencies, or sketch estimates when approx_frequency is set."""
+    if not approx_frequency:
+        common_words = get_most_common_words(tokens, n=top_words_count, stop_words=stop_words, min_length=min_word_length)
+        return {'common_words': common_words, 'word_sketch': None}
+    
+    sketch = build_word_sketch(tokens, stop_words=stop_words, min_length=min_word_length, capacity=sketch_capacity)
+    # Sketch state lets corpus runs merge results across files
+    return {'common_words': sketch.estimates(top_words_count), 'word_sketch': sketch.to_dict()}
+
+
+@stage(
+    'summary',
+    inputs=('total_words', 'total_sentences'),
+    outputs=('avg_words_per_sentence', 'reading_time', 'badge'),
+    description='Finalizing'
+)
+def _summary(total_words: int, total_sentences: int) -> Dict[str, Any]:
+    return {
+        'avg_words_per_sentence': total_words / total_sentences if total_sentences > 0 else 0,
+        'reading_time': estimate_reading_time(total_words),
+        'badge': get_achievement_badge(total_words),
+    }
+
+
+@stage('chapter_stats', inputs=('chapters',), outputs=('chapter_stats',), description='Comparing chapters')
+def _chapter_stats(chapters: List) -> Dict[str, Any]:
+    return {'chapter_stats': calculate_chapter_statistics(chapters)}
+
+
+@stage('scene_stats', inputs=('structure',), outputs=('scene_stats',), description='Comparing scenes')
+def _scene_stats(structure: StructureNode) -> Dict[str, Any]:
+    return {'scene_stats': calculate_scene_statistics(structure.nodes(SCENE))}
+
+
+@stage('dialogue', inputs=('totals',), outputs=('dialogue',), description='Analyzing dialogue')
+def _dialogue(totals: SectionStats) -> Dict[str, Any]:
+    return {'dialogue': totals.dialogue()}
+
+
+# Both read tokens.sentences, so they wait for the segmentation
+@stage(
+    'pacing',
+    inputs=('tokens', 'sentence_index', 'line_index'),
+    outputs=('pacing',),
+    description='Checking pacing'
+)
+def _pacing(tokens: TokenizedText, sentence_index: SentenceIndex, line_index: LineIndex) -> Dict[str, Any]:
+    return {'pacing': detect_pacing_issues(tokens, line_index)}
+
+
+@stage(
+    'readability',
+    inputs=('tokens', 'sentence_index'),
+    outputs=('readability',),
+    description='Calculating readability'
+)
+def _readability(tokens: TokenizedText, sentence_index: SentenceIndex) -> Dict[str, Any]:
+    return {'readability': calculate_readability(tokens)}
+
 
 def analyze_manuscript(
     file_path: str, 
     enable_advanced: bool = False, 
     show_progress: bool = True,
     top_words_count: int = 20,
-    min_word_length: int = 1
-) -> Optional[Dict]:
+    min_word_length: int = 1,
+    approx_frequency: bool = False,
+    sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    skip_stages: Iterable[str] = (),
+    chapter_patterns: Iterable[str] = (),
+    scene_patterns: Iterable[str] = (),
+    part_patterns: Iterable[str] = (),
+    use_index: bool = False
+) -> Optional[AnalysisResult]:
     """
     Analyze the manuscript and return comprehensive statistics.
     
+    Statistics are computed when first read from the result, so callers that
+    only show a few of them (e.g. ``--minimalist``) skip the rest. With
+    ``show_progress`` every statistic is computed up front behind the
+    progress display.
+    
+    With ``use_index`` the finished analysis is saved to a sidecar index
+    next to the manuscript (see ``core.sidecar``). While the file is
+    unchanged, later runs restore the statistics from it instead of
+    analyzing the text; runs with other options reuse its tokenization.
+    
     Args:
         file_path: Path to manuscript file
         enable_advanced: Enable advanced features (readability, dialogue, pacing)
         show_progress: Show progress indicators during analysis
         top_words_count: Number of most frequent words to include (default: 20)
         min_word_length: Minimum word length for frequency analysis (default: 1)
+        approx_frequency: Estimate word frequencies with a bounded-memory sketch
+        sketch_capacity: Number of counters in the sketch (default: 1000)
+        skip_stages: Names of stages to leave out (e.g. 'readability'); their
+            statistics, and those depending on them, are missing from the result
+        chapter_patterns: Additional chapter heading regexes (e.g. '^Prologue')
+        scene_patterns: Additional scene break regexes (e.g. '# # #')
+        part_patterns: Additional part heading regexes (e.g. '^Book ')
+        use_index: Read and write the sidecar index (manuscript.md.musestat.idx)
         
     Returns:
-        Dictionary with all statistics, or None if analysis failed
-    """
-    if show_progress:
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-            transient=True
-        ) as progress:
-            task = progress.add_task("[cyan]Reading file...", total=100)
-            text = read_manuscript(file_path)
-            progress.update(task, advance=20)
-            
-            if not text:
-                return None
-            
-            progress.update(task, description="[cyan]Counting words...", advance=20)
-            total_words = count_words(text)
-            total_chars = count_characters(text, include_spaces=True)
-            total_chars_no_spaces = count_characters(text, include_spaces=False)
-            
-            progress.update(task, description="[cyan]Analyzing structure...", advance=20)
-            total_sentences = count_sentences(text)
-            total_paragraphs = count_paragraphs(text)
-            chapters = extract_chapters(text)
-            
-            progress.update(task, description="[cyan]Extracting keywords...", advance=20)
-            language = detect_language(text) if enable_advanced else 'en'
-            stop_words = get_language_stopwords(language)
-            common_words = get_most_common_words(text, n=top_words_count, stop_words=stop_words, min_length=min_word_length)
-            
-            progress.update(task, description="[cyan]Finalizing...", advance=20)
-    else:
-        text = read_manuscript(file_path)
-        if not text:
-            return None
-        
-        total_words = count_words(text)
-        total_chars = count_characters(text, include_spaces=True)
-        total_chars_no_spaces = count_characters(text, include_spaces=False)
-        total_sentences = count_sentences(text)
-        total_paragraphs = count_paragraphs(text)
-        chapters = extract_chapters(text)
-        language = detect_language(text) if enable_advanced else 'en'
-        stop_words = get_language_stopwords(language)
-        common_words = get_most_common_words(text, n=top_words_count, stop_words=stop_words, min_length=min_word_length)
+        AnalysisResult with dictionary-style access to all statistics,
+        or None if analysis failed
     
-    # Build statistics dictionary
-    stats = {
+    Raises:
+        ValueError: If a chapter, scene or part pattern is not a valid regex
+    """
+    skip_stages = list(skip_stages)
+    chapter_patterns, scene_patterns, part_patterns = tuple(chapter_patterns), tuple(scene_patterns), tuple(part_patterns)
+    pipeline = Pipeline({
         'file_path': file_path,
-        'file_size': Path(file_path).stat().st_size,
-        'modified_date': datetime.fromtimestamp(Path(file_path).stat().st_mtime),
-        'language': language,
-        'total_words': total_words,
-        'total_characters': total_chars,
-        'total_characters_no_spaces': total_chars_no_spaces,
-        'total_sentences': total_sentences,
-        'total_paragraphs': total_paragraphs,
-        'chapters': chapters,
-        'common_words': common_words,
-    }
+        'enable_advanced': enable_advanced,
+        'top_words_count': top_words_count,
+        'min_word_length': min_word_length,
+        'approx_frequency': approx_frequency,
+        'sketch_capacity': sketch_capacity,
+        'measure_dialogue': enable_advanced and 'dialogue' not in skip_stages,
+        'boundary_matcher': get_boundary_matcher(chapter_patterns, scene_patterns, part_patterns),
+    }, skip=skip_stages)
     
-    # Calculate derived statistics
-    if stats['total_sentences'] > 0:
-        stats['avg_words_per_sentence'] = stats['total_words'] / stats['total_sentences']
-    else:
-        stats['avg_words_per_sentence'] = 0
+    keys = list(STATISTICS)
+    if approx_frequency:
+        keys.append('word_sketch')
+    if enable_advanced:
+        keys.extend(ADVANCED_STATISTICS)
+    keys = [key for key in keys if pipeline.available(key)]
     
-    stats['reading_time'] = estimate_reading_time(stats['total_words'])
-    stats['chapter_stats'] = calculate_chapter_statistics(chapters)
-    stats['badge'] = get_achievement_badge(stats['total_words'])
+    # Everything that changes the statistics of an unchanged file
+    options = {
+        'keys': keys,
+        'enable_advanced': enable_advanced,
+        'approx_frequency': approx_frequency,
+        'top_words_count': top_words_count,
+        'min_word_length': min_word_length,
+        'sketch_capacity': sketch_capacity,
+        'measure_dialogue': pipeline.values['measure_dialogue'],
+        'patterns': [chapter_patterns, scene_patterns, part_patterns],
+    }
     
-    # Advanced features
-    if enable_advanced:
-        if show_progress:
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-                transient=True
-            ) as progress:
-                task = progress.add_task("[cyan]Advanced analysis...", total=100)
-                
-                progress.update(task, description="[cyan]Analyzing dialogue...", advance=33)
-                stats['dialogue'] = count_dialogue(text)
-                
-                progress.update(task, description="[cyan]Checking pacing...", advance=33)
-                stats['pacing'] = detect_pacing_issues(text)
-                
-                progress.update(task, description="[cyan]Calculating readability...", advance=34)
-                stats['readability'] = calculate_readability(text)
-        else:
-            stats['dialogue'] = count_dialogue(text)
-            stats['pacing'] = detect_pacing_issues(text)
-            stats['readability'] = calculate_readability(text)
+    progress_display = Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console,
+        transient=True
+    ) if show_progress else nullcontext()
     
-    return stats
+    with progress_display as progress:
+        on_stage = None
+        if progress:
+            task = progress.add_task("[cyan]Reading file...", total=len(pipeline.plan(['text'] + keys)))
+            on_stage = lambda s: progress.update(task, description=f"[cyan]{s.description}...", advance=1)
+        
+        text = pipeline.run(['text'], on_stage)['text']
+        if not text:
+            return None
+        
+        sidecar = open_sidecar(file_path, options) if use_index else None
+        if sidecar:
+            with sidecar:
+                if sidecar.options_match:
+                    return _file_result(file_path, {}, sidecar.restore_statistics(text), pipeline.get)
+                # Same text, other options: skip cleaning and tokenizing
+                pipeline.values['tokens'] = sidecar.restore_tokens(text)
+                pipeline.values['line_index'] = sidecar.restore_lines(text)
+        
+        if progress or use_index:
+            pipeline.run(keys, on_stage)
+    
+    if use_index:
+        write_sidecar(
+            file_path, options, {key: pipeline.get(key) for key in keys},
+            pipeline.get('tokens'), pipeline.get('line_index')
+        )
+    return _file_result(file_path, {key: partial(pipeline.get, key) for key in keys}, shared=pipeline.get)
 
+
+def _file_result(
+    file_path: str,
+    fields: Dict[str, Any],
+    values: Optional[Dict[str, Any]] = None,
+    shared: Optional[Callable[[str], Any]] = None
+) -> AnalysisResult:
+    """Result with the file details first, then the given statistics."""
+    file_stat = Path(archive_path(file_path)).stat()
+    return AnalysisResult(fields, {
+        'file_path': file_path,
+        'file_size': file_stat.st_size,
+        'modified_date': datetime.fromtimestamp(file_stat.st_mtime),
+        **(values or {}),
+    }, shared)
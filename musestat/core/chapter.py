@@ -3,11 +3,464 @@ Chapter extraction and analysis for manuscripts.
 """
 
 import re
-from typing import List, Dict, Optional
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, TYPE_CHECKING
 from .text_processing import count_words
+from .lines import LineIndex, index_lines
 
+if TYPE_CHECKING:
+    from .sections import SectionStats
 
-def extract_chapters(text: str) -> List[Dict]:
+
+class Chapter:
+    """
+    A chapter as a span of the manuscript text.
+
+    Only the start and end offsets into the source string are stored; the
+    content is sliced on demand, so the manuscript is held exactly once no
+    matter how many chapters refer to it. Supports the ``chapter['words']``
+    and ``chapter.get('scenes', 0)`` access used by the UI and exporters.
+    Once measured (see ``measure_chapters``), ``characters``, ``sentences``
+    and ``paragraphs`` are available the same way, along with
+    ``outlier_scenes`` once the structure tree has been measured.
+
+    Attributes:
+        title: Chapter title from the heading line
+        start: Offset of the first character after the heading line
+        end: Offset just past the last character of the chapter
+        words: Word count of the chapter content
+        scenes: Number of scene breaks (*** or ---) in the chapter
+        metrics: SectionStats of the chapter content, or None if not measured
+        outlier_scenes: Number of the chapter's scenes flagged as unusually short or long
+        line: 1-based line of the heading in the manuscript file, if known
+    """
+
+    __slots__ = ('title', 'start', 'end', 'words', 'scenes', 'metrics', 'outlier_scenes', 'line', '_source')
+
+    # Keys exposed through the mapping-style interface
+    _FIELDS = ('title', 'content', 'words', 'scenes', 'line')
+    _METRIC_FIELDS = ('characters', 'sentences', 'paragraphs', 'outlier_scenes')
+
+    def __init__(
+        self,
+        source: str,
+        title: str,
+        start: int,
+        end: int,
+        words: int = 0,
+        scenes: int = 0,
+        line: Optional[int] = None
+    ):
+        self._source = source
+        self.title = title
+        self.start = start
+        self.end = end
+        self.words = words
+        self.scenes = scenes
+        self.metrics: Optional['SectionStats'] = None
+        self.outlier_scenes = 0
+        self.line = line
+
+    @property
+    def content(self) -> str:
+        """Chapter text (sliced from the source on each access)."""
+        return self._source[self.start:self.end]
+
+    @property
+    def characters(self) -> Optional[int]:
+        """Character count of the content, if measured."""
+        return self.metrics.characters if self.metrics else None
+
+    @property
+    def sentences(self) -> Optional[int]:
+        """Sentence count of the content, if measured."""
+        return self.metrics.sentences if self.metrics else None
+
+    @property
+    def paragraphs(self) -> Optional[int]:
+        """Paragraph count of the content, if measured."""
+        return self.metrics.paragraphs if self.metrics else None
+
+    def keys(self):
+        """Field names available through item access."""
+        return self._FIELDS + self._METRIC_FIELDS if self.metrics else self._FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dictionary-style access with a default."""
+        return getattr(self, key) if key in self.keys() else default
+
+    def to_dict(self) -> Dict:
+        """Plain dictionary copy (materializes the content)."""
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"Chapter(title={self.title!r}, start={self.start}, end={self.end}, words={self.words})"
+
+
+# Kinds of structural boundaries
+HEADING = 'heading'
+SCENE_BREAK = 'scene_break'
+
+# Heading levels: custom part headings, Markdown H1 and H2, and every other heading
+PART_LEVEL = 0
+H1_LEVEL = 1
+H2_LEVEL = 2
+CHAPTER_LEVEL = 3
+
+# Chapter headings (markdown H1/H2, "Chapter 1: Title", "CHAPTER 1: Title",
+# "Ch. 1: Title") and scene breaks (*** or --- on a line of their own) as
+# alternatives of one pattern matched over the whole text. ``[^\S\n]`` is
+# whitespace other than a newline, so no match runs into the next line; the
+# first alternative that matches wins. A scene break line never matches a
+# heading.
+_SCENE_BREAK_ALTERNATIVE = r'(?P<scene_break>[^\S\n]*(?:\*\*\*|---)[^\S\n]*)$'
+_H1_ALTERNATIVE = r'#[^\S\n]+(?P<h1>.+)$'
+_HEADING_ALTERNATIVES = (
+    r'##[^\S\n]+(?P<h2>.+)$',
+    r'Chapter[^\S\n]+\d+(?:[^\S\n]|:)+(?P<chapter>.+)',
+    r'CHAPTER[^\S\n]+\d+(?:[^\S\n]|:)+(?P<upper_chapter>.+)',
+    r'Ch\.[^\S\n]*\d+(?:[^\S\n]|:)+(?P<short_chapter>.+)',
+)
+
+# File with custom part, chapter and scene break patterns (see load_boundary_patterns)
+PATTERNS_FILE = '.musestatpatterns'
+
+# Leading global flags, e.g. "(?i)", which must become scoped in an alternation
+_GLOBAL_FLAGS_PATTERN = re.compile(r'^\(\?([imsx]+)\)')
+
+# Parts of a custom pattern that refer to its groups by number or name:
+# numbered backreferences, named groups and backreferences, and the
+# condition of a conditional group. Character classes and octal escapes
+# are matched only to be skipped.
+_GROUP_REFERENCE_PATTERN = re.compile(r"""
+      \[\^?\]?(?:\\.|[^\]\\])*\]
+    | \\(?:[1-7][0-7]{2}|0[0-7]{0,2})
+    | \\(?P<number>[1-9][0-9]?)
+    | \\.
+    | \(\?P(?P<named>[<=])(?P<name>\w+)
+    | \(\?\((?P<condition>\w+)\)
+""", re.VERBOSE | re.DOTALL)
+
+
+class Boundary(NamedTuple):
+    """A chapter heading or scene break line found in the manuscript."""
+    kind: str
+    start: int
+    end: int
+    title: Optional[str]
+    level: Optional[int] = None  # PART_LEVEL, H1_LEVEL, H2_LEVEL or CHAPTER_LEVEL for headings
+
+
+def _renumbered(pattern: str, offset: int, prefix: str) -> str:
+    """
+    Rewrite a pattern's group references for its place in the alternation.
+
+    Numbered backreferences and conditions are shifted by ``offset`` (the
+    number of groups before the pattern's own), and group names get
+    ``prefix`` so that two patterns may use the same name.
+    """
+    def replace(match: re.Match) -> str:
+        if match.group('number'):
+            return f'(?:\\{int(match.group("number")) + offset})'
+        if match.group('named'):
+            return f'(?P{match.group("named")}{prefix}_{match.group("name")}'
+        condition = match.group('condition')
+        if condition:
+            if condition.isdigit():
+                return f'(?({int(condition) + offset})'
+            return f'(?({prefix}_{condition})'
+        return match.group()
+
+    return _GROUP_REFERENCE_PATTERN.sub(replace, pattern)
+
+
+def _scoped(pattern: str) -> str:
+    """Rewrite leading global flags ("(?i)...") as a scoped group ("(?i:...)")."""
+    match = _GLOBAL_FLAGS_PATTERN.match(pattern)
+    if match:
+        return f'(?{match.group(1)}:{pattern[match.end():]})'
+    return f'(?:{pattern})'
+
+
+class BoundaryMatcher:
+    """
+    Chapter heading and scene break patterns compiled into one regex.
+
+    Custom patterns are added as further alternatives of the same pattern, so
+    each line is still scanned once however many patterns there are. Scene
+    break patterns are tried before heading patterns (so "# # #" can be a
+    scene break), then part headings, then built-in before custom headings.
+
+    A custom part or chapter pattern matches at the start of a line; its
+    first group, if it has one, is the title, otherwise the whole heading
+    line is. A custom scene break pattern must match the whole line apart
+    from surrounding whitespace.
+
+    Backreferences and named groups in a custom pattern refer to that
+    pattern's own groups; patterns may reuse the same group names.
+
+    Args:
+        chapter_patterns: Additional chapter heading regexes
+        scene_patterns: Additional scene break regexes
+        part_patterns: Heading regexes for parts (or books) that group chapters
+
+    Raises:
+        ValueError: If a pattern is not a valid regular expression
+    """
+
+    __slots__ = ('chapter_patterns', 'scene_patterns', 'part_patterns', 'pattern', '_headings')
+
+    def __init__(
+        self,
+        chapter_patterns: Tuple[str, ...] = (),
+        scene_patterns: Tuple[str, ...] = (),
+        part_patterns: Tuple[str, ...] = ()
+    ):
+        self.chapter_patterns = tuple(chapter_patterns)
+        self.scene_patterns = tuple(scene_patterns)
+        self.part_patterns = tuple(part_patterns)
+
+        group_counts = {}
+        for pattern in self.chapter_patterns + self.scene_patterns + self.part_patterns:
+            try:
+                group_counts[pattern] = re.compile(pattern).groups
+            except re.error as e:
+                raise ValueError(f"Invalid pattern '{pattern}': {e}") from None
+
+        # Each custom pattern is wrapped in a group named for its place; the
+        # references to its own groups are renumbered past the groups of the
+        # alternatives before it
+        alternatives = []
+        groups_before = 0
+
+        def add(alternative: str, groups: int) -> None:
+            nonlocal groups_before
+            alternatives.append(alternative)
+            groups_before += groups
+
+        def add_custom(name: str, pattern: str, template: str) -> None:
+            body = _scoped(_renumbered(pattern, groups_before + 1, name))
+            add(template.format(name=name, body=body), group_counts[pattern] + 1)
+
+        add(_SCENE_BREAK_ALTERNATIVE, 1)
+        for i, p in enumerate(self.scene_patterns):
+            add_custom(f'scene_{i}', p, r'(?P<{name}>[^\S\n]*{body}[^\S\n]*)$')
+        for i, p in enumerate(self.part_patterns):
+            add_custom(f'part_{i}', p, '(?P<{name}>{body})')
+        add(_H1_ALTERNATIVE, 1)
+        for alternative in _HEADING_ALTERNATIVES:
+            add(alternative, 1)
+        for i, p in enumerate(self.chapter_patterns):
+            add_custom(f'heading_{i}', p, '(?P<{name}>{body})')
+        try:
+            self.pattern = re.compile('^(?:' + '|'.join(alternatives) + ')', re.MULTILINE)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern set: {e}") from None
+
+        # Group holding the title of each heading alternative (None: whole
+        # line) and the heading's level
+        groups = self.pattern.groupindex
+        self._headings: Dict[str, Tuple[Optional[int], int]] = {
+            name: (groups[name], CHAPTER_LEVEL)
+            for name in ('chapter', 'upper_chapter', 'short_chapter')
+        }
+        self._headings['h1'] = (groups['h1'], H1_LEVEL)
+        self._headings['h2'] = (groups['h2'], H2_LEVEL)
+        for prefix, patterns, level in (
+            ('part', self.part_patterns, PART_LEVEL),
+            ('heading', self.chapter_patterns, CHAPTER_LEVEL)
+        ):
+            for i, p in enumerate(patterns):
+                name = f'{prefix}_{i}'
+                self._headings[name] = (groups[name] + 1 if group_counts[p] else None, level)
+
+    def iter_boundaries(self, text: str) -> Iterator[Boundary]:
+        """
+        Find chapter headings and scene breaks in one pass over the text.
+
+        Args:
+            text: Full manuscript text (or any run of whole lines)
+
+        Yields:
+            Boundary records in text order; ``start`` and ``end`` span the
+            line without its newline, ``title`` is the stripped heading title
+            and ``level`` its heading level (both None for scene breaks)
+        """
+        headings = self._headings
+        for match in self.pattern.finditer(text):
+            kind = match.lastgroup
+            start = match.start()
+            if kind not in headings:
+                yield Boundary(SCENE_BREAK, start, match.end(), None)
+                continue
+            end = text.find('\n', start)
+            if end < 0:
+                end = len(text)
+            group, level = headings[kind]
+            title = match.group(group) if group is not None else text[start:end]
+            yield Boundary(HEADING, start, end, (title or '').strip(), level)
+
+    def __repr__(self) -> str:
+        return (
+            f"BoundaryMatcher(chapter_patterns={self.chapter_patterns!r}, "
+            f"scene_patterns={self.scene_patterns!r}, part_patterns={self.part_patterns!r})"
+        )
+
+
+@lru_cache(maxsize=32)
+def get_boundary_matcher(
+    chapter_patterns: Tuple[str, ...] = (),
+    scene_patterns: Tuple[str, ...] = (),
+    part_patterns: Tuple[str, ...] = ()
+) -> BoundaryMatcher:
+    """
+    Get the compiled matcher for a set of custom patterns.
+
+    Matchers are cached by pattern set, so each set is compiled once.
+
+    Args:
+        chapter_patterns: Additional chapter heading regexes
+        scene_patterns: Additional scene break regexes
+        part_patterns: Heading regexes for parts that group chapters
+
+    Returns:
+        BoundaryMatcher for the built-in plus the given patterns
+
+    Raises:
+        ValueError: If a pattern is not a valid regular expression
+    """
+    return BoundaryMatcher(tuple(chapter_patterns), tuple(scene_patterns), tuple(part_patterns))
+
+
+def load_boundary_patterns(path: str = PATTERNS_FILE) -> Tuple[List[str], List[str], List[str]]:
+    r"""
+    Load custom part, chapter and scene break patterns from a file.
+
+    Each line is ``part: <regex>``, ``chapter: <regex>`` or ``scene: <regex>``;
+    empty lines and lines starting with '#' are skipped. For example::
+
+        part: ^Part\s+[IVXLC]+
+        chapter: ^(?:Prologue|Epilogue|Interlude)\b
+        scene: # # #
+        scene: ~
+
+    Args:
+        path: Pattern file (default: .musestatpatterns)
+
+    Returns:
+        Tuple of (chapter patterns, scene break patterns, part patterns),
+        empty if the file does not exist
+    """
+    chapter_patterns = []
+    scene_patterns = []
+    part_patterns = []
+    pattern_file = Path(path)
+
+    if pattern_file.exists():
+        try:
+            with open(pattern_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    kind, _, pattern = line.partition(':')
+                    kind = kind.strip().lower()
+                    pattern = pattern.strip()
+                    if not pattern:
+                        continue
+                    if kind == 'chapter':
+                        chapter_patterns.append(pattern)
+                    elif kind == 'scene':
+                        scene_patterns.append(pattern)
+                    elif kind == 'part':
+                        part_patterns.append(pattern)
+        except OSError:
+            pass
+
+    return chapter_patterns, scene_patterns, part_patterns
+
+
+def iter_boundaries(text: str, matcher: Optional[BoundaryMatcher] = None) -> Iterator[Boundary]:
+    """
+    Find chapter headings and scene breaks in one pass over the text.
+
+    Args:
+        text: Full manuscript text (or any run of whole lines)
+        matcher: Compiled patterns (default: the built-in patterns)
+
+    Yields:
+        Boundary records in text order
+    """
+    return (matcher or get_boundary_matcher()).iter_boundaries(text)
+
+
+class HeadingSpan(NamedTuple):
+    """A heading and the content that follows it up to the next heading."""
+    title: str
+    level: int
+    heading_start: int
+    start: int
+    end: int
+    breaks: Tuple[Tuple[int, int], ...]
+
+
+def iter_heading_spans(text: str, matcher: Optional[BoundaryMatcher] = None) -> Iterator[HeadingSpan]:
+    """
+    Group the boundaries of a manuscript by heading.
+
+    Args:
+        text: Full manuscript text
+        matcher: Compiled heading and scene break patterns (default: built-in)
+
+    Yields:
+        HeadingSpan for every heading (including headings with an empty
+        title): ``heading_start`` is the start of the heading line, ``start``
+        and ``end`` the content up to the newline before the next heading,
+        ``breaks`` the (start, end) offsets of the scene break lines in it
+    """
+    heading = None
+    breaks = []
+
+    def make_span(end: int) -> HeadingSpan:
+        start = min(heading.end + 1, len(text))
+        return HeadingSpan(heading.title, heading.level, heading.start, start, max(start, end), tuple(breaks))
+
+    for boundary in iter_boundaries(text, matcher):
+        if boundary.kind == SCENE_BREAK:
+            if heading is not None:
+                breaks.append((boundary.start, boundary.end))
+            continue
+        # The previous heading's content ends before this heading's newline
+        if heading is not None:
+            yield make_span(boundary.start - 1)
+        heading = boundary
+        breaks = []
+
+    if heading is not None:
+        yield make_span(len(text))
+
+
+def extract_chapters(
+    text: str,
+    with_words: bool = True,
+    matcher: Optional[BoundaryMatcher] = None,
+    lines: Optional[LineIndex] = None
+) -> List[Chapter]:
     """
     Extract chapter information with smart detection.
     
@@ -17,67 +470,38 @@ def extract_chapters(text: str) -> List[Dict]:
     - Chapter 1: Title
     - CHAPTER 1: Title
     - Ch. 1: Title
+    - Custom patterns (see get_boundary_matcher and load_boundary_patterns)
+    
+    Headings and scene breaks are found with one precompiled pattern over
+    the whole text (see iter_boundaries), without splitting it into lines.
+    Every heading (parts included) starts a chapter; see build_outline for
+    the nested parts, chapters and scenes.
     
     Args:
         text: Full manuscript text
+        with_words: Count each chapter's words (skip when the chapters are
+            measured afterwards with measure_chapters)
+        matcher: Compiled heading and scene break patterns (default: built-in)
+        lines: Line index of the text, if already built (locates the headings)
         
     Returns:
-        List of chapter dictionaries with title, content, words, and scenes
+        List of Chapter records with title, content, words, scenes and heading line
     """
-    chapters = []
-    lines = text.split('\n')
-    
-    # Patterns for chapter detection
-    patterns = [
-        r'^#\s+(.+)$',  # Markdown H1
-        r'^##\s+(.+)$',  # Markdown H2
-        r'^Chapter\s+\d+[:\s]+(.+)',  # "Chapter 1: Title"
-        r'^CHAPTER\s+\d+[:\s]+(.+)',  # "CHAPTER 1: Title"
-        r'^Ch\.\s*\d+[:\s]+(.+)',  # "Ch. 1: Title"
+    if lines is None:
+        lines = index_lines(text)
+    return [
+        Chapter(
+            text,
+            span.title,
+            span.start,
+            span.end,
+            words=count_words(text[span.start:span.end]) if with_words else 0,
+            scenes=len(span.breaks),
+            line=lines.line(span.heading_start)
+        )
+        for span in iter_heading_spans(text, matcher)
+        if span.title
     ]
-    
-    current_chapter = None
-    chapter_content = []
-    scene_break_count = 0
-    
-    for line in lines:
-        # Check for scene breaks (*** or ---)
-        if re.match(r'^\s*\*\*\*\s*$', line) or re.match(r'^\s*---\s*$', line):
-            scene_break_count += 1
-        
-        # Check all chapter patterns
-        matched = False
-        for pattern in patterns:
-            match = re.match(pattern, line)
-            if match:
-                # Save previous chapter if exists
-                if current_chapter:
-                    chapters.append({
-                        'title': current_chapter,
-                        'content': '\n'.join(chapter_content),
-                        'words': count_words('\n'.join(chapter_content)),
-                        'scenes': scene_break_count
-                    })
-                
-                current_chapter = match.group(1).strip()
-                chapter_content = []
-                scene_break_count = 0
-                matched = True
-                break
-        
-        if not matched and current_chapter:
-            chapter_content.append(line)
-    
-    # Add final chapter if exists
-    if current_chapter:
-        chapters.append({
-            'title': current_chapter,
-            'content': '\n'.join(chapter_content),
-            'words': count_words('\n'.join(chapter_content)),
-            'scenes': scene_break_count
-        })
-    
-    return chapters
 
 
 def calculate_chapter_statistics(chapters: List[Dict]) -> Optional[Dict]:
@@ -0,0 +1,220 @@
+"""
+Bounded-memory approximate word frequency (Space-Saving sketch).
+
+Used by ``--approx-frequency`` when word counts are aggregated over many
+chapters or manuscripts and an exact Counter would grow with the combined
+vocabulary.
+"""
+
+import heapq
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_SKETCH_CAPACITY = 1000
+
+
+class WordEstimate(NamedTuple):
+    """Estimated frequency of a word from a sketch."""
+    word: str
+    count: int
+    error: int
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter sketch with a fixed number of counters.
+
+    At most ``capacity`` items are monitored. When a new item arrives and
+    every counter is taken, the item with the smallest count is replaced and
+    the newcomer inherits that count as its error.
+
+    Error bounds, with N the total weight added (``total``) and k the capacity:
+        - Estimates never undercount: true <= count <= true + error
+        - error <= min_count <= N / k for every monitored item
+        - Every item whose true frequency exceeds N / k is monitored
+        - ``count - error`` is a guaranteed lower bound on the true frequency
+
+    Sketches merge (``merge``) with the same bounds over the combined total,
+    so partial results from chapters or files can be combined in any order.
+    """
+
+    __slots__ = ('capacity', 'total', '_counts', '_errors', '_heap')
+
+    def __init__(self, capacity: int = DEFAULT_SKETCH_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[Hashable, int] = {}
+        self._errors: Dict[Hashable, int] = {}
+        # Min-heap of (count, item); entries may lag behind _counts and are
+        # refreshed lazily when they reach the top
+        self._heap: List[Tuple[int, Hashable]] = []
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._counts
+
+    def _peek_min(self) -> Tuple[int, Hashable]:
+        heap = self._heap
+        while True:
+            count, item = heap[0]
+            current = self._counts[item]
+            if current == count:
+                return count, item
+            heapq.heapreplace(heap, (current, item))
+
+    @property
+    def min_count(self) -> int:
+        """Smallest monitored count (0 while counters are still free)."""
+        if len(self._counts) < self.capacity:
+            return 0
+        return self._peek_min()[0]
+
+    @property
+    def error_bound(self) -> float:
+        """Upper bound on the overestimate of any count (N / k)."""
+        return self.total / self.capacity
+
+    def update(self, item: Hashable, count: int = 1):
+        """
+        Add ``count`` occurrences of an item.
+
+        Args:
+            item: Item to count (e.g. a word)
+            count: Number of occurrences (weighted update)
+        """
+        self.total += count
+        counts = self._counts
+        if item in counts:
+            counts[item] += count
+            return
+
+        if len(counts) < self.capacity:
+            counts[item] = count
+            self._errors[item] = 0
+            heapq.heappush(self._heap, (count, item))
+            return
+
+        floor, victim = self._peek_min()
+        heapq.heappop(self._heap)
+        del counts[victim]
+        del self._errors[victim]
+        counts[item] = floor + count
+        self._errors[item] = floor
+        heapq.heappush(self._heap, (floor + count, item))
+
+    def update_counts(self, counts: Dict[Hashable, int]):
+        """
+        Add a batch of pre-aggregated counts (e.g. a Counter for one chunk).
+
+        Args:
+            counts: Mapping of item to occurrences
+        """
+        for item, count in counts.items():
+            self.update(item, count)
+
+    def merge(self, other: 'SpaceSaving') -> 'SpaceSaving':
+        """
+        Combine two sketches into a new one.
+
+        Items missing from a full sketch may have been evicted from it, so
+        they are charged that sketch's minimum count (as count and error).
+        The errors of the two sketches add up, so the merged sketch keeps the
+        smaller capacity, for which error <= N / k still holds.
+
+        Args:
+            other: Sketch built over another chapter or file
+
+        Returns:
+            New sketch with the smaller of the two capacities
+        """
+        merged = SpaceSaving(min(self.capacity, other.capacity))
+        merged.total = self.total + other.total
+        floor_self = self.min_count
+        floor_other = other.min_count
+
+        combined = []
+        for item in self._counts.keys() | other._counts.keys():
+            count = self._counts.get(item, floor_self) + other._counts.get(item, floor_other)
+            error = self._errors.get(item, floor_self) + other._errors.get(item, floor_other)
+            combined.append((count, error, item))
+
+        for count, error, item in heapq.nlargest(merged.capacity, combined, key=lambda entry: entry[0]):
+            merged._counts[item] = count
+            merged._errors[item] = error
+            merged._heap.append((count, item))
+        heapq.heapify(merged._heap)
+        return merged
+
+    def estimates(self, n: Optional[int] = None) -> List[WordEstimate]:
+        """
+        Get the items with the highest estimated counts.
+
+        Args:
+            n: Number of items to return (default: all monitored items)
+
+        Returns:
+            List of WordEstimate(word, count, error), highest count first
+        """
+        items = sorted(self._counts.items(), key=lambda entry: entry[1], reverse=True)
+        if n is not None:
+            items = items[:n]
+        return [WordEstimate(item, count, self._errors[item]) for item, count in items]
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Get (word, estimated count) pairs like ``Counter.most_common``.
+
+        Args:
+            n: Number of items to return (default: all monitored items)
+
+        Returns:
+            List of (word, count) tuples
+        """
+        return [(estimate.word, estimate.count) for estimate in self.estimates(n)]
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, for merging results across runs."""
+        return {
+            'capacity': self.capacity,
+            'total': self.total,
+            'items': [[item, count, self._errors[item]] for item, count in self._counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SpaceSaving':
+        """
+        Rebuild a sketch saved with ``to_dict``.
+
+        Args:
+            data: Dictionary produced by ``to_dict``
+
+        Returns:
+            Restored sketch
+        """
+        sketch = cls(data['capacity'])
+        sketch.total = data['total']
+        for item, count, error in data['items']:
+            sketch._counts[item] = count
+            sketch._errors[item] = error
+            sketch._heap.append((count, item))
+        heapq.heapify(sketch._heap)
+        return sketch
+
+
+def merge_sketches(sketches: Iterable[SpaceSaving]) -> Optional[SpaceSaving]:
+    """
+    Merge sketches from several chapters or files.
+
+    Args:
+        sketches: Sketches to combine
+
+    Returns:
+        Combined sketch, or None if no sketches were given
+    """
+    merged = None
+    for sketch in sketches:
+        merged = sketch if merged is None else merged.merge(sketch)
+    return merged
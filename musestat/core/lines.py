@@ -0,0 +1,86 @@
+"""
+Line index for reporting exact file locations.
+
+The offset where every line starts is recorded once per document, so any
+offset (a sentence, paragraph, heading or verification issue) is turned
+into a line and column with a binary search instead of counting newlines
+or splitting the text into lines again.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import NamedTuple
+
+from .tokens import offset_typecode
+
+
+class Location(NamedTuple):
+    """A 1-based line and column in the manuscript file."""
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"{self.line}:{self.column}"
+
+
+class LineIndex:
+    """
+    Start offset of every line of a text.
+
+    Attributes:
+        text: The indexed text
+        starts: Offset of the first character of each line (the first is 0)
+    """
+
+    __slots__ = ('text', 'starts')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.starts = array(offset_typecode(len(text)), [0])
+        find = text.find
+        newline = find('\n')
+        while newline != -1:
+            self.starts.append(newline + 1)
+            newline = find('\n', newline + 1)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line(self, offset: int) -> int:
+        """1-based number of the line holding an offset."""
+        return bisect_right(self.starts, offset)
+
+    def location(self, offset: int) -> Location:
+        """
+        Get the line and column of an offset.
+
+        Args:
+            offset: Offset in the indexed text
+
+        Returns:
+            1-based Location of the offset
+        """
+        line = bisect_right(self.starts, offset)
+        return Location(line, offset - self.starts[line - 1] + 1)
+
+    def line_text(self, line: int) -> str:
+        """Text of a 1-based line, without its newline."""
+        start = self.starts[line - 1]
+        end = self.starts[line] - 1 if line < len(self.starts) else len(self.text)
+        return self.text[start:end]
+
+    def __repr__(self) -> str:
+        return f"LineIndex(lines={len(self)})"
+
+
+def index_lines(text: str) -> LineIndex:
+    """
+    Record where every line of a text starts.
+
+    Args:
+        text: Raw manuscript text
+
+    Returns:
+        LineIndex answering offset-to-line/column lookups in O(log n)
+    """
+    return LineIndex(text)
@@ -0,0 +1,143 @@
+"""
+Single-pass markdown scanner.
+
+Finds every piece of markdown syntax in one left-to-right pass and reports
+the spans of the source text that survive cleaning, so callers can build
+the cleaned text with a single join or work with offsets directly.
+"""
+
+import re
+from typing import Iterator, List, Optional, Tuple
+
+# One alternation instead of seven re.sub passes. Every branch stops at the
+# next opening delimiter of its own kind, so a failed attempt never rescans
+# text that another attempt of the same kind has already covered; this keeps
+# the whole scan linear even on adversarial input. Each branch starts with a
+# plain literal so the regex engine can skip prose using its first-character
+# set, and the named group tells the scanner which construct matched.
+_MARKUP_PATTERN = re.compile(
+    r'`(?P<fence>``[\s\S]*?```)'                      # Code blocks
+    r'|`(?P<code>[^`]+)`'                              # Inline code
+    r'|!(?P<image>\[[^\[\]]*\]\([^()]+\))'             # Images
+    r'|\[(?P<link>[^\[\]]+)\]\([^()]+\)'               # Links (group is the kept text)
+    r'|<(?P<html>[^<>]+)>'                             # HTML tags
+    r'|#(?P<header>#*[ \t]+)'                          # Header markers (line start only)
+    r'|\*(?P<asterisks>\**)'                           # Emphasis markers
+    r'|_(?P<underscores>_*)'
+)
+
+# Longest delimiter run treated as emphasis (*, **, ***)
+MAX_EMPHASIS_RUN = 3
+
+
+def _is_emphasis_marker(text: str, start: int, end: int) -> bool:
+    """
+    Decide whether a run of '*' or '_' is emphasis rather than literal text.
+
+    Runs of up to three markers are stripped, including a free-standing
+    ``***`` scene break. A single marker surrounded by whitespace (list
+    bullets, "5 * 3") and underscores inside words (snake_case) are kept.
+    """
+    if end - start > MAX_EMPHASIS_RUN:
+        return False
+    before = text[start - 1] if start > 0 else ' '
+    after = text[end] if end < len(text) else ' '
+    if end - start == 1 and before.isspace() and after.isspace():
+        return False
+    if text[start] == '_' and before.isalnum() and after.isalnum():
+        return False
+    return True
+
+
+def iter_clean_spans(
+    text: str,
+    start: int = 0,
+    end: int = None,
+    headings: Optional[List[int]] = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (start, end) offsets of the text that remains after removing markdown.
+
+    Handles code fences, inline code, images, links (keeping their text),
+    HTML tags, header markers and emphasis markers in a single pass.
+
+    Args:
+        text: Raw text with markdown formatting
+        start: Offset to start scanning at (default: beginning of text)
+        end: Offset to stop scanning at (default: end of text)
+        headings: If given, the offset just past each header marker (where
+            a heading line's text starts) is appended to it as it is found,
+            before the span starting there is yielded
+
+    Returns:
+        Iterator of (start, end) offsets into ``text``, in order
+    """
+    if end is None:
+        end = len(text)
+    pos = start
+
+    for match in _MARKUP_PATTERN.finditer(text, start, end):
+        kind = match.lastgroup
+        match_start, match_end = match.span()
+
+        if kind == 'header':
+            if match_start > 0 and text[match_start - 1] != '\n':
+                continue
+        elif kind in ('asterisks', 'underscores'):
+            if not _is_emphasis_marker(text, match_start, match_end):
+                continue
+
+        if match_start > pos:
+            yield pos, match_start
+
+        if kind == 'link':
+            # Link text may carry its own emphasis
+            yield from iter_clean_spans(text, match.start('link'), match.end('link'))
+        elif kind == 'header' and headings is not None:
+            headings.append(match_end)
+
+        pos = match_end
+
+    if pos < end:
+        yield pos, end
+
+
+def clean_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Get the offsets of the text that remains after removing markdown.
+
+    Args:
+        text: Raw text with markdown formatting
+
+    Returns:
+        List of (start, end) offsets into ``text``
+    """
+    return list(iter_clean_spans(text))
+
+
+def scan_markdown(text: str, headings: Optional[List[int]] = None) -> str:
+    """
+    Remove markdown formatting in a single pass.
+
+    Args:
+        text: Raw text with markdown formatting
+        headings: If given, the offset in the cleaned text where each heading
+            line's text starts is appended to it (see ``segment_sentences``)
+
+    Returns:
+        Cleaned text without markdown syntax
+    """
+    if headings is None:
+        return ''.join([text[s:e] for s, e in iter_clean_spans(text)])
+
+    raw_headings: List[int] = []
+    pieces = []
+    length = 0
+    for s, e in iter_clean_spans(text, headings=raw_headings):
+        # Headings found so far start at or before this span
+        while len(headings) < len(raw_headings):
+            headings.append(length)
+        pieces.append(text[s:e])
+        length += e - s
+    headings.extend([length] * (len(raw_headings) - len(headings)))
+    return ''.join(pieces)
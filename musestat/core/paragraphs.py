@@ -0,0 +1,127 @@
+"""
+Paragraph index shared by counting, pacing and verification.
+
+Paragraphs are the non-blank stretches of the raw text between blank lines.
+One pass records each paragraph as (start, end, word_count), so every
+feature counts, measures and locates paragraphs by index instead of
+splitting the manuscript into paragraph strings again.
+"""
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import Iterator, NamedTuple, Optional
+
+from .tokens import offset_typecode
+
+# Blank lines (possibly with whitespace) separate paragraphs
+PARAGRAPH_SPLIT_PATTERN = re.compile(r'\n\s*\n')
+
+# Characters of a paragraph shown in previews
+PREVIEW_LENGTH = 70
+
+# Leading whitespace of a line inside a paragraph
+_INDENT_PATTERN = re.compile(r'\s*')
+
+
+class Paragraph(NamedTuple):
+    """One paragraph as offsets into the indexed text."""
+    start: int
+    end: int
+    words: int
+
+
+class ParagraphIndex:
+    """
+    Paragraphs of a text as parallel offset and word-count arrays.
+
+    Attributes:
+        text: The indexed text
+        starts: Offset of the first non-blank character of each paragraph
+        ends: Offset just past the last non-blank character of each paragraph
+        word_counts: Whitespace-separated words in each paragraph
+    """
+
+    __slots__ = ('text', 'starts', 'ends', 'word_counts')
+
+    def __init__(self, text: str):
+        self.text = text
+        typecode = offset_typecode(len(text))
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self.word_counts = array('I')
+
+    def _add(self, start: int, end: int, words: int):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.word_counts.append(words)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Paragraph:
+        return Paragraph(self.starts[i], self.ends[i], self.word_counts[i])
+
+    def __iter__(self) -> Iterator[Paragraph]:
+        return map(Paragraph, self.starts, self.ends, self.word_counts)
+
+    def paragraph_text(self, i: int) -> str:
+        """Text of the i-th paragraph."""
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def preview(self, i: int, length: int = PREVIEW_LENGTH, offset: Optional[int] = None) -> str:
+        """First characters of the i-th paragraph's first line (or of its line holding an offset)."""
+        start = self.starts[i]
+        if offset is not None:
+            line_start = self.text.rfind('\n', start, offset) + 1
+            if line_start:
+                start = _INDENT_PATTERN.match(self.text, line_start).end()
+        end = min(self.ends[i], start + length)
+        line_end = self.text.find('\n', start, end)
+        return self.text[start:line_end if line_end != -1 else end].rstrip()
+
+    def find(self, offset: int) -> Optional[int]:
+        """
+        Get the paragraph holding an offset of the text.
+
+        Args:
+            offset: Offset in the indexed text
+
+        Returns:
+            Index of the paragraph, or None if the offset is in a blank stretch
+        """
+        i = bisect_right(self.starts, offset) - 1
+        if i >= 0 and offset < self.ends[i]:
+            return i
+        return None
+
+    def __repr__(self) -> str:
+        return f"ParagraphIndex(paragraphs={len(self)})"
+
+
+def index_paragraphs(text: str) -> ParagraphIndex:
+    """
+    Find the paragraphs of a text in one pass.
+
+    Args:
+        text: Raw manuscript text (or a piece of it)
+
+    Returns:
+        ParagraphIndex with the (start, end, word_count) of every non-blank paragraph
+    """
+    index = ParagraphIndex(text)
+    piece_start = 0
+    for match in PARAGRAPH_SPLIT_PATTERN.finditer(text):
+        _add_piece(index, text, piece_start, match.start())
+        piece_start = match.end()
+    _add_piece(index, text, piece_start, len(text))
+    return index
+
+
+def _add_piece(index: ParagraphIndex, text: str, start: int, end: int):
+    """Record the text between two separators if it is not blank."""
+    piece = text[start:end]
+    stripped = piece.strip()
+    if stripped:
+        first = start + len(piece) - len(piece.lstrip())
+        index._add(first, first + len(stripped), len(stripped.split()))
@@ -0,0 +1,153 @@
+"""
+Declarative analysis stages and their scheduler.
+
+Each stage declares the values it reads (inputs) and the statistics it
+produces (outputs). A Pipeline runs only the stages needed for the outputs
+a caller asks for and shares every intermediate value between stages.
+Stages run one after another in dependency order: they are CPU-bound
+Python code, so threads would only take turns on the GIL, and the shared
+values (token store, indexes) are too large to hand to worker processes.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+class Stage(NamedTuple):
+    """A unit of analysis work with declared inputs and outputs."""
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    func: Callable[..., Dict[str, Any]]
+    description: str
+
+
+# Registered stages, in registration order
+STAGES: Dict[str, Stage] = {}
+
+
+def stage(name: str, inputs: Iterable[str], outputs: Iterable[str], description: str = ''):
+    """
+    Register a function as an analysis stage.
+
+    The function is called with its inputs as keyword arguments and must
+    return a dictionary with a value for every output.
+
+    Args:
+        name: Stage name (used to skip stages)
+        inputs: Names of the values the stage reads
+        outputs: Names of the values the stage produces
+        description: Short text shown in the progress display
+
+    Returns:
+        Decorator that registers the function and returns it unchanged
+    """
+    def register(func: Callable[..., Dict[str, Any]]) -> Callable[..., Dict[str, Any]]:
+        STAGES[name] = Stage(name, tuple(inputs), tuple(outputs), func, description or name)
+        return func
+    return register
+
+
+class Pipeline:
+    """
+    Runs registered stages on demand and memoizes their outputs.
+
+    Args:
+        values: Initial values (e.g. file path and options) available as inputs
+        skip: Names of stages that must not run
+        stages: Stage registry to use (default: all registered stages)
+    """
+
+    def __init__(
+        self,
+        values: Dict[str, Any],
+        skip: Iterable[str] = (),
+        stages: Optional[Dict[str, Stage]] = None
+    ):
+        self.values: Dict[str, Any] = dict(values)
+        stages = STAGES if stages is None else stages
+        skip = set(skip)
+        unknown = skip - stages.keys()
+        if unknown:
+            raise ValueError(f"Unknown stage(s): {', '.join(sorted(unknown))}")
+        self.stages = {name: s for name, s in stages.items() if name not in skip}
+        self._producers: Dict[str, Stage] = {}
+        for s in self.stages.values():
+            for output in s.outputs:
+                self._producers[output] = s
+        self._lock = threading.RLock()
+
+    def available(self, name: str) -> bool:
+        """Check whether a value is known or can be produced by the enabled stages."""
+        return self._resolve(name, set()) is not None
+
+    def _resolve(self, name: str, visiting: Set[str]) -> Optional[List[Stage]]:
+        """Stages (dependencies first) needed to produce a value, or None if impossible."""
+        if name in self.values:
+            return []
+        producer = self._producers.get(name)
+        if producer is None or producer.name in visiting:
+            return None
+        visiting.add(producer.name)
+        needed: List[Stage] = []
+        for dependency in producer.inputs:
+            stages = self._resolve(dependency, visiting)
+            if stages is None:
+                return None
+            needed.extend(s for s in stages if s not in needed)
+        visiting.discard(producer.name)
+        needed.append(producer)
+        return needed
+
+    def plan(self, outputs: Iterable[str]) -> List[Stage]:
+        """
+        Get the stages that must run to produce the given outputs.
+
+        Args:
+            outputs: Names of the requested values
+
+        Returns:
+            Stages in an order where every stage follows its dependencies
+
+        Raises:
+            KeyError: If an output cannot be produced by the enabled stages
+        """
+        planned: List[Stage] = []
+        for output in outputs:
+            stages = self._resolve(output, set())
+            if stages is None:
+                raise KeyError(output)
+            planned.extend(s for s in stages if s not in planned)
+        return planned
+
+    def run(self, outputs: Iterable[str], on_stage: Optional[Callable[[Stage], None]] = None) -> Dict[str, Any]:
+        """
+        Run the stages needed for the outputs, dependencies first.
+
+        Args:
+            outputs: Names of the requested values
+            on_stage: Called with each stage after it finishes (e.g. progress)
+
+        Returns:
+            Dictionary with the requested values
+        """
+        outputs = list(outputs)
+        with self._lock:
+            for s in self.plan(outputs):
+                self._finish(s, self._call(s), on_stage)
+            return {output: self.values[output] for output in outputs}
+
+    def get(self, name: str) -> Any:
+        """Get one value, running the stages it needs."""
+        if name in self.values:
+            return self.values[name]
+        return self.run([name])[name]
+
+    def _call(self, s: Stage) -> Dict[str, Any]:
+        return s.func(**{name: self.values[name] for name in s.inputs})
+
+    def _finish(self, s: Stage, result: Dict[str, Any], on_stage: Optional[Callable[[Stage], None]]):
+        for output in s.outputs:
+            self.values[output] = result[output]
+        if on_stage:
+            on_stage(s)
@@ -0,0 +1,233 @@
+"""
+Multi-file book projects analyzed as one manuscript.
+
+Every file of a project (see ``io.project``) is analyzed on its own by a
+``StreamAccumulator``, in a pool of worker processes when more than one CPU
+is available. The finished accumulators are then appended in reading order,
+which gives the same statistics as streaming the files joined into one
+manuscript: a file without a heading at its top continues the previous
+file's last chapter, and line numbers run on through the project.
+
+Each file's accumulator is cached inside the project folder
+(``.musestat-project.cache``), keyed by the file's modification time and size
+and by the analysis options. After editing one chapter file, only that
+file is analyzed again before the totals are re-merged.
+"""
+
+import json
+import os
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from rich.console import Console
+
+from ..io.readers import ProjectSource, DEFAULT_STREAM_CHUNK_SIZE
+from ..io.project import PROJECT_SEPARATOR, resolve_project, project_cache_path
+from .frequency import DEFAULT_SKETCH_CAPACITY
+from .chapter import get_boundary_matcher
+from .streaming import StreamAccumulator, LANGUAGE_SAMPLE_SIZE, open_chunks, iter_blocks, accumulator_statistics
+from ..features.language import detect_language
+from ..utils.concurrency import ordered_map
+
+console = Console()
+
+CACHE_FORMAT_VERSION = 1
+
+
+def analyze_file(
+    file_path: str,
+    language: Optional[str] = None,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    enable_advanced: bool = False,
+    min_word_length: int = 1,
+    approx_frequency: bool = False,
+    sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    patterns: Tuple[tuple, tuple, tuple] = ((), (), ())
+) -> Dict:
+    """
+    Analyze one file of a project (run in the worker processes).
+
+    Args:
+        file_path: Path to the file
+        language: Language of the project (default: detected from the file)
+        chunk_size: Number of characters read at a time
+        enable_advanced: Collect dialogue, pacing and readability counts
+        min_word_length: Minimum word length for frequency analysis
+        approx_frequency: Count words in a bounded-memory sketch
+        sketch_capacity: Number of counters in the sketch
+        patterns: Additional chapter, scene and part heading regexes
+
+    Returns:
+        State of the file's finished StreamAccumulator (see ``to_dict``)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file cannot be decoded
+    """
+    # The source is only read again after a code fence that is never closed
+    source, chunks = open_chunks(file_path, chunk_size)
+    accumulator = StreamAccumulator(
+        source, enable_advanced, min_word_length, approx_frequency, sketch_capacity,
+        get_boundary_matcher(*patterns), language=language
+    )
+    for block in iter_blocks(chunks, chunk_size):
+        accumulator.add(block)
+    accumulator.finish()
+    return accumulator.to_dict()
+
+
+def _load_cache(path: Path, options: Dict) -> Dict[str, list]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_FORMAT_VERSION and cache.get('options') == options:
+            return cache['files']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _save_cache(path: Path, options: Dict, files: Dict[str, list]):
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_FORMAT_VERSION, 'options': options, 'files': files}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _file_key(stat: os.stat_result) -> List[int]:
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def analyze_project(
+    file_path: str,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    enable_advanced: bool = False,
+    top_words_count: int = 20,
+    min_word_length: int = 1,
+    approx_frequency: bool = False,
+    sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    chapter_patterns: Iterable[str] = (),
+    scene_patterns: Iterable[str] = (),
+    part_patterns: Iterable[str] = (),
+    workers: Optional[int] = None,
+    use_cache: bool = True
+) -> Optional[Dict]:
+    """
+    Analyze a book split across several files as one manuscript.
+
+    The statistics have the same form as ``analyze_manuscript_stream``'s,
+    as if the files were one manuscript with a blank line between them,
+    plus ``files``: each file's path, word count, first line in the
+    manuscript and whether its analysis came from the cache.
+
+    Args:
+        file_path: Project directory, mdBook SUMMARY.md, or glob pattern
+        chunk_size: Number of characters read at a time (default: 1 MiB)
+        enable_advanced: Enable advanced features (readability, dialogue, pacing)
+        top_words_count: Number of most frequent words to include (default: 20)
+        min_word_length: Minimum word length for frequency analysis (default: 1)
+        approx_frequency: Estimate word frequencies with a bounded-memory sketch
+        sketch_capacity: Number of counters in the sketch (default: 1000)
+        chapter_patterns: Additional chapter heading regexes
+        scene_patterns: Additional scene break regexes
+        part_patterns: Additional part heading regexes (parts are listed as chapters)
+        workers: Worker processes (default: available CPUs; 1 analyzes in-process)
+        use_cache: Read and update the per-file cache next to the project
+
+    Returns:
+        Dictionary with all statistics, or None if analysis failed
+
+    Raises:
+        ValueError: If a chapter, scene or part pattern is not a valid regex
+    """
+    patterns = (tuple(chapter_patterns), tuple(scene_patterns), tuple(part_patterns))
+    matcher = get_boundary_matcher(*patterns)
+    # Everything that changes a file's analysis (the chunk size does not)
+    options = {
+        'enable_advanced': enable_advanced,
+        'min_word_length': min_word_length,
+        'approx_frequency': approx_frequency,
+        'sketch_capacity': sketch_capacity,
+        'patterns': [list(group) for group in patterns],
+    }
+    analyze = partial(
+        analyze_file, chunk_size=chunk_size, enable_advanced=enable_advanced, min_word_length=min_word_length,
+        approx_frequency=approx_frequency, sketch_capacity=sketch_capacity, patterns=patterns
+    )
+
+    try:
+        files = resolve_project(file_path)
+        file_stats = [os.stat(path) for path in files]
+        cache_path = project_cache_path(file_path)
+        cache_dir = cache_path.parent
+        names = [os.path.relpath(os.path.abspath(path), cache_dir) for path in files]
+        cache = _load_cache(cache_path, options) if use_cache else {}
+        states: Dict[str, Dict] = {
+            name: cache[name][2] for name, stat in zip(names, file_stats)
+            if isinstance(cache.get(name), list) and len(cache[name]) == 3 and cache[name][:2] == _file_key(stat)
+        }
+        cached = set(states)
+
+        language = None if enable_advanced else 'en'
+        if enable_advanced:
+            # Detected from the start of the project, as for one manuscript;
+            # the leading files are analyzed first to get it
+            samples = []
+            for path, name in zip(files, names):
+                if name not in states:
+                    states[name] = analyze(path)
+                samples.append(states[name]['language_sample'])
+                if len(PROJECT_SEPARATOR.join(samples)) >= LANGUAGE_SAMPLE_SIZE:
+                    break
+            language = detect_language(PROJECT_SEPARATOR.join(samples)[:LANGUAGE_SAMPLE_SIZE])
+
+        # Files analyzed in another language are analyzed again
+        misses = [(path, name) for path, name in zip(files, names)
+                  if name not in states or states[name]['language'] != language]
+        results = ordered_map(partial(analyze, language=language), [path for path, _ in misses], workers)
+        try:
+            for (_, name), state in zip(misses, results):
+                states[name] = state
+                cached.discard(name)
+        finally:
+            results.close()
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading project:[/bold red] {e}")
+        return None
+
+    if use_cache:
+        _save_cache(cache_path, options, {
+            name: [*_file_key(stat), states[name]] for name, stat in zip(names, file_stats)
+        })
+
+    project = StreamAccumulator(
+        ProjectSource(files, [states[name]['offset'] for name in names]),
+        enable_advanced, min_word_length, approx_frequency, sketch_capacity, matcher, language=language
+    )
+    file_details = []
+    for path, name in zip(files, names):
+        state = states[name]
+        file_details.append({
+            'file_path': path,
+            'words': state['total_words'],
+            'line': project.line_offset + (PROJECT_SEPARATOR.count('\n') if project.offset else 0) + 1,
+            'cached': name in cached,
+        })
+        project.append(StreamAccumulator.from_dict(state))
+    project.finish()
+
+    if not project.offset:
+        return None
+    result = accumulator_statistics(
+        project, file_path, sum(stat.st_size for stat in file_stats),
+        datetime.fromtimestamp(max(stat.st_mtime for stat in file_stats)), top_words_count
+    )
+    result['files'] = file_details
+    return result
@@ -0,0 +1,108 @@
+"""
+Lazily computed analysis results.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class AnalysisResult(MutableMapping):
+    """
+    Statistics dictionary whose fields are computed on first access.
+
+    Each field is backed by a zero-argument function that runs the first
+    time the field is read; the value is then memoized. Fields may read other
+    fields through the result itself, so shared steps (e.g. the language
+    needed by the stopword list) run once. Supports the ``stats['...']`` and
+    ``stats.get(...)`` access used by the UI and exporters, and ``copy()``
+    returns a plain dictionary with every field computed.
+
+    Args:
+        fields: Field name to function computing its value, in display order
+        values: Fields whose values are already known (listed first)
+        shared: Function returning a value the statistics were computed from
+            by name (e.g. the analysis pipeline's ``get``)
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Callable[[], Any]],
+        values: Optional[Dict[str, Any]] = None,
+        shared: Optional[Callable[[str], Any]] = None
+    ):
+        self._values: Dict[str, Any] = dict(values or {})
+        self._shared = shared
+        # Known values come first, then the computed fields in their given order
+        self._fields: Dict[str, Optional[Callable[[], Any]]] = dict.fromkeys(self._values)
+        self._fields.update(fields)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        compute = self._fields.get(key)
+        if compute is None:
+            raise KeyError(key)
+        value = self._values[key] = compute()
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self._fields.setdefault(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str):
+        if key not in self._fields:
+            raise KeyError(key)
+        del self._fields[key]
+        self._values.pop(key, None)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def is_computed(self, key: str) -> bool:
+        """Check whether a field has been computed (or set) already."""
+        return key in self._values
+
+    def compute(self, *keys: str) -> 'AnalysisResult':
+        """
+        Compute fields ahead of their first access.
+
+        Args:
+            keys: Field names (default: every field)
+
+        Returns:
+            The result itself
+        """
+        for key in keys or list(self._fields):
+            self[key]
+        return self
+
+    def shared(self, name: str) -> Any:
+        """
+        Get a value the statistics were computed from, so later steps (such
+        as verification) reuse it instead of reading the file again.
+
+        Args:
+            name: Value name, e.g. 'text', 'tokens' or 'line_index'
+
+        Returns:
+            The value, or None if the result does not keep it
+        """
+        if self._shared is None:
+            return None
+        return self._shared(name)
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain dictionary with every field computed."""
+        return {key: self[key] for key in self._fields}
+
+    def __repr__(self) -> str:
+        computed = ', '.join(key for key in self._fields if key in self._values)
+        return f"AnalysisResult(fields={len(self._fields)}, computed=[{computed}])"
@@ -0,0 +1,283 @@
+"""
+Per-section manuscript metrics from a single pass.
+
+The manuscript is tiled into sections (the preamble before the first
+heading, each heading line and each chapter's content). One pass over the
+cleaned text assigns every word, character, sentence, paragraph and
+dialogue line to exactly one section, so whole-book totals are the merge of
+the sections instead of a second scan. Each section also keeps its span of
+the cleaned text, so its word frequencies are read from the shared token
+store on request.
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from .text_processing import WORD_PATTERN, WHITESPACE_PATTERN
+from .sentences import SentenceIndex
+from ..features.dialogue import dialogue_counts, dialogue_summary
+
+if TYPE_CHECKING:
+    from .chapter import Chapter
+    from .tokenizer import TokenizedText
+
+
+class SectionStats:
+    """
+    Counts for one span of the manuscript.
+
+    ``merge`` adds the counts and widens the span, and is associative, so
+    chapters, parts or whole books can be combined in any grouping. Word
+    frequencies come from the token range of the span, so the frequencies
+    of merged sections are the sum of theirs.
+
+    Attributes:
+        start: Offset of the section in the raw text
+        end: Offset just past the section in the raw text
+        clean_start: Offset of the section in the cleaned text
+        clean_end: Offset just past the section in the cleaned text
+        words: Word count of the cleaned section
+        characters: Character count of the cleaned section
+        characters_no_spaces: Character count without whitespace
+        sentences: Sentences ending in the section
+        paragraphs: Paragraphs ending in the section
+        dialogue_lines: Lines with quoted dialogue (0 unless measured)
+        dialogue_words: Words inside quotes (0 unless measured)
+        lines: Non-empty lines (0 unless dialogue was measured)
+    """
+
+    __slots__ = (
+        'start', 'end', 'clean_start', 'clean_end', 'words', 'characters', 'characters_no_spaces',
+        'sentences', 'paragraphs', 'dialogue_lines', 'dialogue_words', 'lines'
+    )
+
+    def __init__(self, start: int = 0, end: int = 0, clean_start: int = 0, clean_end: int = 0):
+        self.start = start
+        self.end = end
+        self.clean_start = clean_start
+        self.clean_end = clean_end
+        self.words = 0
+        self.characters = 0
+        self.characters_no_spaces = 0
+        self.sentences = 0
+        self.paragraphs = 0
+        self.dialogue_lines = 0
+        self.dialogue_words = 0
+        self.lines = 0
+
+    def merge(self, other: 'SectionStats') -> 'SectionStats':
+        """
+        Combine two sections into one covering both.
+
+        Args:
+            other: Section to add
+
+        Returns:
+            New SectionStats with summed counts
+        """
+        merged = SectionStats(
+            min(self.start, other.start), max(self.end, other.end),
+            min(self.clean_start, other.clean_start), max(self.clean_end, other.clean_end)
+        )
+        for name in self.__slots__[4:]:
+            setattr(merged, name, getattr(self, name) + getattr(other, name))
+        return merged
+
+    def token_range(self, tokens: 'TokenizedText') -> Tuple[int, int]:
+        """
+        Get the section's tokens in the manuscript's token store.
+
+        Args:
+            tokens: TokenizedText the section was measured on
+
+        Returns:
+            (first, last) token indices, usable with ``tokens.tokens.most_common``
+        """
+        return tokens.tokens.token_range(self.clean_start, self.clean_end)
+
+    def word_frequencies(self, tokens: 'TokenizedText') -> Counter:
+        """
+        Count the words of the section.
+
+        Args:
+            tokens: TokenizedText the section was measured on
+
+        Returns:
+            Counter mapping word id (see ``tokens.tokens.vocabulary``) to occurrences
+        """
+        return tokens.tokens.frequencies(*self.token_range(tokens))
+
+    def common_words(
+        self,
+        tokens: 'TokenizedText',
+        n: int = 20,
+        stop_words: Optional[Iterable[str]] = None,
+        min_length: int = 3
+    ) -> List[Tuple[str, int]]:
+        """
+        Get the most common words of the section.
+
+        Args:
+            tokens: TokenizedText the section was measured on
+            n: Number of top words to return
+            stop_words: Words to exclude
+            min_length: Minimum word length to include
+
+        Returns:
+            List of (word, count) tuples for the most common words
+        """
+        first, last = self.token_range(tokens)
+        return tokens.tokens.most_common(n, stop_words=stop_words, min_length=min_length, start=first, end=last)
+
+    def dialogue(self) -> Dict:
+        """Dialogue statistics in the form returned by count_dialogue."""
+        return dialogue_summary(self.dialogue_lines, self.dialogue_words, self.lines)
+
+    def to_dict(self) -> Dict:
+        """Plain dictionary of the counts."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (
+            f"SectionStats(start={self.start}, end={self.end}, words={self.words}, "
+            f"sentences={self.sentences}, paragraphs={self.paragraphs})"
+        )
+
+
+def merge_sections(sections: Iterable[SectionStats]) -> Optional[SectionStats]:
+    """
+    Merge sections (e.g. every chapter of a book) into one.
+
+    Args:
+        sections: Sections to combine
+
+    Returns:
+        Combined section, or None if no sections were given
+    """
+    sections = list(sections)
+    return reduce(SectionStats.merge, sections) if sections else None
+
+
+def _assign_ends(ends: Sequence[int], bounds: Sequence[int]) -> List[int]:
+    """
+    Count spans (sentences or paragraphs) per section.
+
+    A span belongs to the section holding its last character.
+
+    Args:
+        ends: Offset just past each span, in text order
+        bounds: Section boundaries in the same text (first 0, last len(text))
+
+    Returns:
+        Span count for each section
+    """
+    counts = [0] * (len(bounds) - 1)
+    last = len(counts) - 1
+    for end in ends:
+        counts[min(max(bisect_right(bounds, end - 1) - 1, 0), last)] += 1
+    return counts
+
+
+def measure_sections(
+    tokens: 'TokenizedText',
+    boundaries: Sequence[int],
+    include_dialogue: bool = False,
+    sentences: Optional[SentenceIndex] = None
+) -> List[SectionStats]:
+    """
+    Measure consecutive sections of a manuscript in one pass.
+
+    Args:
+        tokens: TokenizedText of the whole manuscript
+        boundaries: Increasing raw offsets, starting at 0 and ending at len(text)
+        include_dialogue: Also count dialogue lines per section
+        sentences: Segmented sentences of the cleaned text (default: tokens.sentences)
+
+    Returns:
+        One SectionStats per pair of consecutive boundaries
+    """
+    text = tokens.text
+    clean_text = tokens.clean_text
+    clean_bounds = [tokens.clean_offset(offset) for offset in boundaries]
+    clean_bounds[0] = 0
+    clean_bounds[-1] = len(clean_text)
+
+    sections = []
+    for i in range(len(boundaries) - 1):
+        section = SectionStats(boundaries[i], boundaries[i + 1], clean_bounds[i], clean_bounds[i + 1])
+        chunk = clean_text[clean_bounds[i]:clean_bounds[i + 1]]
+        section.words = len(WORD_PATTERN.findall(chunk))
+        section.characters = len(chunk)
+        section.characters_no_spaces = len(chunk) - len(WHITESPACE_PATTERN.findall(chunk))
+        if include_dialogue:
+            section.dialogue_lines, section.dialogue_words, section.lines = dialogue_counts(
+                text[boundaries[i]:boundaries[i + 1]]
+            )
+        sections.append(section)
+
+    if sentences is None:
+        sentences = tokens.sentences
+    for section, count in zip(sections, _assign_ends(sentences.ends, clean_bounds)):
+        section.sentences = count
+    for section, count in zip(sections, _assign_ends(tokens.paragraphs.ends, boundaries)):
+        section.paragraphs = count
+    return sections
+
+
+def chapter_boundaries(text: str, chapters: Sequence['Chapter']) -> Tuple[List[int], List[int]]:
+    """
+    Tile the manuscript into preamble, heading and chapter content sections.
+
+    Args:
+        text: Full manuscript text
+        chapters: Chapters from extract_chapters, in order
+
+    Returns:
+        Tuple of (boundaries, index of each chapter's content section)
+    """
+    boundaries = [0]
+    content_sections = []
+    for chapter in chapters:
+        if not content_sections:
+            # Preamble ends where the first heading line starts
+            heading_start = text.rfind('\n', 0, max(chapter.start - 1, 0)) + 1
+            boundaries.append(min(heading_start, chapter.start))
+        # Heading section: the newline before the heading plus the heading line
+        boundaries.append(chapter.start)
+        content_sections.append(len(boundaries) - 1)
+        boundaries.append(chapter.end)
+    if boundaries[-1] != len(text):
+        boundaries.append(len(text))
+    return boundaries, content_sections
+
+
+def measure_chapters(
+    tokens: 'TokenizedText',
+    chapters: Sequence['Chapter'],
+    include_dialogue: bool = False,
+    sentences: Optional[SentenceIndex] = None
+) -> Tuple[SectionStats, SectionStats]:
+    """
+    Measure every chapter, the preamble and the book in one pass.
+
+    Each chapter's ``metrics`` (and ``words``) are set from its content
+    section; heading lines count towards the totals only.
+
+    Args:
+        tokens: TokenizedText of the whole manuscript
+        chapters: Chapters from extract_chapters, in order
+        include_dialogue: Also count dialogue lines per section
+        sentences: Segmented sentences of the cleaned text (default: tokens.sentences)
+
+    Returns:
+        Tuple of (whole-book totals, preamble before the first heading)
+    """
+    boundaries, content_sections = chapter_boundaries(tokens.text, chapters)
+    sections = measure_sections(tokens, boundaries, include_dialogue, sentences)
+    for chapter, index in zip(chapters, content_sections):
+        chapter.metrics = sections[index]
+        chapter.words = chapter.metrics.words
+    preamble = sections[0] if chapters else SectionStats()
+    return merge_sections(sections), preamble
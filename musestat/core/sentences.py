@@ -0,0 +1,198 @@
+"""
+Abbreviation-aware sentence segmentation.
+
+A single left-to-right pass over the cleaned text finds sentence ends and
+records each sentence as (start, end, word_count) offsets, so counting,
+pacing and readability share one segmentation instead of re-splitting
+sentence strings.
+
+A terminator (``.``, ``!``, ``?``, ``…`` or a run of them, with any closing
+quotes or brackets) ends a sentence when it is followed by whitespace or the
+end of the text, unless:
+    - a single period follows an abbreviation of the language ("Mr.", "e.g.")
+      or a single-letter initial ("J. R. R. Tolkien")
+    - an ellipsis is followed by a lowercase word ("Wait... what?")
+    - the next word on the same or the following line starts in lowercase
+      (dialogue tags such as '"Stop!" she said.')
+
+A blank line always ends a sentence, so unpunctuated lines do not run into
+the next paragraph. Heading lines (markdown headings found by the scanner,
+and plain "Chapter 2" lines) and lines without a word (scene breaks such as
+``---`` or ``* * *``) end the sentence before them and are not sentences
+themselves, and neither is any piece without a word character. Decimals ("3.5") and dotted names
+("example.com") never end a sentence since no whitespace follows the period.
+"""
+
+import re
+from array import array
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Sequence
+
+from .tokens import offset_typecode
+
+# Lines that are never part of a sentence: lines without a word (scene
+# breaks) and plain-text chapter headings ("Chapter 2", "CHAPTER 3: Title")
+# that do not end like a sentence
+_SKIPPED_LINE = (
+    r'(?:[^\w\n]*[^\w\s][^\w\n]*'
+    r'|(?:Chapter|CHAPTER|Ch\.)[^\S\n]*\d+(?![\w.])[^\n]*(?<![.!?…]))(?=\n|\Z)'
+)
+
+# Sentence terminators (with closing quotes/brackets), then a newline
+# starting a blank or skipped line. A blank line leaves its own newline to
+# start the next line, which may be skipped.
+_BOUNDARY_PATTERN = re.compile(
+    r'(?P<term>[.!?…]+[\"\'”’»)\]]*)(?=\s|\Z)'
+    rf'|\n(?:[ \t]*(?=\n)|{_SKIPPED_LINE})'
+)
+
+# A skipped first line (the other lines are found after their newline)
+_LEADING_LINE_PATTERN = re.compile(_SKIPPED_LINE)
+
+# A sentence needs at least one word character
+_WORD_CHAR_PATTERN = re.compile(r'\w')
+
+# First character of the next word, at most one line break away
+_NEXT_CHAR_PATTERN = re.compile(r'[ \t]*\n?[ \t]*(\S)')
+
+_CLOSING_CHARS = '"\'”’»)]'
+_OPENING_CHARS = '"\'“‘«(['
+
+# Characters looked at before a period to find the abbreviation it ends
+_MAX_ABBREVIATION_LENGTH = 12
+
+
+class Sentence(NamedTuple):
+    """One sentence as offsets into the segmented text."""
+    start: int
+    end: int
+    words: int
+
+
+class SentenceIndex:
+    """
+    Sentences of a text as parallel offset and word-count arrays.
+
+    Attributes:
+        text: The segmented text
+        starts: Offset of the first character of each sentence
+        ends: Offset just past each sentence (after its terminator)
+        word_counts: Whitespace-separated words in each sentence
+    """
+
+    __slots__ = ('text', 'starts', 'ends', 'word_counts')
+
+    def __init__(self, text: str):
+        self.text = text
+        typecode = offset_typecode(len(text))
+        self.starts = array(typecode)
+        self.ends = array(typecode)
+        self.word_counts = array('I')
+
+    def _add(self, start: int, end: int):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.word_counts.append(len(self.text[start:end].split()))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, i: int) -> Sentence:
+        return Sentence(self.starts[i], self.ends[i], self.word_counts[i])
+
+    def __iter__(self) -> Iterator[Sentence]:
+        return map(Sentence, self.starts, self.ends, self.word_counts)
+
+    def sentence_text(self, i: int) -> str:
+        """Text of the i-th sentence."""
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def __repr__(self) -> str:
+        return f"SentenceIndex(sentences={len(self)})"
+
+
+@lru_cache(maxsize=64)
+def _abbreviations(language: str) -> frozenset:
+    # Imported here: the features package imports core modules at load time
+    from ..features.language import get_language_abbreviations
+    return get_language_abbreviations(language)
+
+
+def _ends_sentence(text: str, start: int, terminator: str, end: int, abbreviations: frozenset) -> bool:
+    """Decide whether a terminator followed by whitespace ends the sentence."""
+    core = terminator.rstrip(_CLOSING_CHARS)
+    next_char = _NEXT_CHAR_PATTERN.match(text, end)
+    next_is_lower = next_char is not None and next_char.group(1).islower()
+
+    if core == '.':
+        # The token the period belongs to, e.g. "Mr" or "e.g"
+        before = text[max(0, start - _MAX_ABBREVIATION_LENGTH):start]
+        if before and not before[-1].isspace():
+            token = before.split()[-1].lstrip(_OPENING_CHARS)
+            if token.lower() in abbreviations:
+                return False
+            if len(token) == 1 and token.isalpha() and token.isupper():
+                return False
+    return not next_is_lower
+
+
+def segment_sentences(text: str, language: str = 'en', headings: Sequence[int] = ()) -> SentenceIndex:
+    """
+    Split text into sentences in one linear pass.
+
+    Args:
+        text: Cleaned text (markdown already removed)
+        language: Language code selecting the abbreviation list (default: 'en')
+        headings: Ascending offsets where heading lines start in the text
+            (see ``scan_markdown``); each runs to the end of its line
+
+    Returns:
+        SentenceIndex with the (start, end, word_count) of every sentence
+    """
+    abbreviations = _abbreviations(language or 'en')
+    search_word = _WORD_CHAR_PATTERN.search
+    index = SentenceIndex(text)
+    sentence_start = 0
+    leading = _LEADING_LINE_PATTERN.match(text)
+    if leading:
+        sentence_start = leading.end()
+
+    # Headings split the text into segments, each scanned for boundaries
+    segment_start = sentence_start
+    for heading in (*headings, None):
+        if heading is None:
+            segment_end = heading_end = len(text)
+        else:
+            if heading < segment_start:
+                continue
+            segment_end = heading
+            heading_end = text.find('\n', heading)
+            if heading_end < 0:
+                heading_end = len(text)
+
+        for match in _BOUNDARY_PATTERN.finditer(text, segment_start, segment_end):
+            terminator = match.group('term')
+            if terminator is not None:
+                end = match.end()
+                if not _ends_sentence(text, match.start(), terminator, end, abbreviations):
+                    continue
+            else:
+                end = match.start()
+
+            # Skip leading whitespace; a piece without a word is not a sentence
+            piece = text[sentence_start:end]
+            if search_word(piece):
+                stripped = piece.lstrip()
+                start = end - len(stripped)
+                if terminator is None:
+                    end = start + len(stripped.rstrip())
+                index._add(start, end)
+            sentence_start = match.end()
+
+        # Text before the heading line (or trailing text without a terminator)
+        piece = text[sentence_start:segment_end]
+        if search_word(piece):
+            start = sentence_start + len(piece) - len(piece.lstrip())
+            index._add(start, sentence_start + len(piece.rstrip()))
+        sentence_start = segment_start = heading_end
+    return index
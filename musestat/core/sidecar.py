@@ -0,0 +1,506 @@
+"""
+Memory-mappable sidecar index for re-analyzing unchanged manuscripts.
+
+After a full analysis, ``write_sidecar`` saves everything the analysis
+built next to the manuscript (``manuscript.md.musestat.idx``): the cleaned
+span offsets, token ids and vocabulary, sentence, paragraph and line
+offsets, the chapter and structure tables with their per-section metrics,
+and the finished statistics. A later run maps the file and reads only the
+sections it needs, so an unchanged manuscript is rendered without cleaning,
+tokenizing or measuring it again.
+
+Layout (native byte order, recorded in the header)::
+
+    header   magic, format version, byte order, section count,
+             file size, file mtime (ns), SHA-256 of the file, options digest
+    toc      one (name, typecode, itemsize, offset, length) entry per section
+    sections 8-byte aligned raw array bytes, or UTF-8 JSON / text
+
+The index is stale when the file size differs, or when the mtime differs
+and the content hash does too; a touched but unchanged file refreshes the
+recorded mtime instead. An index written with other analysis options still
+restores the tokenization, so only the statistics are computed again.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..config import __version__
+from .chapter import Chapter
+from .frequency import WordEstimate
+from .lines import LineIndex
+from .paragraphs import ParagraphIndex
+from .sections import SectionStats
+from .sentences import SentenceIndex
+from .structure import StructureNode, BOOK, PART, CHAPTER, SCENE, SHORT, LONG
+from .tokenizer import TokenizedText
+from .tokens import TokenStore
+
+# Sidecar file name suffix, appended to the full file name so that
+# manuscript.md and manuscript.txt get separate indexes
+# (manuscript.md -> manuscript.md.musestat.idx)
+SIDECAR_SUFFIX = '.musestat.idx'
+
+# Bumped whenever the layout or the meaning of a section changes
+FORMAT_VERSION = 4
+
+MAGIC = b'MUSEIDX\0'
+_HEADER = struct.Struct('<8sHBxIQq32s32s')
+_TOC_ENTRY = struct.Struct('<16scB6xQQ')
+_ALIGNMENT = 8
+
+# Typecode of raw byte sections (JSON and text)
+_BYTES = 'B'
+
+# Codes used in the node and chapter tables
+_KINDS = (BOOK, PART, CHAPTER, SCENE)
+_OUTLIERS = (None, SHORT, LONG)
+_NONE = -1
+
+# Columns of the node table, followed by the SectionStats slots
+_NODE_COLUMNS = ('kind', 'parent', 'chapter', 'heading_start', 'start', 'end', 'line', 'outlier', 'measured')
+
+# Columns of the chapter table, followed by the SectionStats slots
+_CHAPTER_COLUMNS = ('start', 'end', 'words', 'scenes', 'line', 'outlier_scenes', 'measured')
+
+# JSON has no tuples, so they are saved as {"__tuple__": [...]}, with
+# {"__type__": name} added for the named tuples listed here
+_TUPLE_KEY = '__tuple__'
+_TYPE_KEY = '__type__'
+_NAMED_TUPLES = {cls.__name__: cls for cls in (WordEstimate,)}
+
+
+def sidecar_path(file_path: str) -> Path:
+    """
+    Get the sidecar index path of a manuscript.
+
+    Args:
+        file_path: Path to the manuscript
+
+    Returns:
+        Path of the index next to the manuscript
+    """
+    path = Path(file_path)
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def options_digest(options: Dict[str, Any]) -> bytes:
+    """
+    Fingerprint the analysis options an index was written with.
+
+    Args:
+        options: JSON-serializable analysis options
+
+    Returns:
+        SHA-256 digest that also covers the MuseStat and format versions
+    """
+    payload = json.dumps([__version__, FORMAT_VERSION, options], sort_keys=True, default=list)
+    return hashlib.sha256(payload.encode('utf-8')).digest()
+
+
+def _file_digest(path: Path) -> bytes:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _byte_order() -> int:
+    return ord(sys.byteorder[0])
+
+
+class Sidecar:
+    """
+    An open, validated sidecar index.
+
+    Sections are read from the memory map on demand, so restoring the
+    statistics never touches the token or sentence arrays.
+
+    Attributes:
+        path: Path of the index file
+        options_match: Whether the index was written with the same analysis options
+    """
+
+    __slots__ = ('path', 'options_match', '_map', '_sections')
+
+    def __init__(self, path: Path, mapped: mmap.mmap, sections: Dict[str, Tuple[str, int, int]], options_match: bool):
+        self.path = path
+        self.options_match = options_match
+        self._map = mapped
+        self._sections = sections
+
+    def __enter__(self) -> 'Sidecar':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the index file."""
+        self._map.close()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._sections
+
+    def array(self, name: str) -> array:
+        """
+        Copy one array section out of the map.
+
+        Args:
+            name: Section name
+
+        Returns:
+            Array with the section's typecode
+        """
+        typecode, offset, length = self._sections[name]
+        values = array(typecode)
+        values.frombytes(self._map[offset:offset + length])
+        return values
+
+    def json(self, name: str) -> Any:
+        """Decode a JSON section."""
+        _, offset, length = self._sections[name]
+        return json.loads(self._map[offset:offset + length].decode('utf-8'), object_hook=_decode_tuples)
+
+    def restore_statistics(self, text: str) -> Dict[str, Any]:
+        """
+        Rebuild the saved statistics of the analysis.
+
+        Args:
+            text: Manuscript text the index was written for (chapter content source)
+
+        Returns:
+            Statistics in result order, with Chapter and StructureNode records
+        """
+        meta = self.json('meta')
+        titles = self.json('titles')
+        chapters = _restore_chapters(text, self.array('chapters'), titles['chapters'])
+        root = _restore_nodes(text, self.array('nodes'), titles['nodes'], chapters)
+
+        restored = {'chapters': chapters, 'structure': root}
+        statistics = meta['statistics']
+        return {key: restored[key] if key in restored else statistics[key] for key in meta['keys']}
+
+    def restore_tokens(self, text: str) -> TokenizedText:
+        """
+        Rebuild the tokenized manuscript without cleaning or tokenizing it.
+
+        Args:
+            text: Manuscript text the index was written for
+
+        Returns:
+            TokenizedText with its token store, sentences and paragraphs restored
+        """
+        meta = self.json('meta')
+        _, offset, length = self._sections['vocabulary']
+        vocabulary = self._map[offset:offset + length].decode('utf-8').split('\n') if length else []
+
+        store = TokenStore()
+        store.vocabulary = vocabulary
+        store.index = {word: word_id for word_id, word in enumerate(vocabulary)}
+        store.ids = self.array('token_ids')
+        store.offsets = self.array('token_offsets')
+
+        sentences = SentenceIndex('')
+        sentences.starts = self.array('sentence_starts')
+        sentences.ends = self.array('sentence_ends')
+        sentences.word_counts = self.array('sentence_words')
+
+        paragraphs = ParagraphIndex('')
+        paragraphs.starts = self.array('paragraph_starts')
+        paragraphs.ends = self.array('paragraph_ends')
+        paragraphs.word_counts = self.array('paragraph_words')
+
+        return TokenizedText.restore(
+            text,
+            self.array('span_starts'),
+            self.array('clean_starts'),
+            meta['clean_length'],
+            self.array('heading_starts'),
+            meta['language'],
+            tokens=store,
+            sentences=sentences,
+            paragraphs=paragraphs
+        )
+
+    def restore_lines(self, text: str) -> LineIndex:
+        """Rebuild the line index of the manuscript."""
+        lines = LineIndex('')
+        lines.text = text
+        lines.starts = self.array('line_starts')
+        return lines
+
+    def __repr__(self) -> str:
+        return f"Sidecar(path={str(self.path)!r}, sections={len(self._sections)}, options_match={self.options_match})"
+
+
+def open_sidecar(file_path: str, options: Dict[str, Any]) -> Optional[Sidecar]:
+    """
+    Map the sidecar index of a manuscript if it is still valid.
+
+    Args:
+        file_path: Path to the manuscript
+        options: Analysis options of the current run (see options_digest)
+
+    Returns:
+        Open Sidecar, or None if there is no index or it is stale or unreadable
+    """
+    path = sidecar_path(file_path)
+    try:
+        file_stat = os.stat(file_path)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        magic, version, byte_order, count, size, mtime_ns, content_hash, digest = _HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or version != FORMAT_VERSION or byte_order != _byte_order():
+            raise ValueError('incompatible index')
+        if size != file_stat.st_size:
+            raise ValueError('file size changed')
+        if mtime_ns != file_stat.st_mtime_ns:
+            # Touched files keep their index if the content is unchanged
+            if _file_digest(Path(file_path)) != content_hash:
+                raise ValueError('file content changed')
+            _refresh_mtime(path, file_stat.st_mtime_ns)
+
+        sections = {}
+        for i in range(count):
+            name, typecode, itemsize, offset, length = _TOC_ENTRY.unpack_from(mapped, _HEADER.size + i * _TOC_ENTRY.size)
+            typecode = typecode.decode('ascii')
+            if array(typecode).itemsize != itemsize or length % itemsize or offset + length > len(mapped):
+                raise ValueError('incompatible section')
+            sections[name.rstrip(b'\0').decode('ascii')] = (typecode, offset, length)
+    except (OSError, ValueError, struct.error, UnicodeDecodeError):
+        mapped.close()
+        return None
+
+    return Sidecar(path, mapped, sections, digest == options_digest(options))
+
+
+def _refresh_mtime(path: Path, mtime_ns: int):
+    """Record a new file mtime in an index whose content hash still matches."""
+    try:
+        with open(path, 'r+b') as f:
+            f.seek(struct.calcsize('<8sHBxIQ'))
+            f.write(struct.pack('<q', mtime_ns))
+    except OSError:
+        pass
+
+
+def write_sidecar(
+    file_path: str,
+    options: Dict[str, Any],
+    statistics: Dict[str, Any],
+    tokens: TokenizedText,
+    lines: LineIndex
+) -> Optional[Path]:
+    """
+    Save an analysis next to its manuscript.
+
+    The index is an optional cache, so failures (e.g. a read-only
+    directory) leave no file behind and are not reported as errors.
+
+    Args:
+        file_path: Path to the manuscript
+        options: Analysis options of the run (see options_digest)
+        statistics: Every statistic of the result, in result order
+        tokens: TokenizedText the statistics were computed from
+        lines: Line index of the manuscript
+
+    Returns:
+        Path of the written index, or None if it could not be written
+    """
+    path = sidecar_path(file_path)
+    chapters = statistics.get('chapters') or []
+    root = statistics.get('structure')
+    store = tokens.tokens
+    sentences = tokens.sentences
+    paragraphs = tokens.paragraphs
+    span_starts, clean_starts = tokens.span_offsets()
+
+    plain = {key: value for key, value in statistics.items() if key not in ('chapters', 'structure')}
+    chapter_table, chapter_titles = _chapter_table(chapters)
+    node_table, node_titles = _node_table(root, chapters)
+    sections = [
+        ('meta', _json_bytes({
+            'version': __version__,
+            'keys': list(statistics),
+            'statistics': plain,
+            'language': tokens.language,
+            'clean_length': len(tokens.clean_text),
+        })),
+        ('titles', _json_bytes({'chapters': chapter_titles, 'nodes': node_titles})),
+        ('chapters', chapter_table),
+        ('nodes', node_table),
+        ('span_starts', span_starts),
+        ('clean_starts', clean_starts),
+        ('heading_starts', tokens.headings),
+        ('vocabulary', '\n'.join(store.vocabulary).encode('utf-8')),
+        ('token_ids', store.ids),
+        ('token_offsets', store.offsets),
+        ('sentence_starts', sentences.starts),
+        ('sentence_ends', sentences.ends),
+        ('sentence_words', sentences.word_counts),
+        ('paragraph_starts', paragraphs.starts),
+        ('paragraph_ends', paragraphs.ends),
+        ('paragraph_words', paragraphs.word_counts),
+        ('line_starts', lines.starts),
+    ]
+
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        file_stat = os.stat(file_path)
+        content_hash = _file_digest(Path(file_path))
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(
+                MAGIC, FORMAT_VERSION, _byte_order(), len(sections),
+                file_stat.st_size, file_stat.st_mtime_ns, content_hash, options_digest(options)
+            ))
+            offset = _align(_HEADER.size + len(sections) * _TOC_ENTRY.size)
+            for name, data in sections:
+                typecode, itemsize = (data.typecode, data.itemsize) if isinstance(data, array) else (_BYTES, 1)
+                length = len(data) * itemsize
+                f.write(_TOC_ENTRY.pack(name.encode('ascii'), typecode.encode('ascii'), itemsize, offset, length))
+                offset = _align(offset + length)
+            for name, data in sections:
+                f.write(b'\0' * (_align(f.tell()) - f.tell()))
+                f.write(data.tobytes() if isinstance(data, array) else data)
+        os.replace(temp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return None
+    return path
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _json_bytes(value: Any) -> bytes:
+    return json.dumps(_encode_tuples(value), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _encode_tuples(value: Any) -> Any:
+    """Tag tuples (e.g. (word, count) pairs) so they are restored as tuples."""
+    if isinstance(value, tuple):
+        encoded = {_TUPLE_KEY: [_encode_tuples(item) for item in value]}
+        if type(value).__name__ in _NAMED_TUPLES:
+            encoded[_TYPE_KEY] = type(value).__name__
+        return encoded
+    if isinstance(value, list):
+        return [_encode_tuples(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode_tuples(item) for key, item in value.items()}
+    return value
+
+
+def _decode_tuples(value: Dict) -> Any:
+    if len(value) == 1 and _TUPLE_KEY in value:
+        return tuple(value[_TUPLE_KEY])
+    if len(value) == 2 and _TUPLE_KEY in value and value.get(_TYPE_KEY) in _NAMED_TUPLES:
+        return _NAMED_TUPLES[value[_TYPE_KEY]](*value[_TUPLE_KEY])
+    return value
+
+
+def _metric_columns(metrics: Optional[SectionStats]) -> List[int]:
+    if metrics is None:
+        return [0] * len(SectionStats.__slots__)
+    return [getattr(metrics, name) for name in SectionStats.__slots__]
+
+
+def _restore_metrics(row: Sequence[int]) -> SectionStats:
+    metrics = SectionStats()
+    for name, value in zip(SectionStats.__slots__, row):
+        setattr(metrics, name, value)
+    return metrics
+
+
+def _chapter_table(chapters: Sequence[Chapter]) -> Tuple[array, List[str]]:
+    """Flatten chapters into one row of integers each, plus their titles."""
+    table = array('q')
+    for chapter in chapters:
+        table.extend((
+            chapter.start, chapter.end, chapter.words, chapter.scenes,
+            _NONE if chapter.line is None else chapter.line, chapter.outlier_scenes,
+            chapter.metrics is not None
+        ))
+        table.extend(_metric_columns(chapter.metrics))
+    return table, [chapter.title for chapter in chapters]
+
+
+def _restore_chapters(text: str, table: array, titles: List[str]) -> List[Chapter]:
+    width = len(_CHAPTER_COLUMNS) + len(SectionStats.__slots__)
+    chapters = []
+    for i, title in enumerate(titles):
+        row = table[i * width:(i + 1) * width]
+        start, end, words, scenes, line, outlier_scenes, measured = row[:len(_CHAPTER_COLUMNS)]
+        chapter = Chapter(text, title, start, end, words, scenes, None if line == _NONE else line)
+        chapter.outlier_scenes = outlier_scenes
+        if measured:
+            chapter.metrics = _restore_metrics(row[len(_CHAPTER_COLUMNS):])
+        chapters.append(chapter)
+    return chapters
+
+
+def _node_table(root: Optional[StructureNode], chapters: Sequence[Chapter]) -> Tuple[array, List[Optional[str]]]:
+    """Flatten the structure tree, parents first, into rows of integers plus titles."""
+    table = array('q')
+    titles = []
+    if root is None:
+        return table, titles
+    chapter_ids = {id(chapter): i for i, chapter in enumerate(chapters)}
+    node_ids = {}
+    for node in (root, *root.iter_nodes()):
+        node_ids[id(node)] = len(titles)
+        table.extend((
+            _KINDS.index(node.kind),
+            node_ids[id(node.parent)] if node.parent is not None else _NONE,
+            chapter_ids.get(id(node.chapter), _NONE),
+            node.heading_start, node.start, node.end,
+            _NONE if node.line is None else node.line,
+            _OUTLIERS.index(node.outlier),
+            node.metrics is not None
+        ))
+        table.extend(_metric_columns(node.metrics))
+        titles.append(node.title)
+    return table, titles
+
+
+def _restore_nodes(
+    text: str,
+    table: array,
+    titles: List[Optional[str]],
+    chapters: List[Chapter]
+) -> Optional[StructureNode]:
+    width = len(_NODE_COLUMNS) + len(SectionStats.__slots__)
+    nodes = []
+    for i, title in enumerate(titles):
+        row = table[i * width:(i + 1) * width]
+        kind, parent, chapter, heading_start, start, end, line, outlier, measured = row[:len(_NODE_COLUMNS)]
+        parent_node = nodes[parent] if parent != _NONE else None
+        node = StructureNode(
+            text, _KINDS[kind], title, heading_start, start, end, parent_node,
+            chapters[chapter] if chapter != _NONE else None,
+            None if line == _NONE else line
+        )
+        node.outlier = _OUTLIERS[outlier]
+        if measured:
+            node.metrics = _restore_metrics(row[len(_NODE_COLUMNS):])
+        if parent_node is not None:
+            parent_node.children.append(node)
+        nodes.append(node)
+    return nodes[0] if nodes else None
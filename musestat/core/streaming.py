@@ -0,0 +1,942 @@
+"""
+Streaming manuscript analysis.
+
+Reads a manuscript in chunks and folds the counts of each chunk into the
+same statistics dictionary as ``analyze_manuscript``. Memory stays bounded
+by the chunk size plus the vocabulary, so very large manuscripts (or whole
+series concatenated into one file) can be analyzed without loading them.
+
+The pipeline is a chain of generators:
+
+    file chunks -> safe blocks -> per-block counts -> running totals
+
+Chunks are re-cut into blocks that end after a blank line outside a code
+fence, so words, paragraphs, chapter headings and fenced code normally stay
+in one block. Text with no such line for a while (single-newline paragraphs,
+RTF, a long code fence) is cut at the last line break, or at whitespace
+within one very long line, once it reaches ``MAX_BLOCK_FACTOR`` blocks. The
+accumulator carries the sentence, paragraph and dialogue line that run
+across such a cut into the next block, and cleans a fence cut in two as one
+fence, so memory stays bounded without changing the counts.
+
+A fence marker with no closing marker after it is text, as in memory. Since
+that is only known at the end, the accumulator keeps a copy of its state
+from before the block that opened a fence still open at the end of a block;
+if the fence is never closed, ``finish`` restores that copy and reads the
+rest of the manuscript again from the source with the marker as text.
+
+Streaming does not build the part/chapter/scene tree: the statistics have
+chapters (with their scene break counts) but no ``structure`` and no
+``scene_stats``.
+"""
+
+import copy
+import re
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from rich.console import Console
+
+from ..io.readers import TextFileSource, DocumentSource, STREAMING_READERS, read_manuscript, DEFAULT_STREAM_CHUNK_SIZE
+from ..io.compressed import archive_path, is_compressed, iter_compressed_text
+from .markdown import scan_markdown
+from .text_processing import clean_markdown, WORD_PATTERN, WHITESPACE_PATTERN
+from .sentences import segment_sentences
+from .paragraphs import index_paragraphs
+from .tokenizer import TokenizedText
+from .lines import index_lines
+from .frequency import SpaceSaving, DEFAULT_SKETCH_CAPACITY
+from .chapter import Chapter, BoundaryMatcher, SCENE_BREAK, get_boundary_matcher, calculate_chapter_statistics
+from ..features.language import detect_language, get_language_stopwords
+from ..features.dialogue import QUOTE_CHARACTER_PATTERN, dialogue_counts, dialogue_summary
+from ..features.readability import readability_counts, readability_from_counts
+from ..utils.achievements import get_achievement_badge, estimate_reading_time
+
+console = Console()
+
+# Block boundaries: code fence markers, and blank lines
+BLOCK_BOUNDARY_PATTERN = re.compile(r'(?P<fence>```)|\n[ \t]*\n')
+FENCE = '```'
+FENCE_PATTERN = re.compile(FENCE)
+
+# Blocks without a blank line are cut once this many times the block size
+MAX_BLOCK_FACTOR = 4
+
+# Longest sentence carried into the next block; longer ones are counted as cut
+MAX_SENTENCE_CARRY = 1 << 16
+
+_TRAILING_SPACE = re.compile(r'[ \t]*')
+
+# Characters of cleaned text used for language detection (as detect_language)
+LANGUAGE_SAMPLE_SIZE = 5000
+
+# Pacing thresholds and list sizes (as detect_pacing_issues)
+LONG_SENTENCE_WORDS = 40
+LONG_PARAGRAPH_WORDS = 200
+SHORT_PARAGRAPH_WORDS = 10
+PACING_LIST_SIZE = 10
+
+# Formats that can be read incrementally; others are read whole and sliced
+STREAMABLE_EXTENSIONS = {'.txt', '.md', '.markdown'}
+
+# Text files at least this large are streamed by the CLI even without --stream
+LARGE_TEXT_FILE_SIZE = 1 << 30
+
+
+class _BlockScanner:
+    """
+    Finds the safe cuts of a growing buffer, scanning each character once.
+
+    Attributes:
+        pos: Offset the next scan starts at (a marker may start just before
+            the end of the scanned text and finish in the next chunk)
+        in_fence: Whether a code fence is open at ``pos``
+        cut: Offset just after the last blank line outside a fence, or 0
+    """
+
+    __slots__ = ('pos', 'in_fence', 'cut')
+
+    def __init__(self):
+        self.pos = 0
+        self.in_fence = False
+        self.cut = 0
+
+    def scan(self, buffer: str):
+        """Scan the text added to the buffer since the last call."""
+        scanned = self.pos
+        for match in BLOCK_BOUNDARY_PATTERN.finditer(buffer, self.pos):
+            if match.lastgroup == 'fence':
+                self.in_fence = not self.in_fence
+            elif not self.in_fence:
+                self.cut = match.end()
+            scanned = match.end()
+
+        # Resume at a line break followed only by spaces, or at trailing
+        # backticks, which the next chunk may complete
+        resume = len(buffer)
+        newline = buffer.rfind('\n', scanned)
+        if newline != -1 and _TRAILING_SPACE.fullmatch(buffer, newline + 1):
+            resume = newline
+        ticks = len(buffer)
+        while ticks > max(scanned, len(buffer) - 2) and buffer[ticks - 1] == '`':
+            ticks -= 1
+        self.pos = min(resume, ticks)
+
+    def shift(self, cut: int):
+        """Drop the first ``cut`` characters of the buffer."""
+        self.pos = max(self.pos - cut, 0)
+        self.cut = 0
+
+
+def _forced_cut(buffer: str) -> int:
+    """
+    Find where to cut a buffer that has no safe cut.
+
+    Args:
+        buffer: Pending manuscript text
+
+    Returns:
+        Offset just after the last line break, else after the last space or
+        tab, or 0 if the buffer is one unbroken word
+    """
+    cut = buffer.rfind('\n') + 1
+    if not cut:
+        cut = max(buffer.rfind(' '), buffer.rfind('\t')) + 1
+    return cut
+
+
+def iter_blocks(
+    chunks: Iterable[str],
+    block_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    max_block_size: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Re-cut arbitrary text chunks into blocks for ``StreamAccumulator``.
+
+    A block ends after a blank line that is not inside a code fence, so no
+    word, paragraph, heading line or fenced code block is split. Once the
+    pending text reaches ``max_block_size`` without such a line, it is cut
+    after its last line break instead (or after its last space, for one very
+    long line), so no block is longer than ``max_block_size`` plus a chunk
+    unless a single word is. Each chunk is scanned once.
+
+    Args:
+        chunks: Consecutive pieces of the manuscript
+        block_size: Minimum size of a block before it is cut
+        max_block_size: Size at which a block is cut without a blank line
+            (default: ``MAX_BLOCK_FACTOR`` times the block size)
+
+    Yields:
+        Blocks whose concatenation is the full manuscript
+    """
+    max_block_size = max(max_block_size or block_size * MAX_BLOCK_FACTOR, block_size)
+    scanner = _BlockScanner()
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk
+        scanner.scan(buffer)
+        if len(buffer) < block_size:
+            continue
+        cut = scanner.cut
+        if not cut and len(buffer) >= max_block_size:
+            cut = _forced_cut(buffer)
+        if cut:
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+            scanner.shift(cut)
+    if buffer:
+        yield buffer
+
+
+class StreamAccumulator:
+    """
+    Running totals of the manuscript statistics, fed one block at a time.
+
+    Args:
+        source: Sliceable text the blocks come from (for chapter content)
+        enable_advanced: Detect the language and collect dialogue, pacing
+            and readability counts
+        min_word_length: Minimum word length for frequency analysis
+        approx_frequency: Count words in a bounded-memory sketch
+        sketch_capacity: Number of counters in the sketch
+        matcher: Compiled heading and scene break patterns (default: built-in)
+        language: Language of the manuscript, if already known (default:
+            detected from the first blocks with enable_advanced, else 'en')
+    """
+
+    def __init__(
+        self,
+        source,
+        enable_advanced: bool = False,
+        min_word_length: int = 1,
+        approx_frequency: bool = False,
+        sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+        matcher: Optional[BoundaryMatcher] = None,
+        language: Optional[str] = None
+    ):
+        self.source = source
+        self.matcher = matcher or get_boundary_matcher()
+        self.enable_advanced = enable_advanced
+        self.min_word_length = min_word_length
+        self.offset = 0
+        # Lines before the current block, and characters of its first line
+        # already seen (a block only starts mid-line after a cut at whitespace)
+        self.line_offset = 0
+        self.column_offset = 0
+        # Whether a code fence is open at the start of the current block
+        self.in_fence = False
+        # Copy of the state before the block that opened the fence still open,
+        # with that marker's offset (see finish), and the offset of a marker
+        # known to be text while the rest is read again
+        self._fence_checkpoint: Optional[Tuple['StreamAccumulator', int]] = None
+        self._literal_fence: Optional[int] = None
+
+        # The language (and so the stopwords) is known once enough text is seen
+        self.language: Optional[str] = language or (None if enable_advanced else 'en')
+        self.stop_words: Optional[set] = get_language_stopwords(self.language) if self.language else None
+        self._pending_counts: List[Counter] = []
+        # Cleaned blocks (with what locates their sentences) waiting for the
+        # language to pick the abbreviations
+        self._pending_sentences: List[tuple] = []
+
+        self.total_words = 0
+        self.total_chars = 0
+        self.total_chars_no_spaces = 0
+        self.total_sentences = 0
+        self.total_paragraphs = 0
+        self.word_counts: Counter = Counter()
+        self.word_sketch = SpaceSaving(sketch_capacity) if approx_frequency else None
+        self.language_sample = ''
+
+        # Chapter in progress
+        self.chapters: List[Chapter] = []
+        self.chapter_title: Optional[str] = None
+        self.chapter_start = 0
+        self.chapter_line: Optional[int] = None
+        self.chapter_words = 0
+        self.scene_break_count = 0
+        # Words and scene breaks before the first heading, and the offset where
+        # that heading's line ends them (None until a heading is found)
+        self.lead_words = 0
+        self.lead_scenes = 0
+        self.lead_end: Optional[int] = None
+
+        self.sentence_words = 0
+        # Cleaned text of the last sentence, which may run on into the next
+        # block, and a function giving the line and column it starts at
+        self._sentence_carry = ''
+        self._carry_headings: List[int] = []
+        self._carry_location: Callable[[], Tuple[int, int]] = lambda: (1, 1)
+        # Pacing entries are (number, words, line, column)
+        self.long_sentences: List[Tuple[int, int, int, int]] = []
+        self.paragraph_words = 0
+        # Last paragraph seen as [words, line, column], closed by a blank line,
+        # and the line breaks in the whitespace after it
+        self._open_paragraph: Optional[List[int]] = None
+        self._trailing_newlines = 0
+        self.long_paragraphs: List[Tuple[int, int, int, int]] = []
+        self.short_paragraphs: List[Tuple[int, int, int, int]] = []
+
+        self.dialogue = [0, 0, 0]
+        # Line that runs on into the next block, as [non-empty, quotes found,
+        # words of a quote still open (None if none), words in closed quotes]
+        self._dialogue_line = [False, False, None, 0]
+        self.readability: Optional[Dict[str, int]] = None
+
+    def add(self, block: str):
+        """
+        Fold one block (as yielded by ``iter_blocks``) into the totals.
+
+        Args:
+            block: Next piece of the manuscript
+        """
+        # A fence cut between blocks is closed at the end of the first and
+        # reopened at the start of the next, so each part cleans as fenced code
+        fence_ends = [match.end() for match in FENCE_PATTERN.finditer(block)
+                      if self.offset + match.start() != self._literal_fence]
+        in_fence_after = self.in_fence != (len(fence_ends) % 2 == 1)
+        if not in_fence_after:
+            self._fence_checkpoint = None
+        elif fence_ends and self._literal_fence is None:
+            # The fence opened here may never close
+            self._fence_checkpoint = None
+            self._fence_checkpoint = (self._copy(), self.offset + fence_ends[-1] - len(FENCE))
+        prefix = FENCE if self.in_fence else ''
+        marked = prefix + block + (FENCE if in_fence_after else '')
+        headings = []
+        clean_text = scan_markdown(marked, headings)
+
+        words = WORD_PATTERN.findall(clean_text)
+        words_before = self.total_words
+        self.total_words += len(words)
+        self.total_chars += len(clean_text)
+        self.total_chars_no_spaces += len(clean_text) - len(WHITESPACE_PATTERN.findall(clean_text))
+        self._add_words(words)
+
+        if len(self.language_sample) < LANGUAGE_SAMPLE_SIZE:
+            self.language_sample += clean_text[:LANGUAGE_SAMPLE_SIZE - len(self.language_sample)]
+            if self.language is None and len(self.language_sample) >= LANGUAGE_SAMPLE_SIZE:
+                self._detect_language()
+
+        placement = (block, marked, len(prefix), self.line_offset, self.column_offset)
+        if self.language is None:
+            self._pending_sentences.append((clean_text, headings, placement))
+        else:
+            self._add_sentences(clean_text, headings, placement)
+        self._add_paragraphs(block)
+        self._add_chapters(block, words_before, fence_ends)
+
+        if self.enable_advanced:
+            self._add_dialogue(block)
+            # Sentences are taken from the segmenter's total in finish()
+            counts = readability_counts(clean_text, sentences=0)
+            if counts is not None:
+                if self.readability is None:
+                    self.readability = Counter()
+                self.readability.update(counts)
+
+        self.offset += len(block)
+        self.in_fence = in_fence_after
+        newlines = block.count('\n')
+        self.line_offset += newlines
+        if newlines:
+            self.column_offset = len(block) - block.rfind('\n') - 1
+        else:
+            self.column_offset += len(block)
+
+    def _copy(self) -> 'StreamAccumulator':
+        """Independent copy of the running state (sharing the source and matcher)."""
+        return copy.deepcopy(self, {id(self.source): self.source, id(self.matcher): self.matcher})
+
+    def _replay_open_fence(self):
+        """Read the text after an unclosed fence marker again, with the marker as text."""
+        state, marker = self._fence_checkpoint
+        end = self.offset
+        self.__dict__ = state.__dict__
+        self._literal_fence = marker
+        chunks = (self.source[i:min(i + DEFAULT_STREAM_CHUNK_SIZE, end)]
+                  for i in range(self.offset, end, DEFAULT_STREAM_CHUNK_SIZE))
+        for block in iter_blocks(chunks, DEFAULT_STREAM_CHUNK_SIZE):
+            self.add(block)
+        self._literal_fence = None
+
+    def _add_dialogue(self, block: str):
+        # Whole lines are counted at once; a line cut between blocks is
+        # followed quote by quote until its end is seen
+        first = block.find('\n')
+        if first == -1:
+            self._continue_dialogue_line(block)
+            return
+        self._continue_dialogue_line(block[:first])
+        self._end_dialogue_line()
+        last = block.rfind('\n')
+        for i, count in enumerate(dialogue_counts(block[first + 1:last])):
+            self.dialogue[i] += count
+        self._continue_dialogue_line(block[last + 1:])
+
+    def _continue_dialogue_line(self, piece: str):
+        line = self._dialogue_line
+        if not line[0] and piece.strip():
+            line[0] = True
+        # Quotes pair up from the left, as in dialogue_counts; blocks are
+        # cut at whitespace, so the words of a quote add up across the cut
+        start = 0
+        for match in QUOTE_CHARACTER_PATTERN.finditer(piece):
+            if line[2] is None:
+                line[2] = 0
+            else:
+                line[1] = True
+                line[3] += line[2] + len(piece[start:match.start()].split())
+                line[2] = None
+            start = match.end()
+        if line[2] is not None:
+            line[2] += len(piece[start:].split())
+
+    def _end_dialogue_line(self):
+        non_empty, quoted, _, words = self._dialogue_line
+        if non_empty:
+            self.dialogue[2] += 1
+            if quoted:
+                self.dialogue[0] += 1
+                self.dialogue[1] += words
+        self._dialogue_line = [False, False, None, 0]
+
+    def _add_words(self, words: List[str]):
+        block_counts = Counter()
+        for word, count in Counter(words).items():
+            block_counts[word.lower()] += count
+        if self.word_sketch is None:
+            self.word_counts.update(block_counts)
+        elif self.stop_words is None:
+            # Hold the first blocks until the language is detected
+            self._pending_counts.append(block_counts)
+        else:
+            self._add_to_sketch(block_counts)
+
+    def _add_to_sketch(self, counts: Counter):
+        min_length = self.min_word_length
+        stop_words = self.stop_words
+        self.word_sketch.update_counts({
+            word: count for word, count in counts.items()
+            if len(word) >= min_length and word not in stop_words
+        })
+
+    def _detect_language(self):
+        self.language = detect_language(self.language_sample)
+        self.stop_words = get_language_stopwords(self.language)
+        for counts in self._pending_counts:
+            self._add_to_sketch(counts)
+        self._pending_counts = []
+        for clean_text, headings, placement in self._pending_sentences:
+            self._add_sentences(clean_text, headings, placement)
+        self._pending_sentences = []
+
+    @staticmethod
+    def _location(block: str, offset: int, line_offset: int, column_offset: int) -> Tuple[int, int]:
+        """File line and column of an offset in a block."""
+        line_start = block.rfind('\n', 0, offset) + 1
+        if not line_start:
+            return line_offset + 1, offset + 1 + column_offset
+        return line_offset + block.count('\n', 0, offset) + 1, offset - line_start + 1
+
+    def _add_sentences(self, clean_text: str, headings: List[int], placement: tuple):
+        block, marked, prefix_length, line_offset, column_offset = placement
+        carry = self._sentence_carry
+        carry_location = self._carry_location
+        text = carry + clean_text
+        headings = self._carry_headings + [heading + len(carry) for heading in headings]
+        sentences = segment_sentences(text, self.language, headings)
+        # Only built for blocks with a sentence to locate
+        tokens = None
+
+        def locate(start: int) -> Tuple[int, int]:
+            nonlocal tokens
+            if start < len(carry):
+                return carry_location()
+            if tokens is None:
+                tokens = TokenizedText(marked)
+            raw = max(tokens.raw_offset(start - len(carry)) - prefix_length, 0)
+            return self._location(block, raw, line_offset, column_offset)
+
+        # The last sentence may run on, or end differently, once the next
+        # block is seen; its text is segmented again with that block
+        count = len(sentences)
+        self._sentence_carry = ''
+        self._carry_headings = []
+        if count and len(text) - sentences.starts[count - 1] <= MAX_SENTENCE_CARRY:
+            count -= 1
+            carry_start = sentences.starts[count]
+            self._sentence_carry = text[carry_start:]
+            # Headings after the carried sentence still end it
+            self._carry_headings = [heading - carry_start for heading in headings if heading >= carry_start]
+            self._carry_location = lambda: locate(carry_start)
+
+        for i in range(count):
+            self._count_sentence(sentences.word_counts[i], partial(locate, sentences.starts[i]))
+
+    def _count_sentence(self, word_count: int, locate: Callable[[], Tuple[int, int]]):
+        self.total_sentences += 1
+        self.sentence_words += word_count
+        if word_count > LONG_SENTENCE_WORDS and len(self.long_sentences) < PACING_LIST_SIZE:
+            self.long_sentences.append((self.total_sentences, word_count) + locate())
+
+    def _flush_sentences(self):
+        """Count the carried sentence once no text follows it."""
+        if self._sentence_carry:
+            sentences = segment_sentences(self._sentence_carry, self.language, self._carry_headings)
+            for word_count in sentences.word_counts:
+                self._count_sentence(word_count, self._carry_location)
+            self._sentence_carry = ''
+            self._carry_headings = []
+
+    def _add_paragraphs(self, block: str):
+        paragraphs = index_paragraphs(block)
+        last = len(paragraphs) - 1
+        if last < 0:
+            self._trailing_newlines += block.count('\n')
+            return
+
+        first = 0
+        if self._open_paragraph is not None:
+            # Without a blank line across the cut, the open paragraph goes on
+            # into this block
+            if self._trailing_newlines + block.count('\n', 0, paragraphs.starts[0]) < 2:
+                self._open_paragraph[0] += paragraphs.word_counts[0]
+                first = 1
+        if first <= last:
+            self._close_paragraph()
+            lines = None
+            for i in range(first, last):
+                word_count = paragraphs.word_counts[i]
+                if self._flags_paragraph(word_count):
+                    if lines is None:
+                        lines = index_lines(block)
+                    line, column = lines.location(paragraphs.starts[i])
+                    if line == 1:
+                        column += self.column_offset
+                    self._count_paragraph(word_count, self.line_offset + line, column)
+                else:
+                    self._count_paragraph(word_count)
+            # The last paragraph is counted once a blank line ends it
+            self._open_paragraph = [paragraphs.word_counts[last], *self._location(
+                block, paragraphs.starts[last], self.line_offset, self.column_offset
+            )]
+        self._trailing_newlines = block.count('\n', paragraphs.ends[last])
+
+    def _flags_paragraph(self, word_count: int) -> bool:
+        if word_count > LONG_PARAGRAPH_WORDS:
+            return len(self.long_paragraphs) < PACING_LIST_SIZE
+        return 0 < word_count < SHORT_PARAGRAPH_WORDS and len(self.short_paragraphs) < PACING_LIST_SIZE
+
+    def _count_paragraph(self, word_count: int, line: int = 0, column: int = 0):
+        self.total_paragraphs += 1
+        self.paragraph_words += word_count
+        if self._flags_paragraph(word_count):
+            flagged = self.long_paragraphs if word_count > LONG_PARAGRAPH_WORDS else self.short_paragraphs
+            flagged.append((self.total_paragraphs, word_count, line, column))
+
+    def _close_paragraph(self):
+        if self._open_paragraph is not None:
+            self._count_paragraph(*self._open_paragraph)
+            self._open_paragraph = None
+
+    def _close_chapter(self, end: int):
+        end = max(self.chapter_start, end)
+        self.chapters.append(Chapter(
+            self.source,
+            self.chapter_title,
+            self.chapter_start,
+            end,
+            words=self.chapter_words,
+            scenes=self.scene_break_count,
+            line=self.chapter_line
+        ))
+
+    def _piece_words(self, block: str, start: int, end: int, fence_ends: List[int]) -> int:
+        """Words of a piece of a block, cleaned with the fences open around it."""
+        opened = self.in_fence != (bisect_right(fence_ends, start) % 2 == 1)
+        closed = self.in_fence != (bisect_right(fence_ends, end) % 2 == 1)
+        piece = (FENCE if opened else '') + block[start:end] + (FENCE if closed else '')
+        return len(WORD_PATTERN.findall(clean_markdown(piece)))
+
+    def _add_chapters(self, block: str, words_before: int, fence_ends: List[int]):
+        # Word counts are summed over the pieces of a chapter in each block,
+        # which matches counting the whole chapter since blocks never split words
+        piece_start = 0
+        for boundary in self.matcher.iter_boundaries(block):
+            if boundary.start == 0 and self.column_offset:
+                # The block starts mid-line, so its first line is no heading
+                continue
+            if boundary.kind == SCENE_BREAK:
+                self.scene_break_count += 1
+                continue
+
+            piece_end = max(piece_start, boundary.start - 1)
+            if self.chapter_title:
+                self.chapter_words += self._piece_words(block, piece_start, piece_end, fence_ends)
+                self._close_chapter(self.offset + boundary.start - 1)
+            elif self.lead_end is None:
+                self.lead_words = words_before + self._piece_words(block, 0, piece_end, fence_ends)
+                self.lead_scenes = self.scene_break_count
+                self.lead_end = self.offset + boundary.start - 1
+            self.chapter_title = boundary.title
+            self.chapter_line = self.line_offset + block.count('\n', 0, boundary.start) + 1
+            piece_start = min(boundary.end + 1, len(block))
+            self.chapter_start = self.offset + piece_start
+            self.chapter_words = 0
+            self.scene_break_count = 0
+
+        if self.chapter_title:
+            self.chapter_words += self._piece_words(block, piece_start, len(block), fence_ends)
+
+    def finish(self):
+        """Close the last chapter, and settle the language and sentence counts."""
+        if self._fence_checkpoint is not None:
+            self._replay_open_fence()
+        if self.enable_advanced:
+            self._end_dialogue_line()
+        if self.language is None:
+            self._detect_language()
+        self._flush_sentences()
+        self._close_paragraph()
+        if self.readability is not None:
+            self.readability['sentences'] = self.total_sentences
+        if self.lead_end is None:
+            self.lead_words = self.total_words
+            self.lead_scenes = self.scene_break_count
+        if self.chapter_title:
+            self._close_chapter(self.offset)
+            self.chapter_title = None
+
+    def append(self, other: 'StreamAccumulator', separator: str = '\n\n'):
+        """
+        Fold in the finished accumulator of a manuscript that follows this one.
+
+        The result is what streaming the two texts joined by ``separator``
+        would give: the other manuscript's chapters, lines and pacing
+        entries are shifted after this one, and its words and scene breaks
+        before its first heading continue this manuscript's last chapter.
+        Both must be counted in the same language.
+
+        Args:
+            other: Accumulator of the next manuscript (after ``finish``)
+            separator: Whitespace between the texts; a blank line ends any
+                sentence or paragraph, so nothing is counted across the join
+        """
+        if not self.offset:
+            separator = ''
+        shift = self.offset + len(separator)
+        line_shift = self.line_offset + separator.count('\n')
+
+        pacing = (
+            (self.long_sentences, other.long_sentences, self.total_sentences),
+            (self.long_paragraphs, other.long_paragraphs, self.total_paragraphs),
+            (self.short_paragraphs, other.short_paragraphs, self.total_paragraphs),
+        )
+        for flagged, others, numbered in pacing:
+            for number, words, line, column in others[:max(PACING_LIST_SIZE - len(flagged), 0)]:
+                flagged.append((numbered + number, words, line_shift + line, column))
+
+        if len(self.language_sample) < LANGUAGE_SAMPLE_SIZE:
+            sample = self.language_sample + separator + other.language_sample
+            self.language_sample = sample[:LANGUAGE_SAMPLE_SIZE]
+
+        if self.chapter_title:
+            self.chapter_words += other.lead_words
+            self.scene_break_count += other.lead_scenes
+            if other.lead_end is not None:
+                self._close_chapter(shift + other.lead_end)
+        elif self.lead_end is None:
+            # Everything so far comes before the first heading
+            self.lead_words = self.total_words + other.lead_words
+            self.scene_break_count += other.lead_scenes
+            if other.lead_end is not None:
+                self.lead_scenes = self.scene_break_count
+                self.lead_end = shift + other.lead_end
+
+        for chapter in other.chapters:
+            line = chapter.line + line_shift if chapter.line is not None else None
+            self.chapters.append(Chapter(
+                self.source, chapter.title, chapter.start + shift, chapter.end + shift,
+                words=chapter.words, scenes=chapter.scenes, line=line
+            ))
+        if other.chapters:
+            # The last chapter stays open for the manuscripts that follow
+            last = self.chapters.pop()
+            self.chapter_title = last.title
+            self.chapter_start = last.start
+            self.chapter_line = last.line
+            self.chapter_words = last.words
+            self.scene_break_count = last.scenes
+
+        self.total_words += other.total_words
+        # The separator is whitespace, kept by cleaning
+        self.total_chars += other.total_chars + len(separator)
+        self.total_chars_no_spaces += other.total_chars_no_spaces
+        self.total_sentences += other.total_sentences
+        self.total_paragraphs += other.total_paragraphs
+        self.sentence_words += other.sentence_words
+        self.paragraph_words += other.paragraph_words
+        if self.word_sketch is not None and other.word_sketch is not None:
+            self.word_sketch = self.word_sketch.merge(other.word_sketch)
+        else:
+            self.word_counts.update(other.word_counts)
+        for i, count in enumerate(other.dialogue):
+            self.dialogue[i] += count
+        if other.readability is not None:
+            if self.readability is None:
+                self.readability = Counter()
+            self.readability.update(other.readability)
+
+        self.offset = shift + other.offset
+        self.line_offset = line_shift + other.line_offset
+
+    def to_dict(self) -> Dict:
+        """
+        JSON-serializable state of a finished accumulator (see ``from_dict``).
+
+        Returns:
+            Dictionary with the counts, chapters and pacing entries
+        """
+        return {
+            'enable_advanced': self.enable_advanced,
+            'language': self.language,
+            'language_sample': self.language_sample,
+            'offset': self.offset,
+            'line_offset': self.line_offset,
+            'total_words': self.total_words,
+            'total_chars': self.total_chars,
+            'total_chars_no_spaces': self.total_chars_no_spaces,
+            'total_sentences': self.total_sentences,
+            'total_paragraphs': self.total_paragraphs,
+            'sentence_words': self.sentence_words,
+            'paragraph_words': self.paragraph_words,
+            'word_counts': dict(self.word_counts),
+            'word_sketch': self.word_sketch.to_dict() if self.word_sketch is not None else None,
+            'chapters': [
+                [chapter.title, chapter.start, chapter.end, chapter.words, chapter.scenes, chapter.line]
+                for chapter in self.chapters
+            ],
+            'lead': [self.lead_words, self.lead_scenes, self.lead_end],
+            'long_sentences': self.long_sentences,
+            'long_paragraphs': self.long_paragraphs,
+            'short_paragraphs': self.short_paragraphs,
+            'dialogue': self.dialogue,
+            'readability': dict(self.readability) if self.readability is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, source=None) -> 'StreamAccumulator':
+        """
+        Rebuild a finished accumulator saved with ``to_dict``.
+
+        Args:
+            data: Dictionary produced by ``to_dict``
+            source: Sliceable text for the chapters' content, if needed
+
+        Returns:
+            Restored accumulator, ready to be appended to another
+        """
+        accumulator = cls(source, data['enable_advanced'], language=data['language'])
+        for name in (
+            'language_sample', 'offset', 'line_offset', 'total_words', 'total_chars', 'total_chars_no_spaces',
+            'total_sentences', 'total_paragraphs', 'sentence_words', 'paragraph_words'
+        ):
+            setattr(accumulator, name, data[name])
+        accumulator.word_counts = Counter(data['word_counts'])
+        if data['word_sketch'] is not None:
+            accumulator.word_sketch = SpaceSaving.from_dict(data['word_sketch'])
+        accumulator.chapters = [
+            Chapter(source, title, start, end, words=words, scenes=scenes, line=line)
+            for title, start, end, words, scenes, line in data['chapters']
+        ]
+        accumulator.lead_words, accumulator.lead_scenes, accumulator.lead_end = data['lead']
+        for name in ('long_sentences', 'long_paragraphs', 'short_paragraphs'):
+            setattr(accumulator, name, [tuple(entry) for entry in data[name]])
+        accumulator.dialogue = list(data['dialogue'])
+        if data['readability'] is not None:
+            accumulator.readability = Counter(data['readability'])
+        return accumulator
+
+    def common_words(self, n: int) -> List[tuple]:
+        """
+        Get the most frequent words, filtered like get_most_common_words.
+
+        Args:
+            n: Number of top words to return
+
+        Returns:
+            List of (word, count) tuples, or WordEstimate tuples in sketch mode
+        """
+        if self.word_sketch is not None:
+            return self.word_sketch.estimates(n)
+        min_length = self.min_word_length
+        stop_words = self.stop_words
+        kept = Counter({
+            word: count for word, count in self.word_counts.items()
+            if len(word) >= min_length and word not in stop_words
+        })
+        return kept.most_common(n)
+
+    def pacing(self) -> Dict:
+        """Pacing statistics in the form returned by detect_pacing_issues."""
+        return {
+            'long_sentences': self.long_sentences,
+            'long_paragraphs': self.long_paragraphs,
+            'short_paragraphs': self.short_paragraphs,
+            'avg_sentence_length': self.sentence_words / self.total_sentences if self.total_sentences else 0,
+            'avg_paragraph_length': self.paragraph_words / self.total_paragraphs if self.total_paragraphs else 0
+        }
+
+
+def open_chunks(file_path: str, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Tuple[object, Iterator[str]]:
+    """
+    Open a manuscript for streaming, with the reader for its format.
+
+    Args:
+        file_path: Path to manuscript file
+        chunk_size: Number of characters read at a time
+
+    Returns:
+        Tuple of (sliceable source for chapter content, iterator of chunks)
+    """
+    if is_compressed(file_path):
+        # Decompressed as it is analyzed; chapter slices read the spooled text
+        source = DocumentSource(partial(iter_compressed_text, file_path))
+        return source, source.iter_chunks(chunk_size)
+    extension = Path(file_path).suffix.lower()
+    if extension in STREAMABLE_EXTENSIONS:
+        source = TextFileSource(file_path)
+        return source, source.iter_chunks(chunk_size)
+    if extension in STREAMING_READERS:
+        source = DocumentSource(partial(STREAMING_READERS[extension], file_path))
+        return source, source.iter_chunks(chunk_size)
+
+    # Other formats have no incremental reader; slice the extracted text
+    text = read_manuscript(file_path)
+    return text, (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+
+
+def analyze_manuscript_stream(
+    file_path: str,
+    chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    enable_advanced: bool = False,
+    top_words_count: int = 20,
+    min_word_length: int = 1,
+    approx_frequency: bool = False,
+    sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    chapter_patterns: Iterable[str] = (),
+    scene_patterns: Iterable[str] = (),
+    part_patterns: Iterable[str] = ()
+) -> Optional[Dict]:
+    """
+    Analyze a manuscript in chunks and return the same statistics as analyze_manuscript.
+
+    Chapter content is not kept in memory; ``chapter['content']`` re-reads
+    the chapter's span from the file (or from the spooled text of a parsed
+    or compressed file). Readability is scored from counts
+    summed over the blocks (see readability_counts). The part/chapter/scene
+    tree is not built, so there is no ``structure`` or ``scene_stats``.
+
+    Args:
+        file_path: Path to manuscript file
+        chunk_size: Number of characters read at a time (default: 1 MiB)
+        enable_advanced: Enable advanced features (readability, dialogue, pacing)
+        top_words_count: Number of most frequent words to include (default: 20)
+        min_word_length: Minimum word length for frequency analysis (default: 1)
+        approx_frequency: Estimate word frequencies with a bounded-memory sketch
+        sketch_capacity: Number of counters in the sketch (default: 1000)
+        chapter_patterns: Additional chapter heading regexes
+        scene_patterns: Additional scene break regexes
+        part_patterns: Additional part heading regexes (parts are listed as chapters)
+
+    Returns:
+        Dictionary with all statistics, or None if analysis failed
+
+    Raises:
+        ValueError: If a chapter, scene or part pattern is not a valid regex
+    """
+    matcher = get_boundary_matcher(tuple(chapter_patterns), tuple(scene_patterns), tuple(part_patterns))
+    path = Path(archive_path(file_path))
+    if not path.exists():
+        # Let the reader report the missing file
+        read_manuscript(file_path)
+        return None
+
+    try:
+        source, chunks = open_chunks(file_path, chunk_size)
+        accumulator = StreamAccumulator(
+            source, enable_advanced, min_word_length, approx_frequency, sketch_capacity, matcher
+        )
+        for block in iter_blocks(chunks, chunk_size):
+            accumulator.add(block)
+        accumulator.finish()
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading file:[/bold red] {e}")
+        return None
+
+    if not accumulator.offset:
+        return None
+    file_stat = path.stat()
+    return accumulator_statistics(
+        accumulator, file_path, file_stat.st_size, datetime.fromtimestamp(file_stat.st_mtime), top_words_count
+    )
+
+
+def accumulator_statistics(
+    accumulator: StreamAccumulator,
+    file_path: str,
+    file_size: int,
+    modified_date: datetime,
+    top_words_count: int = 20
+) -> Dict:
+    """
+    Build the statistics dictionary from a finished accumulator.
+
+    Args:
+        accumulator: Accumulator fed the whole manuscript, after ``finish``
+        file_path: Manuscript path reported in the statistics
+        file_size: Size of the manuscript in bytes
+        modified_date: Last modification of the manuscript
+        top_words_count: Number of most frequent words to include
+
+    Returns:
+        Dictionary with all statistics, as returned by analyze_manuscript_stream
+    """
+    chapters = accumulator.chapters
+
+    stats = {
+        'file_path': file_path,
+        'file_size': file_size,
+        'modified_date': modified_date,
+        'language': accumulator.language,
+        'total_words': accumulator.total_words,
+        'total_characters': accumulator.total_chars,
+        'total_characters_no_spaces': accumulator.total_chars_no_spaces,
+        'total_sentences': accumulator.total_sentences,
+        'total_paragraphs': accumulator.total_paragraphs,
+        'chapters': chapters,
+        'common_words': accumulator.common_words(top_words_count),
+    }
+
+    if stats['total_sentences'] > 0:
+        stats['avg_words_per_sentence'] = stats['total_words'] / stats['total_sentences']
+    else:
+        stats['avg_words_per_sentence'] = 0
+
+    stats['reading_time'] = estimate_reading_time(stats['total_words'])
+    stats['chapter_stats'] = calculate_chapter_statistics(chapters)
+    stats['badge'] = get_achievement_badge(stats['total_words'])
+
+    if accumulator.word_sketch is not None:
+        stats['word_sketch'] = accumulator.word_sketch.to_dict()
+
+    if accumulator.enable_advanced:
+        stats['dialogue'] = dialogue_summary(*accumulator.dialogue)
+        stats['pacing'] = accumulator.pacing()
+        stats['readability'] = readability_from_counts(accumulator.readability)
+
+    return stats
@@ -0,0 +1,547 @@
+"""
+Hierarchical manuscript structure: parts, chapters and scenes.
+
+``build_outline`` nests the headings found by the boundary matcher into a
+tree (book -> parts -> chapters -> scenes) of offset-based nodes and tiles
+the manuscript into leaf sections. ``measure_outline`` measures every leaf
+in one pass and merges the metrics bottom-up, so every node, at every level,
+carries its counts without measuring any text twice.
+
+Markdown H1 headings are parts when the manuscript also has H2 headings,
+and chapters otherwise; custom part patterns always start a part. Every
+other heading is a chapter. Scenes are the non-blank stretches of a
+chapter's content between scene breaks; a part's own text before its first
+chapter counts towards the part but is not a scene.
+
+Scenes carry their own dialogue ratio and average sentence length from the
+same measurement, and scenes far outside the book's usual scene length are
+flagged as short or long outliers (Tukey's fences on the scene word counts).
+"""
+
+import statistics
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from .chapter import Chapter, BoundaryMatcher, iter_heading_spans, PART_LEVEL, H1_LEVEL, H2_LEVEL
+from .sections import SectionStats, measure_sections, merge_sections
+from .lines import LineIndex, index_lines
+
+if TYPE_CHECKING:
+    from .sentences import SentenceIndex
+    from .tokenizer import TokenizedText
+
+# Node kinds, from the root down
+BOOK = 'book'
+PART = 'part'
+CHAPTER = 'chapter'
+SCENE = 'scene'
+
+# Levels a report can be made at
+LEVELS = (PART, CHAPTER, SCENE)
+
+# Scene length outlier flags
+SHORT = 'short'
+LONG = 'long'
+
+# Interquartile ranges beyond the quartiles at which a scene is an outlier
+OUTLIER_IQR_FACTOR = 1.5
+
+# Fewer scenes than this give no meaningful quartiles, so none is flagged
+MIN_SCENES_FOR_OUTLIERS = 4
+
+# Number of equal-width buckets in the scene length distribution
+DISTRIBUTION_BUCKETS = 8
+
+
+class StructureNode:
+    """
+    A part, chapter or scene (or the whole book) as a span of the manuscript.
+
+    Supports the same ``node['words']`` / ``node.get('scenes', 0)`` access as
+    Chapter, so tables and exporters can list nodes of any level.
+
+    Attributes:
+        kind: BOOK, PART, CHAPTER or SCENE
+        title: Heading title ("Scene 2" for scenes, None for the book)
+        heading_start: Offset of the heading line (same as start for scenes)
+        start: Offset of the content after the heading line
+        end: Offset just past the node's last character (including children)
+        parent: Enclosing node (None for the book)
+        children: Scenes of a chapter's own content, then nested headings
+        metrics: SectionStats of everything after the heading, or None if not measured
+        chapter: Flat Chapter record of the heading (None for the book and scenes)
+        outlier: SHORT or LONG for scenes far outside the usual scene length, else None
+        line: 1-based line of the heading (or a scene's first line) in the file
+    """
+
+    __slots__ = (
+        'kind', 'title', 'heading_start', 'start', 'end', 'parent', 'children', 'metrics', 'chapter',
+        'outlier', 'line', '_source', '_content', '_extra'
+    )
+
+    # Keys exposed through the mapping-style interface
+    _FIELDS = ('kind', 'title', 'path', 'line', 'start', 'end', 'words', 'scenes')
+    _METRIC_FIELDS = ('characters', 'sentences', 'paragraphs')
+    _SCENE_FIELDS = ('dialogue_ratio', 'avg_sentence_length', 'outlier')
+    _CONTAINER_FIELDS = ('outlier_scenes',)
+
+    def __init__(
+        self,
+        source: str,
+        kind: str,
+        title: Optional[str],
+        heading_start: int,
+        start: int,
+        end: int,
+        parent: Optional['StructureNode'] = None,
+        chapter: Optional[Chapter] = None,
+        line: Optional[int] = None
+    ):
+        self._source = source
+        self.kind = kind
+        self.title = title
+        self.heading_start = heading_start
+        self.start = start
+        self.end = end
+        self.parent = parent
+        self.children: List['StructureNode'] = []
+        self.metrics: Optional[SectionStats] = None
+        self.chapter = chapter
+        self.outlier: Optional[str] = None
+        self.line = line
+        # Leaf sections (see Outline.bounds) of the node's own content, and
+        # other leaves directly inside it (child heading lines, untitled headings)
+        self._content: List[int] = []
+        self._extra: List[int] = []
+
+    @property
+    def content(self) -> str:
+        """Text after the heading line (sliced from the source on each access)."""
+        return self._source[self.start:self.end]
+
+    @property
+    def path(self) -> str:
+        """Titles from the outermost part down to this node, e.g. "Part I › Chapter 2 › Scene 1"."""
+        titles = []
+        node = self
+        while node is not None and node.kind != BOOK:
+            titles.append(node.title)
+            node = node.parent
+        return ' › '.join(reversed(titles))
+
+    @property
+    def words(self) -> int:
+        """Word count of everything after the heading (0 until measured)."""
+        return self.metrics.words if self.metrics else 0
+
+    @property
+    def scenes(self) -> int:
+        """Number of scenes in the node."""
+        return sum(1 for _ in self.iter_nodes(SCENE)) if self.kind != SCENE else 0
+
+    @property
+    def characters(self) -> Optional[int]:
+        """Character count, if measured."""
+        return self.metrics.characters if self.metrics else None
+
+    @property
+    def sentences(self) -> Optional[int]:
+        """Sentence count, if measured."""
+        return self.metrics.sentences if self.metrics else None
+
+    @property
+    def paragraphs(self) -> Optional[int]:
+        """Paragraph count, if measured."""
+        return self.metrics.paragraphs if self.metrics else None
+
+    @property
+    def dialogue_ratio(self) -> Optional[float]:
+        """Percentage of lines with dialogue, if dialogue was measured."""
+        if not self.metrics or not self.metrics.lines:
+            return None
+        return self.metrics.dialogue_lines / self.metrics.lines * 100
+
+    @property
+    def avg_sentence_length(self) -> Optional[float]:
+        """Average words per sentence, if measured."""
+        if not self.metrics:
+            return None
+        return self.metrics.words / self.metrics.sentences if self.metrics.sentences else 0
+
+    @property
+    def outlier_scenes(self) -> int:
+        """Number of scenes in the node flagged as unusually short or long."""
+        return sum(1 for scene in self.iter_nodes(SCENE) if scene.outlier)
+
+    def iter_nodes(self, kind: Optional[str] = None) -> Iterator['StructureNode']:
+        """
+        Walk the nodes below this one in manuscript order.
+
+        Args:
+            kind: Only yield nodes of this kind (default: all)
+
+        Yields:
+            Descendant nodes, parents before their children
+        """
+        for child in self.children:
+            if kind is None or child.kind == kind:
+                yield child
+            yield from child.iter_nodes(kind)
+
+    def nodes(self, kind: str) -> List['StructureNode']:
+        """All descendant nodes of one kind, in manuscript order."""
+        return list(self.iter_nodes(kind))
+
+    def keys(self):
+        """Field names available through item access."""
+        if not self.metrics:
+            return self._FIELDS
+        if self.kind == SCENE:
+            return self._FIELDS + self._METRIC_FIELDS + self._SCENE_FIELDS
+        return self._FIELDS + self._METRIC_FIELDS + self._CONTAINER_FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.keys()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dictionary-style access with a default."""
+        return getattr(self, key) if key in self.keys() else default
+
+    def to_dict(self) -> Dict:
+        """Nested plain dictionary of the node and its children (without content)."""
+        data = {key: getattr(self, key) for key in self.keys() if key != 'path'}
+        data['children'] = [child.to_dict() for child in self.children]
+        return data
+
+    def __repr__(self) -> str:
+        return (
+            f"StructureNode(kind={self.kind!r}, title={self.title!r}, start={self.start}, "
+            f"end={self.end}, children={len(self.children)})"
+        )
+
+
+class Outline:
+    """
+    The structure tree of a manuscript and the leaf sections tiling it.
+
+    Attributes:
+        root: BOOK node holding the parts and chapters
+        chapters: Flat Chapter records of every heading (as extract_chapters)
+        bounds: Raw offsets of the leaf sections (first 0, last len(text));
+            section i spans bounds[i] to bounds[i + 1], section 0 is the
+            preamble before the first heading
+    """
+
+    __slots__ = ('root', 'chapters', 'bounds')
+
+    def __init__(self, root: StructureNode, chapters: List[Chapter], bounds: List[int]):
+        self.root = root
+        self.chapters = chapters
+        self.bounds = bounds
+
+    def nodes(self, level: str) -> List[StructureNode]:
+        """All nodes of one level (PART, CHAPTER or SCENE)."""
+        return self.root.nodes(level)
+
+    def __repr__(self) -> str:
+        return (
+            f"Outline(parts={len(self.nodes(PART))}, chapters={len(self.nodes(CHAPTER))}, "
+            f"scenes={len(self.nodes(SCENE))})"
+        )
+
+
+def build_outline(
+    text: str,
+    matcher: Optional[BoundaryMatcher] = None,
+    lines: Optional[LineIndex] = None
+) -> Outline:
+    """
+    Nest the headings and scene breaks of a manuscript into a tree.
+
+    Args:
+        text: Full manuscript text
+        matcher: Compiled heading and scene break patterns (default: built-in)
+        lines: Line index of the text, if already built (locates the nodes)
+
+    Returns:
+        Outline whose nodes are not measured yet (see measure_outline)
+    """
+    spans = list(iter_heading_spans(text, matcher))
+    if lines is None:
+        lines = index_lines(text)
+    part_levels = {PART_LEVEL}
+    if any(span.level == H2_LEVEL and span.title for span in spans):
+        part_levels.add(H1_LEVEL)
+
+    root = StructureNode(text, BOOK, None, 0, 0, len(text))
+    chapters = []
+    bounds = [0]
+
+    def add_section(end: int, owner: List[int]):
+        owner.append(len(bounds) - 1)
+        bounds.append(end)
+
+    # Preamble before the first heading line
+    add_section(spans[0].heading_start if spans else len(text), root._extra)
+
+    container = root
+    for span in spans:
+        if not span.title:
+            # Headings without a title start no chapter; their text stays with the enclosing node
+            add_section(span.start, container._extra)
+            add_section(span.end, container._extra)
+            continue
+
+        kind = PART if span.level in part_levels else CHAPTER
+        parent = root if kind == PART else container
+        line = lines.line(span.heading_start)
+        chapter = Chapter(text, span.title, span.start, span.end, scenes=len(span.breaks), line=line)
+        node = StructureNode(
+            text, kind, span.title, span.heading_start, span.start, span.end, parent, chapter, line
+        )
+        parent.children.append(node)
+        chapters.append(chapter)
+        if kind == PART:
+            container = node
+
+        # Heading line (with the newline before it) belongs to the parent
+        add_section(span.start, parent._extra)
+
+        # A part's own text (an epigraph or introduction before its first
+        # chapter) counts towards the part but is not a scene
+        if kind == PART:
+            add_section(span.end, node._content)
+            continue
+
+        # Own content: scenes separated by scene break lines
+        pieces = []
+        scene_start = span.start
+        for break_start, break_end in span.breaks:
+            pieces.append((scene_start, break_start, True))
+            pieces.append((break_start, break_end, False))
+            scene_start = break_end
+        pieces.append((scene_start, span.end, True))
+
+        for start, end, is_scene in pieces:
+            piece = text[start:end] if is_scene else ''
+            if piece.strip():
+                # A scene's location is its first non-blank line
+                first = start + len(piece) - len(piece.lstrip())
+                scene = StructureNode(
+                    text, SCENE, f"Scene {len(node.children) + 1}", start, start, end, node,
+                    line=lines.line(first)
+                )
+                node.children.append(scene)
+                add_section(end, scene._content)
+                node._content.append(scene._content[0])
+            else:
+                add_section(end, node._content)
+
+    # Whatever follows the last heading's content (normally nothing)
+    add_section(len(text), root._extra)
+
+    for part in root.children:
+        if part.kind == PART and part.children:
+            part.end = max(part.end, part.children[-1].end)
+
+    return Outline(root, chapters, bounds)
+
+
+def _merge_node(node: StructureNode, sections: Sequence[SectionStats]) -> SectionStats:
+    """Set the metrics of a node and its descendants from the leaf sections."""
+    own = merge_sections(sections[i] for i in node._content)
+    parts = [own] if own else []
+    parts.extend(sections[i] for i in node._extra)
+    for child in node.children:
+        if child.kind == SCENE:
+            child.metrics = sections[child._content[0]]
+        else:
+            parts.append(_merge_node(child, sections))
+
+    node.metrics = merge_sections(parts) or SectionStats(node.start, node.end)
+    if node.chapter is not None:
+        node.chapter.metrics = own or SectionStats(node.start, node.end)
+        node.chapter.words = node.chapter.metrics.words
+    return node.metrics
+
+
+def measure_outline(
+    tokens: 'TokenizedText',
+    outline: Outline,
+    include_dialogue: bool = False,
+    sentences: Optional['SentenceIndex'] = None
+) -> Tuple[SectionStats, SectionStats]:
+    """
+    Measure every node of an outline in one pass over the manuscript.
+
+    The leaf sections are measured once; parents merge their children's
+    metrics in a single bottom-up traversal. The flat chapter records get
+    the metrics of their own content, as with measure_chapters, and scene
+    length outliers are flagged (see flag_scene_outliers).
+
+    Args:
+        tokens: TokenizedText of the whole manuscript
+        outline: Outline from build_outline for the same text
+        include_dialogue: Also count dialogue lines per section
+        sentences: Segmented sentences of the cleaned text (default: tokens.sentences)
+
+    Returns:
+        Tuple of (whole-book totals, preamble before the first heading)
+    """
+    sections = measure_sections(tokens, outline.bounds, include_dialogue, sentences)
+    totals = _merge_node(outline.root, sections)
+    flag_scene_outliers(outline.nodes(SCENE))
+    return totals, sections[0]
+
+
+def scene_length_fences(word_counts: Sequence[int]) -> Optional[Tuple[float, float]]:
+    """
+    Get the word counts below and above which a scene is an outlier.
+
+    Args:
+        word_counts: Word count of every scene
+
+    Returns:
+        Tuple of (lower fence, upper fence), or None if there are too few
+        scenes to tell
+    """
+    if len(word_counts) < MIN_SCENES_FOR_OUTLIERS:
+        return None
+    q1, _, q3 = statistics.quantiles(word_counts, n=4, method='inclusive')
+    spread = (q3 - q1) * OUTLIER_IQR_FACTOR
+    return q1 - spread, q3 + spread
+
+
+def flag_scene_outliers(scenes: Sequence[StructureNode]) -> int:
+    """
+    Flag scenes whose length is far outside the usual scene length.
+
+    Sets each scene's ``outlier`` and counts the flagged scenes of every
+    chapter in its ``outlier_scenes``.
+
+    Args:
+        scenes: Measured scene nodes of the whole book
+
+    Returns:
+        Number of flagged scenes
+    """
+    fences = scene_length_fences([scene.words for scene in scenes])
+    flagged = 0
+    for scene in scenes:
+        scene.outlier = None
+        if scene.parent.chapter is not None:
+            scene.parent.chapter.outlier_scenes = 0
+    if fences is None:
+        return 0
+
+    lower, upper = fences
+    for scene in scenes:
+        if scene.words < lower:
+            scene.outlier = SHORT
+        elif scene.words > upper:
+            scene.outlier = LONG
+        else:
+            continue
+        flagged += 1
+        if scene.parent.chapter is not None:
+            scene.parent.chapter.outlier_scenes += 1
+    return flagged
+
+
+def calculate_scene_statistics(scenes: Sequence[StructureNode]) -> Optional[Dict]:
+    """
+    Calculate the scene length distribution of a measured structure.
+
+    Args:
+        scenes: Measured scene nodes (e.g. ``structure.nodes(SCENE)``)
+
+    Returns:
+        Dictionary with count, mean, median, std_dev, min, max, quartiles,
+        outlier fences, a length distribution (equal-width word count
+        buckets), the flagged short and long scenes (by path), and the
+        average dialogue ratio and sentence length, or None if there are
+        no scenes
+    """
+    if not scenes:
+        return None
+
+    word_counts = [scene.words for scene in scenes]
+    mean = sum(word_counts) / len(word_counts)
+    variance = sum((x - mean) ** 2 for x in word_counts) / len(word_counts)
+    min_words = min(word_counts)
+    max_words = max(word_counts)
+
+    if len(word_counts) > 1:
+        q1, median, q3 = statistics.quantiles(word_counts, n=4, method='inclusive')
+    else:
+        q1 = median = q3 = word_counts[0]
+    fences = scene_length_fences(word_counts)
+
+    # Equal-width buckets from the shortest to the longest scene
+    width = max((max_words - min_words) / DISTRIBUTION_BUCKETS, 1)
+    buckets = min(DISTRIBUTION_BUCKETS, max_words - min_words + 1)
+    counts = [0] * buckets
+    for words in word_counts:
+        counts[min(int((words - min_words) / width), buckets - 1)] += 1
+    distribution = [
+        {
+            'min': round(min_words + i * width),
+            'max': max_words if i == buckets - 1 else round(min_words + (i + 1) * width) - 1,
+            'count': count
+        }
+        for i, count in enumerate(counts)
+    ]
+
+    dialogue_ratios = [scene.dialogue_ratio for scene in scenes if scene.dialogue_ratio is not None]
+    total_sentences = sum(scene.sentences or 0 for scene in scenes)
+
+    return {
+        'count': len(word_counts),
+        'mean': mean,
+        'median': median,
+        'std_dev': variance ** 0.5,
+        'min': min_words,
+        'max': max_words,
+        'q1': q1,
+        'q3': q3,
+        'lower_fence': fences[0] if fences else None,
+        'upper_fence': fences[1] if fences else None,
+        'distribution': distribution,
+        'short_scenes': [scene.path for scene in scenes if scene.outlier == SHORT],
+        'long_scenes': [scene.path for scene in scenes if scene.outlier == LONG],
+        'avg_dialogue_ratio': (
+            sum(dialogue_ratios) / len(dialogue_ratios) if dialogue_ratios else None
+        ),
+        'avg_sentence_length': sum(word_counts) / total_sentences if total_sentences else 0,
+    }
+
+
+def get_level_sections(stats: Dict, level: str = CHAPTER) -> List:
+    """
+    Get the sections of an analysis result at one level of the structure.
+
+    The chapter level is the flat chapter list (every heading, as before);
+    parts and scenes come from the structure tree.
+
+    Args:
+        stats: Statistics from analyze_manuscript
+        level: PART, CHAPTER or SCENE
+
+    Returns:
+        Chapter records or StructureNodes, empty if the level is not
+        available (e.g. no parts, or streaming analysis without a tree)
+    """
+    if level == CHAPTER:
+        return stats.get('chapters') or []
+    structure = stats.get('structure')
+    return structure.nodes(level) if structure is not None else []
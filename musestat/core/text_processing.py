@@ -6,103 +6,116 @@ Handles text cleaning, word/character counting, and keyword extraction.
 
 import re
 from collections import Counter
-from typing import List, Tuple
+from typing import List, Tuple, Union, TYPE_CHECKING
+from .markdown import scan_markdown
+from .frequency import SpaceSaving, WordEstimate, DEFAULT_SKETCH_CAPACITY
+from .tokens import TokenStore
+from .sentences import segment_sentences
+from .paragraphs import PARAGRAPH_SPLIT_PATTERN, index_paragraphs
+
+if TYPE_CHECKING:
+    from .tokenizer import TokenizedText
+
+WORD_PATTERN = re.compile(r'\w+')  # Same matches as \b\w+\b, without boundary checks
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+# Tokens aggregated per sketch update when building approximate frequencies
+SKETCH_BATCH_SIZE = 1 << 16
 
 
 def clean_markdown(text: str) -> str:
     """
     Remove markdown formatting for accurate word counting.
     
+    Code blocks, inline code, images, HTML tags, header markers and emphasis
+    markers are removed and links are reduced to their text, all in a single
+    pass over the text (see ``core.markdown``).
+    
     Args:
         text: Raw text with markdown formatting
         
     Returns:
         Cleaned text without markdown syntax
     """
-    # Remove code blocks
-    text = re.sub(r'```.*?```', '', text, flags=re.DOTALL)
-    # Remove inline code
-    text = re.sub(r'`[^`]+`', '', text)
-    # Remove markdown links but keep text
-    text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-    # Remove images
-    text = re.sub(r'!\[([^\]]*)\]\([^\)]+\)', '', text)
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove markdown headers symbols
-    text = re.sub(r'^#+\s+', '', text, flags=re.MULTILINE)
-    # Remove emphasis markers
-    text = re.sub(r'[*_]{1,3}([^*_]+)[*_]{1,3}', r'\1', text)
-    return text
-
-
-def count_words(text: str) -> int:
+    return scan_markdown(text)
+
+
+def count_words(text: Union[str, 'TokenizedText']) -> int:
     """
     Count words in text.
     
     Args:
-        text: Text to count words in
+        text: Text to count words in, or a pre-built TokenizedText
         
     Returns:
         Number of words
     """
+    if not isinstance(text, str):
+        return text.word_count
     clean_text = clean_markdown(text)
-    words = re.findall(r'\b\w+\b', clean_text)
+    words = WORD_PATTERN.findall(clean_text)
     return len(words)
 
 
-def count_characters(text: str, include_spaces: bool = True) -> int:
+def count_characters(text: Union[str, 'TokenizedText'], include_spaces: bool = True) -> int:
     """
     Count characters in text.
     
     Args:
-        text: Text to count characters in
+        text: Text to count characters in, or a pre-built TokenizedText
         include_spaces: Whether to include spaces in the count
         
     Returns:
         Number of characters
     """
-    clean_text = clean_markdown(text)
+    clean_text = clean_markdown(text) if isinstance(text, str) else text.clean_text
     if include_spaces:
         return len(clean_text)
-    return len(re.sub(r'\s', '', clean_text))
+    return len(WHITESPACE_PATTERN.sub('', clean_text))
 
 
-def count_sentences(text: str) -> int:
+def count_sentences(text: Union[str, 'TokenizedText'], language: str = 'en') -> int:
     """
     Count sentences in text.
     
+    Abbreviations ("Mr."), decimals ("3.5") and ellipses inside a sentence
+    do not end it (see core/sentences.py).
+    
     Args:
-        text: Text to count sentences in
+        text: Text to count sentences in, or a pre-built TokenizedText
+        language: Language code for abbreviations (ignored for a TokenizedText,
+            which is segmented with its own language)
         
     Returns:
         Number of sentences
     """
-    clean_text = clean_markdown(text)
-    sentences = re.split(r'[.!?]+', clean_text)
-    return len([s for s in sentences if s.strip()])
+    if not isinstance(text, str):
+        return len(text.sentences)
+    headings = []
+    return len(segment_sentences(scan_markdown(text, headings), language, headings))
 
 
-def count_paragraphs(text: str) -> int:
+def count_paragraphs(text: Union[str, 'TokenizedText']) -> int:
     """
     Count paragraphs in text.
     
     Args:
-        text: Text to count paragraphs in
+        text: Text to count paragraphs in, or a pre-built TokenizedText
         
     Returns:
         Number of paragraphs
     """
-    paragraphs = re.split(r'\n\s*\n', text)
-    return len([p for p in paragraphs if p.strip()])
+    paragraphs = index_paragraphs(text) if isinstance(text, str) else text.paragraphs
+    return len(paragraphs)
 
 
-def get_most_common_words(text: str, n: int = 20, stop_words: set = None, min_length: int = 3) -> List[Tuple[str, int]]:
+def get_most_common_words(text: Union[str, 'TokenizedText'], n: int = 20, stop_words: set = None, min_length: int = 3) -> List[Tuple[str, int]]:
     """
     Get the most common words (excluding stop words).
     
     Args:
-        text: Text to analyze
+        text: Text to analyze, or a pre-built TokenizedText
         n: Number of top words to return
         stop_words: Set of words to exclude (if None, uses empty set)
         min_length: Minimum word length to include (default: 3)
@@ -113,9 +126,79 @@ def get_most_common_words(text: str, n: int = 20, stop_words: set = None, min_le
     if stop_words is None:
         stop_words = set()
     
-    clean_text = clean_markdown(text).lower()
-    words = re.findall(r'\b\w+\b', clean_text)
+    if not isinstance(text, str):
+        return text.tokens.most_common(n, stop_words=stop_words, min_length=min_length)
+    
+    words = WORD_PATTERN.findall(clean_markdown(text).lower())
     words = [w for w in words if w not in stop_words and len(w) >= min_length]
     
     return Counter(words).most_common(n)
 
+
+
+def build_word_sketch(
+    text: Union[str, 'TokenizedText'],
+    stop_words: set = None,
+    min_length: int = 3,
+    capacity: int = DEFAULT_SKETCH_CAPACITY,
+    start: int = 0,
+    end: int = None
+) -> SpaceSaving:
+    """
+    Build a bounded-memory Space-Saving sketch of word frequencies.
+    
+    Memory stays at ``capacity`` counters no matter how large the vocabulary
+    grows, and sketches from different chapters or files can be combined with
+    ``SpaceSaving.merge``. See ``core.frequency`` for the error bounds.
+    
+    Args:
+        text: Text to analyze, or a pre-built TokenizedText
+        stop_words: Set of words to exclude (if None, uses empty set)
+        min_length: Minimum word length to include (default: 3)
+        capacity: Number of counters in the sketch
+        start: First token index to include (default: 0)
+        end: Token index to stop at (default: all tokens)
+        
+    Returns:
+        SpaceSaving sketch of the word counts
+    """
+    if stop_words is None:
+        stop_words = set()
+    
+    store = TokenStore(clean_markdown(text)) if isinstance(text, str) else text.tokens
+    vocabulary = store.vocabulary
+    if end is None:
+        end = len(store)
+    
+    sketch = SpaceSaving(capacity)
+    for batch_start in range(start, end, SKETCH_BATCH_SIZE):
+        batch = store.frequencies(batch_start, min(batch_start + SKETCH_BATCH_SIZE, end))
+        sketch.update_counts({
+            vocabulary[word_id]: count for word_id, count in batch.items()
+            if len(vocabulary[word_id]) >= min_length and vocabulary[word_id] not in stop_words
+        })
+    return sketch
+
+
+def get_approximate_common_words(
+    text: Union[str, 'TokenizedText'],
+    n: int = 20,
+    stop_words: set = None,
+    min_length: int = 3,
+    capacity: int = DEFAULT_SKETCH_CAPACITY
+) -> List[WordEstimate]:
+    """
+    Get estimated most common words using a bounded-memory sketch.
+    
+    Args:
+        text: Text to analyze, or a pre-built TokenizedText
+        n: Number of top words to return
+        stop_words: Set of words to exclude (if None, uses empty set)
+        min_length: Minimum word length to include (default: 3)
+        capacity: Number of counters in the sketch
+        
+    Returns:
+        List of WordEstimate(word, count, error) tuples; counts may be
+        overestimated by at most ``error``
+    """
+    return build_word_sketch(text, stop_words, min_length, capacity).estimates(n)
@@ -0,0 +1,242 @@
+"""
+Single-pass tokenization stage for manuscript analysis.
+
+Cleans the manuscript once and keeps the words, sentences and paragraphs
+so every counter and feature can read them instead of re-cleaning the text.
+Words, sentences and paragraphs are split on first use, so callers that only
+need some of them (e.g. ``--minimalist``) do not pay for the rest.
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import chain, islice
+from typing import Optional, Tuple
+from .markdown import iter_clean_spans
+from .text_processing import WORD_PATTERN
+from .tokens import TokenStore, offset_typecode
+from .sentences import SentenceIndex, segment_sentences
+from .paragraphs import ParagraphIndex, index_paragraphs
+
+
+class TokenizedText:
+    """
+    Pre-built form of a manuscript shared by all analysis steps.
+
+    Attributes:
+        text: Raw manuscript text
+        clean_text: Text with markdown formatting removed
+        tokens: Interned word ids and offsets of the cleaned text
+        sentences: Sentence offsets and word counts of the cleaned text
+        paragraphs: Paragraph offsets and word counts of the raw text
+    """
+
+    __slots__ = (
+        'text', 'clean_text', 'language', '_tokens', '_sentences', '_paragraphs',
+        '_span_starts', '_clean_starts', '_headings'
+    )
+
+    def __init__(self, text: str, language: str = 'en'):
+        self.text = text
+        self.language = language
+
+        # Remember where each kept span starts in both texts so offsets
+        # can be translated between the raw and the cleaned text
+        typecode = offset_typecode(len(text))
+        self._span_starts = array(typecode)
+        self._clean_starts = array(typecode)
+        # Cleaned offsets of heading lines, which are never sentences
+        self._headings = array(typecode)
+        raw_headings = []
+        pieces = []
+        clean_length = 0
+        for start, end in iter_clean_spans(text, headings=raw_headings):
+            while len(self._headings) < len(raw_headings):
+                self._headings.append(clean_length)
+            self._span_starts.append(start)
+            self._clean_starts.append(clean_length)
+            pieces.append(text[start:end])
+            clean_length += end - start
+        self._headings.extend([clean_length] * (len(raw_headings) - len(self._headings)))
+        self.clean_text = ''.join(pieces)
+        del pieces
+
+        self._tokens = None
+        self._sentences = None
+        self._paragraphs = None
+
+    @classmethod
+    def restore(
+        cls,
+        text: str,
+        span_starts: array,
+        clean_starts: array,
+        clean_length: int,
+        headings: array,
+        language: str = 'en',
+        tokens: Optional[TokenStore] = None,
+        sentences: Optional[SentenceIndex] = None,
+        paragraphs: Optional[ParagraphIndex] = None
+    ) -> 'TokenizedText':
+        """
+        Rebuild a tokenized text from saved offsets without cleaning it again.
+
+        The cleaned text is joined back from the kept spans, so only the
+        markdown scan is skipped; splits that were not saved are still
+        computed on first use.
+
+        Args:
+            text: Raw manuscript text the offsets were taken from
+            span_starts: Raw offset of each kept span
+            clean_starts: Cleaned offset of each kept span
+            clean_length: Length of the cleaned text
+            headings: Cleaned offset of each heading line
+            language: Language the sentences were segmented with
+            tokens: Saved token store of the cleaned text
+            sentences: Saved sentence index of the cleaned text
+            paragraphs: Saved paragraph index of the raw text
+
+        Returns:
+            TokenizedText equivalent to ``tokenize(text, language)``
+        """
+        self = cls.__new__(cls)
+        self.text = text
+        self.language = language
+        self._span_starts = span_starts
+        self._clean_starts = clean_starts
+        self._headings = headings
+        ends = chain(islice(clean_starts, 1, None), (clean_length,))
+        self.clean_text = ''.join(
+            text[start:start + end - clean_start]
+            for start, clean_start, end in zip(span_starts, clean_starts, ends)
+        )
+        if sentences is not None:
+            sentences.text = self.clean_text
+        if paragraphs is not None:
+            paragraphs.text = text
+        self._tokens = tokens
+        self._sentences = sentences
+        self._paragraphs = paragraphs
+        return self
+
+    def span_offsets(self) -> Tuple[array, array]:
+        """Raw and cleaned start offsets of every span kept by the cleaning."""
+        return self._span_starts, self._clean_starts
+
+    @property
+    def headings(self) -> array:
+        """Cleaned offsets where heading lines start."""
+        return self._headings
+
+    @property
+    def tokens(self) -> TokenStore:
+        """Interned word ids and offsets of the cleaned text."""
+        if self._tokens is None:
+            self._tokens = TokenStore(self.clean_text)
+        return self._tokens
+
+    @property
+    def sentences(self) -> SentenceIndex:
+        """Sentence offsets and word counts of the cleaned text."""
+        return self.segment()
+
+    def segment(self, language: Optional[str] = None) -> SentenceIndex:
+        """
+        Split the cleaned text into sentences using a language's abbreviations.
+
+        The split is kept, so later calls (and ``sentences``) reuse it; asking
+        for a different language segments the text again.
+
+        Args:
+            language: Language code (default: the text's current language)
+
+        Returns:
+            SentenceIndex of the cleaned text
+        """
+        if language is not None and language != self.language:
+            self.language = language
+            self._sentences = None
+        if self._sentences is None:
+            self._sentences = segment_sentences(self.clean_text, self.language, self._headings)
+        return self._sentences
+
+    @property
+    def paragraphs(self) -> ParagraphIndex:
+        """Paragraph offsets and word counts of the raw text."""
+        if self._paragraphs is None:
+            self._paragraphs = index_paragraphs(self.text)
+        return self._paragraphs
+
+    @property
+    def word_count(self) -> int:
+        """Number of words, without building the token store if it is not needed yet."""
+        if self._tokens is not None:
+            return len(self._tokens)
+        return len(WORD_PATTERN.findall(self.clean_text))
+
+    def clean_offset(self, offset: int) -> int:
+        """
+        Translate an offset in the raw text to the cleaned text.
+
+        Offsets inside removed markdown map to the next kept character.
+
+        Args:
+            offset: Offset in the raw text
+
+        Returns:
+            Corresponding offset in the cleaned text
+        """
+        i = bisect_right(self._span_starts, offset) - 1
+        if i < 0:
+            return 0
+        span_length = (
+            self._clean_starts[i + 1] if i + 1 < len(self._clean_starts) else len(self.clean_text)
+        ) - self._clean_starts[i]
+        return self._clean_starts[i] + min(offset - self._span_starts[i], span_length)
+
+    def raw_offset(self, offset: int) -> int:
+        """
+        Translate an offset in the cleaned text back to the raw text.
+
+        Args:
+            offset: Offset in the cleaned text
+
+        Returns:
+            Offset of the same character in the raw text
+        """
+        i = bisect_right(self._clean_starts, offset) - 1
+        if i < 0:
+            return offset
+        return self._span_starts[i] + offset - self._clean_starts[i]
+
+    def token_range(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Get the token indices for a span of the raw text (e.g. a chapter).
+
+        Args:
+            start: Start offset in the raw text
+            end: End offset in the raw text
+
+        Returns:
+            (first, last) token indices, usable with ``tokens.most_common``
+        """
+        return self.tokens.token_range(self.clean_offset(start), self.clean_offset(end))
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenizedText(words={self.word_count}, sentences={len(self.sentences)}, "
+            f"paragraphs={len(self.paragraphs)})"
+        )
+
+
+def tokenize(text: str, language: str = 'en') -> TokenizedText:
+    """
+    Clean and tokenize a manuscript once for reuse by every analysis step.
+
+    Args:
+        text: Raw manuscript text
+        language: Language code used for sentence segmentation
+
+    Returns:
+        TokenizedText accepted by the counting functions and features
+    """
+    return TokenizedText(text, language)
@@ -0,0 +1,154 @@
+"""
+Vocabulary-interned token storage for word statistics.
+
+Each distinct (lowercased) word is stored once; the manuscript itself is an
+``array('I')`` of word ids plus an array of word offsets, so counting, top-N
+and stopword filtering work on integers instead of millions of strings.
+"""
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import accumulate, chain, islice
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Words never span a non-word character, so chunks are cut there
+_NON_WORD_PATTERN = re.compile(r'\W')
+_WORD_SPLIT_PATTERN = re.compile(r'(\w+)')
+
+# Characters of cleaned text tokenized per chunk (bounds temporary lists)
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def offset_typecode(length: int) -> str:
+    """Smallest unsigned array typecode able to hold offsets up to ``length``."""
+    return 'I' if length < 2 ** 32 else 'Q'
+
+
+class TokenStore:
+    """
+    Interned word ids and offsets for a cleaned text.
+
+    Attributes:
+        vocabulary: Lowercased word for each id
+        index: Mapping from lowercased word to id
+        ids: Word id of every token, in text order
+        offsets: Offset of every token in the cleaned text
+    """
+
+    __slots__ = ('vocabulary', 'index', 'ids', 'offsets')
+
+    def __init__(self, clean_text: str = '', chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.vocabulary: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.ids = array('I')
+        self.offsets = array(offset_typecode(len(clean_text)))
+        if clean_text:
+            self._tokenize(clean_text, chunk_size)
+
+    def _tokenize(self, text: str, chunk_size: int):
+        length = len(text)
+        start = 0
+        while start < length:
+            end = start + chunk_size
+            if end >= length:
+                end = length
+            else:
+                boundary = _NON_WORD_PATTERN.search(text, end)
+                end = boundary.start() if boundary else length
+
+            # One regex pass yields [gap, word, gap, word, ..., gap]; word
+            # offsets are the running length of everything before each word
+            parts = _WORD_SPLIT_PATTERN.split(text[start:end])
+            words = parts[1::2]
+            running = accumulate(chain((start,), map(len, parts)))
+            self.offsets.extend(islice(running, 1, len(parts), 2))
+
+            # Resolve each distinct spelling once, then map the chunk in C
+            local_ids = {word: self.intern(word.lower()) for word in dict.fromkeys(words)}
+            self.ids.extend(map(local_ids.__getitem__, words))
+            start = end
+
+    def intern(self, word: str) -> int:
+        """
+        Get the id of a word, adding it to the vocabulary if needed.
+
+        Args:
+            word: Lowercased word
+
+        Returns:
+            Word id
+        """
+        word_id = self.index.get(word)
+        if word_id is None:
+            word_id = len(self.vocabulary)
+            self.index[word] = word_id
+            self.vocabulary.append(word)
+        return word_id
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def token_range(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Get the token indices that fall within a span of the cleaned text.
+
+        Args:
+            start: Start offset in the cleaned text
+            end: End offset in the cleaned text
+
+        Returns:
+            (first, last) token indices, usable as ``ids[first:last]``
+        """
+        return bisect_left(self.offsets, start), bisect_left(self.offsets, end)
+
+    def frequencies(self, start: int = 0, end: Optional[int] = None) -> Counter:
+        """
+        Count word ids over a range of tokens.
+
+        Args:
+            start: First token index (default: 0)
+            end: Token index to stop at (default: all tokens)
+
+        Returns:
+            Counter mapping word id to occurrences
+        """
+        if start == 0 and end is None:
+            return Counter(self.ids)
+        return Counter(self.ids[start:end])
+
+    def most_common(
+        self,
+        n: int = 20,
+        stop_words: Optional[Iterable[str]] = None,
+        min_length: int = 3,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> List[Tuple[str, int]]:
+        """
+        Get the most common words over a range of tokens.
+
+        Args:
+            n: Number of top words to return
+            stop_words: Words to exclude
+            min_length: Minimum word length to include
+            start: First token index (default: 0)
+            end: Token index to stop at (default: all tokens)
+
+        Returns:
+            List of (word, count) tuples for the most common words
+        """
+        stop_words = stop_words or ()
+        vocabulary = self.vocabulary
+        counts = self.frequencies(start, end)
+        # Filter each distinct id once rather than every token
+        kept = (
+            item for item in counts.items()
+            if len(vocabulary[item[0]]) >= min_length and vocabulary[item[0]] not in stop_words
+        )
+        # Ties keep first-seen order, matching Counter.most_common
+        top = heapq.nlargest(n, kept, key=itemgetter(1))
+        return [(vocabulary[word_id], count) for word_id, count in top]
@@ -1,6 +1,6 @@
 """Feature modules for advanced manuscript analysis."""
 
-from .language import detect_language, get_language_stopwords
+from .language import detect_language, get_language_stopwords, get_language_abbreviations
 from .dialogue import count_dialogue
 from .readability import calculate_readability, detect_pacing_issues
 from .verification import (
@@ -14,6 +14,7 @@ from .verification import (
 __all__ = [
     'detect_language',
     'get_language_stopwords',
+    'get_language_abbreviations',
     'count_dialogue',
     'calculate_readability',
     'detect_pacing_issues',
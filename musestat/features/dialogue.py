@@ -3,18 +3,29 @@ Dialogue analysis for manuscripts.
 """
 
 import re
-from typing import Dict
+from typing import Dict, Tuple, Union, TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from ..core.tokenizer import TokenizedText
 
-def count_dialogue(text: str) -> Dict:
+
+QUOTE_PATTERN = re.compile(r'["\'](.*?)["\']')
+# The characters QUOTE_PATTERN opens and closes a quote on
+QUOTE_CHARACTER_PATTERN = re.compile(r'["\']')
+
+
+def dialogue_counts(text: str) -> Tuple[int, int, int]:
     """
-    Count dialogue lines and calculate dialogue ratio.
+    Count dialogue lines, dialogue words and non-empty lines.
+    
+    The counts are per line, so they can be summed over consecutive
+    line-aligned pieces of a manuscript (used by streaming analysis).
     
     Args:
-        text: Full manuscript text
+        text: Manuscript text (or a line-aligned piece of it)
         
     Returns:
-        Dictionary with lines, words, and ratio statistics
+        Tuple of (dialogue_lines, dialogue_words, total_lines)
     """
     lines = text.split('\n')
     dialogue_lines = 0
@@ -30,11 +41,26 @@ def count_dialogue(text: str) -> Dict:
         # Check for quoted dialogue (supports various quote styles)
         if '"' in line or '"' in line or '"' in line or "'" in line or "'" in line:
             # Count as dialogue if it has substantial quoted content
-            quotes = re.findall(r'["\'](.*?)["\']', line)
+            quotes = QUOTE_PATTERN.findall(line)
             if quotes:
                 dialogue_lines += 1
                 dialogue_words += sum(len(q.split()) for q in quotes)
     
+    return dialogue_lines, dialogue_words, total_lines
+
+
+def dialogue_summary(dialogue_lines: int, dialogue_words: int, total_lines: int) -> Dict:
+    """
+    Build the dialogue statistics dictionary from raw counts.
+    
+    Args:
+        dialogue_lines: Number of lines containing dialogue
+        dialogue_words: Number of words inside quotes
+        total_lines: Number of non-empty lines
+        
+    Returns:
+        Dictionary with lines, words, and ratio statistics
+    """
     dialogue_ratio = (dialogue_lines / total_lines * 100) if total_lines > 0 else 0
     
     return {
@@ -43,3 +69,17 @@ def count_dialogue(text: str) -> Dict:
         'ratio': dialogue_ratio
     }
 
+
+def count_dialogue(text: Union[str, 'TokenizedText']) -> Dict:
+    """
+    Count dialogue lines and calculate dialogue ratio.
+    
+    Args:
+        text: Full manuscript text, or a pre-built TokenizedText
+        
+    Returns:
+        Dictionary with lines, words, and ratio statistics
+    """
+    if not isinstance(text, str):
+        text = text.text
+    return dialogue_summary(*dialogue_counts(text))
@@ -6,7 +6,10 @@ from __future__ import annotations
 from ..core.text_processing import clean_markdown
 from functools import lru_cache
 import unicodedata
-from typing import Iterable, Set
+from typing import Iterable, Set, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..core.tokenizer import TokenizedText
 
 # Optional import for language detection
 try:
@@ -16,12 +19,12 @@ except ImportError:
     LANG_DETECT_SUPPORT = False
 
 
-def detect_language(text: str) -> str:
+def detect_language(text: Union[str, TokenizedText]) -> str:
     """
     Detect the language of the text.
     
     Args:
-        text: Text to analyze
+        text: Text to analyze, or a pre-built TokenizedText
         
     Returns:
         Language code (e.g., 'en', 'ko') or 'unknown' if detection fails
@@ -31,7 +34,8 @@ def detect_language(text: str) -> str:
     
     try:
         # Sample the text to avoid performance issues
-        sample = clean_markdown(text)[:5000]
+        clean_text = clean_markdown(text) if isinstance(text, str) else text.clean_text
+        sample = clean_text[:5000]
         lang = langdetect.detect(sample)
         return lang
     except Exception:
@@ -246,6 +250,78 @@ _LANG_ALIASES: dict[str, str] = {
     "sk-sk": "sk", "sl-si": "sl", "fi-fi": "fi", "sv-se": "sv", "da-dk": "da", "no-no": "no",
 }
 
+# --- Abbreviations that do not end a sentence (lowercased, without the final period) ---
+# Used by the sentence segmenter; keyed like _STOPWORDS. Single-letter initials
+# ("J. R. R.") and decimals ("3.5") are handled by the segmenter for every language.
+_ABBREVIATIONS: dict[str, frozenset[str]] = {
+    "en": frozenset({
+        "mr","mrs","ms","mx","dr","prof","sr","jr","st","mt","ft","rev","fr","gen","col","capt","lt",
+        "sgt","cpl","gov","sen","rep","hon","pres","supt","insp","det","messrs","mme","mlle",
+        "vs","etc","e.g","i.e","cf","viz","approx","ca","al","no","nos","vol","vols","pp","ch","chap",
+        "fig","figs","ed","eds","esp","dept","est","inc","ltd","co","corp","bros","assn","univ",
+        "jan","feb","mar","apr","jun","jul","aug","sep","sept","oct","nov","dec",
+        "mon","tue","tues","wed","thu","thur","thurs","fri","sat","sun",
+        "a.m","p.m","u.s","u.k","b.c","a.d","ave","blvd","rd","hwy","p.s","ph.d","m.d","b.a","m.a",
+    }),
+    "de": frozenset({
+        "hr","hrn","fr","frl","dr","prof","bzw","ca","d.h","evtl","ggf","inkl","nr","s","sog","u.a",
+        "usw","vgl","z.b","z.t","u.u","o.ä","u.ä","bspw","etc","geb","gest","jh","jhd","mio","mrd",
+        "st","str","tel","abs","abt","allg","bd","bzgl","i.d.r","m.e","n.chr","v.chr","zzgl","a.d",
+    }),
+    "fr": frozenset({
+        "m","mm","mme","mmes","mlle","mlles","dr","pr","me","mgr","st","ste","cf","etc","env","ex",
+        "p.ex","c.-à-d","av","bd","apr","vol","chap","p","pp","n°","no","éd","fig","janv","févr",
+        "avr","juil","sept","oct","nov","déc",
+    }),
+    "es": frozenset({
+        "sr","sra","srta","sres","dr","dra","d","dña","dª","lic","ing","prof","ud","uds","vd","vds",
+        "etc","p.ej","pág","págs","aprox","av","avda","cap","núm","no","vol","ej","admón","cía",
+        "ene","feb","mar","abr","jun","jul","ago","sept","oct","nov","dic",
+    }),
+    "it": frozenset({
+        "sig","sigg","sig.ra","sig.na","dott","dott.ssa","prof","prof.ssa","ing","avv","arch","geom",
+        "on","sen","mons","s","ss","ecc","es","p.es","pag","pagg","cap","vol","n","nn","ca","cfr",
+        "gen","feb","mar","apr","giu","lug","ago","set","ott","nov","dic",
+    }),
+    "pt": frozenset({
+        "sr","sra","srta","dr","dra","prof","profa","eng","exmo","exma","v.exa","d","etc","p.ex",
+        "pág","págs","cap","vol","n","nº","av","aprox","cia","ltda","jan","fev","mar","abr","mai",
+        "jun","jul","ago","set","out","nov","dez",
+    }),
+    "nl": frozenset({
+        "dhr","mevr","mw","dr","drs","ir","ing","mr","prof","st","bijv","bv","d.w.z","enz","m.a.w",
+        "o.a","t.a.v","vgl","z.g.a","ca","nr","blz","jan","feb","mrt","apr","jun","jul","aug","sep",
+        "okt","nov","dec",
+    }),
+    "sv": frozenset({
+        "hr","fr","frk","dr","prof","bl.a","d.v.s","dvs","etc","f.d","fr.o.m","m.fl","m.m","o.s.v",
+        "osv","t.ex","t.o.m","ca","jfr","nr","s","sid","st",
+    }),
+    "da": frozenset({
+        "hr","fr","frk","dr","prof","bl.a","ca","d.v.s","dvs","etc","f.eks","fx","jf","m.fl","m.m",
+        "nr","osv","pga","s","st","t.eks","tlf",
+    }),
+    "no": frozenset({
+        "hr","fr","frk","dr","prof","bl.a","ca","d.v.s","dvs","etc","f.eks","jf","m.fl","m.m","nr",
+        "osv","pga","s","st","t.o.m","tlf",
+    }),
+    "fi": frozenset({
+        "hra","rva","nti","tri","prof","esim","ym","yms","jne","ks","mm","n","nro","s","v","vrt","ns",
+    }),
+    "ru": frozenset({
+        "г","гг","т.е","т.д","т.п","т.к","др","пр","см","стр","им","ул","д","кв","проф","акад","тов",
+        "гр","млн","млрд","тыс","руб","коп","напр","с","ст","вв","в",
+    }),
+    "pl": frozenset({
+        "p","pan","pani","dr","prof","inż","mgr","hab","ks","np","m.in","tj","tzn","itd","itp","ok",
+        "r","w","wg","ul","al","nr","str","godz","tys","mln","zob","por",
+    }),
+    "cs": frozenset({
+        "p","pí","sl","dr","prof","ing","mgr","doc","např","tj","tzn","atd","apod","aj","tzv","resp",
+        "č","čís","str","s","ul","nám","r","tis","mil","mld",
+    }),
+}
+
 def _canonical_lang(lang: str) -> str:
     """Normalize incoming language codes to our canonical keys."""
     if not lang:
@@ -350,4 +426,19 @@ def get_language_stopwords(
 
 def _normalize_word(w: str) -> str:
     """Lowercase + NFKC normalize to match stored inventories."""
-    return unicodedata.normalize("NFKC", w).lower()
\ No newline at end of file
+    return unicodedata.normalize("NFKC", w).lower()
+
+
+@lru_cache(maxsize=64)
+def get_language_abbreviations(lang: str) -> frozenset[str]:
+    """
+    Return the abbreviations that do not end a sentence in the given language.
+
+    Args:
+        lang: Language code or name (same codes and aliases as get_language_stopwords).
+
+    Returns:
+        Lowercased abbreviations without their final period (e.g. 'mr', 'e.g'),
+        or an empty set for languages without a list.
+    """
+    return _ABBREVIATIONS.get(_canonical_lang(lang), frozenset())
@@ -2,9 +2,12 @@
 Readability metrics and pacing analysis.
 """
 
-import re
-from typing import Dict, Optional, List, Tuple
+from itertools import islice
+from typing import Callable, Dict, Optional, List, Tuple, Union
+from ..core.sentences import segment_sentences
 from ..core.text_processing import clean_markdown
+from ..core.tokenizer import TokenizedText
+from ..core.lines import LineIndex, index_lines
 
 # Optional import for readability metrics
 try:
@@ -14,12 +17,19 @@ except ImportError:
     READABILITY_SUPPORT = False
 
 
-def calculate_readability(text: str) -> Optional[Dict]:
+# Syllables that make a word difficult in textstat's English Gunning Fog index
+_DIFFICULT_WORD_SYLLABLES = 3
+
+
+def calculate_readability(text: Union[str, 'TokenizedText']) -> Optional[Dict]:
     """
     Calculate readability metrics.
     
+    The scores are textstat's own, computed on the cleaned text of the
+    shared tokenization (so the markdown is not cleaned again).
+    
     Args:
-        text: Full manuscript text
+        text: Full manuscript text, or a pre-built TokenizedText
         
     Returns:
         Dictionary with various readability scores, or None if textstat not available
@@ -27,9 +37,8 @@ def calculate_readability(text: str) -> Optional[Dict]:
     if not READABILITY_SUPPORT:
         return None
     
+    clean_text = text.clean_text if isinstance(text, TokenizedText) else clean_markdown(text)
     try:
-        clean_text = clean_markdown(text)
-        
         return {
             'flesch_reading_ease': textstat.flesch_reading_ease(clean_text),
             'flesch_kincaid_grade': textstat.flesch_kincaid_grade(clean_text),
@@ -41,37 +50,119 @@ def calculate_readability(text: str) -> Optional[Dict]:
         return None
 
 
-def detect_pacing_issues(text: str) -> Dict:
+def readability_counts(clean_text: str, sentences: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """
+    Count the quantities the readability formulas are built from.
+    
+    The counts add up over consecutive pieces of a manuscript, so streaming
+    analysis can score a book without holding all of its text. Sentences
+    are counted by the shared segmenter rather than textstat's, and
+    difficult words per piece, so streamed scores can differ slightly from
+    those of calculate_readability.
+    
+    Args:
+        clean_text: Text with markdown formatting removed
+        sentences: Sentence count if already known (default: segment the text)
+        
+    Returns:
+        Dictionary of counts, or None if textstat not available
+    """
+    if not READABILITY_SUPPORT:
+        return None
+    
+    if sentences is None:
+        sentences = len(segment_sentences(clean_text))
+    try:
+        return {
+            'words': textstat.lexicon_count(clean_text),
+            'sentences': sentences,
+            'syllables': textstat.syllable_count(clean_text),
+            'letters': textstat.letter_count(clean_text),
+            'characters': textstat.char_count(clean_text),
+            'difficult_words': textstat.difficult_words(clean_text, _DIFFICULT_WORD_SYLLABLES),
+        }
+    except Exception:
+        return None
+
+
+def readability_from_counts(counts: Optional[Dict[str, int]]) -> Optional[Dict]:
+    """
+    Calculate readability metrics from summed ``readability_counts``.
+    
+    These are textstat's English formulas applied to the totals; given
+    textstat's own sentence count they give calculate_readability's scores
+    (rounded to two decimals).
+    
+    Args:
+        counts: Totals of the readability counts, or None
+        
+    Returns:
+        Dictionary with the same scores as calculate_readability, or None
+    """
+    if not counts or not counts['words'] or not counts['sentences']:
+        return None
+    
+    words = counts['words']
+    words_per_sentence = words / counts['sentences']
+    syllables_per_word = counts['syllables'] / words
+    
+    return {
+        'flesch_reading_ease': round(206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word, 2),
+        'flesch_kincaid_grade': round(0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59, 2),
+        'gunning_fog': round(0.4 * (words_per_sentence + 100 * counts['difficult_words'] / words), 2),
+        'coleman_liau_index': round(
+            0.058 * counts['letters'] / words * 100 - 0.296 * counts['sentences'] / words * 100 - 15.8, 2
+        ),
+        'automated_readability_index': round(
+            4.71 * counts['characters'] / words + 0.5 * words_per_sentence - 21.43, 2
+        ),
+    }
+
+
+def detect_pacing_issues(text: Union[str, 'TokenizedText'], lines: Optional[LineIndex] = None) -> Dict:
     """
     Detect long sentences and paragraphs that may affect pacing.
     
+    Each flagged sentence or paragraph is reported as (number, words, line,
+    column): its 1-based position among the sentences or paragraphs, its
+    word count and where it starts in the file.
+    
     Args:
-        text: Full manuscript text
+        text: Full manuscript text, or a pre-built TokenizedText
+        lines: Line index of the raw text, if already built
         
     Returns:
         Dictionary with pacing statistics including long sentences/paragraphs
     """
-    clean_text = clean_markdown(text)
+    if isinstance(text, str):
+        text = TokenizedText(text)
+    sentences = text.sentences
+    paragraphs = text.paragraphs
+    if lines is None:
+        lines = index_lines(text.text)
     
-    # Analyze sentences
-    sentences = [s.strip() for s in re.split(r'[.!?]+', clean_text) if s.strip()]
-    sentence_lengths = [len(s.split()) for s in sentences]
+    # Word counts were recorded while segmenting and indexing
+    sentence_lengths = sentences.word_counts
+    paragraph_lengths = paragraphs.word_counts
     
-    # Find long sentences (>40 words)
-    long_sentences = [(i+1, len(s.split())) for i, s in enumerate(sentences) if len(s.split()) > 40]
+    def first_flagged(lengths, keep: Callable[[int], bool], offset_of: Callable[[int], int]) -> List[Tuple]:
+        # Only the first 10 are located
+        flagged = islice((i for i, n in enumerate(lengths) if keep(n)), 10)
+        return [(i + 1, lengths[i]) + tuple(lines.location(offset_of(i))) for i in flagged]
     
-    # Analyze paragraphs
-    paragraphs = [p.strip() for p in re.split(r'\n\s*\n', text) if p.strip()]
-    paragraph_lengths = [len(p.split()) for p in paragraphs]
+    # Find long sentences (>40 words); sentences are offsets into the cleaned text
+    long_sentences = first_flagged(
+        sentence_lengths, lambda n: n > 40, lambda i: text.raw_offset(sentences.starts[i])
+    )
     
     # Find long paragraphs (>200 words) and short paragraphs (<10 words)
-    long_paragraphs = [(i+1, len(p.split())) for i, p in enumerate(paragraphs) if len(p.split()) > 200]
-    short_paragraphs = [(i+1, len(p.split())) for i, p in enumerate(paragraphs) if 0 < len(p.split()) < 10]
+    long_paragraphs = first_flagged(paragraph_lengths, lambda n: n > 200, paragraphs.starts.__getitem__)
+    short_paragraphs = first_flagged(paragraph_lengths, lambda n: 0 < n < 10, paragraphs.starts.__getitem__)
     
     return {
-        'long_sentences': long_sentences[:10],  # Top 10
-        'long_paragraphs': long_paragraphs[:10],  # Top 10
-        'short_paragraphs': short_paragraphs[:10],  # Top 10
+        'long_sentences': long_sentences,
+        'long_paragraphs': long_paragraphs,
+        'short_paragraphs': short_paragraphs,
         'avg_sentence_length': sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0,
         'avg_paragraph_length': sum(paragraph_lengths) / len(paragraph_lengths) if paragraph_lengths else 0
     }
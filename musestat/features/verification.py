@@ -8,7 +8,11 @@ import re
 from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Optional
+from operator import itemgetter
+from typing import Callable, List, Optional
+
+from ..core.paragraphs import ParagraphIndex, index_paragraphs
+from ..core.lines import LineIndex, index_lines
 
 
 class IssueType(Enum):
@@ -27,6 +31,8 @@ class Issue:
     line_number: Optional[int] = None
     line_preview: Optional[str] = None
     suggestion: Optional[str] = None
+    paragraph: Optional[int] = None  # 1-based paragraph number, as in pacing results
+    column: Optional[int] = None  # 1-based column where the problem starts, if known
 
 
 def load_ignore_patterns() -> List[str]:
@@ -122,351 +128,342 @@ def should_ignore_line(line: str, line_number: int, ignore_patterns: List[str])
     return False
 
 
-def verify_manuscript(text: str, ignore_patterns: Optional[List[str]] = None) -> List[Issue]:
+# Issues are listed check by check in this order, by line within each check
+(
+    _FORMATTING, _MARKERS, _TYPOS, _PUNCTUATION, _WHITESPACE, _HEADINGS,
+    _QUOTE_STYLE, _BRACKETS, _SPACING, _LINE_LENGTH, _STRAIGHT_QUOTES, _CONTENT
+) = range(12)
+
+_SINGLE_ASTERISK_PATTERN = re.compile(r'(?<!\*)\*(?!\*)')
+_DOUBLE_ASTERISK_PATTERN = re.compile(r'(?<!\*)\*\*(?!\*)')
+_UNDERSCORE_PATTERN = re.compile(r'(?<!_)_(?!_)')
+_HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+
+_MARKERS_FOUND = ['TODO', 'FIXME', 'XXX', 'HACK', 'NOTE:', 'TK', 'TBD', 'PLACEHOLDER']
+
+# Words reported when repeated, in report order, found by one pattern
+_REPEATED_WORDS = ['the', 'a', 'and', 'to', 'of', 'in', 'it']
+_REPEATED_WORD_PATTERN = re.compile(r'\b(' + '|'.join(_REPEATED_WORDS) + r')\s+\1\b')
+
+
+def verify_manuscript(
+    text: str,
+    ignore_patterns: Optional[List[str]] = None,
+    paragraphs: Optional[ParagraphIndex] = None,
+    line_index: Optional[LineIndex] = None
+) -> List[Issue]:
     """
     Run comprehensive verification checks on manuscript.
     
+    Every check runs in one walk over the paragraphs and the blank lines
+    between them. Issues are recorded at their offset in the text and
+    located through the line index afterwards.
+    
     Args:
         text: Full manuscript text
         ignore_patterns: Optional list of patterns to ignore (loaded from file if None)
+        paragraphs: Paragraph index of the text, if already built (e.g. TokenizedText.paragraphs)
+        line_index: Line index of the text, if already built
         
     Returns:
-        List of Issue objects found during verification
+        List of Issue objects found during verification, each line issue
+        numbered with the paragraph holding the line (and, where the check
+        finds one spot, the column it starts at)
     """
     if ignore_patterns is None:
         ignore_patterns = load_ignore_patterns()
+    if paragraphs is None:
+        paragraphs = index_paragraphs(text)
+    if line_index is None:
+        line_index = index_lines(text)
     
-    ignored_lines_cache = {}
-    has_patterns = len(ignore_patterns) > 0
+    # (check, offset, whether the offset is a column, paragraph, whether to preview, issue)
+    found = []
     
-    def is_line_ignored(line: str, line_num: int) -> bool:
-        if not has_patterns:
-            return False
-        if line_num in ignored_lines_cache:
-            return ignored_lines_cache[line_num]
-        result = should_ignore_line(line, line_num, ignore_patterns)
-        ignored_lines_cache[line_num] = result
-        return result
+    def report(check: int, issue: Issue, offset: Optional[int] = None,
+               paragraph: Optional[int] = None, column: bool = True, preview: bool = True):
+        found.append((check, offset, column, paragraph, preview, issue))
     
-    issues = []
-    lines = text.split('\n')
-    in_code_block = False
+    straight_double = text.count('"')
+    curly_double = text.count('\u201c') + text.count('\u201d')
+    check_straight_quotes = curly_double > straight_double * 2
     
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        if line.strip().startswith('```'):
-            in_code_block = not in_code_block
-            continue
+    if straight_double > 10 and curly_double > 10:
+        report(_QUOTE_STYLE, Issue(
+            type=IssueType.WARNING,
+            category="Smart Quotes",
+            message=f"Mixed straight ({straight_double}) and curly ({curly_double}) quotes",
+            suggestion="Use consistent quote style throughout manuscript"
+        ))
+    
+    state = {'in_code_block': False, 'prev_level': 0}
+    previous_line = 0
+    for p in range(len(paragraphs)):
+        first_line = line_index.line(paragraphs.starts[p])
+        last_line = line_index.line(paragraphs.ends[p] - 1)
         
-        if in_code_block:
-            continue
+        # Blank lines since the previous paragraph
+        for number in range(previous_line + 1, first_line):
+            _check_blank_line(line_index, number, ignore_patterns, report)
+        blank_lines = first_line - previous_line - 1
+        if blank_lines > 2:
+            report(_SPACING, Issue(
+                type=IssueType.INFO,
+                category="Spacing",
+                message=f"{blank_lines} consecutive blank lines",
+                suggestion="Use single blank line between paragraphs"
+            ), line_index.starts[first_line - 2], column=False)
         
-        single_asterisks = len(re.findall(r'(?<!\*)\*(?!\*)', line))
+        for number in range(first_line, last_line + 1):
+            _check_line(line_index, number, p, ignore_patterns, check_straight_quotes, state, report)
+        previous_line = last_line
+    
+    for number in range(previous_line + 1, len(line_index) + 1):
+        _check_blank_line(line_index, number, ignore_patterns, report)
+    
+    # Listed check by check; the sort is stable, so lines stay in order
+    found.sort(key=itemgetter(0))
+    issues = []
+    for _, offset, is_column, paragraph, preview, issue in found:
+        if offset is not None:
+            location = line_index.location(offset)
+            issue.line_number = location.line
+            if is_column:
+                issue.column = location.column
+            if paragraph is not None:
+                issue.paragraph = paragraph + 1
+                if preview:
+                    issue.line_preview = paragraphs.preview(paragraph, offset=offset)
+        issues.append(issue)
+    return issues
+
+
+def _check_blank_line(line_index: LineIndex, number: int, ignore_patterns: List[str], report: Callable):
+    """Check a blank (or whitespace-only) line between paragraphs."""
+    line = line_index.line_text(number)
+    start = line_index.starts[number - 1]
+    if len(line) > 1000:
+        report(_LINE_LENGTH, _long_line_issue(line), start, column=False)
+    if line and not (ignore_patterns and should_ignore_line(line, number, ignore_patterns)):
+        report(_WHITESPACE, _trailing_whitespace_issue(), start)
+
+
+def _trailing_whitespace_issue() -> Issue:
+    return Issue(
+        type=IssueType.INFO,
+        category="Whitespace",
+        message="Trailing whitespace at end of line",
+        suggestion="Remove trailing spaces/tabs"
+    )
+
+
+def _long_line_issue(line: str) -> Issue:
+    return Issue(
+        type=IssueType.WARNING,
+        category="Line Length",
+        message=f"Very long line ({len(line)} characters)",
+        suggestion="Consider breaking into multiple lines"
+    )
+
+
+def _check_line(
+    line_index: LineIndex,
+    number: int,
+    paragraph: int,
+    ignore_patterns: List[str],
+    check_straight_quotes: bool,
+    state: dict,
+    report: Callable
+):
+    """Run every line check on one line of a paragraph."""
+    line = line_index.line_text(number)
+    start = line_index.starts[number - 1]
+    
+    def add(check: int, issue: Issue, column: Optional[int] = None, preview: bool = True):
+        report(check, issue, start + (column or 0), paragraph, column=column is not None, preview=preview)
+    
+    if len(line) > 1000:
+        add(_LINE_LENGTH, _long_line_issue(line), preview=False)
+    if ignore_patterns and should_ignore_line(line, number, ignore_patterns):
+        return
+    
+    stripped = line.strip()
+    if stripped.startswith('```'):
+        state['in_code_block'] = not state['in_code_block']
+    elif not state['in_code_block']:
+        single_asterisks = len(_SINGLE_ASTERISK_PATTERN.findall(line))
         if single_asterisks % 2 != 0 and not re.match(r'^\s*\*\s', line):
-            preview = line.strip()[:70]
-            issues.append(Issue(
+            add(_FORMATTING, Issue(
                 type=IssueType.ERROR,
                 category="Markdown Formatting",
                 message="Unmatched asterisk (*) - italic formatting incomplete",
-                line_number=i,
-                line_preview=preview,
                 suggestion="Ensure all * have matching pairs"
             ))
         
-        double_asterisks = len(re.findall(r'(?<!\*)\*\*(?!\*)', line))
+        double_asterisks = len(_DOUBLE_ASTERISK_PATTERN.findall(line))
         if double_asterisks % 2 != 0:
-            preview = line.strip()[:70]
-            issues.append(Issue(
+            add(_FORMATTING, Issue(
                 type=IssueType.ERROR,
                 category="Markdown Formatting",
                 message="Unmatched double asterisk (**) - bold formatting incomplete",
-                line_number=i,
-                line_preview=preview,
                 suggestion="Ensure all ** have matching pairs"
             ))
         
         if '***' in line and not re.match(r'^\s*\*\*\*\s*$', line):
-            preview = line.strip()[:70]
-            issues.append(Issue(
+            add(_FORMATTING, Issue(
                 type=IssueType.WARNING,
                 category="Markdown Formatting",
                 message="Triple asterisk (***) found - may be formatting error",
-                line_number=i,
-                line_preview=preview,
                 suggestion="Use ** for bold or * for italic, or *** for scene break"
             ))
         
-        underscores = len(re.findall(r'(?<!_)_(?!_)', line))
+        underscores = len(_UNDERSCORE_PATTERN.findall(line))
         if underscores % 2 != 0 and not re.search(r'\w+_\w+', line):
-            preview = line.strip()[:70]
-            issues.append(Issue(
+            add(_FORMATTING, Issue(
                 type=IssueType.WARNING,
                 category="Markdown Formatting",
                 message="Unmatched underscore (_) - incomplete emphasis",
-                line_number=i,
-                line_preview=preview,
                 suggestion="Ensure all _ have matching pairs"
             ))
     
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        for keyword in ['TODO', 'FIXME', 'XXX', 'HACK', 'NOTE:', 'TK', 'TBD', 'PLACEHOLDER']:
-            if keyword in line.upper():
-                preview = line.strip()[:70]
-                issues.append(Issue(
-                    type=IssueType.ERROR,
-                    category="Pre-publish",
-                    message=f"'{keyword}' marker found - should be resolved before publishing",
-                    line_number=i,
-                    line_preview=preview,
-                    suggestion="Complete or remove this marker"
-                ))
-                break
-    
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        line_lower = line.lower()
-        for pattern, msg in [
-            (r'\bthe\s+the\b', "Repeated 'the the'"),
-            (r'\ba\s+a\b', "Repeated 'a a'"),
-            (r'\band\s+and\b', "Repeated 'and and'"),
-            (r'\bto\s+to\b', "Repeated 'to to'"),
-            (r'\bof\s+of\b', "Repeated 'of of'"),
-            (r'\bin\s+in\b', "Repeated 'in in'"),
-            (r'\bit\s+it\b', "Repeated 'it it'"),
-        ]:
-            if re.search(pattern, line_lower):
-                preview = line.strip()[:70]
-                issues.append(Issue(
-                    type=IssueType.WARNING,
-                    category="Typos",
-                    message=msg,
-                    line_number=i,
-                    line_preview=preview,
-                    suggestion="Remove duplicate word"
-                ))
-    
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        if re.search(r'[!?]{2,}', line):
-            preview = line.strip()[:70]
-            issues.append(Issue(
-                type=IssueType.WARNING,
-                category="Punctuation",
-                message="Multiple consecutive exclamation/question marks",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Use single punctuation for professional writing"
-            ))
-        
-        if re.search(r'\s[.,!?;:]', line):
-            preview = line.strip()[:70]
-            issues.append(Issue(
+    line_upper = line.upper()
+    for keyword in _MARKERS_FOUND:
+        column = line_upper.find(keyword)
+        if column >= 0:
+            add(_MARKERS, Issue(
                 type=IssueType.ERROR,
-                category="Punctuation",
-                message="Space before punctuation mark",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Remove space before punctuation"
-            ))
-        
-        if re.search(r'\.{4,}', line):
-            preview = line.strip()[:70]
-            issues.append(Issue(
+                category="Pre-publish",
+                message=f"'{keyword}' marker found - should be resolved before publishing",
+                suggestion="Complete or remove this marker"
+            ), column)
+            break
+    
+    line_lower = line.lower()
+    repeated = {}
+    for match in _REPEATED_WORD_PATTERN.finditer(line_lower):
+        repeated.setdefault(match.group(1), match.start())
+    for word in _REPEATED_WORDS:
+        if word in repeated:
+            add(_TYPOS, Issue(
                 type=IssueType.WARNING,
-                category="Punctuation",
-                message="Too many dots in ellipsis (should be 3)",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Use three dots (...) or unicode ellipsis (…)"
-            ))
-        
-        if ' - ' in line:
-            preview = line.strip()[:70]
-            issues.append(Issue(
-                type=IssueType.INFO,
-                category="Punctuation",
-                message="Spaced hyphen found - consider em-dash",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Use em-dash (—) without spaces for professional formatting"
-            ))
+                category="Typos",
+                message=f"Repeated '{word} {word}'",
+                suggestion="Remove duplicate word"
+            ), repeated[word])
     
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        if line and (line[-1] == ' ' or line[-1] == '\t'):
-            issues.append(Issue(
-                type=IssueType.INFO,
-                category="Whitespace",
-                message="Trailing whitespace at end of line",
-                line_number=i,
-                suggestion="Remove trailing spaces/tabs"
-            ))
-        
-        if '  ' in line.strip():
-            spaces = re.findall(r' {2,}', line.strip())
-            if spaces:
-                max_spaces = max(len(s) for s in spaces)
-                if max_spaces > 2:
-                    preview = line.strip()[:70]
-                    issues.append(Issue(
-                        type=IssueType.WARNING,
-                        category="Whitespace",
-                        message=f"Multiple consecutive spaces ({max_spaces}) found",
-                        line_number=i,
-                        line_preview=preview,
-                        suggestion="Use single spaces between words"
-                    ))
-        
-        if '\t' in line and line.strip():
-            preview = line.strip()[:70]
-            issues.append(Issue(
-                type=IssueType.INFO,
-                category="Whitespace",
-                message="Tab character found in content",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Use spaces instead of tabs"
-            ))
+    match = re.search(r'[!?]{2,}', line)
+    if match:
+        add(_PUNCTUATION, Issue(
+            type=IssueType.WARNING,
+            category="Punctuation",
+            message="Multiple consecutive exclamation/question marks",
+            suggestion="Use single punctuation for professional writing"
+        ), match.start())
     
-    prev_level = 0
+    match = re.search(r'\s[.,!?;:]', line)
+    if match:
+        add(_PUNCTUATION, Issue(
+            type=IssueType.ERROR,
+            category="Punctuation",
+            message="Space before punctuation mark",
+            suggestion="Remove space before punctuation"
+        ), match.start())
     
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        heading_match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        
-        if heading_match:
-            level = len(heading_match.group(1))
-            
-            if not re.match(r'^#{1,6}\s+\S', line):
-                issues.append(Issue(
-                    type=IssueType.ERROR,
-                    category="Heading Format",
-                    message="Missing space after # in heading",
-                    line_number=i,
-                    line_preview=line.strip(),
-                    suggestion="Add space: '# Title' not '#Title'"
-                ))
-            
-            if prev_level > 0 and level > prev_level + 1:
-                issues.append(Issue(
-                    type=IssueType.WARNING,
-                    category="Heading Hierarchy",
-                    message=f"Heading level skipped (H{prev_level} to H{level})",
-                    line_number=i,
-                    line_preview=line.strip(),
-                    suggestion="Use proper heading hierarchy without skipping levels"
-                ))
-            
-            prev_level = level
+    match = re.search(r'\.{4,}', line)
+    if match:
+        add(_PUNCTUATION, Issue(
+            type=IssueType.WARNING,
+            category="Punctuation",
+            message="Too many dots in ellipsis (should be 3)",
+            suggestion="Use three dots (...) or unicode ellipsis (…)"
+        ), match.start())
     
-    straight_double = text.count('"')
-    curly_double = text.count(""") + text.count(""")
+    if ' - ' in line:
+        add(_PUNCTUATION, Issue(
+            type=IssueType.INFO,
+            category="Punctuation",
+            message="Spaced hyphen found - consider em-dash",
+            suggestion="Use em-dash (—) without spaces for professional formatting"
+        ), line.find(' - '))
     
-    if straight_double > 10 and curly_double > 10:
-        issues.append(Issue(
-            type=IssueType.WARNING,
-            category="Smart Quotes",
-            message=f"Mixed straight ({straight_double}) and curly ({curly_double}) quotes",
-            suggestion="Use consistent quote style throughout manuscript"
-        ))
+    if line[-1] == ' ' or line[-1] == '\t':
+        add(_WHITESPACE, _trailing_whitespace_issue(), len(line.rstrip()), preview=False)
     
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        if '[' in line and ']' in line:
-            open_brackets = line.count('[')
-            close_brackets = line.count(']')
-            if open_brackets != close_brackets:
-                preview = line.strip()[:70]
-                issues.append(Issue(
-                    type=IssueType.ERROR,
-                    category="Markdown Links",
-                    message="Unmatched square brackets [ ]",
-                    line_number=i,
-                    line_preview=preview,
-                    suggestion="Ensure all brackets are properly paired"
+    if '  ' in stripped:
+        spaces = re.findall(r' {2,}', stripped)
+        if spaces:
+            max_spaces = max(len(s) for s in spaces)
+            if max_spaces > 2:
+                add(_WHITESPACE, Issue(
+                    type=IssueType.WARNING,
+                    category="Whitespace",
+                    message=f"Multiple consecutive spaces ({max_spaces}) found",
+                    suggestion="Use single spaces between words"
                 ))
     
-    consecutive_blanks = 0
-    for i, line in enumerate(lines, 1):
-        if not line.strip():
-            consecutive_blanks += 1
-        else:
-            if consecutive_blanks > 2:
-                issues.append(Issue(
-                    type=IssueType.INFO,
-                    category="Spacing",
-                    message=f"{consecutive_blanks} consecutive blank lines",
-                    line_number=i-1,
-                    suggestion="Use single blank line between paragraphs"
-                ))
-            consecutive_blanks = 0
+    if '\t' in line:
+        add(_WHITESPACE, Issue(
+            type=IssueType.INFO,
+            category="Whitespace",
+            message="Tab character found in content",
+            suggestion="Use spaces instead of tabs"
+        ), line.find('\t'))
     
-    for i, line in enumerate(lines, 1):
-        if len(line) > 1000:
-            issues.append(Issue(
+    heading_match = _HEADING_PATTERN.match(line)
+    if heading_match:
+        level = len(heading_match.group(1))
+        prev_level = state['prev_level']
+        
+        if not re.match(r'^#{1,6}\s+\S', line):
+            add(_HEADINGS, Issue(
+                type=IssueType.ERROR,
+                category="Heading Format",
+                message="Missing space after # in heading",
+                suggestion="Add space: '# Title' not '#Title'"
+            ))
+        
+        if prev_level > 0 and level > prev_level + 1:
+            add(_HEADINGS, Issue(
                 type=IssueType.WARNING,
-                category="Line Length",
-                message=f"Very long line ({len(line)} characters)",
-                line_number=i,
-                suggestion="Consider breaking into multiple lines"
+                category="Heading Hierarchy",
+                message=f"Heading level skipped (H{prev_level} to H{level})",
+                suggestion="Use proper heading hierarchy without skipping levels"
             ))
-    
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
         
-        if curly_double > straight_double * 2:
-            if '"' in line and re.search(r'\w+\s+"[^"]+"\s+\w+', line):
-                preview = line.strip()[:70]
-                issues.append(Issue(
-                    type=IssueType.INFO,
-                    category="Smart Quotes",
-                    message="Straight quote in primarily curly-quote document",
-                    line_number=i,
-                    line_preview=preview,
-                    suggestion="Consider using curly quotes for consistency"
-                ))
+        state['prev_level'] = level
     
-    for i, line in enumerate(lines, 1):
-        if is_line_ignored(line, i):
-            continue
-        
-        if '[INSERT' in line.upper() or '[ADD' in line.upper() or '[EDIT' in line.upper():
-            preview = line.strip()[:70]
-            issues.append(Issue(
+    if '[' in line and ']' in line:
+        if line.count('[') != line.count(']'):
+            add(_BRACKETS, Issue(
                 type=IssueType.ERROR,
-                category="Incomplete Content",
-                message="Placeholder text found",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Replace with actual content before publishing"
+                category="Markdown Links",
+                message="Unmatched square brackets [ ]",
+                suggestion="Ensure all brackets are properly paired"
             ))
-        
-        if 'lorem ipsum' in line.lower():
-            preview = line.strip()[:70]
-            issues.append(Issue(
-                type=IssueType.ERROR,
-                category="Incomplete Content",
-                message="Lorem Ipsum placeholder text found",
-                line_number=i,
-                line_preview=preview,
-                suggestion="Replace with actual content"
+    
+    if check_straight_quotes:
+        if '"' in line and re.search(r'\w+\s+"[^"]+"\s+\w+', line):
+            add(_STRAIGHT_QUOTES, Issue(
+                type=IssueType.INFO,
+                category="Smart Quotes",
+                message="Straight quote in primarily curly-quote document",
+                suggestion="Consider using curly quotes for consistency"
             ))
     
-    return issues
-
+    placeholder = re.search(r'\[(?:INSERT|ADD|EDIT)', line_upper)
+    if placeholder:
+        add(_CONTENT, Issue(
+            type=IssueType.ERROR,
+            category="Incomplete Content",
+            message="Placeholder text found",
+            suggestion="Replace with actual content before publishing"
+        ), placeholder.start())
+    
+    lorem = line_lower.find('lorem ipsum')
+    if lorem >= 0:
+        add(_CONTENT, Issue(
+            type=IssueType.ERROR,
+            category="Incomplete Content",
+            message="Lorem Ipsum placeholder text found",
+            suggestion="Replace with actual content"
+        ), lorem)
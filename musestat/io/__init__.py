@@ -2,19 +2,118 @@
 
 from .readers import (
     read_docx,
+    read_odt,
     read_rtf,
     read_text,
+    read_epub,
+    read_scrivener,
+    read_compressed,
+    read_project,
     read_manuscript,
-    get_supported_formats_info
+    get_supported_formats_info,
+    TextFileSource,
+    DocumentSource,
+    ProjectSource,
+    iter_project_text,
+    STREAMING_READERS
+)
+from .documents import (
+    DocumentParagraph,
+    iter_docx_paragraphs,
+    iter_docx_text,
+    iter_odt_paragraphs,
+    iter_odt_text,
+    paragraphs_to_markdown
+)
+from .rtf import RtfParser, iter_rtf_text, iter_rtf_blocks
+from .mapped import map_file, iter_decoded_blocks, iter_mapped_text, decode_blocks
+from .compressed import (
+    split_member_path,
+    archive_path,
+    is_compressed,
+    inner_extension,
+    open_compressed,
+    iter_decompressed,
+    iter_compressed_text,
+    prefetch
+)
+from .epub import SpineItem, read_epub_spine, xhtml_to_paragraphs, iter_epub_paragraphs, iter_epub_text
+from .scrivener import (
+    BinderDocument,
+    parse_binder,
+    iter_scrivener_documents,
+    iter_scrivener_text,
+    scrivener_cache_path
+)
+from .project import (
+    PROJECT_SEPARATOR,
+    is_glob,
+    is_project,
+    natural_key,
+    read_summary,
+    list_chapter_files,
+    resolve_project,
+    project_root,
+    project_cache_path
 )
 from .exporters import export_to_json, export_to_csv, export_to_html
 
 __all__ = [
     'read_docx',
+    'read_odt',
     'read_rtf',
     'read_text',
+    'read_epub',
+    'read_scrivener',
+    'read_compressed',
+    'read_project',
     'read_manuscript',
     'get_supported_formats_info',
+    'TextFileSource',
+    'DocumentSource',
+    'ProjectSource',
+    'iter_project_text',
+    'STREAMING_READERS',
+    'DocumentParagraph',
+    'iter_docx_paragraphs',
+    'iter_docx_text',
+    'iter_odt_paragraphs',
+    'iter_odt_text',
+    'paragraphs_to_markdown',
+    'RtfParser',
+    'iter_rtf_text',
+    'iter_rtf_blocks',
+    'map_file',
+    'iter_decoded_blocks',
+    'iter_mapped_text',
+    'decode_blocks',
+    'split_member_path',
+    'archive_path',
+    'is_compressed',
+    'inner_extension',
+    'open_compressed',
+    'iter_decompressed',
+    'iter_compressed_text',
+    'prefetch',
+    'SpineItem',
+    'read_epub_spine',
+    'xhtml_to_paragraphs',
+    'iter_epub_paragraphs',
+    'iter_epub_text',
+    'BinderDocument',
+    'parse_binder',
+    'iter_scrivener_documents',
+    'iter_scrivener_text',
+    'scrivener_cache_path',
+    'PROJECT_SEPARATOR',
+    'is_glob',
+    'is_project',
+    'natural_key',
+    'read_summary',
+    'list_chapter_files',
+    'resolve_project',
+    'project_root',
+    'project_cache_path',
     'export_to_json',
     'export_to_csv',
     'export_to_html',
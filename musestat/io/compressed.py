@@ -0,0 +1,264 @@
+"""
+Streaming readers for compressed manuscripts.
+
+``book.md.gz``, ``book.md.bz2`` and ``book.md.xz`` are decompressed as a
+stream, and a member of a zip archive is read in place by naming it after
+the archive: ``archive.zip::drafts/book.md``. Nothing is inflated to a
+temporary file, and the whole inflated text is never held unless the
+caller joins it.
+
+On a machine with more than one CPU, decompression runs on a background
+thread that stays a few blocks ahead of the reader (zlib, bz2 and lzma
+release the GIL while they work), so inflating the next block overlaps
+with analyzing the current one. The decompressed bytes go through the
+same readers as uncompressed files: the incremental UTF-8 decoder for
+text, ``RtfParser`` for .rtf, and the streaming Word and OpenDocument
+readers for .docx and .odt.
+"""
+
+import bz2
+import gzip
+import lzma
+import threading
+import zipfile
+from contextlib import contextmanager
+from pathlib import PurePosixPath
+from queue import Empty, Full, Queue
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from .documents import iter_docx_text, iter_odt_text
+from .mapped import decode_blocks
+from .rtf import iter_rtf_blocks
+from ..utils.concurrency import available_cpus
+
+# Decompressors for single-file formats, by extension
+COMPRESSED_OPENERS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+# Separates a zip archive from the member to read: archive.zip::path/inside.md
+ZIP_MEMBER_SEPARATOR = '::'
+
+# Decompressed bytes read at a time
+DEFAULT_DECOMPRESS_BLOCK_SIZE = 1 << 20
+
+# Decompressed blocks kept ready ahead of the reader
+DEFAULT_PREFETCH_DEPTH = 4
+
+# Seconds between checks for an abandoned reader while the queue is full
+_PUT_TIMEOUT = 0.1
+
+T = TypeVar('T')
+
+
+def split_member_path(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    Split ``archive.zip::path/inside.md`` into the archive and the member.
+
+    Args:
+        file_path: Manuscript path, possibly naming a zip member
+
+    Returns:
+        (path of the file on disk, member name or None)
+    """
+    archive, separator, member = file_path.partition(ZIP_MEMBER_SEPARATOR)
+    if separator and archive.lower().endswith('.zip') and member:
+        return archive, member
+    return file_path, None
+
+
+def archive_path(file_path: str) -> str:
+    """
+    Get the file on disk that holds a manuscript.
+
+    Args:
+        file_path: Manuscript path, possibly naming a zip member
+
+    Returns:
+        The zip archive for a member, otherwise the path itself
+    """
+    return split_member_path(file_path)[0]
+
+
+def is_compressed(file_path: str) -> bool:
+    """
+    Check whether a manuscript path names a compressed file or a zip member.
+
+    Args:
+        file_path: Manuscript path
+
+    Returns:
+        True if the manuscript must be decompressed to be read
+    """
+    archive, member = split_member_path(file_path)
+    return member is not None or PurePosixPath(archive).suffix.lower() in COMPRESSED_OPENERS
+
+
+def inner_extension(file_path: str) -> str:
+    """
+    Get the extension of the manuscript inside a compressed file.
+
+    Args:
+        file_path: Manuscript path (``book.md.gz``, ``archive.zip::book.rtf``, ...)
+
+    Returns:
+        Lower-case extension of the decompressed manuscript (e.g. '.md')
+    """
+    archive, member = split_member_path(file_path)
+    name = PurePosixPath(member if member is not None else archive.replace('\\', '/'))
+    if member is None and name.suffix.lower() in COMPRESSED_OPENERS:
+        name = name.with_suffix('')
+    return name.suffix.lower()
+
+
+@contextmanager
+def open_compressed(file_path: str) -> Iterator[BinaryIO]:
+    """
+    Open a compressed manuscript as a stream of its decompressed bytes.
+
+    Args:
+        file_path: Path to a .gz/.bz2/.xz file, or ``archive.zip::member``
+
+    Yields:
+        Readable (and seekable) binary file
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the archive is corrupt or has no such member
+    """
+    archive, member = split_member_path(file_path)
+    try:
+        if member is None:
+            with COMPRESSED_OPENERS[PurePosixPath(archive).suffix.lower()](archive, 'rb') as stream:
+                yield stream
+        else:
+            with zipfile.ZipFile(archive) as zip_file, zip_file.open(member) as stream:
+                yield stream
+    except KeyError as e:
+        raise ValueError(f"No member {member!r} in {archive}") from e
+    except (zipfile.BadZipFile, lzma.LZMAError, EOFError, NotImplementedError) as e:
+        raise ValueError(f"Cannot decompress {file_path}: {e}") from e
+
+
+def iter_decompressed(file_path: str, block_size: int = DEFAULT_DECOMPRESS_BLOCK_SIZE) -> Iterator[bytes]:
+    """
+    Stream the decompressed bytes of a manuscript.
+
+    Args:
+        file_path: Path to a .gz/.bz2/.xz file, or ``archive.zip::member``
+        block_size: Decompressed bytes per block
+
+    Yields:
+        Consecutive blocks of the decompressed bytes
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the archive is corrupt or has no such member
+    """
+    with open_compressed(file_path) as stream:
+        for block in iter(lambda: stream.read(block_size), b''):
+            yield block
+
+
+def prefetch(items: Iterable[T], depth: int = DEFAULT_PREFETCH_DEPTH) -> Iterator[T]:
+    """
+    Produce items on a background thread, a bounded number ahead of the consumer.
+
+    Errors raised while producing are re-raised to the consumer. If the
+    consumer stops early, the producer is stopped and closed.
+
+    Args:
+        items: Iterable whose items are slow to produce (e.g. decompressed blocks)
+        depth: Maximum number of items waiting to be consumed
+
+    Yields:
+        The items, in order
+    """
+    queue: Queue = Queue(maxsize=max(depth, 1))
+    stopped = threading.Event()
+    done = object()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                queue.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except Full:
+                continue
+        return False
+
+    def produce():
+        iterator = iter(items)
+        try:
+            for item in iterator:
+                if not put((item, None)):
+                    return
+            put((done, None))
+        except Exception as e:
+            put((done, e))
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close:
+                close()
+
+    thread = threading.Thread(target=produce, name='musestat-prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = queue.get()
+            if item is done:
+                if error:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        # Unblock a producer waiting on a full queue
+        try:
+            while True:
+                queue.get_nowait()
+        except Empty:
+            pass
+        thread.join()
+
+
+def iter_compressed_text(file_path: str, block_size: int = DEFAULT_DECOMPRESS_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Stream the text of a compressed manuscript.
+
+    The decompressed manuscript is read like an uncompressed file of the
+    inner extension: ``book.rtf.gz`` as RTF, ``archive.zip::book.docx`` as
+    a Word document (``.odt`` as an OpenDocument text), anything else as
+    UTF-8 text.
+
+    Args:
+        file_path: Path to a .gz/.bz2/.xz file, or ``archive.zip::member``
+        block_size: Decompressed bytes per block
+
+    Yields:
+        Pieces of the manuscript's text
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the archive is corrupt, has no such member, or the
+            manuscript cannot be decoded
+    """
+    extension = inner_extension(file_path)
+    if extension in ('.docx', '.odt'):
+        # The zip reader needs random access; the decompressed stream is seekable
+        with open_compressed(file_path) as stream:
+            yield from (iter_docx_text if extension == '.docx' else iter_odt_text)(stream)
+        return
+
+    blocks = iter_decompressed(file_path, block_size)
+    if available_cpus() > 1:
+        blocks = prefetch(blocks)
+    try:
+        if extension == '.rtf':
+            yield from iter_rtf_blocks(blocks)
+        else:
+            yield from decode_blocks(blocks)
+    finally:
+        blocks.close()
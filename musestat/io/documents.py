@@ -0,0 +1,443 @@
+"""
+Streaming readers for zipped XML document formats.
+
+Word documents are parsed straight out of the zip with ``iterparse``:
+each body paragraph is yielded as soon as its closing tag is read and its
+elements are discarded, so memory stays flat no matter how long the
+document is. Paragraph styles are resolved against ``word/styles.xml``
+so headings are known from their style ("Heading 1", "Heading 2", or any
+style with an outline level) rather than guessed from the text.
+
+OpenDocument text (.odt) is read the same way from ``content.xml``:
+``text:h`` headings carry their outline level, and paragraph styles with
+a default outline level (in ``styles.xml`` or the document's automatic
+styles) are headings too.
+
+``iter_docx_text`` and ``iter_odt_text`` turn the paragraphs into the
+Markdown the analyzer already understands: headings become ``#``/``##``
+lines, and paragraphs are separated by blank lines.
+"""
+
+import posixpath
+import re
+import zipfile
+from typing import BinaryIO, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+from xml.etree import ElementTree
+
+WORD_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+RELATIONSHIPS_NAMESPACE = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Package parts used when the relationships do not name them
+DOCX_DOCUMENT_PART = 'word/document.xml'
+DOCX_STYLES_PART = 'word/styles.xml'
+
+# Deepest heading level written as Markdown
+MAX_HEADING_LEVEL = 6
+
+# Built-in heading style names ("heading 1", as stored in styles.xml)
+HEADING_STYLE_PATTERN = re.compile(r'^heading\s*(\d)$', re.IGNORECASE)
+
+ODF_OFFICE_NAMESPACE = 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+ODF_TEXT_NAMESPACE = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
+ODF_STYLE_NAMESPACE = 'urn:oasis:names:tc:opendocument:xmlns:style:1.0'
+ODF_TABLE_NAMESPACE = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
+ODF_DRAWING_NAMESPACE = 'urn:oasis:names:tc:opendocument:xmlns:drawing:1.0'
+
+# Package parts of an OpenDocument text
+ODT_CONTENT_PART = 'content.xml'
+ODT_STYLES_PART = 'styles.xml'
+
+
+def _w(tag: str) -> str:
+    return f'{{{WORD_NAMESPACE}}}{tag}'
+
+
+_BODY = _w('body')
+_PARAGRAPH = _w('p')
+_STYLE = _w('style')
+_STYLE_ID = _w('styleId')
+_VAL = _w('val')
+_TYPE = _w('type')
+
+# Run content that becomes text, and subtrees whose text is not part of the paragraph
+_TEXT_TAGS = {_w('t')}
+_CHARACTER_TAGS = {_w('tab'): '\t', _w('br'): '\n', _w('cr'): '\n', _w('noBreakHyphen'): '-'}
+_SKIPPED_TAGS = {_w('del'), _w('txbxContent'), _w('pPr'), _w('rPr')}
+
+
+def _text(tag: str) -> str:
+    return f'{{{ODF_TEXT_NAMESPACE}}}{tag}'
+
+
+def _style(tag: str) -> str:
+    return f'{{{ODF_STYLE_NAMESPACE}}}{tag}'
+
+
+_ODT_TEXT = f'{{{ODF_OFFICE_NAMESPACE}}}text'
+_ODT_AUTOMATIC_STYLES = f'{{{ODF_OFFICE_NAMESPACE}}}automatic-styles'
+_ODT_HEADING = _text('h')
+_ODT_PARAGRAPH_TAGS = {_text('p'), _ODT_HEADING}
+_ODT_STYLE_NAME = _text('style-name')
+_ODT_OUTLINE_LEVEL = _text('outline-level')
+_ODT_SPACE = _text('s')
+_ODT_SPACE_COUNT = _text('c')
+
+# Inline elements that stand for characters, and inline subtrees that are not part
+# of the paragraph's text (notes, comments, frames such as text boxes, list numbers)
+_ODT_CHARACTER_TAGS = {_text('tab'): '\t', _text('line-break'): '\n'}
+_ODT_SKIPPED_TAGS = {
+    _text('note'), f'{{{ODF_OFFICE_NAMESPACE}}}annotation', f'{{{ODF_DRAWING_NAMESPACE}}}frame', _text('number'),
+}
+# Body-level containers whose paragraphs are not read, like Word's tables:
+# tables, tracked deletions and generated indexes (which repeat the headings)
+_ODT_SKIPPED_BLOCKS = {
+    f'{{{ODF_TABLE_NAMESPACE}}}table', _text('tracked-changes'), _text('table-of-content'),
+    _text('alphabetical-index'), _text('illustration-index'), _text('table-index'),
+    _text('object-index'), _text('user-index'), _text('bibliography'),
+}
+
+# Runs of XML whitespace, which ODF collapses to one space
+_ODT_WHITESPACE = re.compile(r'[ \t\r\n]+')
+
+
+class DocumentParagraph(NamedTuple):
+    """One paragraph of a word-processor document."""
+    text: str
+    style: Optional[str]
+    level: Optional[int]
+
+
+def _read_xml(archive: zipfile.ZipFile, name: str) -> Optional[ElementTree.Element]:
+    """Parse a (small) package part, or None if the package has no such part."""
+    try:
+        with archive.open(name) as part:
+            return ElementTree.parse(part).getroot()
+    except KeyError:
+        return None
+
+
+def _relationship_target(archive: zipfile.ZipFile, rels_part: str, kind: str, base: str = '') -> Optional[str]:
+    """Resolve the target of the first relationship of a kind (e.g. 'officeDocument')."""
+    root = _read_xml(archive, rels_part)
+    if root is None:
+        return None
+    for relationship in root.iter(f'{{{RELATIONSHIPS_NAMESPACE}}}Relationship'):
+        if relationship.get('Type', '').rsplit('/', 1)[-1] == kind:
+            target = relationship.get('Target', '')
+            if target.startswith('/'):
+                return target.lstrip('/')
+            return posixpath.normpath(posixpath.join(base, target))
+    return None
+
+
+def _outline_level(properties: Optional[ElementTree.Element]) -> Optional[int]:
+    """1-based heading level from a w:outlineLvl inside paragraph properties."""
+    if properties is None:
+        return None
+    outline = properties.find(_w('outlineLvl'))
+    if outline is None:
+        return None
+    try:
+        value = int(outline.get(_VAL, ''))
+    except ValueError:
+        return None
+    # Level 9 is "body text"
+    return value + 1 if 0 <= value < 9 else None
+
+
+def load_docx_heading_levels(archive: zipfile.ZipFile, styles_part: str = DOCX_STYLES_PART) -> Dict[str, int]:
+    """
+    Find the paragraph styles of a Word document that are headings.
+
+    A style is a heading if it is a built-in "heading N" style, has an
+    outline level, or is based on such a style.
+
+    Args:
+        archive: Open .docx package
+        styles_part: Name of the styles part in the package
+
+    Returns:
+        Mapping from style id to 1-based heading level
+    """
+    root = _read_xml(archive, styles_part)
+    if root is None:
+        return {}
+
+    levels: Dict[str, Optional[int]] = {}
+    based_on: Dict[str, str] = {}
+    for style in root.iter(_STYLE):
+        if style.get(_TYPE) != 'paragraph':
+            continue
+        style_id = style.get(_STYLE_ID)
+        if not style_id:
+            continue
+        name = style.find(_w('name'))
+        match = HEADING_STYLE_PATTERN.match(name.get(_VAL, '')) if name is not None else None
+        levels[style_id] = int(match.group(1)) if match else _outline_level(style.find(_w('pPr')))
+        parent = style.find(_w('basedOn'))
+        if parent is not None and parent.get(_VAL):
+            based_on[style_id] = parent.get(_VAL)
+
+    return _resolve_style_levels(levels, based_on)
+
+
+def _resolve_style_levels(levels: Dict[str, Optional[int]], based_on: Dict[str, str]) -> Dict[str, int]:
+    """Give styles without a heading level the level of the style they are based on."""
+    def resolve(style_id: str, seen: frozenset = frozenset()) -> Optional[int]:
+        level = levels.get(style_id)
+        if level is None and style_id in based_on and style_id not in seen:
+            return resolve(based_on[style_id], seen | {style_id})
+        return level
+
+    resolved = {style_id: resolve(style_id) for style_id in levels}
+    return {style_id: level for style_id, level in resolved.items() if level is not None}
+
+
+def _paragraph_text(paragraph: ElementTree.Element) -> str:
+    """Text of a w:p, without deleted revisions or text box content."""
+    pieces = []
+    stack = [iter(paragraph)]
+    while stack:
+        element = next(stack[-1], None)
+        if element is None:
+            stack.pop()
+        elif element.tag in _TEXT_TAGS:
+            pieces.append(element.text or '')
+        elif element.tag in _CHARACTER_TAGS:
+            pieces.append(_CHARACTER_TAGS[element.tag])
+        elif element.tag not in _SKIPPED_TAGS:
+            stack.append(iter(element))
+    return ''.join(pieces)
+
+
+def iter_docx_paragraphs(file_path: Union[str, BinaryIO]) -> Iterator[DocumentParagraph]:
+    """
+    Stream the body paragraphs of a Word document (.docx).
+
+    Only ``word/document.xml`` is parsed incrementally; each paragraph is
+    dropped from the tree once yielded. Like Word's own paragraph list,
+    paragraphs inside tables and text boxes are not included.
+
+    Args:
+        file_path: Path to .docx file, or a seekable binary file holding one
+
+    Yields:
+        DocumentParagraph with the text, style id and heading level (None for body text)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid Word document
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            document_part = _relationship_target(archive, '_rels/.rels', 'officeDocument') or DOCX_DOCUMENT_PART
+            base = posixpath.dirname(document_part)
+            rels_part = posixpath.join(base, '_rels', posixpath.basename(document_part) + '.rels')
+            styles_part = _relationship_target(archive, rels_part, 'styles', base) or DOCX_STYLES_PART
+            heading_levels = load_docx_heading_levels(archive, styles_part)
+
+            with archive.open(document_part) as part:
+                body = None
+                depth = 0
+                body_depth = -1
+                for event, element in ElementTree.iterparse(part, events=('start', 'end')):
+                    if event == 'start':
+                        depth += 1
+                        if element.tag == _BODY:
+                            body, body_depth = element, depth
+                        continue
+
+                    depth -= 1
+                    if depth != body_depth or body is None:
+                        continue
+                    if element.tag == _PARAGRAPH:
+                        properties = element.find(_w('pPr'))
+                        style_element = properties.find(_w('pStyle')) if properties is not None else None
+                        style = style_element.get(_VAL) if style_element is not None else None
+                        level = _outline_level(properties) or heading_levels.get(style)
+                        yield DocumentParagraph(_paragraph_text(element), style, level)
+                    # Body-level elements are finished; drop them to keep memory flat
+                    body.clear()
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ValueError(f"Not a valid Word document: {e}") from e
+
+
+def paragraphs_to_markdown(paragraphs: Iterable[DocumentParagraph]) -> Iterator[str]:
+    """
+    Render document paragraphs as Markdown blocks.
+
+    Headings become ``#`` lines of their level (Heading 1 -> ``#``,
+    Heading 2 -> ``##``), so chapter and part detection follow the
+    document's styles; empty paragraphs are dropped and the rest are
+    separated by blank lines.
+
+    Args:
+        paragraphs: Paragraphs in document order
+
+    Yields:
+        Pieces of Markdown text, to be concatenated
+    """
+    separator = ''
+    for paragraph in paragraphs:
+        text = paragraph.text.strip()
+        if not text:
+            continue
+        if paragraph.level:
+            # Heading text must stay on the heading line
+            text = '#' * min(paragraph.level, MAX_HEADING_LEVEL) + ' ' + ' '.join(text.split())
+        yield separator + text
+        separator = '\n\n'
+
+
+def iter_docx_text(file_path: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Stream a Word document as Markdown text.
+
+    Args:
+        file_path: Path to .docx file, or a seekable binary file holding one
+
+    Yields:
+        Pieces of the document's text, one paragraph at a time
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid Word document
+    """
+    return paragraphs_to_markdown(iter_docx_paragraphs(file_path))
+
+
+def _collect_odt_styles(
+    styles: ElementTree.Element,
+    levels: Dict[str, Optional[int]],
+    based_on: Dict[str, str]
+):
+    """Record the outline level and parent of every paragraph style under an element."""
+    for style in styles.iter(_style('style')):
+        name = style.get(_style('name'))
+        if not name or style.get(_style('family')) != 'paragraph':
+            continue
+        levels[name] = _parse_level(style.get(_style('default-outline-level')))
+        parent = style.get(_style('parent-style-name'))
+        if parent:
+            based_on[name] = parent
+
+
+def _parse_level(value: Optional[str]) -> Optional[int]:
+    """1-based heading level from an ODF outline level attribute."""
+    try:
+        level = int(value or '')
+    except ValueError:
+        return None
+    return level if level > 0 else None
+
+
+def _odt_paragraph_text(paragraph: ElementTree.Element) -> str:
+    """Text of a text:p or text:h, without notes, comments, frames or list numbers."""
+    pieces = [_ODT_WHITESPACE.sub(' ', paragraph.text or '')]
+    stack = [(iter(paragraph), '')]
+    while stack:
+        element = next(stack[-1][0], None)
+        if element is None:
+            pieces.append(_ODT_WHITESPACE.sub(' ', stack.pop()[1]))
+            continue
+        tail = element.tail or ''
+        if element.tag == _ODT_SPACE:
+            pieces.append(' ' * (_parse_level(element.get(_ODT_SPACE_COUNT)) or 1))
+        elif element.tag in _ODT_CHARACTER_TAGS:
+            pieces.append(_ODT_CHARACTER_TAGS[element.tag])
+        elif element.tag not in _ODT_SKIPPED_TAGS:
+            # The tail follows the element's own content
+            pieces.append(_ODT_WHITESPACE.sub(' ', element.text or ''))
+            stack.append((iter(element), tail))
+            continue
+        pieces.append(_ODT_WHITESPACE.sub(' ', tail))
+    return ''.join(pieces)
+
+
+def iter_odt_paragraphs(file_path: Union[str, BinaryIO]) -> Iterator[DocumentParagraph]:
+    """
+    Stream the paragraphs and headings of an OpenDocument text (.odt).
+
+    ``content.xml`` is parsed incrementally; each paragraph is removed from
+    the tree once yielded, so no document model is ever built. Paragraphs
+    in lists and sections are included; like the Word reader, paragraphs
+    in tables, text frames, notes and generated indexes are not.
+
+    Args:
+        file_path: Path to .odt file, or a seekable binary file holding one
+
+    Yields:
+        DocumentParagraph with the text, style name and heading level (None for body text)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid OpenDocument text
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            style_levels: Dict[str, Optional[int]] = {}
+            based_on: Dict[str, str] = {}
+            styles = _read_xml(archive, ODT_STYLES_PART)
+            if styles is not None:
+                _collect_odt_styles(styles, style_levels, based_on)
+            heading_levels = _resolve_style_levels(style_levels, based_on)
+
+            with archive.open(ODT_CONTENT_PART) as part:
+                # Open elements, from the root down
+                ancestors = []
+                in_body = 0
+                in_paragraph = 0
+                skipped = 0
+                for event, element in ElementTree.iterparse(part, events=('start', 'end')):
+                    tag = element.tag
+                    if event == 'start':
+                        ancestors.append(element)
+                        if tag == _ODT_TEXT:
+                            in_body += 1
+                        elif tag in _ODT_PARAGRAPH_TAGS:
+                            in_paragraph += 1
+                        elif tag in _ODT_SKIPPED_BLOCKS and not in_paragraph:
+                            skipped += 1
+                        continue
+
+                    ancestors.pop()
+                    if tag in _ODT_PARAGRAPH_TAGS:
+                        in_paragraph -= 1
+                        if in_body and not in_paragraph and not skipped:
+                            style = element.get(_ODT_STYLE_NAME)
+                            level = heading_levels.get(style)
+                            if tag == _ODT_HEADING:
+                                level = _parse_level(element.get(_ODT_OUTLINE_LEVEL)) or level or 1
+                            yield DocumentParagraph(_odt_paragraph_text(element), style, level)
+                    elif tag == _ODT_AUTOMATIC_STYLES:
+                        # Automatic styles precede the body; they may make a paragraph a heading
+                        _collect_odt_styles(element, style_levels, based_on)
+                        heading_levels = _resolve_style_levels(style_levels, based_on)
+                    elif tag == _ODT_TEXT:
+                        in_body -= 1
+                    elif tag in _ODT_SKIPPED_BLOCKS and not in_paragraph:
+                        skipped -= 1
+
+                    # Finished body elements outside paragraphs are dropped to keep memory
+                    # flat; earlier siblings are already gone, so this removes the first child
+                    if in_body and not in_paragraph:
+                        ancestors[-1].remove(element)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise ValueError(f"Not a valid OpenDocument text: {e}") from e
+
+
+def iter_odt_text(file_path: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Stream an OpenDocument text as Markdown text.
+
+    Args:
+        file_path: Path to .odt file, or a seekable binary file holding one
+
+    Yields:
+        Pieces of the document's text, one paragraph at a time
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid OpenDocument text
+    """
+    return paragraphs_to_markdown(iter_odt_paragraphs(file_path))
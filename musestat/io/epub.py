@@ -0,0 +1,341 @@
+"""
+EPUB reader.
+
+An EPUB is a zip of XHTML files. ``META-INF/container.xml`` names the
+package document (OPF), whose spine lists the XHTML files in reading
+order; the table of contents (the EPUB 3 ``nav`` document, or the EPUB 2
+``toc.ncx``) gives the titles.
+
+Spine items map directly to chapters: an item the table of contents
+points at starts a chapter with the contents' title (nested entries
+become parts and chapters, as with ``#``/``##`` headings), and an item
+it does not list (a chapter split across files, an epigraph) continues
+the previous one. Without a table of contents, an item's first heading
+starts a chapter. Non-linear items (e.g. pop-up notes) are skipped.
+
+The XHTML items are parsed into paragraphs in a pool of worker processes
+when more than one CPU is available, and handed on in spine order as each
+one is ready, so no single string of the whole book is built while
+streaming. Items that are not well-formed XML (e.g. HTML entities such as
+``&nbsp;``) fall back to the standard library's forgiving HTML parser.
+"""
+
+import posixpath
+import zipfile
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+from .documents import DocumentParagraph, paragraphs_to_markdown, MAX_HEADING_LEVEL
+from ..utils.concurrency import ordered_map
+
+CONTAINER_PART = 'META-INF/container.xml'
+CONTAINER_NAMESPACE = 'urn:oasis:names:tc:opendocument:xmlns:container'
+OPF_NAMESPACE = 'http://www.idpf.org/2007/opf'
+NCX_NAMESPACE = 'http://www.daisy.org/z3986/2005/ncx/'
+XHTML_NAMESPACE = 'http://www.w3.org/1999/xhtml'
+OPS_NAMESPACE = 'http://www.idpf.org/2007/ops'
+
+# Deepest table of contents level that becomes a heading (parts, then chapters)
+MAX_TOC_DEPTH = 2
+
+# Elements that end the current paragraph, and elements whose text is not content
+BLOCK_TAGS = frozenset((
+    'address', 'article', 'aside', 'blockquote', 'br', 'caption', 'dd', 'div', 'dl', 'dt',
+    'figcaption', 'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr',
+    'li', 'ol', 'p', 'pre', 'section', 'table', 'td', 'th', 'tr', 'ul',
+))
+SKIPPED_TAGS = frozenset(('head', 'script', 'style', 'title', 'rt', 'rp'))
+HEADING_TAGS = {f'h{level}': level for level in range(1, MAX_HEADING_LEVEL + 1)}
+
+
+class SpineItem(NamedTuple):
+    """One linear XHTML item of an EPUB's spine, in reading order."""
+    path: str
+    title: Optional[str]
+    level: Optional[int]
+
+
+@lru_cache(maxsize=None)
+def _local(tag: str) -> str:
+    """Element name without its namespace, lower-cased."""
+    return tag.rpartition('}')[2].lower()
+
+
+def _read_xml(archive: zipfile.ZipFile, name: str) -> Optional[ElementTree.Element]:
+    try:
+        return ElementTree.fromstring(archive.read(name))
+    except (KeyError, ElementTree.ParseError):
+        return None
+
+
+def _read_part(archive: zipfile.ZipFile, name: str) -> bytes:
+    """Bytes of a package part, or nothing if the manifest names a missing file."""
+    try:
+        return archive.read(name)
+    except KeyError:
+        return b''
+
+
+def _resolve(base: str, href: str) -> str:
+    """Package path of an href relative to a part, without its fragment."""
+    return posixpath.normpath(posixpath.join(base, unquote(href.split('#', 1)[0])))
+
+
+def _nav_entries(root: ElementTree.Element, base: str) -> List[Tuple[str, str, int]]:
+    """(path, title, depth) of the entries of an EPUB 3 navigation document's toc."""
+    entries: List[Tuple[str, str, int]] = []
+
+    def walk(ordered_list: ElementTree.Element, depth: int):
+        for item in ordered_list:
+            if _local(item.tag) != 'li':
+                continue
+            for child in item:
+                name = _local(child.tag)
+                if name == 'a' and child.get('href'):
+                    title = ' '.join(''.join(child.itertext()).split())
+                    entries.append((_resolve(base, child.get('href')), title, depth))
+                elif name == 'ol':
+                    walk(child, depth + 1)
+
+    for nav in root.iter(f'{{{XHTML_NAMESPACE}}}nav'):
+        if 'toc' in nav.get(f'{{{OPS_NAMESPACE}}}type', '').split():
+            for ordered_list in nav.iter(f'{{{XHTML_NAMESPACE}}}ol'):
+                walk(ordered_list, 1)
+                break
+            break
+    return entries
+
+
+def _ncx_entries(root: ElementTree.Element, base: str) -> List[Tuple[str, str, int]]:
+    """(path, title, depth) of the entries of an EPUB 2 toc.ncx."""
+    entries: List[Tuple[str, str, int]] = []
+    nav_point = f'{{{NCX_NAMESPACE}}}navPoint'
+
+    def walk(parent: ElementTree.Element, depth: int):
+        for point in parent.findall(nav_point):
+            content = point.find(f'{{{NCX_NAMESPACE}}}content')
+            title = point.findtext(f'{{{NCX_NAMESPACE}}}navLabel/{{{NCX_NAMESPACE}}}text') or ''
+            if content is not None and content.get('src'):
+                entries.append((_resolve(base, content.get('src')), ' '.join(title.split()), depth))
+            walk(point, depth + 1)
+
+    nav_map = root.find(f'{{{NCX_NAMESPACE}}}navMap')
+    if nav_map is not None:
+        walk(nav_map, 1)
+    return entries
+
+
+def read_epub_spine(archive: zipfile.ZipFile) -> List[SpineItem]:
+    """
+    Read the reading order and chapter titles of an EPUB.
+
+    Args:
+        archive: Open .epub package
+
+    Returns:
+        Linear spine items, each with the title and level of the table of
+        contents entry that points at it (None if it has none)
+
+    Raises:
+        ValueError: If the package has no readable container or package document
+    """
+    container = _read_xml(archive, CONTAINER_PART)
+    rootfile = container.find(f'.//{{{CONTAINER_NAMESPACE}}}rootfile') if container is not None else None
+    if rootfile is None or not rootfile.get('full-path'):
+        raise ValueError("Not a valid EPUB: no package document in META-INF/container.xml")
+    opf_path = rootfile.get('full-path')
+    package = _read_xml(archive, opf_path)
+    if package is None:
+        raise ValueError(f"Not a valid EPUB: cannot read {opf_path}")
+    base = posixpath.dirname(opf_path)
+
+    # Manifest id -> (package path, properties)
+    manifest: Dict[str, Tuple[str, str]] = {}
+    for item in package.iter(f'{{{OPF_NAMESPACE}}}item'):
+        manifest[item.get('id')] = (_resolve(base, item.get('href', '')), item.get('properties', ''))
+
+    # Table of contents: EPUB 3 navigation document, else the NCX
+    entries: List[Tuple[str, str, int]] = []
+    spine = package.find(f'{{{OPF_NAMESPACE}}}spine')
+    nav_path = next((path for path, properties in manifest.values() if 'nav' in properties.split()), None)
+    if nav_path:
+        nav = _read_xml(archive, nav_path)
+        if nav is not None:
+            entries = _nav_entries(nav, posixpath.dirname(nav_path))
+    if not entries and spine is not None and spine.get('toc') in manifest:
+        ncx_path = manifest[spine.get('toc')][0]
+        ncx = _read_xml(archive, ncx_path)
+        if ncx is not None:
+            entries = _ncx_entries(ncx, posixpath.dirname(ncx_path))
+
+    # The first entry pointing at a file titles it
+    titles: Dict[str, Tuple[str, int]] = {}
+    for path, title, depth in entries:
+        titles.setdefault(path, (title, depth))
+
+    items = []
+    for itemref in (spine if spine is not None else ()):
+        if itemref.get('linear', 'yes') == 'no' or itemref.get('idref') not in manifest:
+            continue
+        path = manifest[itemref.get('idref')][0]
+        title, depth = titles.get(path, (None, None))
+        heading = bool(title) and depth <= MAX_TOC_DEPTH
+        items.append(SpineItem(path, title if heading else None, depth if heading else None))
+    return items
+
+
+class _HtmlParagraphs(HTMLParser):
+    """Paragraphs of an XHTML document that is not well-formed XML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.paragraphs: List[DocumentParagraph] = []
+        self.buffer: List[str] = []
+        self.skipping = 0
+
+    def flush(self, level: Optional[int] = None):
+        text = ' '.join(''.join(self.buffer).split())
+        self.buffer.clear()
+        if text:
+            self.paragraphs.append(DocumentParagraph(text, None, level))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self.skipping += 1
+        elif tag in BLOCK_TAGS and not self.skipping:
+            self.flush()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self.skipping = max(self.skipping - 1, 0)
+        elif tag in BLOCK_TAGS and not self.skipping:
+            self.flush(HEADING_TAGS.get(tag))
+
+    def handle_data(self, data):
+        if not self.skipping:
+            self.buffer.append(data)
+
+
+def xhtml_to_paragraphs(data: bytes) -> List[DocumentParagraph]:
+    """
+    Extract the paragraphs of an XHTML document (run in the worker processes).
+
+    Args:
+        data: Raw bytes of the document
+
+    Returns:
+        Paragraphs in document order; h1-h6 carry their heading level
+    """
+    try:
+        root = ElementTree.fromstring(data)
+    except ElementTree.ParseError:
+        parser = _HtmlParagraphs()
+        parser.feed(data.decode('utf-8', errors='replace'))
+        parser.close()
+        parser.flush()
+        return parser.paragraphs
+
+    paragraphs: List[DocumentParagraph] = []
+    buffer: List[str] = []
+
+    def flush(level: Optional[int] = None):
+        text = ' '.join(''.join(buffer).split())
+        buffer.clear()
+        if text:
+            paragraphs.append(DocumentParagraph(text, None, level))
+
+    def walk(element: ElementTree.Element):
+        name = _local(element.tag) if isinstance(element.tag, str) else ''
+        if name in SKIPPED_TAGS or not isinstance(element.tag, str):
+            # Comments and processing instructions have no text, only a tail
+            if element.tail:
+                buffer.append(element.tail)
+            return
+        block = name in BLOCK_TAGS
+        if block:
+            flush()
+        if element.text:
+            buffer.append(element.text)
+        for child in element:
+            walk(child)
+        if block:
+            flush(HEADING_TAGS.get(name))
+        if element.tail:
+            buffer.append(element.tail)
+
+    body = next((child for child in root if _local(child.tag) == 'body'), root)
+    walk(body)
+    flush()
+    return paragraphs
+
+
+def _same_title(heading: str, title: str) -> bool:
+    return ' '.join(heading.split()).casefold() == ' '.join(title.split()).casefold()
+
+
+def iter_epub_paragraphs(file_path: str, workers: Optional[int] = None) -> Iterator[DocumentParagraph]:
+    """
+    Stream an EPUB as chapter headings and paragraphs.
+
+    Each spine item that starts a chapter yields a heading with the table
+    of contents' title (its own matching heading is not repeated); the
+    headings inside items are kept as ordinary paragraphs, so chapters
+    follow the spine rather than the markup.
+
+    Args:
+        file_path: Path to .epub file
+        workers: Worker processes for XHTML parsing (default: available CPUs)
+
+    Yields:
+        DocumentParagraph for each heading and paragraph, in reading order
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid EPUB
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            items = read_epub_spine(archive)
+            contents = [_read_part(archive, item.path) for item in items]
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not a valid EPUB: {e}") from e
+
+    has_toc = any(item.title for item in items)
+    parsed = ordered_map(xhtml_to_paragraphs, contents, workers)
+    try:
+        for item, paragraphs in zip(items, parsed):
+            title, level = item.title, item.level
+            first_heading = next((i for i, paragraph in enumerate(paragraphs) if paragraph.level), None)
+            if title is None and not has_toc and first_heading is not None:
+                # No table of contents: the item's first heading starts a chapter
+                title, level = paragraphs[first_heading].text, 1
+            if title is not None:
+                yield DocumentParagraph(title, None, level)
+                # Drop the item's own copy of the title (its first heading)
+                if first_heading is not None and _same_title(paragraphs[first_heading].text, title):
+                    paragraphs = paragraphs[:first_heading] + paragraphs[first_heading + 1:]
+            for paragraph in paragraphs:
+                yield paragraph._replace(level=None)
+    finally:
+        parsed.close()
+
+
+def iter_epub_text(file_path: str, workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream an EPUB as Markdown text.
+
+    Args:
+        file_path: Path to .epub file
+        workers: Worker processes for XHTML parsing (default: available CPUs)
+
+    Yields:
+        Pieces of the book's text, one paragraph at a time
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not a valid EPUB
+    """
+    return paragraphs_to_markdown(iter_epub_paragraphs(file_path, workers))
@@ -11,6 +11,8 @@ from datetime import datetime
 from typing import Dict
 from rich.console import Console
 
+from ..core.structure import CHAPTER, SCENE, get_level_sections
+
 console = Console()
 
 
@@ -29,6 +31,11 @@ def export_to_json(stats: Dict, output_file: str) -> bool:
         # Make stats JSON-serializable
         export_stats = stats.copy()
         export_stats['modified_date'] = stats['modified_date'].isoformat()
+        export_stats['chapters'] = [dict(ch) for ch in stats['chapters']]
+        if stats.get('structure') is not None:
+            export_stats['structure'] = stats['structure'].to_dict()
+        else:
+            export_stats.pop('structure', None)
         
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(export_stats, f, indent=2, ensure_ascii=False)
@@ -40,13 +47,14 @@ def export_to_json(stats: Dict, output_file: str) -> bool:
         return False
 
 
-def export_to_csv(stats: Dict, output_file: str) -> bool:
+def export_to_csv(stats: Dict, output_file: str, level: str = CHAPTER) -> bool:
     """
     Export statistics to CSV format.
     
     Args:
         stats: Statistics dictionary from analyzer
         output_file: Output file path
+        level: Structure level of the breakdown rows: 'part', 'chapter' or 'scene'
         
     Returns:
         True if successful, False otherwise
@@ -80,12 +88,46 @@ def export_to_csv(stats: Dict, output_file: str) -> bool:
                 writer.writerow(['Shortest Chapter', f"{cs['shortest_chapter']} ({cs['min']} words)"])
                 writer.writerow(['Longest Chapter', f"{cs['longest_chapter']} ({cs['max']} words)"])
             
-            # Chapter breakdown
+            # Scene statistics
+            if stats.get('scene_stats'):
+                ss = stats['scene_stats']
+                writer.writerow([''])
+                writer.writerow(['Scene Statistics', ''])
+                writer.writerow(['Scenes', ss['count']])
+                writer.writerow(['Mean Length', f"{ss['mean']:.0f} words"])
+                writer.writerow(['Median Length', f"{ss['median']:.0f} words"])
+                writer.writerow(['Quartiles', f"{ss['q1']:.0f} - {ss['q3']:.0f} words"])
+                writer.writerow(['Avg Sentence Length', f"{ss['avg_sentence_length']:.1f}"])
+                if ss.get('avg_dialogue_ratio') is not None:
+                    writer.writerow(['Avg Dialogue Ratio', f"{ss['avg_dialogue_ratio']:.1f}%"])
+                writer.writerow(['Short Outliers', len(ss['short_scenes'])])
+                writer.writerow(['Long Outliers', len(ss['long_scenes'])])
+                writer.writerow([''])
+                writer.writerow(['Scene Length (words)', 'Scenes'])
+                for bucket in ss['distribution']:
+                    writer.writerow([f"{bucket['min']}-{bucket['max']}", bucket['count']])
+            
+            # Breakdown at the requested level (scenes also get their chapter path)
             writer.writerow([''])
-            writer.writerow(['Chapter', 'Words', 'Percentage'])
-            for ch in stats['chapters']:
+            if level == SCENE:
+                writer.writerow([
+                    'Scene', 'Path', 'Line', 'Words', 'Percentage', 'Dialogue Ratio', 'Avg Sentence Length', 'Outlier'
+                ])
+            else:
+                writer.writerow([level.capitalize(), 'Line', 'Words', 'Percentage', 'Outlier Scenes'])
+            for ch in get_level_sections(stats, level):
                 pct = (ch['words'] / stats['total_words'] * 100) if stats['total_words'] > 0 else 0
-                writer.writerow([ch['title'], ch['words'], f"{pct:.1f}%"])
+                if level == SCENE:
+                    ratio = ch['dialogue_ratio']
+                    writer.writerow([
+                        ch['title'], ch['path'], ch['line'], ch['words'], f"{pct:.1f}%",
+                        f"{ratio:.1f}%" if ratio is not None else '',
+                        f"{ch['avg_sentence_length']:.1f}", ch['outlier'] or ''
+                    ])
+                else:
+                    writer.writerow([
+                        ch['title'], ch.get('line') or '', ch['words'], f"{pct:.1f}%", ch.get('outlier_scenes', 0)
+                    ])
         
         console.print(f"[green]✓ Exported to CSV: {output_file}[/green]")
         return True
@@ -267,6 +309,33 @@ def export_to_html(stats: Dict, output_file: str) -> bool:
     </div>
 """
         
+        # Scene statistics
+        ss = stats.get('scene_stats')
+        if ss:
+            outliers = ', '.join(
+                [f"{path} (short)" for path in ss['short_scenes']] + [f"{path} (long)" for path in ss['long_scenes']]
+            ) or 'None'
+            distribution = ''.join(
+                f"<tr><td>{bucket['min']:,} – {bucket['max']:,} words</td><td>{bucket['count']}</td></tr>"
+                for bucket in ss['distribution']
+            )
+            html += f"""
+    <div class="section">
+        <h2>Scene Statistics</h2>
+        <table>
+            <tr><td><strong>Scenes:</strong></td><td>{ss['count']:,}</td></tr>
+            <tr><td><strong>Average Length:</strong></td><td>{ss['mean']:.0f} words</td></tr>
+            <tr><td><strong>Median Length:</strong></td><td>{ss['median']:.0f} words</td></tr>
+            <tr><td><strong>Average Sentence Length:</strong></td><td>{ss['avg_sentence_length']:.1f} words</td></tr>
+            <tr><td><strong>Outliers:</strong></td><td>{outliers}</td></tr>
+        </table>
+        <table>
+            <thead><tr><th>Scene Length</th><th>Scenes</th></tr></thead>
+            <tbody>{distribution}</tbody>
+        </table>
+    </div>
+"""
+        
         # Chapter breakdown
         html += """
     <div class="section">
@@ -276,8 +345,10 @@ def export_to_html(stats: Dict, output_file: str) -> bool:
                 <tr>
                     <th>#</th>
                     <th>Chapter</th>
+                    <th>Line</th>
                     <th>Words</th>
                     <th>Percentage</th>
+                    <th>Outlier Scenes</th>
                 </tr>
             </thead>
             <tbody>
@@ -289,6 +360,7 @@ def export_to_html(stats: Dict, output_file: str) -> bool:
                 <tr>
                     <td>{i}</td>
                     <td>{ch['title']}</td>
+                    <td>{ch.get('line') or ''}</td>
                     <td>{ch['words']:,}</td>
                     <td>
                         {pct:.1f}%
@@ -296,6 +368,7 @@ def export_to_html(stats: Dict, output_file: str) -> bool:
                             <div class="progress-fill" style="width: {pct}%"></div>
                         </div>
                     </td>
+                    <td>{ch.get('outlier_scenes', 0) or ''}</td>
                 </tr>
 """
         
@@ -0,0 +1,131 @@
+"""
+Memory-mapped reader for plain text and Markdown files.
+
+The file is mapped read-only and decoded a large block at a time with an
+incremental UTF-8 decoder, so a multi-gigabyte manuscript never exists as
+one ``bytes`` or ``str`` object: only the current block is decoded, and
+the operating system pages the mapping in and out as needed. A character
+split across two blocks is completed by the decoder, and line endings are
+translated exactly as ``open(..., encoding='utf-8')`` does (``\\r\\n`` and
+``\\r`` become ``\\n``), even when a ``\\r\\n`` pair straddles a block.
+"""
+
+import codecs
+import io
+import mmap
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Bytes decoded at a time
+DEFAULT_MAP_BLOCK_SIZE = 8 << 20
+
+
+@contextmanager
+def map_file(file_path: str) -> Iterator[Optional[mmap.mmap]]:
+    """
+    Map a file read-only for the duration of the block.
+
+    Args:
+        file_path: Path to the file
+
+    Yields:
+        The mapping, or None for an empty file (which cannot be mapped)
+
+    Raises:
+        OSError: If the file cannot be opened or mapped
+    """
+    with open(file_path, 'rb') as f:
+        if not f.seek(0, io.SEEK_END):
+            yield None
+            return
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapping
+        finally:
+            mapping.close()
+
+
+def _new_decoder() -> io.IncrementalNewlineDecoder:
+    return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+
+
+def _pending_bytes(decoder: io.IncrementalNewlineDecoder) -> int:
+    """Bytes the decoder has consumed but not yet turned into characters."""
+    buffered, flag = decoder.getstate()
+    # The lowest bit of the flag is a held-back '\r'
+    return len(buffered) + (flag & 1)
+
+
+def iter_decoded_blocks(
+    mapping: Optional[mmap.mmap],
+    position: int = 0,
+    block_size: int = DEFAULT_MAP_BLOCK_SIZE
+) -> Iterator[Tuple[int, str]]:
+    """
+    Decode a mapped UTF-8 file block by block.
+
+    Args:
+        mapping: Mapping returned by ``map_file`` (None for an empty file)
+        position: Byte offset to start at; must be the start of a character
+        block_size: Bytes decoded at a time
+
+    Yields:
+        (byte offset where the text starts, text) for each non-empty block
+
+    Raises:
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    if mapping is None:
+        return
+    decoder = _new_decoder()
+    size = len(mapping)
+    while position < size:
+        end = min(position + block_size, size)
+        start = position - _pending_bytes(decoder)
+        text = decoder.decode(mapping[position:end], final=end == size)
+        position = end
+        if text:
+            yield start, text
+
+
+def iter_mapped_text(file_path: str, block_size: int = DEFAULT_MAP_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Stream the text of a UTF-8 file through a memory mapping.
+
+    Args:
+        file_path: Path to .txt or .md file
+        block_size: Bytes decoded at a time
+
+    Yields:
+        Consecutive pieces of the file's text
+
+    Raises:
+        OSError: If the file cannot be read
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    with map_file(file_path) as mapping:
+        for _, text in iter_decoded_blocks(mapping, 0, block_size):
+            yield text
+
+
+def decode_blocks(blocks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Decode consecutive blocks of UTF-8 bytes (e.g. from a decompressor).
+
+    Args:
+        blocks: Consecutive pieces of the file's bytes, split anywhere
+
+    Yields:
+        Consecutive pieces of the file's text, with newlines translated
+
+    Raises:
+        UnicodeDecodeError: If the bytes are not valid UTF-8
+    """
+    decoder = _new_decoder()
+    for block in blocks:
+        text = decoder.decode(block)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
@@ -0,0 +1,243 @@
+"""
+Multi-file book projects.
+
+A book split into chapter files is analyzed as one manuscript when ``-f``
+names one of:
+
+* an mdBook ``SUMMARY.md``, or a directory holding one (directly, or in
+  the source folder named by its ``book.toml``): the files it links to, in
+  the order of the summary;
+* a directory of chapter files: files whose names start with a number
+  (``01-arrival.md``, ``2-storm.md``, ...) in numeric order, or every
+  manuscript file when none are numbered; subfolders (e.g. one per part)
+  are read in the same order;
+* a glob (``"chapters/*.md"``, ``"book/**/*.md"``): the matching files in
+  natural order.
+
+The files are joined with a blank line between them, so no sentence or
+paragraph runs from one file into the next, and the chapters come from the
+headings in the files, as they would in a single manuscript.
+"""
+
+import glob
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import List, Tuple
+from urllib.parse import unquote
+
+from .compressed import COMPRESSED_OPENERS
+
+# Blank line written between the files of a project
+PROJECT_SEPARATOR = '\n\n'
+
+# mdBook table of contents and configuration
+SUMMARY_FILE_NAME = 'SUMMARY.md'
+MDBOOK_CONFIG_NAME = 'book.toml'
+MDBOOK_DEFAULT_SOURCE = 'src'
+
+# Files read from a project directory or glob
+PROJECT_EXTENSIONS = {'.md', '.markdown', '.txt', '.docx', '.odt', '.rtf'}
+
+# Project cache written inside the project folder; a glob's cache name also
+# carries a digest of its pattern, so two globs over one folder keep
+# separate caches (and none is mistaken for a Scrivener .musestat.cache)
+PROJECT_CACHE_NAME = '.musestat-project'
+PROJECT_CACHE_SUFFIX = '.cache'
+
+# Links in a summary line ("- [Title](path.md)"), and src = "..." in book.toml
+SUMMARY_LINK_PATTERN = re.compile(r'\[[^\]]*\]\(\s*<?([^)>]*?)>?\s*\)')
+MDBOOK_SOURCE_PATTERN = re.compile(r'^\s*src\s*=\s*["\']([^"\']+)["\']', re.MULTILINE)
+
+GLOB_CHARACTERS = re.compile(r'[*?[]')
+_DIGITS = re.compile(r'(\d+)')
+_URL_SCHEME = re.compile(r'^[a-z][a-z0-9+.-]*:', re.IGNORECASE)
+
+
+def is_glob(file_path: str) -> bool:
+    """
+    Check whether a manuscript path is a glob pattern.
+
+    Args:
+        file_path: Path given to -f
+
+    Returns:
+        True if the path has wildcards and is not itself an existing file
+    """
+    return bool(GLOB_CHARACTERS.search(file_path)) and not Path(file_path).exists()
+
+
+def is_project(file_path: str) -> bool:
+    """
+    Check whether a manuscript path names a multi-file project.
+
+    Args:
+        file_path: Path given to -f
+
+    Returns:
+        True for a directory (other than a Scrivener project), an mdBook
+        SUMMARY.md, or a glob pattern
+    """
+    path = Path(file_path)
+    if is_glob(file_path):
+        return True
+    if path.is_dir():
+        return path.suffix.lower() != '.scriv'
+    return path.name.lower() == SUMMARY_FILE_NAME.lower() and path.is_file()
+
+
+def natural_key(name: str) -> list:
+    """Sort key putting '2-storm.md' before '10-flood.md'."""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part.lower()) for part in _DIGITS.split(name) if part]
+
+
+def _is_manuscript_file(path: Path) -> bool:
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    if suffixes and suffixes[-1] in COMPRESSED_OPENERS:
+        suffixes.pop()
+    return (path.is_file() and bool(suffixes) and suffixes[-1] in PROJECT_EXTENSIONS
+            and path.name.lower() != SUMMARY_FILE_NAME.lower())
+
+
+def read_summary(summary_path: str) -> List[str]:
+    """
+    List the chapter files of an mdBook summary, in order.
+
+    Draft chapters (links without a target), external links and anchors
+    are skipped; a file linked twice is read once.
+
+    Args:
+        summary_path: Path to SUMMARY.md
+
+    Returns:
+        Paths of the linked files, relative to the current directory
+
+    Raises:
+        OSError: If the summary cannot be read
+    """
+    base = Path(summary_path).parent
+    files = []
+    seen = set()
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            match = SUMMARY_LINK_PATTERN.search(line)
+            if not match:
+                continue
+            target = unquote(match.group(1).split('#', 1)[0].strip())
+            if not target or _URL_SCHEME.match(target):
+                continue
+            path = base / target
+            if path not in seen:
+                seen.add(path)
+                files.append(str(path))
+    return files
+
+
+def _mdbook_summary(directory: Path) -> Path:
+    """The SUMMARY.md of a directory, or of the mdBook whose book.toml it holds."""
+    config = directory / MDBOOK_CONFIG_NAME
+    if config.is_file():
+        match = MDBOOK_SOURCE_PATTERN.search(config.read_text(encoding='utf-8'))
+        return directory / (match.group(1) if match else MDBOOK_DEFAULT_SOURCE) / SUMMARY_FILE_NAME
+    return directory / SUMMARY_FILE_NAME
+
+
+def list_chapter_files(directory: str) -> List[str]:
+    """
+    List the chapter files of a directory, subfolders included.
+
+    When some names at a level start with a number, only those are read,
+    so notes or a README next to numbered chapters are left out. Hidden
+    files and folders are skipped.
+
+    Args:
+        directory: Project directory
+
+    Returns:
+        Paths of the files, in natural order
+    """
+    entries = [
+        entry for entry in Path(directory).iterdir()
+        if not entry.name.startswith('.') and (entry.is_dir() or _is_manuscript_file(entry))
+    ]
+    numbered = [entry for entry in entries if entry.name[:1].isdigit()]
+    files = []
+    for entry in sorted(numbered or entries, key=lambda entry: natural_key(entry.name)):
+        if entry.is_dir():
+            files.extend(list_chapter_files(str(entry)))
+        else:
+            files.append(str(entry))
+    return files
+
+
+def resolve_project(file_path: str) -> List[str]:
+    """
+    List the files of a multi-file project in reading order.
+
+    Args:
+        file_path: Directory, mdBook SUMMARY.md, or glob pattern
+
+    Returns:
+        Paths of the project's files
+
+    Raises:
+        OSError: If the directory or summary cannot be read
+        ValueError: If the project has no manuscript files
+    """
+    path = Path(file_path)
+    if is_glob(file_path):
+        matches = [Path(match) for match in glob.glob(file_path, recursive=True)]
+        matches.sort(key=lambda match: [natural_key(part) for part in match.parts])
+        files = [str(match) for match in matches if _is_manuscript_file(match)]
+    elif path.is_dir():
+        summary = _mdbook_summary(path)
+        files = read_summary(str(summary)) if summary.is_file() else list_chapter_files(file_path)
+    else:
+        files = read_summary(file_path)
+
+    if not files:
+        raise ValueError(f"No manuscript files in {file_path}")
+    return files
+
+
+def _split_glob(file_path: str) -> Tuple[str, str]:
+    """Split a glob into the folder before its first wildcard and the pattern within it."""
+    folder = os.path.dirname(file_path[:GLOB_CHARACTERS.search(file_path).start()])
+    return folder or '.', file_path[len(folder):].lstrip('/' + os.sep) if folder else file_path
+
+
+def project_root(file_path: str) -> Path:
+    """
+    Get the path that stands for a project on disk.
+
+    Args:
+        file_path: Directory, mdBook SUMMARY.md, or glob pattern
+
+    Returns:
+        The directory or summary itself, or the folder a glob searches
+    """
+    if is_glob(file_path):
+        file_path = _split_glob(file_path)[0]
+    return Path(file_path).resolve()
+
+
+def project_cache_path(file_path: str) -> Path:
+    """
+    Get the per-file analysis cache path of a project.
+
+    Args:
+        file_path: Directory, mdBook SUMMARY.md, or glob pattern
+
+    Returns:
+        Path of the cache inside the project folder (e.g.
+        book/.musestat-project.cache for the book/ folder or book/SUMMARY.md,
+        chapters/.musestat-project-<digest>.cache for "chapters/*.md")
+    """
+    if is_glob(file_path):
+        folder, pattern = _split_glob(file_path)
+        digest = hashlib.sha256(pattern.encode('utf-8')).hexdigest()[:12]
+        return Path(folder).resolve() / f'{PROJECT_CACHE_NAME}-{digest}{PROJECT_CACHE_SUFFIX}'
+    root = project_root(file_path)
+    folder = root if root.is_dir() else root.parent
+    return folder / (PROJECT_CACHE_NAME + PROJECT_CACHE_SUFFIX)
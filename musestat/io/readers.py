@@ -1,24 +1,27 @@
 """
 File readers for various manuscript formats.
 
-Supports .md, .txt, .docx, and .rtf files.
+Supports .md, .txt, .docx, .odt and .rtf files, also compressed (.gz, .bz2,
+.xz) or inside a zip archive (``archive.zip::path/inside.md``), EPUB
+books, Scrivener projects (.scriv directories), and books split across
+several files (a directory, an mdBook SUMMARY.md, or a glob).
 """
 
+import tempfile
+import threading
+from bisect import bisect_right
 from pathlib import Path
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from rich.console import Console
 
-# Optional imports for different file formats
-try:
-    from docx import Document
-    DOCX_SUPPORT = True
-except ImportError:
-    DOCX_SUPPORT = False
-
-try:
-    from striprtf.striprtf import rtf_to_text
-    RTF_SUPPORT = True
-except ImportError:
-    RTF_SUPPORT = False
+from .documents import iter_docx_text, iter_odt_text
+from .rtf import iter_rtf_text
+from .mapped import map_file, iter_decoded_blocks, iter_mapped_text
+from .compressed import archive_path, is_compressed, iter_compressed_text
+from .scrivener import iter_scrivener_text
+from .epub import iter_epub_text
+from .project import PROJECT_SEPARATOR, is_project, resolve_project
+from ..utils.concurrency import ordered_map
 
 console = Console()
 
@@ -27,22 +30,39 @@ def read_docx(file_path: str) -> str:
     """
     Read a Word document (.docx).
     
+    The document XML is parsed as a stream (see ``io.documents``); heading
+    styles become Markdown headings and paragraphs are separated by blank lines.
+    
     Args:
         file_path: Path to .docx file
         
     Returns:
         Text content of the document, or empty string on error
     """
-    if not DOCX_SUPPORT:
-        console.print("[bold red]Error:[/bold red] python-docx not installed. Install with: pip install python-docx")
+    try:
+        return ''.join(iter_docx_text(file_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading DOCX file:[/bold red] {e}")
         return ""
+
+
+def read_odt(file_path: str) -> str:
+    """
+    Read an OpenDocument text (.odt), as written by LibreOffice.
+    
+    ``content.xml`` is parsed as a stream (see ``io.documents``); headings
+    become Markdown headings and paragraphs are separated by blank lines.
     
+    Args:
+        file_path: Path to .odt file
+        
+    Returns:
+        Text content of the document, or empty string on error
+    """
     try:
-        doc = Document(file_path)
-        paragraphs = [para.text for para in doc.paragraphs]
-        return '\n'.join(paragraphs)
-    except Exception as e:
-        console.print(f"[bold red]Error reading DOCX file:[/bold red] {e}")
+        return ''.join(iter_odt_text(file_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading ODT file:[/bold red] {e}")
         return ""
 
 
@@ -50,21 +70,18 @@ def read_rtf(file_path: str) -> str:
     """
     Read a Rich Text Format (.rtf) file.
     
+    The file is tokenized as a stream (see ``io.rtf``); pictures and other
+    non-text groups are skipped without being decoded.
+    
     Args:
         file_path: Path to .rtf file
         
     Returns:
         Text content of the file, or empty string on error
     """
-    if not RTF_SUPPORT:
-        console.print("[bold red]Error:[/bold red] striprtf not installed. Install with: pip install striprtf")
-        return ""
-    
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            rtf_content = f.read()
-        return rtf_to_text(rtf_content)
-    except Exception as e:
+        return ''.join(iter_rtf_text(file_path))
+    except OSError as e:
         console.print(f"[bold red]Error reading RTF file:[/bold red] {e}")
         return ""
 
@@ -73,6 +90,9 @@ def read_text(file_path: str) -> str:
     """
     Read a plain text or markdown file (.txt, .md).
     
+    The file is memory-mapped and decoded in blocks (see ``io.mapped``), so
+    only the decoded text is held, never a second copy of the raw bytes.
+    
     Args:
         file_path: Path to text file
         
@@ -80,13 +100,329 @@ def read_text(file_path: str) -> str:
         Text content of the file, or empty string on error
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        return ''.join(iter_mapped_text(file_path))
     except Exception as e:
         console.print(f"[bold red]Error reading file:[/bold red] {e}")
         return ""
 
 
+def read_epub(file_path: str) -> str:
+    """
+    Read an EPUB book (.epub).
+    
+    The spine gives the reading order and the table of contents the
+    chapter titles; the XHTML items are parsed in parallel (see ``io.epub``).
+    
+    Args:
+        file_path: Path to .epub file
+        
+    Returns:
+        Text content of the book, or empty string on error
+    """
+    try:
+        return ''.join(iter_epub_text(file_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading EPUB file:[/bold red] {e}")
+        return ""
+
+
+def read_scrivener(file_path: str) -> str:
+    """
+    Read a Scrivener project (.scriv directory, or its .scrivx binder).
+    
+    The binder gives the document order and the chapter titles; the RTF
+    documents are parsed in parallel and cached (see ``io.scrivener``).
+    
+    Args:
+        file_path: Path to the .scriv directory
+        
+    Returns:
+        Text of the project's manuscript (Draft folder), or empty string on error
+    """
+    try:
+        return ''.join(iter_scrivener_text(file_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading Scrivener project:[/bold red] {e}")
+        return ""
+
+
+def read_compressed(file_path: str) -> str:
+    """
+    Read a compressed manuscript (.gz, .bz2, .xz, or ``archive.zip::member``).
+    
+    The file is decompressed as a stream (see ``io.compressed``) and read
+    like an uncompressed file of its inner extension.
+    
+    Args:
+        file_path: Path to the compressed file or zip member
+        
+    Returns:
+        Text content of the manuscript, or empty string on error
+    """
+    try:
+        return ''.join(iter_compressed_text(file_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading compressed file:[/bold red] {e}")
+        return ""
+
+
+def read_project(file_path: str) -> str:
+    """
+    Read a book split across several files as one manuscript.
+    
+    The files (see ``io.project``) are read in parallel and joined with a
+    blank line between them.
+    
+    Args:
+        file_path: Project directory, mdBook SUMMARY.md, or glob pattern
+        
+    Returns:
+        Text of the whole project, or empty string on error
+    """
+    try:
+        return ''.join(iter_project_text(file_path))
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error reading project:[/bold red] {e}")
+        return ""
+
+
+def iter_project_text(file_path: str, workers: Optional[int] = None) -> Iterator[str]:
+    """
+    Stream the text of a multi-file project, one file at a time.
+    
+    Args:
+        file_path: Project directory, mdBook SUMMARY.md, or glob pattern
+        workers: Worker processes reading the files (default: available CPUs)
+        
+    Yields:
+        The text of each file, and the blank line between files
+        
+    Raises:
+        OSError: If the project cannot be listed
+        ValueError: If the project has no manuscript files
+    """
+    texts = ordered_map(read_manuscript, resolve_project(file_path), workers)
+    try:
+        for i, text in enumerate(texts):
+            if i:
+                yield PROJECT_SEPARATOR
+            yield text
+    finally:
+        texts.close()
+
+
+# Characters read at a time when streaming a text file
+DEFAULT_STREAM_CHUNK_SIZE = 1 << 20
+
+
+class TextFileSource:
+    """
+    Character-addressable view of a text file that is read on demand.
+
+    The file is memory-mapped and decoded incrementally (see ``io.mapped``).
+    ``iter_chunks`` remembers the byte position where each chunk starts, so
+    a later slice (e.g. one chapter's content) decodes from the nearest
+    chunk instead of keeping the whole manuscript in memory.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.length = 0
+        # (character offset, byte position) at the start of each chunk
+        self._checkpoints: List[Tuple[int, int]] = [(0, 0)]
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Decode the file in chunks.
+
+        Args:
+            chunk_size: Number of bytes decoded per chunk (a chunk has at most
+                as many characters)
+
+        Yields:
+            Consecutive pieces of the file's text
+        """
+        checkpoints = []
+        offset = 0
+        with map_file(self.file_path) as mapping:
+            for position, chunk in iter_decoded_blocks(mapping, 0, chunk_size):
+                checkpoints.append((offset, position))
+                offset += len(chunk)
+                yield chunk
+        self.length = offset
+        self._checkpoints = checkpoints or [(0, 0)]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, key: slice) -> str:
+        if not isinstance(key, slice):
+            raise TypeError("TextFileSource only supports slicing")
+        start, stop, _ = key.indices(self.length)
+        if stop <= start:
+            return ""
+        i = bisect_right(self._checkpoints, (start, float('inf'))) - 1
+        offset, position = self._checkpoints[i]
+        pieces = []
+        needed = stop - offset
+        with map_file(self.file_path) as mapping:
+            # A character takes at least one byte, so one block usually suffices
+            for _, text in iter_decoded_blocks(mapping, position, max(needed, 4096)):
+                pieces.append(text[:needed])
+                needed -= len(pieces[-1])
+                if not needed:
+                    break
+        return ''.join(pieces)[start - offset:]
+
+
+class DocumentSource:
+    """
+    Character-addressable view of text produced piece by piece.
+
+    For formats that are parsed rather than read (e.g. .docx), ``iter_chunks``
+    runs the streaming parser once, groups its pieces into chunks and spools
+    them as UTF-8 to a temporary file, remembering the byte position where
+    each chunk starts. A later slice (e.g. one chapter's content) decodes
+    only the chunks it overlaps from the spool instead of parsing the
+    document again or keeping the whole text in memory.
+
+    Args:
+        open_pieces: Function returning a fresh iterator over the text's pieces
+    """
+
+    def __init__(self, open_pieces: Callable[[], Iterable[str]]):
+        self.open_pieces = open_pieces
+        self.length = 0
+        self._spool: Optional[IO[bytes]] = None
+        # Character offset and spool byte position at the start of each chunk
+        self._offsets: List[int] = []
+        self._positions: List[int] = []
+        self._lock = threading.Lock()
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Parse the document and group its text into chunks.
+
+        Args:
+            chunk_size: Minimum number of characters per chunk (the last may be shorter)
+
+        Yields:
+            Consecutive pieces of the document's text
+        """
+        self.close()
+        spool = tempfile.TemporaryFile(prefix='musestat-')
+        offsets, positions = [], []
+        offset = 0
+
+        def spooled(chunk: str) -> str:
+            nonlocal offset
+            offsets.append(offset)
+            positions.append(spool.tell())
+            spool.write(chunk.encode('utf-8', 'surrogatepass'))
+            offset += len(chunk)
+            return chunk
+
+        try:
+            buffer = []
+            buffered = 0
+            for piece in self.open_pieces():
+                buffer.append(piece)
+                buffered += len(piece)
+                if buffered >= chunk_size:
+                    yield spooled(''.join(buffer))
+                    buffer = []
+                    buffered = 0
+            if buffer:
+                yield spooled(''.join(buffer))
+            offsets.append(offset)
+            positions.append(spool.tell())
+        except BaseException:
+            spool.close()
+            raise
+        self._spool = spool
+        self._offsets, self._positions = offsets, positions
+        self.length = offset
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, key: slice) -> str:
+        if not isinstance(key, slice):
+            raise TypeError("DocumentSource only supports slicing")
+        start, stop, _ = key.indices(self.length)
+        if stop <= start:
+            return ""
+        # Chunks holding the first and the last character of the slice
+        first = bisect_right(self._offsets, start) - 1
+        last = bisect_right(self._offsets, stop - 1)
+        with self._lock:
+            self._spool.seek(self._positions[first])
+            data = self._spool.read(self._positions[last] - self._positions[first])
+        text = data.decode('utf-8', 'surrogatepass')
+        offset = self._offsets[first]
+        return text[start - offset:stop - offset]
+
+    def close(self):
+        """Remove the spooled text (slices are empty until ``iter_chunks`` runs again)."""
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        self._offsets, self._positions = [], []
+        self.length = 0
+
+
+class ProjectSource:
+    """
+    Character-addressable view of a multi-file project.
+
+    The files are taken as joined by ``PROJECT_SEPARATOR``; a slice reads
+    only the files it overlaps.
+
+    Args:
+        files: Paths of the project's files, in order
+        lengths: Length of each file's text
+    """
+
+    def __init__(self, files: Sequence[str], lengths: Sequence[int]):
+        self.files = list(files)
+        self.starts: List[int] = []
+        offset = 0
+        for length in lengths:
+            self.starts.append(offset)
+            offset += length + len(PROJECT_SEPARATOR)
+        self.length = max(offset - len(PROJECT_SEPARATOR), 0)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, key: slice) -> str:
+        if not isinstance(key, slice):
+            raise TypeError("ProjectSource only supports slicing")
+        start, stop, _ = key.indices(self.length)
+        if stop <= start:
+            return ""
+        pieces = []
+        for i in range(max(bisect_right(self.starts, start) - 1, 0), len(self.files)):
+            file_start = self.starts[i]
+            if file_start - len(PROJECT_SEPARATOR) >= stop:
+                break
+            if i:
+                pieces.append(PROJECT_SEPARATOR[max(start - file_start + len(PROJECT_SEPARATOR), 0):])
+            pieces.append(read_manuscript(self.files[i])[max(start - file_start, 0):stop - file_start])
+        return ''.join(pieces)[:stop - start]
+
+
+# Formats parsed into text piece by piece, by extension
+STREAMING_READERS: Dict[str, Callable[[str], Iterator[str]]] = {
+    '.docx': iter_docx_text,
+    '.odt': iter_odt_text,
+    '.rtf': iter_rtf_text,
+    '.epub': iter_epub_text,
+    '.scriv': iter_scrivener_text,
+    '.scrivx': iter_scrivener_text,
+}
+
+
 def read_manuscript(file_path: str) -> str:
     """
     Read the manuscript file (auto-detects format from extension).
@@ -97,19 +433,31 @@ def read_manuscript(file_path: str) -> str:
     Returns:
         Text content of the file, or empty string on error
     """
-    path = Path(file_path)
+    if is_project(file_path):
+        return read_project(file_path)
+    
+    path = Path(archive_path(file_path))
     
     if not path.exists():
-        console.print(f"[bold red]Error:[/bold red] File '{file_path}' not found!")
+        console.print(f"[bold red]Error:[/bold red] File '{path}' not found!")
         return ""
     
+    if is_compressed(file_path):
+        return read_compressed(file_path)
+    
     extension = path.suffix.lower()
     
     # Route to appropriate reader based on file extension
     if extension == '.docx':
         return read_docx(file_path)
+    elif extension == '.odt':
+        return read_odt(file_path)
     elif extension == '.rtf':
         return read_rtf(file_path)
+    elif extension == '.epub':
+        return read_epub(file_path)
+    elif extension in ['.scriv', '.scrivx']:
+        return read_scrivener(file_path)
     elif extension in ['.txt', '.md', '.markdown']:
         return read_text(file_path)
     else:
@@ -130,15 +478,19 @@ def get_supported_formats_info() -> str:
         "✓ Plain Text (.txt) - Built-in",
     ]
     
-    if DOCX_SUPPORT:
-        formats.append("✓ Word Document (.docx) - Available")
-    else:
-        formats.append("✗ Word Document (.docx) - install python-docx")
+    formats.append("✓ Word Document (.docx) - Built-in")
     
-    if RTF_SUPPORT:
-        formats.append("✓ Rich Text Format (.rtf) - Available")
-    else:
-        formats.append("✗ Rich Text Format (.rtf) - install striprtf")
+    formats.append("✓ OpenDocument Text (.odt) - Built-in")
+    
+    formats.append("✓ Rich Text Format (.rtf) - Built-in")
+    
+    formats.append("✓ EPUB book (.epub) - Built-in")
+    
+    formats.append("✓ Scrivener project (.scriv) - Built-in")
+    
+    formats.append("✓ Compressed (.gz, .bz2, .xz) and zip members (archive.zip::book.md) - Built-in")
+    
+    formats.append("✓ Multi-file projects (directory, mdBook SUMMARY.md, or glob) - Built-in")
     
     return "\n".join(formats)
 
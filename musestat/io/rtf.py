@@ -0,0 +1,398 @@
+"""
+Streaming Rich Text Format (.rtf) reader.
+
+``RtfParser`` is fed the file's bytes a block at a time and returns the
+text of each block as soon as it is decoded. Control words, symbols, hex
+escapes and text runs are matched with one compiled pattern (a whole run
+of plain text is one token, not one per character), and groups that hold
+no document text (``\\*`` destinations, ``\\pict`` images, font and style
+tables, headers, fields' instructions, ...) are skipped by scanning only
+for braces, so embedded hex pictures are never tokenized or copied.
+``\\binN`` data is skipped by length without looking at it.
+
+The extracted text matches striprtf's ``rtf_to_text`` (paragraphs end with
+a newline, ``\\sect``/``\\page`` with a blank line), except that field
+instructions (e.g. hyperlink targets) are dropped and fonts are restored
+at the end of a group, as the RTF specification requires.
+"""
+
+import codecs
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Bytes read from the file at a time
+DEFAULT_RTF_BLOCK_SIZE = 1 << 20
+
+# Longest control word: backslash, 32 letters, sign, 10 digits and a space
+MAX_CONTROL_WORD_LENGTH = 45
+
+DEFAULT_ENCODING = 'cp1252'
+
+# Control words that start a destination holding no document text
+DESTINATIONS = frozenset((
+    'aftncn', 'aftnsep', 'aftnsepc', 'annotation', 'atnauthor', 'atndate', 'atnicn', 'atnid',
+    'atnparent', 'atnref', 'atntime', 'atrfend', 'atrfstart', 'author', 'background',
+    'bkmkend', 'bkmkstart', 'blipuid', 'buptim', 'category', 'colorschememapping',
+    'colortbl', 'comment', 'company', 'creatim', 'datafield', 'datastore', 'defchp', 'defpap',
+    'do', 'doccomm', 'docvar', 'dptxbxtext', 'ebcend', 'ebcstart', 'factoidname', 'falt',
+    'fchars', 'ffdeftext', 'ffentrymcr', 'ffexitmcr', 'ffformat', 'ffhelptext', 'ffl',
+    'ffname', 'ffstattext', 'file', 'filetbl', 'fldinst', 'fldtype', 'fonttbl',
+    'fname', 'fontemb', 'fontfile', 'footer', 'footerf', 'footerl', 'footerr',
+    'footnote', 'formfield', 'ftncn', 'ftnsep', 'ftnsepc', 'g', 'generator', 'gridtbl',
+    'header', 'headerf', 'headerl', 'headerr', 'hl', 'hlfr', 'hlinkbase', 'hlloc', 'hlsrc',
+    'hsv', 'htmltag', 'info', 'keycode', 'keywords', 'latentstyles', 'lchars', 'levelnumbers',
+    'leveltext', 'lfolevel', 'linkval', 'list', 'listlevel', 'listname', 'listoverride',
+    'listoverridetable', 'listpicture', 'liststylename', 'listtable', 'lsdlockedexcept',
+    'mailmerge', 'manager', 'mmath', 'nesttableprops', 'nextfile', 'nonesttables',
+    'objalias', 'objclass', 'objdata', 'object', 'objname', 'objsect', 'objtime', 'oldcprops',
+    'oldpprops', 'oldsprops', 'oldtprops', 'oleclsid', 'operator', 'panose', 'password',
+    'passwordhash', 'pgp', 'pgptbl', 'picprop', 'pict', 'pn', 'pnseclvl', 'pntext', 'pntxta',
+    'pntxtb', 'printim', 'private', 'propname', 'protend', 'protstart', 'protusertbl', 'pxe',
+    'result', 'revtbl', 'revtim', 'rsidtbl', 'rxe', 'shp', 'shpgrp', 'shpinst',
+    'shppict', 'shprslt', 'shptxt', 'sn', 'sp', 'staticval', 'stylesheet', 'subject', 'sv',
+    'svb', 'tc', 'template', 'themedata', 'title', 'txe', 'ud', 'upr', 'userprops',
+    'wgrffmtfilter', 'windowcaption', 'writereservation', 'writereservhash', 'xe', 'xform',
+    'xmlattrname', 'xmlattrvalue', 'xmlclose', 'xmlname', 'xmlnstbl', 'xmlopen',
+))
+
+# Control words and symbols that stand for text; section breaks also reset the font
+SECTION_BREAKS = {'par': '\n', 'sect': '\n\n', 'page': '\n\n'}
+SPECIAL_CHARACTERS = {
+    'line': '\n',
+    'tab': '\t',
+    'emdash': '\u2014',
+    'endash': '\u2013',
+    'emspace': '\u2003',
+    'enspace': '\u2002',
+    'qmspace': '\u2005',
+    'bullet': '\u2022',
+    'lquote': '\u2018',
+    'rquote': '\u2019',
+    'ldblquote': '\u201C',
+    'rdblquote': '\u201D',
+    'row': '\n',
+    'cell': '|',
+    'nestcell': '|',
+    '~': '\xa0',
+    '\n': '\n',
+    '\r': '\r',
+    '{': '{',
+    '}': '}',
+    '\\': '\\',
+    '-': '\xad',
+    '_': '\u2011',
+    **SECTION_BREAKS,
+}
+
+# Font charsets (\fcharsetN) to Python codecs
+CHARSET_ENCODINGS = {
+    0: 'cp1252', 2: 'cp1252', 77: 'mac_roman', 128: 'cp932', 129: 'cp949', 130: 'johab',
+    134: 'cp936', 136: 'cp950', 161: 'cp1253', 162: 'cp1254', 163: 'cp1258', 177: 'cp1255',
+    178: 'cp1256', 186: 'cp1257', 204: 'cp1251', 222: 'cp874', 238: 'cp1250', 254: 'cp437',
+    255: 'cp850',
+}
+
+# Control word, hex escape, control symbol, brace, line break or a run of plain text
+RTF_TOKEN_PATTERN = re.compile(
+    rb"\\([a-zA-Z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-fA-F]{2})|\\([^a-zA-Z])|([{}])|[\r\n]+|([^\\{}\r\n]+)|\\",
+    re.DOTALL
+)
+
+# What matters while skipping a group: binary data, escaped characters and braces
+RTF_SKIP_PATTERN = re.compile(rb"\\bin(\d{1,10}) ?|\\[\\{}]|[{}]")
+
+# Font table entries: "\f1 ... \fcharset204 ... Name;"
+FONT_ENTRY_PATTERN = re.compile(rb"\\f(\d+)")
+FONT_CHARSET_PATTERN = re.compile(rb"\\fcharset(\d+)")
+
+_OPEN = ord('{')
+_BACKSLASH = ord('\\')
+
+# Groups of RTF_TOKEN_PATTERN
+_WORD, _ARGUMENT, _HEX, _SYMBOL, _BRACE, _TEXT = range(1, 7)
+
+
+# Control words that change the parser's state or stand for text (others are formatting)
+_HANDLED_WORDS = DESTINATIONS | SPECIAL_CHARACTERS.keys() | {'u', 'uc', 'f', 'deff', 'ansicpg', 'bin'}
+
+
+def _lookup_encoding(name: str) -> str:
+    try:
+        codecs.lookup(name)
+    except LookupError:
+        return DEFAULT_ENCODING
+    return name
+
+
+class RtfParser:
+    """
+    Incremental RTF to text converter.
+
+    Args:
+        encoding: Codepage used until the document declares one (``\\ansicpgN``)
+    """
+
+    def __init__(self, encoding: str = DEFAULT_ENCODING):
+        self.encoding = encoding
+        self.fonts: Dict[bytes, str] = {}
+        self.font: Optional[bytes] = None
+        self.default_font: Optional[bytes] = None
+        # Saved (ucskip, font) of every open group
+        self.stack: List[Tuple[int, Optional[bytes]]] = []
+        self.ucskip = 1
+        self.curskip = 0
+        self.started = False
+        self.finished = False
+        # Open braces left in the group being skipped (0: not skipping)
+        self.skip_depth = 0
+        self.bin_remaining = 0
+        self._font_table: Optional[bytearray] = None
+        self._hexes = bytearray()
+        self._pending = b''
+        self._out: List[str] = []
+        self._surrogates = False
+
+    def feed(self, data: bytes) -> str:
+        """
+        Parse the next block of the file.
+
+        A control word cut off at the end of the block is kept for the next call.
+
+        Args:
+            data: Next bytes of the file
+
+        Returns:
+            Text decoded from the block (possibly empty)
+        """
+        buffer = self._pending + data if self._pending else data
+        end = len(buffer)
+        cut = buffer.rfind(b'\\', max(end - MAX_CONTROL_WORD_LENGTH, 0))
+        if cut != -1:
+            # Keep a run of backslashes together so "\\" is not split
+            while cut > 0 and buffer[cut - 1] == _BACKSLASH:
+                cut -= 1
+            end = cut
+        self._pending = buffer[self._process(buffer, 0, end):]
+        return self._take()
+
+    def close(self) -> str:
+        """
+        Parse whatever is left after the last block.
+
+        Returns:
+            Remaining decoded text
+        """
+        buffer, self._pending = self._pending, b''
+        self._process(buffer, 0, len(buffer))
+        self._flush_hexes()
+        return self._take(final=True)
+
+    def _take(self, final: bool = False) -> str:
+        text = ''.join(self._out)
+        self._out.clear()
+        if self._surrogates:
+            # \u escapes spell characters outside the BMP as surrogate pairs;
+            # a leading half at the end of a block waits for the other half
+            if not final and text and '\ud800' <= text[-1] <= '\udbff':
+                self._out.append(text[-1])
+                text = text[:-1]
+            else:
+                self._surrogates = False
+            text = text.encode('utf-16-le', 'surrogatepass').decode('utf-16-le', 'replace')
+        return text
+
+    def _flush_hexes(self):
+        if self._hexes:
+            encoding = self.fonts.get(self.font, self.encoding)
+            self._out.append(self._hexes.decode(encoding, 'replace'))
+            self._hexes.clear()
+
+    def _process(self, buffer: bytes, pos: int, end: int) -> int:
+        """Parse buffer[pos:end] (binary data may run past end); return where parsing stopped."""
+        out = self._out
+        while pos < end and not self.finished:
+            if self.bin_remaining:
+                step = min(self.bin_remaining, len(buffer) - pos)
+                self.bin_remaining -= step
+                pos += step
+                continue
+            if self.skip_depth:
+                pos = self._skip(buffer, pos, end)
+                continue
+
+            for match in RTF_TOKEN_PATTERN.finditer(buffer, pos, end):
+                pos = match.end()
+                kind = match.lastindex
+                if kind == _HEX:
+                    if self.curskip:
+                        self.curskip -= 1
+                    else:
+                        self._hexes.append(int(match.group(_HEX), 16))
+                    continue
+                if self._hexes:
+                    self._flush_hexes()
+
+                if kind == _TEXT:
+                    text = match.group(_TEXT)
+                    if self.curskip:
+                        skipped = min(self.curskip, len(text))
+                        self.curskip -= skipped
+                        text = text[skipped:]
+                    if text:
+                        out.append(text.decode(self.fonts.get(self.font, self.encoding), 'replace'))
+                    continue
+                if kind is None:
+                    # Line breaks in the file (and stray backslashes) are not text
+                    continue
+
+                self.curskip = 0
+                if kind <= _ARGUMENT:
+                    word = match.group(_WORD).decode('ascii')
+                    if word in _HANDLED_WORDS:
+                        self._control_word(word, match.group(_ARGUMENT))
+                elif kind == _BRACE:
+                    if buffer[match.start()] == _OPEN:
+                        self.started = True
+                        self.stack.append((self.ucskip, self.font))
+                    else:
+                        self._close_group()
+                else:
+                    symbol = match.group(_SYMBOL).decode('latin-1')
+                    if symbol == '*':
+                        self._start_skip()
+                    elif symbol in SPECIAL_CHARACTERS:
+                        if symbol in SECTION_BREAKS:
+                            self.font = self.default_font
+                        out.append(SPECIAL_CHARACTERS[symbol])
+                if self.skip_depth or self.bin_remaining or self.finished:
+                    break
+            else:
+                pos = end
+        return pos
+
+    def _control_word(self, word: str, arg: Optional[bytes]):
+        if word in DESTINATIONS:
+            if word == 'fonttbl':
+                self._font_table = bytearray()
+            self._start_skip()
+        elif word in SPECIAL_CHARACTERS:
+            if word in SECTION_BREAKS:
+                self.font = self.default_font
+            self._out.append(SPECIAL_CHARACTERS[word])
+        elif word == 'u':
+            if arg is not None:
+                code = int(arg) % 0x10000
+                self._surrogates = self._surrogates or 0xD800 <= code <= 0xDFFF
+                self._out.append(chr(code))
+            self.curskip = self.ucskip
+        elif word == 'uc':
+            self.ucskip = int(arg) if arg is not None else 1
+        elif word == 'f':
+            self.font = arg
+        elif word == 'deff':
+            self.default_font = arg
+        elif word == 'ansicpg' and arg is not None:
+            self.encoding = _lookup_encoding(f"cp{int(arg)}")
+        elif word == 'bin' and arg is not None:
+            self.bin_remaining = max(int(arg), 0)
+
+    def _start_skip(self):
+        """Skip the rest of the current group."""
+        self.skip_depth = 1
+
+    def _skip(self, buffer: bytes, pos: int, end: int) -> int:
+        """Scan for the brace closing the skipped group; return where scanning stopped."""
+        for match in RTF_SKIP_PATTERN.finditer(buffer, pos, end):
+            token = match.group()
+            if match.group(1) is not None:
+                self._capture(buffer, pos, match.end())
+                self.bin_remaining = int(match.group(1))
+                return match.end()
+            if token == b'{':
+                self.skip_depth += 1
+            elif token == b'}':
+                self.skip_depth -= 1
+                if not self.skip_depth:
+                    self._capture(buffer, pos, match.start())
+                    self._close_group()
+                    return match.end()
+        self._capture(buffer, pos, end)
+        return end
+
+    def _capture(self, buffer: bytes, start: int, end: int):
+        if self._font_table is not None:
+            self._font_table += buffer[start:end]
+            if not self.skip_depth:
+                self._load_fonts(bytes(self._font_table))
+                self._font_table = None
+
+    def _load_fonts(self, table: bytes):
+        """Record the encoding of every font in a font table that declares a charset."""
+        for entry in table.split(b';'):
+            font = FONT_ENTRY_PATTERN.search(entry)
+            charset = FONT_CHARSET_PATTERN.search(entry)
+            if font and charset:
+                encoding = CHARSET_ENCODINGS.get(int(charset.group(1)))
+                if encoding:
+                    self.fonts[font.group(1)] = _lookup_encoding(encoding)
+
+    def _close_group(self):
+        if self.stack:
+            self.ucskip, self.font = self.stack.pop()
+        if self.started and not self.stack:
+            # Anything after the document group is out of band
+            self.finished = True
+
+
+def iter_rtf_text(file_path: str, block_size: int = DEFAULT_RTF_BLOCK_SIZE) -> Iterator[str]:
+    """
+    Stream the text of an RTF file.
+
+    Args:
+        file_path: Path to .rtf file
+        block_size: Bytes read at a time
+
+    Yields:
+        Pieces of the document's text as each block is parsed
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    with open(file_path, 'rb') as f:
+        yield from iter_rtf_blocks(iter(lambda: f.read(block_size), b''))
+
+
+def iter_rtf_blocks(blocks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Stream the text of an RTF document given as consecutive blocks of bytes.
+
+    Args:
+        blocks: Consecutive pieces of the document, split anywhere
+
+    Yields:
+        Pieces of the document's text as each block is parsed
+    """
+    parser = RtfParser()
+    for block in blocks:
+        text = parser.feed(block)
+        if text:
+            yield text
+        if parser.finished:
+            break
+    text = parser.close()
+    if text:
+        yield text
+
+
+def rtf_to_text(data: bytes) -> str:
+    """
+    Convert a whole RTF document to text.
+
+    Args:
+        data: Raw bytes of the RTF document
+
+    Returns:
+        Text of the document
+    """
+    parser = RtfParser()
+    return parser.feed(data) + parser.close()
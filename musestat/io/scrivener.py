@@ -0,0 +1,299 @@
+"""
+Scrivener project (.scriv) reader.
+
+A Scrivener project is a directory: the binder (``Project.scrivx``, XML)
+holds the order, titles and nesting of the documents, and every document
+is its own RTF file (``Files/Data/<UUID>/content.rtf`` in Scrivener 3,
+``Files/Docs/<ID>.rtf`` in older projects). Only the Draft folder (the
+manuscript) is read, skipping documents excluded from compile.
+
+The binder becomes the manuscript's structure instead of headings being
+guessed from the text:
+
+* a folder (or a document with subdocuments) at the top of the Draft is a
+  chapter heading (``#``), and so is a top-level text document;
+* with two levels of folders, the outer ones are parts (``#``) and the
+  inner ones chapters (``##``), as with Markdown headings;
+* the documents inside a chapter are its scenes, separated by ``***``.
+
+Documents are converted with ``RtfParser`` in a pool of worker processes
+(when more than one CPU is available), and the extracted text is cached
+next to the project (``Project.musestat.cache``) keyed by each file's
+modification time and size, so re-reading a project only parses the
+documents that changed.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+from .documents import DocumentParagraph, paragraphs_to_markdown
+from .rtf import iter_rtf_text
+from ..utils.concurrency import ordered_map
+
+SCRIVENER_PROJECT_SUFFIX = '.scriv'
+SCRIVENER_BINDER_SUFFIX = '.scrivx'
+
+# Extraction cache written next to the project
+SCRIVENER_CACHE_SUFFIX = '.musestat.cache'
+CACHE_FORMAT_VERSION = 1
+
+# Binder item types
+DRAFT_FOLDER = 'DraftFolder'
+FOLDER = 'Folder'
+
+# Deepest binder level that becomes a heading (parts, then chapters)
+MAX_HEADING_DEPTH = 2
+
+# Line written between the documents of one chapter
+SCENE_SEPARATOR = '***'
+
+UNTITLED = 'Untitled'
+
+
+class BinderDocument(NamedTuple):
+    """One compiled binder item of a Scrivener project, in binder order."""
+    title: str
+    level: Optional[int]
+    path: Optional[str]
+
+
+def _find_binder(project: Path) -> Path:
+    """The .scrivx file of a project (named after the project when there are several)."""
+    binders = sorted(project.glob('*' + SCRIVENER_BINDER_SUFFIX))
+    if not binders:
+        raise ValueError(f"No {SCRIVENER_BINDER_SUFFIX} binder in {project}")
+    for binder in binders:
+        if binder.stem == project.stem:
+            return binder
+    return binders[0]
+
+
+def _document_path(project: Path, item: ElementTree.Element) -> Optional[str]:
+    """Relative path of a binder item's text, or None if it has none yet."""
+    uuid = item.get('UUID')
+    candidates = []
+    if uuid:
+        candidates.append(f'Files/Data/{uuid}/content.rtf')
+    if item.get('ID'):
+        candidates.append(f"Files/Docs/{item.get('ID')}.rtf")
+    for candidate in candidates:
+        if (project / candidate).is_file():
+            return candidate
+    return None
+
+
+def _include_flag(item: ElementTree.Element) -> Optional[bool]:
+    flag = item.findtext('MetaData/IncludeInCompile')
+    return None if flag is None else flag.strip().lower() == 'yes'
+
+
+def parse_binder(project_path: str) -> List[BinderDocument]:
+    """
+    Read the Draft folder of a Scrivener project's binder.
+
+    Args:
+        project_path: Path to the .scriv directory (or its .scrivx file)
+
+    Returns:
+        Compiled documents in binder order, with their heading level
+        (None for a scene) and RTF path relative to the project
+
+    Raises:
+        OSError: If the binder cannot be read
+        ValueError: If the project has no valid binder
+    """
+    project = Path(project_path)
+    if project.suffix.lower() == SCRIVENER_BINDER_SUFFIX:
+        project = project.parent
+    try:
+        root = ElementTree.parse(_find_binder(project)).getroot()
+    except ElementTree.ParseError as e:
+        raise ValueError(f"Not a valid Scrivener binder: {e}") from e
+
+    top_items = root.findall('Binder/BinderItem')
+    draft = next((item for item in top_items if item.get('Type') == DRAFT_FOLDER), None)
+    items = draft.findall('Children/BinderItem') if draft is not None else top_items[:1]
+    # Projects that never set the flag compile everything
+    flags = [_include_flag(item) for item in root.iter('BinderItem')]
+    use_flags = any(flag is not None for flag in flags)
+
+    documents: List[BinderDocument] = []
+
+    def walk(item: ElementTree.Element, depth: int):
+        children = item.findall('Children/BinderItem')
+        if not use_flags or _include_flag(item):
+            is_container = item.get('Type') == FOLDER or bool(children)
+            heading = depth <= MAX_HEADING_DEPTH and (is_container or depth == 1)
+            title = ' '.join((item.findtext('Title') or '').split()) or UNTITLED
+            documents.append(BinderDocument(title, depth if heading else None, _document_path(project, item)))
+        for child in children:
+            walk(child, depth + 1)
+
+    for item in items:
+        walk(item, 1)
+    return documents
+
+
+def extract_document_text(path: str) -> str:
+    """
+    Extract the text of one RTF document (run in the worker processes).
+
+    Args:
+        path: Path to the .rtf file
+
+    Returns:
+        Text of the document
+    """
+    return ''.join(iter_rtf_text(path))
+
+
+def scrivener_cache_path(project_path: str) -> Path:
+    """
+    Get the extraction cache path of a Scrivener project.
+
+    Args:
+        project_path: Path to the .scriv directory
+
+    Returns:
+        Path of the cache next to the project (Project.musestat.cache)
+    """
+    return Path(project_path).with_suffix(SCRIVENER_CACHE_SUFFIX)
+
+
+def _load_cache(path: Path) -> Dict[str, list]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get('version') == CACHE_FORMAT_VERSION:
+            return cache['documents']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+
+def _save_cache(path: Path, documents: Dict[str, list]):
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_FORMAT_VERSION, 'documents': documents}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def _file_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        file_stat = path.stat()
+    except OSError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+def _is_current(entry, key: Tuple[int, int]) -> bool:
+    """Whether a cache entry ([mtime_ns, size, text]) matches the file's key."""
+    return isinstance(entry, list) and len(entry) == 3 and tuple(entry[:2]) == key
+
+
+def iter_scrivener_documents(
+    project_path: str,
+    workers: Optional[int] = None,
+    use_cache: bool = True
+) -> Iterator[Tuple[BinderDocument, str]]:
+    """
+    Stream the compiled documents of a Scrivener project with their text.
+
+    Documents whose cached text is still current (same modification time
+    and size) are not parsed again; the rest are parsed in a process pool
+    and yielded in binder order as soon as each one is ready.
+
+    Args:
+        project_path: Path to the .scriv directory (or its .scrivx file)
+        workers: Worker processes (default: available CPUs; 1 parses in-process)
+        use_cache: Read and update the extraction cache next to the project
+
+    Yields:
+        (document, text) pairs in binder order
+
+    Raises:
+        OSError: If the binder cannot be read
+        ValueError: If the project has no valid binder
+    """
+    project = Path(project_path)
+    if project.suffix.lower() == SCRIVENER_BINDER_SUFFIX:
+        project = project.parent
+    documents = parse_binder(str(project))
+    cache_path = scrivener_cache_path(str(project))
+    cache = _load_cache(cache_path) if use_cache else {}
+
+    keys = {doc.path: _file_key(project / doc.path) for doc in documents if doc.path}
+    misses = [path for path, key in keys.items() if key and not _is_current(cache.get(path), key)]
+    missing = set(misses)
+    parsed = ordered_map(extract_document_text, [str(project / path) for path in misses], workers)
+    try:
+        fresh: Dict[str, list] = {}
+        for document in documents:
+            text = ''
+            key = keys.get(document.path)
+            if key:
+                if document.path not in fresh:
+                    entry = cache.get(document.path)
+                    if document.path in missing:
+                        entry = [*key, next(parsed)]
+                    fresh[document.path] = entry
+                text = fresh[document.path][2]
+            yield document, text
+    finally:
+        parsed.close()
+
+    if use_cache and (misses or set(cache) != set(fresh)):
+        _save_cache(cache_path, fresh)
+
+
+def scrivener_to_paragraphs(documents: Iterator[Tuple[BinderDocument, str]]) -> Iterator[DocumentParagraph]:
+    """
+    Lay out Scrivener documents as headings, paragraphs and scene breaks.
+
+    Args:
+        documents: (document, text) pairs in binder order
+
+    Yields:
+        DocumentParagraph for each heading, text line and scene separator
+    """
+    scene_open = False
+    for document, text in documents:
+        if document.level:
+            yield DocumentParagraph(document.title, None, document.level)
+            scene_open = False
+        lines = [line for line in text.split('\n') if line.strip()]
+        if not lines:
+            continue
+        if scene_open and not document.level:
+            yield DocumentParagraph(SCENE_SEPARATOR, None, None)
+        for line in lines:
+            yield DocumentParagraph(line, None, None)
+        scene_open = True
+
+
+def iter_scrivener_text(project_path: str, workers: Optional[int] = None, use_cache: bool = True) -> Iterator[str]:
+    """
+    Stream a Scrivener project's manuscript as Markdown text.
+
+    Args:
+        project_path: Path to the .scriv directory (or its .scrivx file)
+        workers: Worker processes (default: available CPUs)
+        use_cache: Read and update the extraction cache next to the project
+
+    Yields:
+        Pieces of the manuscript's text, one paragraph at a time
+
+    Raises:
+        OSError: If the binder cannot be read
+        ValueError: If the project has no valid binder
+    """
+    return paragraphs_to_markdown(scrivener_to_paragraphs(iter_scrivener_documents(project_path, workers, use_cache)))
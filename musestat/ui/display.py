@@ -20,6 +20,7 @@ from .panels import (
     create_achievement_badge_panel,
     create_milestone_panel,
     create_chapter_stats_panel,
+    create_scene_stats_panel,
     create_density_heat_map_panel
 )
 from .tables import (
@@ -31,6 +32,7 @@ from .tables import (
     create_word_frequency_table
 )
 from ..utils.achievements import get_achievement_badge
+from ..core.structure import get_level_sections
 
 console = Console()
 
@@ -60,6 +62,7 @@ def display_statistics(
             - hide_heat_map: Hide density heat map
             - hide_chapter_details: Hide chapter breakdown table
             - show_top_chapters: Show top N longest chapters
+            - level: Structure level of the breakdown table ('part', 'chapter' or 'scene')
     """
     if display_options is None:
         display_options = {}
@@ -71,6 +74,7 @@ def display_statistics(
     hide_heat_map = display_options.get('hide_heat_map', False)
     hide_chapter_details = display_options.get('hide_chapter_details', False)
     show_top_chapters = display_options.get('show_top_chapters')
+    level = display_options.get('level', 'chapter')
     console.clear()
     
     with Progress(
@@ -198,6 +202,13 @@ def display_statistics(
                 console.print(panel)
                 console.print()
         
+        scene_stats = stats.get('scene_stats')
+        if scene_stats and scene_stats['count'] > 1:
+            panel = create_scene_stats_panel(scene_stats)
+            if panel:
+                console.print(panel)
+                console.print()
+        
         if not hide_heat_map and stats.get('chapters') and len(stats['chapters']) > 1:
             heat_map_panel = create_density_heat_map_panel(stats['chapters'])
             if heat_map_panel:
@@ -210,7 +221,12 @@ def display_statistics(
             console.print()
         
         if not hide_chapter_details and stats['chapters']:
-            console.print(create_chapters_table(stats['chapters'], max_chapters=max_chapters, sparkline_width=sparkline_width))
+            console.print(create_chapters_table(
+                get_level_sections(stats, level),
+                max_chapters=max_chapters,
+                sparkline_width=sparkline_width,
+                level=level
+            ))
             console.print()
         
         if not hide_word_frequency:
@@ -275,7 +291,7 @@ def list_manuscript_files(directory: str = ".") -> List[Path]:
         List of Path objects for manuscript files, sorted by modification time
     """
     path = Path(directory)
-    extensions = ['.md', '.txt', '.docx', '.rtf', '.markdown']
+    extensions = ['.md', '.txt', '.docx', '.odt', '.rtf', '.epub', '.markdown']
     files = []
     
     for ext in extensions:
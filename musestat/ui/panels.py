@@ -156,6 +156,62 @@ def create_chapter_stats_panel(chapter_stats: Dict, chapter_lengths: Optional[Li
     )
 
 
+def create_scene_stats_panel(scene_stats: Dict, max_outliers: int = 5) -> Optional[Panel]:
+    """
+    Create panel showing the scene length distribution and outlier scenes.
+    
+    Args:
+        scene_stats: Scene statistics dictionary from calculate_scene_statistics
+        max_outliers: Maximum number of outlier scenes to list per side (default: 5)
+    """
+    if not scene_stats:
+        return None
+    
+    content = Text()
+    content.append("Scene Length Analysis\n\n", style="bold underline cyan")
+    
+    content.append(f"Scenes:    {scene_stats['count']:,}\n", style="white")
+    content.append(f"Mean:      {scene_stats['mean']:,.0f} words\n", style="white")
+    content.append(f"Median:    {scene_stats['median']:,.0f} words\n", style="white")
+    content.append(f"Quartiles: {scene_stats['q1']:,.0f} – {scene_stats['q3']:,.0f} words\n", style="white")
+    content.append(f"Avg Sent.: {scene_stats['avg_sentence_length']:.1f} words\n", style="white")
+    if scene_stats.get('avg_dialogue_ratio') is not None:
+        content.append(f"Dialogue:  {scene_stats['avg_dialogue_ratio']:.1f}% of lines (avg per scene)\n", style="white")
+    
+    # Length distribution as one bar per bucket
+    content.append("\nDistribution\n", style="bold white")
+    largest = max(bucket['count'] for bucket in scene_stats['distribution']) or 1
+    for bucket in scene_stats['distribution']:
+        label = f"{bucket['min']:,}–{bucket['max']:,}"
+        bar = create_horizontal_bar(bucket['count'] / largest * 100, width=20)
+        content.append(f"  {label:>13} ", style="dim")
+        content.append(bar, style="bright_blue")
+        content.append(f" {bucket['count']}\n", style="white")
+    
+    for key, name, style in (('short_scenes', 'Short', 'yellow'), ('long_scenes', 'Long', 'red')):
+        outliers = scene_stats.get(key) or []
+        if not outliers:
+            continue
+        content.append(f"\n{name} outliers ({len(outliers)}):\n", style=f"bold {style}")
+        for path in outliers[:max_outliers]:
+            content.append(f"  {path}\n", style=f"dim {style}")
+        if len(outliers) > max_outliers:
+            content.append(f"  … and {len(outliers) - max_outliers} more\n", style=f"dim {style}")
+    
+    if not scene_stats.get('short_scenes') and not scene_stats.get('long_scenes'):
+        content.append("\nNo outlier scenes", style="green")
+    content.rstrip()
+    
+    return Panel(
+        content,
+        box=box.ROUNDED,
+        border_style="magenta",
+        padding=(1, 2),
+        title="[bold]Scene Statistics[/bold]",
+        title_align="left"
+    )
+
+
 def create_achievement_badge_panel(badge: Dict) -> Panel:
     """Create achievement badge panel."""
     content = Text()
@@ -130,6 +130,15 @@ def create_readability_table(readability: Dict) -> Optional[Table]:
     return table
 
 
+def _pacing_note(note: str, entries: List[tuple], max_locations: int = 3) -> str:
+    """Append the file locations (line:column) of the first flagged entries to a note."""
+    locations = [f"{entry[2]}:{entry[3]}" for entry in entries[:max_locations] if len(entry) > 3]
+    if not locations:
+        return note
+    more = "…" if len(entries) > max_locations else ""
+    return f"{note} (at {', '.join(locations)}{more})"
+
+
 def create_pacing_table(pacing: Dict) -> Optional[Table]:
     """Create pacing analysis table."""
     if not pacing:
@@ -154,24 +163,38 @@ def create_pacing_table(pacing: Dict) -> Optional[Table]:
     
     table.add_row("", "", "")
     table.add_row("Long Sentences (>40 words)", f"{len(pacing['long_sentences'])}", 
-                  "May slow pacing")
+                  _pacing_note("May slow pacing", pacing['long_sentences']))
     table.add_row("Long Paragraphs (>200 words)", f"{len(pacing['long_paragraphs'])}", 
-                  "May lose reader attention")
+                  _pacing_note("May lose reader attention", pacing['long_paragraphs']))
     table.add_row("Short Paragraphs (<10 words)", f"{len(pacing['short_paragraphs'])}", 
-                  "Creates fast pacing")
+                  _pacing_note("Creates fast pacing", pacing['short_paragraphs']))
     
     return table
 
 
-def create_chapters_table(chapters: List[Dict], max_chapters: Optional[int] = None, sparkline_width: int = 40) -> Table:
+def create_chapters_table(
+    chapters: List[Dict],
+    max_chapters: Optional[int] = None,
+    sparkline_width: int = 40,
+    level: str = 'chapter'
+) -> Table:
     """
     Create chapters breakdown table with visual enhancements.
     
     Args:
-        chapters: List of chapter dictionaries
+        chapters: List of chapter dictionaries (or structure nodes of one level)
         max_chapters: Maximum number of chapters to display (default: all)
         sparkline_width: Width of the sparkline chart (default: 40)
+        level: Structure level of the rows: 'part', 'chapter' or 'scene'
+    
+    Chapters and parts with unusually short or long scenes are marked in the
+    Scenes column; scene rows show their dialogue ratio (when measured),
+    average sentence length and outlier flag instead.
     """
+    label = level.capitalize()
+    show_scenes = level != 'scene'
+    show_dialogue = not show_scenes and any(ch.get('dialogue_ratio') is not None for ch in chapters)
+    
     # Determine which chapters to display
     display_chapters = chapters if max_chapters is None else chapters[:max_chapters]
     
@@ -180,7 +203,7 @@ def create_chapters_table(chapters: List[Dict], max_chapters: Optional[int] = No
     sparkline_w = min(sparkline_width, len(chapters) * 2)
     sparkline = create_sparkline(chapter_lengths, width=sparkline_w)
     
-    table_title = f"Chapter Breakdown   Trend: {sparkline}"
+    table_title = f"{label} Breakdown   Trend: {sparkline}"
     if max_chapters and len(chapters) > max_chapters:
         table_title += f"   (Showing {max_chapters} of {len(chapters)})"
     
@@ -193,11 +216,19 @@ def create_chapters_table(chapters: List[Dict], max_chapters: Optional[int] = No
     )
     
     table.add_column("#", style="dim", width=5, justify="right")
-    table.add_column("Chapter Title", style="bold cyan", width=40)
+    # Scene rows have more columns, so their titles get less room
+    title_width = 40 if show_scenes else 30
+    table.add_column(f"{label} Title", style="bold cyan", width=title_width)
     table.add_column("Words", style="bold yellow", justify="right", width=10)
     table.add_column("% of Total", style="green", justify="right", width=10)
     table.add_column("Bar", style="bright_blue", width=15)
-    table.add_column("Scenes", style="dim", justify="right", width=8)
+    if show_scenes:
+        table.add_column("Scenes", style="dim", justify="right", width=8)
+    else:
+        if show_dialogue:
+            table.add_column("Dialogue", style="bright_magenta", justify="right", width=8)
+        table.add_column("Avg Sent.", style="white", justify="right", width=9)
+        table.add_column("Flag", width=8)
     
     total_words = sum(ch['words'] for ch in chapters)
     max_words = max(chapter_lengths) if chapter_lengths else 1
@@ -205,23 +236,33 @@ def create_chapters_table(chapters: List[Dict], max_chapters: Optional[int] = No
     for i, chapter in enumerate(display_chapters, 1):
         percentage = (chapter['words'] / total_words * 100) if total_words > 0 else 0
         
-        # Truncate long titles
-        title = chapter['title']
-        if len(title) > 37:
-            title = title[:34] + "..."
+        # Truncate long titles (scenes are named by their chapter path)
+        title = chapter['title'] if show_scenes else (chapter.get('path') or chapter['title'])
+        if len(title) > title_width - 3:
+            title = title[:title_width - 6] + "..."
         
         # Create mini bar for visual representation
         bar_length = int((chapter['words'] / max_words) * 12)
         bar = "█" * bar_length
         
-        table.add_row(
-            str(i),
-            title,
-            f"{chapter['words']:,}",
-            f"{percentage:.1f}%",
-            bar,
-            str(chapter.get('scenes', 0))
-        )
+        row = [str(i), title, f"{chapter['words']:,}", f"{percentage:.1f}%", bar]
+        if show_scenes:
+            scenes = str(chapter.get('scenes', 0))
+            outliers = chapter.get('outlier_scenes', 0)
+            row.append(Text.assemble((f"⚠{outliers} ", "bold yellow"), scenes) if outliers else scenes)
+        else:
+            if show_dialogue:
+                ratio = chapter.get('dialogue_ratio')
+                row.append(f"{ratio:.0f}%" if ratio is not None else "-")
+            row.append(f"{chapter.get('avg_sentence_length') or 0:.1f}")
+            outlier = chapter.get('outlier')
+            if outlier == 'short':
+                row.append(Text("▼ short", style="bold yellow"))
+            elif outlier == 'long':
+                row.append(Text("▲ long", style="bold red"))
+            else:
+                row.append("")
+        table.add_row(*row)
     
     return table
 
@@ -231,7 +272,8 @@ def create_word_frequency_table(common_words: List[tuple], max_words: Optional[i
     Create most common words table.
     
     Args:
-        common_words: List of (word, count) tuples
+        common_words: List of (word, count) tuples, or (word, count, error)
+            estimates from --approx-frequency
         max_words: Maximum number of words to display (default: all words up to 15, or len(common_words))
     """
     # Determine how many words to show
@@ -240,8 +282,15 @@ def create_word_frequency_table(common_words: List[tuple], max_words: Optional[i
     else:
         display_count = min(max_words, len(common_words))
     
+    # Sketch estimates carry an error bound as a third element
+    approximate = bool(common_words) and len(common_words[0]) > 2
+    
+    title = f"Most Frequent Words (Top {display_count})"
+    if approximate:
+        title = f"Most Frequent Words (Top {display_count}, estimated)"
+    
     table = Table(
-        title=f"Most Frequent Words (Top {display_count})",
+        title=title,
         box=box.ROUNDED,
         border_style="yellow",
         header_style="bold yellow",
@@ -251,20 +300,26 @@ def create_word_frequency_table(common_words: List[tuple], max_words: Optional[i
     table.add_column("Rank", style="dim", width=6, justify="right")
     table.add_column("Word", style="bold cyan", width=20)
     table.add_column("Count", style="bold green", justify="right", width=10)
+    if approximate:
+        table.add_column("± Error", style="dim", justify="right", width=10)
     table.add_column("Bar", style="bright_blue", width=30)
     
     max_count = common_words[0][1] if common_words else 1
     
-    for i, (word, count) in enumerate(common_words[:display_count], 1):
+    for i, entry in enumerate(common_words[:display_count], 1):
+        word, count = entry[0], entry[1]
         bar_length = int((count / max_count) * 25)
         bar = "█" * bar_length
         
-        table.add_row(
-            str(i),
-            word,
-            f"{count:,}",
-            bar
-        )
+        if approximate:
+            table.add_row(str(i), word, f"≈{count:,}", f"{entry[2]:,}", bar)
+        else:
+            table.add_row(
+                str(i),
+                word,
+                f"{count:,}",
+                bar
+            )
     
     return table
 
@@ -385,19 +440,23 @@ def create_verification_table(issues, issue_type, limit: int = 20) -> Optional[T
         title_style=f"bold {border_color}"
     )
     
-    table.add_column("Line", style="dim", width=6, justify="right")
+    table.add_column("Line", style="dim", width=8, justify="right")
+    table.add_column("¶", style="dim", width=5, justify="right")
     table.add_column("Category", style="bold cyan", width=18)
     table.add_column("Issue", style="white", width=35)
     table.add_column("Preview", style="dim", width=35)
     
     for issue in filtered_issues[:limit]:
         line_str = str(issue.line_number) if issue.line_number else "-"
+        if issue.line_number and issue.column:
+            line_str += f":{issue.column}"
         preview = issue.line_preview if issue.line_preview else ""
         if len(preview) > 32:
             preview = preview[:29] + "..."
         
         table.add_row(
             line_str,
+            str(issue.paragraph) if issue.paragraph else "-",
             issue.category,
             issue.message,
             preview
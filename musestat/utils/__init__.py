@@ -1,9 +1,10 @@
-"""Utility modules for stats, achievements, and version checking."""
+"""Utility modules for stats, achievements, version checking, and CPU availability."""
 
 from .stats import save_stats_snapshot, load_comparison_stats
 from .achievements import get_achievement_badge, get_random_quote, estimate_reading_time
 from .constants import WRITER_QUOTES, ACHIEVEMENT_MILESTONES
 from .version_check import check_for_updates, get_update_message
+from .concurrency import available_cpus, ordered_map
 
 __all__ = [
     'save_stats_snapshot',
@@ -15,5 +16,7 @@ __all__ = [
     'ACHIEVEMENT_MILESTONES',
     'check_for_updates',
     'get_update_message',
+    'available_cpus',
+    'ordered_map',
 ]
 
@@ -0,0 +1,55 @@
+"""
+CPU availability and ordered parallel mapping for optional parallel work.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Tasks handed to a worker at a time, per worker, are about 1/4 of its share
+_CHUNKS_PER_WORKER = 4
+
+
+def available_cpus() -> int:
+    """
+    Get the number of CPUs this process may run on.
+
+    Returns:
+        CPUs in the process's affinity mask where the platform reports one,
+        otherwise the machine's CPU count (at least 1)
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def ordered_map(func: Callable[[T], R], items: Iterable[T], workers: Optional[int] = None) -> Iterator[R]:
+    """
+    Apply a function to every item in a pool of worker processes.
+
+    Results come back in the order of the items, each as soon as it and all
+    earlier ones are done. With one worker (or one item) the function runs
+    in this process and no pool is started.
+
+    Args:
+        func: Picklable (module-level) function
+        items: Picklable arguments, one per call
+        workers: Worker processes (default: available CPUs)
+
+    Yields:
+        func(item) for each item, in order
+    """
+    items = list(items)
+    workers = available_cpus() if workers is None else workers
+    if workers <= 1 or len(items) <= 1:
+        yield from map(func, items)
+        return
+
+    workers = min(workers, len(items))
+    chunk_size = max(len(items) // (workers * _CHUNKS_PER_WORKER), 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(func, items, chunksize=chunk_size)
@@ -46,8 +46,6 @@ setup(
     install_requires=[
         "rich>=13.0.0",
         "questionary>=2.0.0",
-        "python-docx>=0.8.11",
-        "striprtf>=0.0.26",
         "langdetect>=1.0.9",
         "textstat>=0.7.3",
         "requests>=2.28.0",
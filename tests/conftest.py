@@ -0,0 +1,48 @@
+"""Shared fixtures: a small generated manuscript with the constructs MuseStat handles."""
+
+import random
+
+import pytest
+
+WORDS = ("the night was dark and the river ran cold beneath a silver moon "
+         "she said nothing while he waited by the old stone bridge").split()
+
+
+def build_manuscript(chapters: int = 6, paragraphs: int = 12, seed: int = 3) -> str:
+    """
+    Generate a markdown manuscript with headings, scene breaks, dialogue,
+    abbreviations, emphasis, links, a code fence and a few very long sentences.
+    """
+    rng = random.Random(seed)
+    out = ["Front matter before the first chapter. It has two sentences.\n"]
+    for number in range(1, chapters + 1):
+        out.append(f"# Chapter {number}: The Title {number}\n" if number % 2 else f"## Another {number}\n")
+        for i in range(paragraphs):
+            sentences = []
+            for _ in range(rng.randint(1, 5)):
+                length = rng.choice((4, 8, 12, 20, 45)) if i % 5 else rng.randint(3, 9)
+                sentence = " ".join(rng.choice(WORDS) for _ in range(length)).capitalize()
+                sentences.append(sentence + rng.choice(".!?"))
+            text = " ".join(sentences)
+            if i % 4 == 1:
+                text = f'"{text}" she said. Mr. Smith met Dr. Jones at 3.5 p.m. and *smiled*.'
+            if i % 6 == 2:
+                text += " See [the map](https://example.com) for **details**."
+            out.append(text + "\n")
+            if i == paragraphs // 2:
+                out.append("***\n")
+        if number == 2:
+            out.append("```\ncode = 'not prose'\n\nmore code\n```\n")
+    return "\n".join(out)
+
+
+@pytest.fixture
+def manuscript_text() -> str:
+    return build_manuscript()
+
+
+@pytest.fixture
+def manuscript_file(tmp_path, manuscript_text):
+    path = tmp_path / "book.md"
+    path.write_text(manuscript_text, encoding="utf-8")
+    return path
@@ -0,0 +1,111 @@
+"""Chapter headings and scene breaks, with built-in and custom patterns."""
+
+import pytest
+
+from musestat.core.analyzer import analyze_manuscript
+from musestat.core.chapter import (
+    HEADING, PART_LEVEL, SCENE_BREAK, BoundaryMatcher, extract_chapters, get_boundary_matcher,
+    iter_boundaries, load_boundary_patterns
+)
+
+TEXT = """Part One
+
+# Arrival
+
+First words here.
+
+# # #
+
+More words.
+
+~ ~ ~
+
+Last words of the chapter.
+
+Prologue: Before
+
+The earlier story.
+"""
+
+
+def _found(text, matcher=None):
+    return [(b.kind, b.title, b.level) for b in iter_boundaries(text, matcher)]
+
+
+def test_builtin_headings_and_scene_breaks():
+    text = "# One\ntext\n## Two\n***\nChapter 3: Three\n---\nCHAPTER 4 Four\nCh. 5: Five\n"
+    assert _found(text) == [
+        (HEADING, 'One', 1), (HEADING, 'Two', 2), (SCENE_BREAK, None, None),
+        (HEADING, 'Three', 3), (SCENE_BREAK, None, None), (HEADING, 'Four', 3), (HEADING, 'Five', 3),
+    ]
+
+
+def test_custom_patterns_with_titles():
+    matcher = BoundaryMatcher(
+        chapter_patterns=(r'Prologue:\s*(.+)',),
+        scene_patterns=(r'~ ~ ~',),
+        part_patterns=(r'Part\s+\w+',),
+    )
+    chapters = extract_chapters(TEXT, matcher=matcher)
+    # Without a scene pattern for it, "# # #" is an H1 titled "# #"
+    assert [chapter.title for chapter in chapters] == ['Part One', 'Arrival', '# #', 'Before']
+    assert _found(TEXT, matcher)[0] == (HEADING, 'Part One', PART_LEVEL)
+    assert chapters[2].scenes == 1
+    assert chapters[3].content.strip() == 'The earlier story.'
+
+
+def test_backreferences_refer_to_their_own_pattern():
+    matcher = BoundaryMatcher(
+        chapter_patterns=(r'(\w+)-\1',),
+        scene_patterns=(r'([#~])( \1)+',),
+        part_patterns=(r'(Part|Book) (?:\d+)(?(1)!)',),
+    )
+    text = "# # #\n~ ~ ~\n# ~ #\nEcho-Echo\nEcho-Other\nBook 2!\n"
+    assert _found(text, matcher) == [
+        (SCENE_BREAK, None, None), (SCENE_BREAK, None, None), (HEADING, '~ #', 1),
+        (HEADING, 'Echo', 3), (HEADING, 'Book', PART_LEVEL),
+    ]
+
+
+def test_patterns_may_share_group_names():
+    matcher = BoundaryMatcher(
+        chapter_patterns=(r'(?P<title>Interlude)', r'(?P<mark>=)(?P=mark)(?P<title>.+)'),
+        scene_patterns=(r'(?P<mark>\*)(?: (?P=mark))+',),
+    )
+    assert _found("Interlude\n* * *\n==Coda\n=-Not\n", matcher) == [
+        (HEADING, 'Interlude', 3), (SCENE_BREAK, None, None), (HEADING, '=', 3),
+    ]
+
+
+def test_invalid_pattern_is_reported():
+    with pytest.raises(ValueError, match="Invalid pattern '\\(unclosed'"):
+        BoundaryMatcher(chapter_patterns=('(unclosed',))
+
+
+def test_patterns_file(tmp_path):
+    path = tmp_path / '.musestatpatterns'
+    path.write_text(
+        "# comment\n\npart: Part\\s+\\w+\nchapter: Prologue:\\s*(.+)\nscene: ([#~])( \\1)+\n"
+        "Scene: ---x\nunknown: ignored\nchapter:\n",
+        encoding='utf-8'
+    )
+    patterns = load_boundary_patterns(str(path))
+    assert patterns == (['Prologue:\\s*(.+)'], ['([#~])( \\1)+', '---x'], ['Part\\s+\\w+'])
+    assert load_boundary_patterns(str(tmp_path / 'missing')) == ([], [], [])
+
+    manuscript = tmp_path / 'book.md'
+    manuscript.write_text(TEXT, encoding='utf-8')
+    chapter_patterns, scene_patterns, part_patterns = patterns
+    stats = analyze_manuscript(
+        str(manuscript), show_progress=False, chapter_patterns=tuple(chapter_patterns),
+        scene_patterns=tuple(scene_patterns), part_patterns=tuple(part_patterns)
+    )
+    assert [chapter['title'] for chapter in stats['chapters']] == ['Part One', 'Arrival', 'Before']
+    assert stats['chapters'][1]['scenes'] == 2
+
+
+def test_matchers_are_cached_by_pattern_set():
+    first = get_boundary_matcher(('Prologue',), ('~',))
+    assert get_boundary_matcher(('Prologue',), ('~',)) is first
+    assert get_boundary_matcher(('Prologue',), ('~',), ('Part',)) is not first
+    assert first.chapter_patterns == ('Prologue',) and first.scene_patterns == ('~',)
@@ -0,0 +1,98 @@
+"""Space-Saving sketch: error bounds, merging and serialization."""
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from musestat.core.frequency import SpaceSaving, WordEstimate, merge_sketches
+
+
+def _stream(size, vocabulary=400, seed=7):
+    """Zipf-like words: a few frequent words and a long tail."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices([f"w{rank}" for rank in range(vocabulary)], weights, k=size)
+
+
+def _check_bounds(sketch, true_counts):
+    assert sketch.total == sum(true_counts.values())
+    assert len(sketch) <= sketch.capacity
+    for estimate in sketch.estimates():
+        true = true_counts[estimate.word]
+        assert estimate.count - estimate.error <= true <= estimate.count
+        assert estimate.error <= sketch.error_bound
+    # Every word more frequent than N / k is monitored
+    for word, true in true_counts.items():
+        if true > sketch.error_bound:
+            assert word in sketch
+
+
+def test_single_updates_stay_within_bounds():
+    words = _stream(20000)
+    sketch = SpaceSaving(50)
+    for word in words:
+        sketch.update(word)
+    _check_bounds(sketch, Counter(words))
+    assert sketch.min_count <= sketch.error_bound
+    assert sketch.most_common(1)[0][0] == 'w0'
+
+
+def test_counts_are_exact_below_capacity():
+    words = _stream(2000, vocabulary=30)
+    sketch = SpaceSaving(30)
+    sketch.update_counts(Counter(words))
+    assert dict(sketch.most_common()) == Counter(words)
+    assert all(estimate.error == 0 for estimate in sketch.estimates())
+
+
+def test_batched_counts_stay_within_bounds():
+    words = _stream(20000)
+    sketch = SpaceSaving(50)
+    for start in range(0, len(words), 1000):
+        sketch.update_counts(Counter(words[start:start + 1000]))
+    _check_bounds(sketch, Counter(words))
+
+
+@pytest.mark.parametrize('capacities', [(50, 50, 50), (20, 60, 40)])
+def test_merged_sketches_stay_within_bounds(capacities):
+    words = _stream(30000)
+    pieces = [words[:7000], words[7000:19000], words[19000:]]
+    sketches = []
+    for capacity, piece in zip(capacities, pieces):
+        sketch = SpaceSaving(capacity)
+        sketch.update_counts(Counter(piece))
+        sketches.append(sketch)
+
+    merged = merge_sketches(sketches)
+    assert merged.capacity == min(capacities)
+    _check_bounds(merged, Counter(words))
+
+    # Merging in another order keeps the same guarantees
+    reordered = sketches[2].merge(sketches[0].merge(sketches[1]))
+    _check_bounds(reordered, Counter(words))
+    assert merge_sketches([]) is None
+    assert merge_sketches([sketches[0]]) is sketches[0]
+
+
+def test_round_trip_through_json():
+    words = _stream(5000)
+    sketch = SpaceSaving(40)
+    sketch.update_counts(Counter(words))
+    restored = SpaceSaving.from_dict(json.loads(json.dumps(sketch.to_dict())))
+    assert restored.capacity == sketch.capacity and restored.total == sketch.total
+    assert restored.estimates() == sketch.estimates()
+    assert all(type(entry) is WordEstimate for entry in restored.estimates())
+
+    # A restored sketch keeps counting like the original
+    more = _stream(3000, seed=8)
+    for target in (sketch, restored):
+        target.update_counts(Counter(more))
+    assert restored.to_dict() == sketch.to_dict()
+    _check_bounds(restored, Counter(words) + Counter(more))
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
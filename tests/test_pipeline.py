@@ -0,0 +1,39 @@
+"""Stage pipeline: only the needed stages run, dependencies first."""
+
+import pytest
+
+from musestat.core.pipeline import Pipeline, Stage
+
+
+def _stages(calls):
+    def make(name, inputs, outputs):
+        def func(**values):
+            calls.append(name)
+            return {output: (name, sorted(values.items())) for output in outputs}
+        return Stage(name, inputs, outputs, func, name)
+    return {s.name: s for s in (
+        make('read', ('path',), ('text',)),
+        make('words', ('text',), ('words',)),
+        make('sentences', ('text',), ('sentences',)),
+        make('average', ('words', 'sentences'), ('average',)),
+    )}
+
+
+def test_runs_needed_stages_in_dependency_order():
+    calls = []
+    pipeline = Pipeline({'path': 'book.md'}, stages=_stages(calls))
+    pipeline.run(['average'])
+    assert calls == ['read', 'words', 'sentences', 'average']
+    assert pipeline.get('words')[0] == 'words'
+    assert calls == ['read', 'words', 'sentences', 'average']
+
+
+def test_skipped_stages_make_outputs_unavailable():
+    calls = []
+    pipeline = Pipeline({'path': 'book.md'}, skip=['sentences'], stages=_stages(calls))
+    assert pipeline.available('words')
+    assert not pipeline.available('average')
+    with pytest.raises(KeyError):
+        pipeline.run(['average'])
+    with pytest.raises(ValueError):
+        Pipeline({}, skip=['unknown'], stages=_stages(calls))
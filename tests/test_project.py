@@ -0,0 +1,42 @@
+"""Multi-file projects: the per-file cache lives inside the project folder."""
+
+from musestat.core.project import analyze_project
+from musestat.io.project import project_cache_path
+from musestat.io.scrivener import scrivener_cache_path
+
+
+def _write_project(folder, chapters=3):
+    folder.mkdir()
+    for number in range(1, chapters + 1):
+        (folder / f"{number:02d}-chapter.md").write_text(
+            f"# Chapter {number}\n\nThe river ran cold. She waited by the bridge.\n", encoding="utf-8")
+    return folder
+
+
+def test_cache_stays_inside_the_project(tmp_path, monkeypatch):
+    book = _write_project(tmp_path / "book")
+    (book / "SUMMARY.md").write_text("- [One](01-chapter.md)\n", encoding="utf-8")
+    assert project_cache_path(str(book)).parent == book.resolve()
+    assert project_cache_path(str(book / "SUMMARY.md")).parent == book.resolve()
+    assert project_cache_path(str(book / "*.md")).parent == book.resolve()
+    assert project_cache_path(str(book)) != scrivener_cache_path(str(tmp_path / "book.scriv"))
+
+    monkeypatch.chdir(book)
+    for spec in (".", "*.md", "0*.md"):
+        assert project_cache_path(spec).parent == book.resolve()
+    assert project_cache_path("*.md") != project_cache_path("0*.md")
+    assert project_cache_path("/").name == ".musestat-project.cache"
+
+
+def test_unchanged_files_come_from_the_cache(tmp_path):
+    book = _write_project(tmp_path / "book")
+    first = analyze_project(str(book))
+    assert not any(f['cached'] for f in first['files'])
+    assert project_cache_path(str(book)).is_file()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["book"]
+
+    (book / "02-chapter.md").write_text("# Chapter 2\n\nA new second chapter.\n", encoding="utf-8")
+    second = analyze_project(str(book))
+    assert [f['cached'] for f in second['files']] == [True, False, True]
+    assert second['total_words'] == first['total_words'] - 5
+    assert [chapter.title for chapter in second['chapters']] == ["Chapter 1", "Chapter 2", "Chapter 3"]
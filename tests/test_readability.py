@@ -0,0 +1,57 @@
+"""Readability: textstat's scores in memory, summed counts when streaming."""
+
+import pytest
+
+from musestat.core.text_processing import clean_markdown
+from musestat.core.tokenizer import tokenize
+from musestat.features import readability
+from musestat.features.readability import calculate_readability, readability_counts, readability_from_counts
+
+textstat = pytest.importorskip("textstat")
+
+METRICS = ('flesch_reading_ease', 'flesch_kincaid_grade', 'gunning_fog', 'coleman_liau_index',
+           'automated_readability_index')
+
+
+def _textstat_scores(clean_text):
+    try:
+        return {metric: getattr(textstat, metric)(clean_text) for metric in METRICS}
+    except LookupError:
+        # textstat needs NLTK's cmudict to count syllables
+        pytest.skip("textstat syllable data not installed")
+
+
+def test_in_memory_scores_are_textstats(monkeypatch, manuscript_text):
+    scored = []
+    for metric in METRICS:
+        monkeypatch.setattr(textstat, metric, lambda text, metric=metric: scored.append((metric, text)) or 1.0)
+    tokens = tokenize(manuscript_text)
+    assert calculate_readability(tokens) == dict.fromkeys(METRICS, 1.0)
+    assert calculate_readability(manuscript_text) == dict.fromkeys(METRICS, 1.0)
+    assert {text for _, text in scored} == {tokens.clean_text}
+    assert {metric for metric, _ in scored} == set(METRICS)
+
+
+def test_formulas_match_textstat(manuscript_text):
+    clean_text = clean_markdown(manuscript_text)
+    expected = _textstat_scores(clean_text)
+    counts = readability_counts(clean_text, textstat.sentence_count(clean_text))
+    scores = readability_from_counts(counts)
+    for metric in METRICS:
+        assert scores[metric] == pytest.approx(expected[metric], abs=0.006)
+
+
+def test_counts_add_up(manuscript_text):
+    clean_text = clean_markdown(manuscript_text)
+    _textstat_scores(clean_text)
+    half = clean_text.index("\n\n", len(clean_text) // 2)
+    pieces = [readability_counts(clean_text[:half]), readability_counts(clean_text[half:])]
+    whole = readability_counts(clean_text)
+    for key in ('words', 'syllables', 'letters', 'characters'):
+        assert pieces[0][key] + pieces[1][key] == whole[key]
+
+
+def test_no_scores_without_textstat(monkeypatch, manuscript_text):
+    monkeypatch.setattr(readability, 'READABILITY_SUPPORT', False)
+    assert calculate_readability(manuscript_text) is None
+    assert readability_counts(manuscript_text) is None
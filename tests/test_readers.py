@@ -0,0 +1,483 @@
+"""Readers and the sliceable sources used for streamed chapter content."""
+
+import bz2
+import gzip
+import lzma
+import threading
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from musestat.core.text_processing import count_words
+from musestat.io.compressed import inner_extension, iter_compressed_text, prefetch, split_member_path
+from musestat.io.documents import iter_docx_paragraphs, iter_odt_paragraphs
+from musestat.io.epub import iter_epub_paragraphs, xhtml_to_paragraphs
+from musestat.io.mapped import decode_blocks, iter_decoded_blocks, iter_mapped_text, map_file
+from musestat.io.readers import (
+    DocumentSource, TextFileSource, read_docx, read_epub, read_manuscript, read_odt, read_rtf, read_text
+)
+from musestat.io.rtf import iter_rtf_blocks, rtf_to_text
+from musestat.io import scrivener
+
+
+def test_document_source_slices_without_parsing_again():
+    pieces = ["Line one\r\n", "ünïcödé ", "x" * 50, "\n\nlast \ud800 piece"] * 40
+    text = ''.join(pieces)
+    opened = []
+
+    def open_pieces():
+        opened.append(1)
+        return iter(pieces)
+
+    source = DocumentSource(open_pieces)
+    assert ''.join(source.iter_chunks(100)) == text
+    assert len(source) == len(text)
+    for start, stop in [(0, 5), (95, 105), (99, 100), (0, len(text)), (len(text) - 7, len(text) + 10), (40, 40)]:
+        assert source[start:stop] == text[start:stop]
+    assert len(opened) == 1
+
+    source.close()
+    assert source[0:10] == ""
+
+
+def test_document_source_only_supports_slices():
+    source = DocumentSource(lambda: iter(["text"]))
+    list(source.iter_chunks())
+    with pytest.raises(TypeError):
+        source[0]
+
+
+def test_docx_paragraphs_match_python_docx(tmp_path):
+    docx = pytest.importorskip("docx")
+    from docx.enum.text import WD_BREAK
+
+    document = docx.Document()
+    document.add_heading("Part One", 0)
+    document.add_heading("Chapter  One", 1)
+    paragraph = document.add_paragraph("It was a ")
+    paragraph.add_run("dark").bold = True
+    paragraph.add_run(" night.\tTabbed")
+    paragraph.add_run().add_break(WD_BREAK.LINE)
+    paragraph.add_run("after the break")
+    document.add_paragraph("")
+    document.add_heading("Scene", 2)
+    document.add_paragraph("Café “quoted” — dash.", style="List Bullet")
+    document.add_table(rows=1, cols=2).cell(0, 0).text = "table cell"
+    document.add_paragraph("Last.")
+    path = tmp_path / "book.docx"
+    document.save(str(path))
+
+    # The previous reader joined python-docx's paragraph texts with newlines
+    expected = docx.Document(str(path)).paragraphs
+    paragraphs = list(iter_docx_paragraphs(str(path)))
+    assert [p.text for p in paragraphs] == [p.text for p in expected]
+    assert [p.level for p in paragraphs] == [None, 1, None, None, 2, None, None]
+    text = read_docx(str(path))
+    assert "# Chapter One\n\nIt was a dark night." in text
+    assert count_words(text) == count_words("\n".join(p.text for p in expected))
+
+
+RTF_DOCUMENT = (
+    r"{\rtf1\ansi\ansicpg1252\deff0{\fonttbl{\f0\froman\fcharset0 Times New Roman;}{\f1\fswiss\fcharset204 Arial;}}"
+    r"{\colortbl;\red0\green0\blue0;}{\stylesheet{\s1 heading 1;}}{\info{\title My Book}{\author Me}}"
+    "\n" r"\viewkind4\uc1\pard\sa200\f0\fs22 Chapter One\par"
+    "\n" r"It was a caf\'e9 night \u8212? she said \ldblquote hello\rdblquote .\par"
+    r"{\pict\pngblip\picw10\pich10 " + "89504e47" * 2000 + r"}"
+    r"Binary {\pict\bin8 ab{}\\cd} after\par"
+    r"{\header header text\par}Tab\tab tabbed\line new\par"
+    r"\f1 \'cf\'f0\'e8\'e2\'e5\'f2\f0  back\par Escaped \{ braces \} and \\ backslash\par"
+    r"\sect Next section\page done\par}"
+)
+
+
+def test_rtf_text_matches_striprtf(tmp_path):
+    striprtf = pytest.importorskip("striprtf.striprtf")
+    data = RTF_DOCUMENT.encode("latin-1")
+    path = tmp_path / "book.rtf"
+    path.write_bytes(data)
+
+    # The previous reader decoded the file and ran striprtf over all of it
+    expected = striprtf.rtf_to_text(RTF_DOCUMENT)
+    assert "Binary  after" in expected and "Привет back" in expected
+    assert read_rtf(str(path)) == rtf_to_text(data) == expected
+    for size in (1, 3, 50):
+        assert "".join(iter_rtf_blocks(data[i:i + size] for i in range(0, len(data), size))) == expected
+
+
+def test_rtf_surrogate_pairs_are_joined():
+    data = rb"{\rtf1\ansi\uc1 Emoji \u-10179?\u-8704? ok\par}"
+    assert rtf_to_text(data) == "Emoji \U0001F600 ok\n"
+
+
+EPUB_CONTAINER = ('<?xml version="1.0"?><container xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+                  '<rootfiles><rootfile full-path="OPS/book.opf"/></rootfiles></container>')
+EPUB_ITEMS = {
+    'part.xhtml': '<h1>Part One</h1>',
+    'ch 1.xhtml': '<h2>Chapter One</h2><p>It was a <i>dark</i>\n  night.<br/>Line two.</p><div><p>Nested.</p></div>',
+    'ch1b.xhtml': '<p>Continued text of <a href="#n">chapter</a> one.</p><ul><li>Listed</li></ul>',
+    'ch2.xhtml': '<section><h2>Chapter Two</h2><h3>Sub</h3><p>Text two.</p><script>skip()</script></section>',
+    'notes.xhtml': '<p>Footnote text</p>',
+}
+
+
+def _xhtml(body):
+    return (f'<html xmlns="http://www.w3.org/1999/xhtml"><head><title>t</title><style>p {{}}</style></head>'
+            f'<body>{body}</body></html>')
+
+
+def _write_epub(path):
+    ncx = ('<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/"><navMap>'
+           '<navPoint><navLabel><text>Part One</text></navLabel><content src="Text/part.xhtml"/>'
+           '<navPoint><navLabel><text>Chapter One</text></navLabel><content src="Text/ch%201.xhtml#top"/></navPoint>'
+           '<navPoint><navLabel><text>Chapter Two</text></navLabel><content src="Text/ch2.xhtml"/></navPoint>'
+           '</navPoint></navMap></ncx>')
+    ids = {name: f'i{n}' for n, name in enumerate(EPUB_ITEMS)}
+    manifest = ''.join(f'<item id="{ids[name]}" href="Text/{name.replace(" ", "%20")}"/>' for name in EPUB_ITEMS)
+    linear = {name: ' linear="no"' if name == 'notes.xhtml' else '' for name in EPUB_ITEMS}
+    spine = ''.join(f'<itemref idref="{ids[name]}"{linear[name]}/>' for name in EPUB_ITEMS)
+    opf = (f'<package xmlns="http://www.idpf.org/2007/opf" version="2.0"><manifest>'
+           f'<item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>{manifest}</manifest>'
+           f'<spine toc="ncx">{spine}</spine></package>')
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('mimetype', 'application/epub+zip')
+        archive.writestr('META-INF/container.xml', EPUB_CONTAINER)
+        archive.writestr('OPS/book.opf', opf)
+        archive.writestr('OPS/toc.ncx', ncx)
+        for name, body in EPUB_ITEMS.items():
+            archive.writestr(f'OPS/Text/{name}', _xhtml(body))
+
+
+def _dom_text(data):
+    """Reference: the body text of a full DOM parse, without scripts and whitespace."""
+    body = next(child for child in ElementTree.fromstring(data) if child.tag.endswith('body'))
+    for element in body.iter():
+        if element.tag.endswith('script'):
+            element.text = None
+    return ''.join(''.join(body.itertext()).split())
+
+
+def test_epub_paragraphs_match_a_dom_parse():
+    for body in EPUB_ITEMS.values():
+        data = _xhtml(body).encode('utf-8')
+        paragraphs = xhtml_to_paragraphs(data)
+        assert ''.join(''.join(paragraph.text.split()) for paragraph in paragraphs) == _dom_text(data)
+    # The HTML fallback for items that are not well-formed XML gives the same paragraphs
+    body = EPUB_ITEMS['ch 1.xhtml']
+    assert (xhtml_to_paragraphs(_xhtml(body.replace(' night', '&nbsp;night')).encode('utf-8'))
+            == xhtml_to_paragraphs(_xhtml(body.replace(' night', '&#160;night')).encode('utf-8')))
+
+
+def test_epub_follows_the_spine_and_contents(tmp_path):
+    path = tmp_path / "book.epub"
+    _write_epub(path)
+    paragraphs = list(iter_epub_paragraphs(str(path), workers=1))
+    assert [(p.text, p.level) for p in paragraphs] == [
+        ("Part One", 1),
+        ("Chapter One", 2), ("It was a dark night.", None), ("Line two.", None), ("Nested.", None),
+        ("Continued text of chapter one.", None), ("Listed", None),
+        ("Chapter Two", 2), ("Sub", None), ("Text two.", None),
+    ]
+    assert list(iter_epub_paragraphs(str(path), workers=2)) == paragraphs
+    assert read_epub(str(path)).startswith("# Part One\n\n## Chapter One\n\nIt was a dark night.")
+
+
+ODF_NAMESPACES = {
+    'office': 'urn:oasis:names:tc:opendocument:xmlns:office:1.0',
+    'text': 'urn:oasis:names:tc:opendocument:xmlns:text:1.0',
+    'style': 'urn:oasis:names:tc:opendocument:xmlns:style:1.0',
+    'table': 'urn:oasis:names:tc:opendocument:xmlns:table:1.0',
+    'draw': 'urn:oasis:names:tc:opendocument:xmlns:drawing:1.0',
+}
+ODF_DECLARATIONS = ' '.join(f'xmlns:{prefix}="{uri}"' for prefix, uri in ODF_NAMESPACES.items())
+ODT_STYLES = f'''<?xml version="1.0"?><office:document-styles {ODF_DECLARATIONS}><office:styles>
+<style:style style:name="Heading" style:family="paragraph"/>
+<style:style style:name="Heading_20_1" style:family="paragraph" style:parent-style-name="Heading" style:default-outline-level="1"/>
+<style:style style:name="Heading_20_2" style:family="paragraph" style:parent-style-name="Heading" style:default-outline-level="2"/>
+</office:styles></office:document-styles>'''
+ODT_CONTENT = f'''<?xml version="1.0"?><office:document-content {ODF_DECLARATIONS}>
+<office:automatic-styles><style:style style:name="P1" style:family="paragraph" style:parent-style-name="Heading_20_2"/></office:automatic-styles>
+<office:body><office:text>
+<text:table-of-content><text:index-body><text:p>Chapter One 1</text:p></text:index-body></text:table-of-content>
+<text:h text:style-name="Heading_20_1" text:outline-level="1"><text:number>1.</text:number>Part   One</text:h>
+<text:h text:style-name="Heading_20_2" text:outline-level="2">Chapter One</text:h>
+<text:p>It was a  <text:span>dark</text:span><text:s text:c="2"/>night.<text:note><text:note-citation>1</text:note-citation><text:note-body><text:p>A footnote.</text:p></text:note-body></text:note> Rain<text:tab/>fell.<text:line-break/>End
+  of line.</text:p>
+<text:p><draw:frame><draw:text-box><text:p>Boxed text</text:p></draw:text-box></draw:frame>Outside box.<office:annotation><text:p>comment</text:p></office:annotation></text:p>
+<table:table><table:table-row><table:table-cell><text:p>Cell</text:p></table:table-cell></table:table-row></table:table>
+<text:list><text:list-item><text:p>List item one.</text:p></text:list-item></text:list>
+<text:section><text:p text:style-name="P1">Chapter Two</text:p><text:p>Second chapter text.</text:p></text:section>
+<text:p/>
+</office:text></office:body></office:document-content>'''
+
+
+def _odf(tag):
+    prefix, name = tag.split(':')
+    return f'{{{ODF_NAMESPACES[prefix]}}}{name}'
+
+
+def _dom_words(content):
+    """Reference: the words of office:text in a full DOM parse, without notes, frames and tables."""
+    skipped = {_odf(tag) for tag in ('text:note', 'office:annotation', 'draw:frame', 'text:number',
+                                     'table:table', 'text:table-of-content')}
+    spaces = {_odf(tag) for tag in ('text:s', 'text:tab', 'text:line-break')}
+
+    def strip(parent):
+        previous = None
+        for child in list(parent):
+            if child.tag in skipped:
+                # Keep the text that follows the removed element
+                if previous is None:
+                    parent.text = (parent.text or '') + (child.tail or '')
+                else:
+                    previous.tail = (previous.tail or '') + (child.tail or '')
+                parent.remove(child)
+                continue
+            if child.tag in spaces:
+                child.text = ' '
+            strip(child)
+            previous = child
+
+    body = ElementTree.fromstring(content).find('office:body/office:text', ODF_NAMESPACES)
+    strip(body)
+    return ' '.join(body.itertext()).split()
+
+
+def test_odt_paragraphs_match_a_dom_parse(tmp_path):
+    path = tmp_path / "book.odt"
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('mimetype', 'application/vnd.oasis.opendocument.text')
+        archive.writestr('content.xml', ODT_CONTENT)
+        archive.writestr('styles.xml', ODT_STYLES)
+
+    paragraphs = list(iter_odt_paragraphs(str(path)))
+    assert [(p.text, p.level) for p in paragraphs] == [
+        ("Part One", 1),
+        ("Chapter One", 2),
+        ("It was a dark  night. Rain\tfell.\nEnd of line.", None),
+        ("Outside box.", None),
+        ("List item one.", None),
+        ("Chapter Two", 2),
+        ("Second chapter text.", None),
+        ("", None),
+    ]
+    assert ' '.join(p.text for p in paragraphs).split() == _dom_words(ODT_CONTENT)
+    assert read_odt(str(path)).startswith("# Part One\n\n## Chapter One\n\nIt was a dark")
+
+
+# Characters of one to four UTF-8 bytes, and line endings of every kind
+MAPPED_TEXT = "Plain é ü — “quoted” 😀 𝔘𝔫𝔦 end.\r\nNext line\rOld Mac\nUnix\r\n\r\n" * 7 + "last 😀"
+
+
+def _write_mapped(tmp_path):
+    path = tmp_path / "book.md"
+    path.write_bytes(MAPPED_TEXT.encode("utf-8"))
+    with open(path, encoding="utf-8") as f:
+        return path, f.read()
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 5, 7, 64, 1 << 20])
+def test_mapped_blocks_complete_split_characters(tmp_path, block_size):
+    path, expected = _write_mapped(tmp_path)
+    assert "".join(iter_mapped_text(str(path), block_size)) == expected
+
+    with map_file(str(path)) as mapping:
+        blocks = list(iter_decoded_blocks(mapping, 0, block_size))
+        assert "".join(text for _, text in blocks) == expected
+        # Every block starts at a character boundary it can be decoded again from
+        for start, text in blocks:
+            again = "".join(t for _, t in iter_decoded_blocks(mapping, start, block_size))
+            assert again.startswith(text)
+
+
+def test_text_file_source_slices_across_blocks(tmp_path):
+    path, expected = _write_mapped(tmp_path)
+    source = TextFileSource(str(path))
+    assert "".join(source.iter_chunks(5)) == expected
+    assert len(source) == len(expected)
+    for start in range(0, len(expected), 11):
+        for stop in (start + 1, start + 9, start + 200):
+            assert source[start:stop] == expected[start:stop]
+
+
+def test_decode_blocks_split_anywhere():
+    data = MAPPED_TEXT.encode("utf-8")
+    expected = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    for size in (1, 2, 3, 4, 13):
+        assert "".join(decode_blocks(data[i:i + size] for i in range(0, len(data), size))) == expected
+
+
+def test_mapped_empty_and_invalid_files(tmp_path):
+    empty = tmp_path / "empty.md"
+    empty.write_bytes(b"")
+    assert list(iter_mapped_text(str(empty))) == []
+    assert read_text(str(empty)) == ""
+
+    invalid = tmp_path / "invalid.md"
+    invalid.write_bytes("café".encode("utf-8")[:-1] + b" \xff")
+    with pytest.raises(UnicodeDecodeError):
+        list(iter_mapped_text(str(invalid), 2))
+
+
+def _write_compressed(tmp_path):
+    data = MAPPED_TEXT.encode("utf-8")
+    for suffix, compress in (("gz", gzip.compress), ("bz2", bz2.compress), ("xz", lzma.compress)):
+        (tmp_path / f"book.md.{suffix}").write_bytes(compress(data))
+    with zipfile.ZipFile(tmp_path / "drafts.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("drafts/book.md", data)
+        archive.writestr("drafts/book.rtf", RTF_DOCUMENT.encode("latin-1"))
+    return data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def test_compressed_text_matches_the_uncompressed_file(tmp_path):
+    expected = _write_compressed(tmp_path)
+    paths = [str(tmp_path / name) for name in ("book.md.gz", "book.md.bz2", "book.md.xz")]
+    paths.append(str(tmp_path / "drafts.zip") + "::drafts/book.md")
+    for path in paths:
+        assert read_manuscript(path) == expected, path
+        for block_size in (1, 3, 1000):
+            assert "".join(iter_compressed_text(path, block_size)) == expected, path
+
+
+def test_zip_members(tmp_path):
+    _write_compressed(tmp_path)
+    archive = str(tmp_path / "drafts.zip")
+    assert split_member_path(archive + "::drafts/book.rtf") == (archive, "drafts/book.rtf")
+    assert split_member_path("notes.txt::x") == ("notes.txt::x", None)
+    assert inner_extension(archive + "::drafts/book.rtf") == ".rtf"
+    assert inner_extension(str(tmp_path / "book.md.gz")) == ".md"
+    assert read_manuscript(archive + "::drafts/book.rtf") == rtf_to_text(RTF_DOCUMENT.encode("latin-1"))
+
+    with pytest.raises(ValueError, match="No member 'drafts/missing.md'"):
+        list(iter_compressed_text(archive + "::drafts/missing.md"))
+    assert read_manuscript(archive + "::drafts/missing.md") == ""
+
+    corrupt = tmp_path / "corrupt.md.xz"
+    corrupt.write_bytes((tmp_path / "book.md.xz").read_bytes()[:40])
+    with pytest.raises(ValueError, match="Cannot decompress"):
+        list(iter_compressed_text(str(corrupt)))
+
+
+def test_prefetch_forwards_errors_and_stops_early():
+    def failing():
+        yield 1
+        raise OSError("read failed")
+
+    with pytest.raises(OSError, match="read failed"):
+        list(prefetch(failing()))
+
+    closed = []
+
+    def endless():
+        try:
+            n = 0
+            while True:
+                n += 1
+                yield n
+        finally:
+            closed.append(True)
+
+    threads = threading.active_count()
+    items = prefetch(endless(), depth=2)
+    assert [next(items) for _ in range(5)] == [1, 2, 3, 4, 5]
+    items.close()
+    assert closed == [True]
+    assert threading.active_count() == threads
+
+
+# Binder of a Scrivener project: (title, type, text or None, include in
+# compile, children). UUIDs count down, so binder order is not file order.
+SCRIVENER_BINDER = [
+    ("Part One", "Folder", None, True, [
+        ("Arrival", "Folder", None, True, [
+            ("First", "Text", "First scene, caf\\'e9.", True, []),
+            ("Cut", "Text", "Cut from the draft.", False, []),
+            ("Second", "Text", "Second scene.", True, []),
+        ]),
+        ("Empty", "Folder", None, False, []),
+    ]),
+    ("Part Two", "Folder", None, True, [
+        ("Return", "Folder", None, True, [
+            ("Third", "Text", "Third scene.", True, []),
+        ]),
+    ]),
+]
+
+
+def _write_scrivener(tmp_path):
+    project = tmp_path / "Novel.scriv"
+    number = [100]
+
+    def item(title, kind, text, include, children, legacy=False):
+        number[0] -= 1
+        if legacy:
+            attributes = f'ID="{number[0]}"'
+            path = project / "Files" / "Docs" / f"{number[0]}.rtf"
+        else:
+            uuid = f"00000000-0000-0000-0000-{number[0]:012d}"
+            attributes = f'UUID="{uuid}"'
+            path = project / "Files" / "Data" / uuid / "content.rtf"
+        if text is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("{\\rtf1\\ansi " + text + "\\par}", encoding="ascii")
+        flag = "Yes" if include else "No"
+        nested = "".join(item(*child, legacy=title == "Return") for child in children)
+        return (f'<BinderItem {attributes} Type="{kind}"><Title>{title}</Title>'
+                f'<MetaData><IncludeInCompile>{flag}</IncludeInCompile></MetaData>'
+                f'<Children>{nested}</Children></BinderItem>')
+
+    draft = item("Draft", "DraftFolder", None, True, SCRIVENER_BINDER)
+    research = item("Research", "ResearchFolder", None, True, [("Notes", "Text", "Research notes.", True, [])])
+    project.mkdir(exist_ok=True)
+    (project / "Novel.scrivx").write_text(
+        f'<?xml version="1.0"?><ScrivenerProject><Binder>{draft}{research}</Binder></ScrivenerProject>',
+        encoding="utf-8"
+    )
+    return project
+
+
+def test_scrivener_follows_the_binder(tmp_path):
+    project = _write_scrivener(tmp_path)
+    documents = scrivener.parse_binder(str(project))
+    assert [(document.title, document.level) for document in documents] == [
+        ("Part One", 1), ("Arrival", 2), ("First", None), ("Second", None),
+        ("Part Two", 1), ("Return", 2), ("Third", None),
+    ]
+    assert documents[-1].path == "Files/Docs/90.rtf"
+    assert read_manuscript(str(project)) == (
+        "# Part One\n\n## Arrival\n\nFirst scene, café.\n\n***\n\nSecond scene.\n\n"
+        "# Part Two\n\n## Return\n\nThird scene."
+    )
+    assert read_manuscript(str(project / "Novel.scrivx")) == read_manuscript(str(project))
+
+
+def test_scrivener_cache_only_parses_changed_documents(tmp_path, monkeypatch):
+    project = _write_scrivener(tmp_path)
+    parsed = []
+    extract = scrivener.extract_document_text
+
+    def counting_extract(path):
+        parsed.append(path)
+        return extract(path)
+
+    monkeypatch.setattr(scrivener, "extract_document_text", counting_extract)
+
+    def read():
+        return "".join(scrivener.iter_scrivener_text(str(project), workers=1))
+
+    first = read()
+    assert len(parsed) == 3
+    assert scrivener.scrivener_cache_path(str(project)).exists()
+
+    parsed.clear()
+    assert read() == first
+    assert parsed == []
+
+    changed = project / "Files" / "Docs" / "90.rtf"
+    changed.write_text("{\\rtf1\\ansi Third scene, rewritten.\\par}", encoding="ascii")
+    assert read() == first.replace("Third scene.", "Third scene, rewritten.")
+    assert parsed == [str(changed)]
+
+    parsed.clear()
+    assert "".join(scrivener.iter_scrivener_text(str(project), workers=1, use_cache=False)) == read()
+    assert len(parsed) == 3
@@ -0,0 +1,47 @@
+"""Per-section metrics from one pass, merged into the whole-book totals."""
+
+from collections import Counter
+
+from musestat.core.chapter import extract_chapters
+from musestat.core.sections import measure_chapters, measure_sections, chapter_boundaries, merge_sections
+from musestat.core.text_processing import WORD_PATTERN, clean_markdown, count_sentences, count_words
+from musestat.core.tokenizer import tokenize
+
+
+def _sections(text):
+    tokens = tokenize(text)
+    boundaries, _ = chapter_boundaries(text, extract_chapters(text))
+    return tokens, measure_sections(tokens, boundaries)
+
+
+def test_totals_are_the_merge_of_the_sections(manuscript_text):
+    tokens, sections = _sections(manuscript_text)
+    totals = merge_sections(sections)
+    assert totals.words == count_words(manuscript_text)
+    assert totals.sentences == count_sentences(manuscript_text)
+    assert (totals.start, totals.end) == (0, len(manuscript_text))
+    assert (totals.clean_start, totals.clean_end) == (0, len(tokens.clean_text))
+
+
+def test_merge_is_associative(manuscript_text):
+    _, sections = _sections(manuscript_text)
+    a, b, c = merge_sections(sections[:3]), merge_sections(sections[3:7]), merge_sections(sections[7:])
+    assert a.merge(b).merge(c).to_dict() == a.merge(b.merge(c)).to_dict()
+
+
+def test_word_frequencies_add_up_per_section(manuscript_text):
+    tokens, sections = _sections(manuscript_text)
+    summed = sum((section.word_frequencies(tokens) for section in sections), Counter())
+    assert summed == merge_sections(sections).word_frequencies(tokens) == tokens.tokens.frequencies()
+
+
+def test_chapter_common_words(manuscript_text):
+    tokens = tokenize(manuscript_text)
+    chapters = extract_chapters(manuscript_text)
+    measure_chapters(tokens, chapters)
+    for chapter in chapters:
+        words = Counter(word.lower() for word in WORD_PATTERN.findall(clean_markdown(chapter.content)))
+        expected = {word: count for word, count in words.items() if len(word) >= 3}
+        top = chapter.metrics.common_words(tokens, n=len(expected))
+        assert dict(top) == expected
+        assert sum(chapter.metrics.word_frequencies(tokens).values()) == chapter.words
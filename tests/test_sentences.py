@@ -0,0 +1,47 @@
+"""Sentence segmentation: headings and scene breaks are not sentences."""
+
+import pytest
+
+from musestat.core.text_processing import count_sentences, count_words
+from musestat.core.tokenizer import tokenize
+
+
+def _sentences(text):
+    sentences = tokenize(text).sentences
+    return [sentences.sentence_text(i) for i in range(len(sentences))]
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("# Chapter 1: The Start\n\nText here.", ["Text here."]),
+    ("## Another\nProse right after. More.\n# Two\n", ["Prose right after.", "More."]),
+    ("Chapter 1: The Start\n\nText here.", ["Text here."]),
+    ("Chapter 2\n\nHe ran.\n\nCHAPTER 3\nShe ran.", ["He ran.", "She ran."]),
+    ("He ran.\n\n---\n\nShe ran.\n\n***\n\n* * *\nThey ran", ["He ran.", "She ran.", "They ran"]),
+    ("---\nFirst line after a rule", ["First line after a rule"]),
+    ("An unfinished line\n# Heading\nNext", ["An unfinished line", "Next"]),
+])
+def test_headings_and_scene_breaks_are_not_sentences(text, expected):
+    assert _sentences(text) == expected
+    assert count_sentences(text) == len(expected)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ("Mr. Smith met Dr. Jones at 3.5 p.m. and smiled.", 1),
+    ("She waited... then left. Done", 2),
+    ('"Stop!" she said. He stopped.', 2),
+    ("Chapter 3 was the longest. It dragged.", 2),
+    ("...", 0),
+])
+def test_sentence_boundaries(text, expected):
+    assert count_sentences(text) == expected
+
+
+def test_scene_breaks_are_not_words():
+    assert count_words("He ran.\n\n---\n\nShe ran.") == 4
+
+
+def test_manuscript_sentence_count(manuscript_text):
+    # Every heading and scene break of the generated manuscript is left out
+    sentences = _sentences(manuscript_text)
+    assert not any(s.startswith(("Chapter ", "Another ", "*")) for s in sentences)
+    assert all(any(c.isalnum() for c in s) for s in sentences)
@@ -0,0 +1,54 @@
+"""Sidecar index: a reloaded analysis matches the one it was saved from."""
+
+from musestat.core.analyzer import analyze_manuscript
+from musestat.core.frequency import WordEstimate
+from musestat.core.sidecar import sidecar_path
+
+
+def _normalized(stats):
+    out = {}
+    for key, value in stats.items():
+        if key == 'chapters':
+            value = [chapter.to_dict() for chapter in value]
+        elif key == 'structure':
+            value = [(node.to_dict(), node.metrics.to_dict() if node.metrics else None)
+                     for node in (value, *value.iter_nodes())]
+        out[key] = value
+    return out
+
+
+def test_reloaded_analysis_is_identical(manuscript_file):
+    saved = dict(analyze_manuscript(str(manuscript_file), enable_advanced=True, show_progress=False, use_index=True))
+    assert sidecar_path(str(manuscript_file)).exists()
+    loaded = dict(analyze_manuscript(str(manuscript_file), enable_advanced=True, show_progress=False, use_index=True))
+    assert list(loaded) == list(saved)
+    assert _normalized(loaded) == _normalized(saved)
+
+
+def test_changed_options_match_a_fresh_analysis(manuscript_file):
+    analyze_manuscript(str(manuscript_file), show_progress=False, use_index=True)
+    reused = analyze_manuscript(str(manuscript_file), show_progress=False, use_index=True, top_words_count=7)
+    fresh = analyze_manuscript(str(manuscript_file), show_progress=False, top_words_count=7)
+    assert _normalized(dict(reused)) == _normalized(dict(fresh))
+
+
+def test_files_sharing_a_stem_get_separate_indexes(tmp_path):
+    markdown = tmp_path / "book.md"
+    plain = tmp_path / "book.txt"
+    markdown.write_text("# One\n\nMarkdown words here.\n", encoding="utf-8")
+    plain.write_text("Plain text with other words entirely.\n", encoding="utf-8")
+    assert sidecar_path(str(markdown)).name == "book.md.musestat.idx"
+    assert sidecar_path(str(markdown)) != sidecar_path(str(plain))
+
+    analyze_manuscript(str(markdown), show_progress=False, use_index=True)
+    analyze_manuscript(str(plain), show_progress=False, use_index=True)
+    again = analyze_manuscript(str(markdown), show_progress=False, use_index=True)
+    assert again['total_words'] == 4
+
+
+def test_word_estimates_are_restored(manuscript_file):
+    options = dict(show_progress=False, use_index=True, approx_frequency=True)
+    saved = analyze_manuscript(str(manuscript_file), **options)['common_words']
+    loaded = analyze_manuscript(str(manuscript_file), **options)['common_words']
+    assert loaded == saved
+    assert all(type(entry) is WordEstimate for entry in loaded)
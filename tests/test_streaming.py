@@ -0,0 +1,119 @@
+"""Streaming analysis gives the same statistics as analyzing the text in memory."""
+
+import re
+
+import pytest
+
+from musestat.core.analyzer import analyze_manuscript
+from musestat.core.streaming import analyze_manuscript_stream, iter_blocks, MAX_BLOCK_FACTOR
+
+COMPARED_KEYS = (
+    'total_words', 'total_characters', 'total_characters_no_spaces', 'total_sentences',
+    'total_paragraphs', 'common_words', 'avg_words_per_sentence', 'language',
+)
+
+
+def _chapters(stats):
+    return [(chapter['title'], chapter['words'], chapter['scenes'], chapter.line) for chapter in stats['chapters']]
+
+
+def assert_same_statistics(path, chunk_size, enable_advanced=False):
+    expected = analyze_manuscript(str(path), enable_advanced=enable_advanced, show_progress=False)
+    streamed = analyze_manuscript_stream(str(path), chunk_size=chunk_size, enable_advanced=enable_advanced)
+    for key in COMPARED_KEYS:
+        assert streamed[key] == expected[key], key
+    assert _chapters(streamed) == _chapters(expected)
+    if enable_advanced:
+        assert streamed['pacing'] == expected['pacing']
+        assert streamed['dialogue'] == expected['dialogue']
+
+
+@pytest.mark.parametrize('chunk_size', [200, 3000, 1 << 20])
+def test_stream_matches_in_memory(manuscript_file, chunk_size):
+    assert_same_statistics(manuscript_file, chunk_size)
+
+
+def test_stream_matches_in_memory_advanced(manuscript_file):
+    assert_same_statistics(manuscript_file, 500, enable_advanced=True)
+
+
+@pytest.mark.parametrize('suffix', ['.txt', '.md'])
+def test_single_newline_text_is_cut_and_carried(tmp_path, manuscript_text, suffix):
+    # No blank lines at all: every block is a forced cut, so sentences and
+    # paragraphs run across blocks
+    path = tmp_path / f"single{suffix}"
+    path.write_text(re.sub(r'\n[ \t]*\n', '\n', manuscript_text), encoding='utf-8')
+    assert_same_statistics(path, 300, enable_advanced=True)
+
+
+def test_long_code_fence_cut_in_two(tmp_path, manuscript_text):
+    fence = "```\n" + "\n".join(f"line {i} of code." for i in range(400)) + "\n```\n"
+    middle = len(manuscript_text) // 2
+    middle = manuscript_text.index("\n\n", middle) + 2
+    path = tmp_path / "fence.md"
+    path.write_text(manuscript_text[:middle] + fence + "\n" + manuscript_text[middle:], encoding='utf-8')
+    assert_same_statistics(path, 250)
+
+
+def test_blocks_are_bounded_without_blank_lines():
+    text = "The river ran cold beneath a silver moon.\n" * 5000
+    chunks = [text[i:i + 1000] for i in range(0, len(text), 1000)]
+    blocks = list(iter_blocks(chunks, 1000))
+    assert ''.join(blocks) == text
+    assert len(blocks) > 1
+    assert max(map(len, blocks)) <= 1000 * (MAX_BLOCK_FACTOR + 1)
+    assert all(block.endswith('\n') for block in blocks)
+
+
+def test_blocks_cut_one_long_line_at_whitespace():
+    text = "word " * 10000
+    blocks = list(iter_blocks([text[i:i + 512] for i in range(0, len(text), 512)], 512))
+    assert ''.join(blocks) == text
+    assert all(block.endswith(' ') for block in blocks)
+    assert max(map(len, blocks)) <= 512 * (MAX_BLOCK_FACTOR + 1)
+
+
+def test_blocks_end_after_blank_lines_outside_fences():
+    text = "one\n\n```\na\n\nb\n```\n\ntwo\n\nthree"
+    # One-character chunks: every boundary straddles chunks
+    blocks = list(iter_blocks(text, 1, max_block_size=1000))
+    assert ''.join(blocks) == text
+    assert blocks == ["one\n\n", "```\na\n\nb\n```\n\n", "two\n\n", "three"]
+
+
+def _insert_after_paragraph(text, fraction, insert):
+    at = text.index("\n\n", int(len(text) * fraction)) + 2
+    return text[:at] + insert + text[at:]
+
+
+@pytest.mark.parametrize('chunk_size', [250, 3000, 1 << 20])
+def test_unmatched_fence_marker_is_text(tmp_path, manuscript_text, chunk_size):
+    # One stray marker in the first chapter: everything after it is still prose
+    path = tmp_path / "stray.md"
+    path.write_text(_insert_after_paragraph(manuscript_text, 0.1, "Stray ``` marker here.\n\n"), encoding='utf-8')
+    assert_same_statistics(path, chunk_size, enable_advanced=True)
+    streamed = analyze_manuscript_stream(str(path), chunk_size=chunk_size)
+    assert all(chapter['words'] for chapter in streamed['chapters'])
+
+
+def test_fence_left_open_at_the_end_is_text(tmp_path, manuscript_text):
+    path = tmp_path / "open.md"
+    path.write_text(manuscript_text + "\n```\nnever closed, these are words\n", encoding='utf-8')
+    assert_same_statistics(path, 300, enable_advanced=True)
+
+
+def test_fences_before_an_unmatched_marker_stay_code(tmp_path, manuscript_text):
+    fence = "```\n" + "\n".join(f"line {i} of code." for i in range(300)) + "\n```\n\n"
+    text = _insert_after_paragraph(manuscript_text, 0.3, fence)
+    path = tmp_path / "mixed.md"
+    path.write_text(_insert_after_paragraph(text, 0.6, "A lone ``` marker.\n\n"), encoding='utf-8')
+    assert_same_statistics(path, 250, enable_advanced=True)
+
+
+def test_long_dialogue_line_cut_at_whitespace(tmp_path):
+    line = " ".join(f'"Quote number {i} here," she said, and he said "reply {i}."' for i in range(200))
+    path = tmp_path / "dialogue.md"
+    path.write_text(f"# Chapter 1\n\nIntro.\n\n{line}\n\n'Short one,' he said.\n", encoding='utf-8')
+    assert_same_statistics(path, 200, enable_advanced=True)
+    streamed = analyze_manuscript_stream(str(path), chunk_size=200, enable_advanced=True)
+    assert streamed['dialogue']['lines'] == 2
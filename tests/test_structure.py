@@ -0,0 +1,124 @@
+"""Part/chapter/scene tree: node counts, metric sums and scene length outliers."""
+
+from musestat.core.analyzer import analyze_manuscript
+from musestat.core.structure import (
+    LONG, PART, CHAPTER, SCENE, SHORT, build_outline, calculate_scene_statistics, measure_outline
+)
+from musestat.core.text_processing import count_words
+from musestat.core.tokenizer import tokenize
+
+WORDS = "the river ran cold beneath a silver moon while she waited".split()
+
+# Scene lengths in words; the short and the long scene are far from the rest
+SHORT_SCENE = (0, 1, 1)
+LONG_SCENE = (1, 2, 0)
+
+
+def _scene(part, chapter, scene):
+    length = 40 + 3 * scene + chapter
+    if (part, chapter, scene) == SHORT_SCENE:
+        length = 2
+    elif (part, chapter, scene) == LONG_SCENE:
+        length = 400
+    words = [WORDS[i % len(WORDS)] for i in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def build_book(parts=2, chapters=3, scenes=3):
+    out = ["Dedication before the first part.\n"]
+    for part in range(parts):
+        out.append(f"# Part {part + 1}\n")
+        out.append("An epigraph for the part, in a few words.\n")
+        for chapter in range(chapters):
+            out.append(f"## Chapter {chapter + 1}\n")
+            out.append("\n***\n\n".join(_scene(part, chapter, scene) for scene in range(scenes)) + "\n")
+    return "\n".join(out)
+
+
+def _measured(text):
+    outline = build_outline(text)
+    totals, preamble = measure_outline(tokenize(text), outline, include_dialogue=True)
+    return outline, totals, preamble
+
+
+def test_part_intro_text_is_not_a_scene():
+    outline, _, _ = _measured(build_book())
+    assert len(outline.nodes(PART)) == 2
+    assert len(outline.nodes(CHAPTER)) == 6
+    assert len(outline.nodes(SCENE)) == 18
+    for part in outline.nodes(PART):
+        assert [child.kind for child in part.children] == [CHAPTER] * 3
+        assert part.scenes == 9
+        # The epigraph is the part's own text
+        assert part.chapter.words == count_words("An epigraph for the part, in a few words.")
+
+
+def test_node_metrics_sum_up_the_tree():
+    text = build_book()
+    outline, totals, preamble = _measured(text)
+    root = outline.root
+    assert totals.words == root.words == count_words(text)
+    assert preamble.words == count_words("Dedication before the first part.")
+
+    def heading_words(node):
+        return count_words(text[node.heading_start:node.start])
+
+    parts = outline.nodes(PART)
+    assert root.words == preamble.words + sum(part.words + heading_words(part) for part in parts)
+    for part in parts:
+        chapters = [child for child in part.children if child.kind == CHAPTER]
+        assert part.words == part.chapter.words + sum(
+            chapter.words + heading_words(chapter) for chapter in chapters
+        )
+        for chapter in chapters:
+            assert chapter.words == chapter.chapter.words == sum(scene.words for scene in chapter.children)
+            assert chapter.sentences == sum(scene.sentences for scene in chapter.children) == 3
+
+
+def test_short_and_long_scenes_are_flagged():
+    outline, _, _ = _measured(build_book())
+    flagged = {scene.path: scene.outlier for scene in outline.nodes(SCENE) if scene.outlier}
+    assert flagged == {
+        'Part 1 › Chapter 2 › Scene 2': SHORT,
+        'Part 2 › Chapter 3 › Scene 1': LONG,
+    }
+    outlier_counts = [chapter.chapter.outlier_scenes for chapter in outline.nodes(CHAPTER)]
+    assert outlier_counts == [0, 1, 0, 0, 0, 1]
+    assert [part.outlier_scenes for part in outline.nodes(PART)] == [1, 1]
+
+
+def test_too_few_scenes_are_never_flagged():
+    outline, _, _ = _measured(build_book(parts=1, chapters=1, scenes=3))
+    assert not any(scene.outlier for scene in outline.nodes(SCENE))
+    stats = calculate_scene_statistics(outline.nodes(SCENE))
+    assert stats['lower_fence'] is None and stats['upper_fence'] is None
+
+
+def test_scene_statistics():
+    outline, _, _ = _measured(build_book())
+    scenes = outline.nodes(SCENE)
+    stats = calculate_scene_statistics(scenes)
+    word_counts = sorted(scene.words for scene in scenes)
+    assert stats['count'] == 18
+    assert (stats['min'], stats['max']) == (word_counts[0], word_counts[-1]) == (2, 400)
+    assert stats['mean'] == sum(word_counts) / 18
+    assert stats['q1'] <= stats['median'] <= stats['q3']
+    assert stats['lower_fence'] > 2 and stats['upper_fence'] < 400
+    assert sum(bucket['count'] for bucket in stats['distribution']) == 18
+    assert stats['distribution'][0]['min'] == 2 and stats['distribution'][-1]['max'] == 400
+    assert stats['short_scenes'] == ['Part 1 › Chapter 2 › Scene 2']
+    assert stats['long_scenes'] == ['Part 2 › Chapter 3 › Scene 1']
+    assert stats['avg_sentence_length'] == sum(word_counts) / 18
+    assert stats['avg_dialogue_ratio'] == 0
+    assert calculate_scene_statistics([]) is None
+
+
+def test_analysis_includes_the_tree(tmp_path):
+    path = tmp_path / 'book.md'
+    path.write_text(build_book(), encoding='utf-8')
+    stats = analyze_manuscript(str(path), show_progress=False)
+    assert stats['structure'].words == stats['total_words']
+    assert len(stats['structure'].nodes(SCENE)) == 18
+    assert stats['scene_stats']['count'] == 18
+    # Every heading is still a flat chapter record
+    assert len(stats['chapters']) == 8
@@ -0,0 +1,97 @@
+"""Manuscript verification: one pass over the shared paragraph and line indexes."""
+
+from musestat.core.analyzer import analyze_manuscript
+from musestat.core.lines import index_lines
+from musestat.core.paragraphs import index_paragraphs
+from musestat.features.verification import verify_manuscript
+
+SAMPLE = (
+    "# Title\n"
+    "\n"
+    "TODO fix this\tline \n"
+    "Some text  here - ok.\n"
+    "\n"
+    "The the end!!\n"
+    "\n"
+    "```\n"
+    "code with *one asterisk\n"
+    "```\n"
+    "Unmatched *asterisk here.\n"
+    "\n"
+    "\n"
+    "\n"
+    "\n"
+    "#### Skipped level [INSERT name\n"
+)
+
+
+def _summary(issues):
+    return [(issue.category, issue.message, issue.line_number, issue.column, issue.paragraph) for issue in issues]
+
+
+def test_issues_are_listed_check_by_check():
+    issues = verify_manuscript(SAMPLE, [])
+    categories = [issue.category for issue in issues]
+    assert categories == [
+        "Markdown Formatting",
+        "Pre-publish",
+        "Typos",
+        "Punctuation", "Punctuation",
+        "Whitespace", "Whitespace",
+        "Heading Hierarchy",
+        "Spacing",
+        "Incomplete Content",
+    ]
+
+
+def test_code_blocks_skip_formatting_checks():
+    issues = verify_manuscript(SAMPLE, [])
+    formatting = [issue for issue in issues if issue.category == "Markdown Formatting"]
+    assert [issue.line_number for issue in formatting] == [11]
+
+
+def test_previews_come_from_the_issue_line():
+    issues = {issue.message: issue for issue in verify_manuscript(SAMPLE, [])}
+    assert issues["Spaced hyphen found - consider em-dash"].line_preview == "Some text  here - ok."
+    assert issues["Repeated 'the the'"].line_preview == "The the end!!"
+    assert issues["Trailing whitespace at end of line"].line_preview is None
+
+
+def test_ignored_lines_are_skipped():
+    issues = verify_manuscript(SAMPLE, ["TODO"])
+    assert not any(issue.line_number == 3 for issue in issues)
+
+
+def test_shared_indexes_give_the_same_issues(manuscript_file, manuscript_text):
+    stats = analyze_manuscript(str(manuscript_file), show_progress=False)
+    text = stats.shared('text')
+    assert text == manuscript_text
+    shared = verify_manuscript(text, [], stats.shared('tokens').paragraphs, stats.shared('line_index'))
+    fresh = verify_manuscript(manuscript_text, [], index_paragraphs(manuscript_text), index_lines(manuscript_text))
+    assert _summary(shared) == _summary(fresh)
+
+
+def test_issue_locations_come_from_offsets():
+    located = {issue.message: issue for issue in verify_manuscript(SAMPLE, [])}
+
+    def where(message):
+        issue = located[message]
+        return issue.line_number, issue.column, issue.paragraph
+
+    # Line, column and paragraph of issues inside multi-line paragraphs
+    assert where("'TODO' marker found - should be resolved before publishing") == (3, 1, 2)
+    assert where("Trailing whitespace at end of line") == (3, 19, 2)
+    assert where("Tab character found in content") == (3, 14, 2)
+    assert where("Spaced hyphen found - consider em-dash") == (4, 16, 2)
+    # The last of four blank lines, which belongs to no paragraph
+    assert where("4 consecutive blank lines") == (15, None, None)
+    assert where("Placeholder text found") == (16, 20, 5)
+
+
+def test_blank_and_last_lines():
+    text = "First line.\n   \nSecond  line ;\n\n\n\nLast line  "
+    issues = _summary(verify_manuscript(text, []))
+    assert ("Whitespace", "Trailing whitespace at end of line", 2, 1, None) in issues
+    assert ("Punctuation", "Space before punctuation mark", 3, 13, 2) in issues
+    assert ("Whitespace", "Trailing whitespace at end of line", 7, 10, 3) in issues
+    assert ("Spacing", "3 consecutive blank lines", 6, None, None) in issues